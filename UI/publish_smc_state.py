@@ -17,7 +17,7 @@ from config.config import (
     UI_SMC_SNAPSHOT_TTL_SEC,
 )
 from core.formatters import fmt_price_stage1, fmt_volume_usd
-from core.serialization import json_dumps, utc_now_iso_z
+from core.serialization import json_dumps_bytes, utc_now_iso_z
 from core.serialization import safe_float
 
 try:  # pragma: no cover - best-effort залежність
@@ -251,7 +251,7 @@ async def publish_smc_state(  # type: ignore
     if analytics:
         payload["analytics"] = analytics
 
-    payload_json = json_dumps(payload)
+    payload_json = json_dumps_bytes(payload)
 
     async def _set_snapshot() -> None:
         try:
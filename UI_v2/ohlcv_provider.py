@@ -22,8 +22,11 @@ class OhlcvProvider(Protocol):
         symbol: str,
         timeframe: str,
         limit: int,
+        *,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
     ) -> Sequence[OhlcvBar]:
-        """Повертає останні ``limit`` барів або кидає виняток."""
+        """Повертає останні ``limit`` барів у ``[start_ms, end_ms)`` або кидає виняток."""
         raise NotImplementedError
 
 
@@ -59,9 +62,15 @@ class UnifiedStoreOhlcvProvider:
         symbol: str,
         timeframe: str,
         limit: int,
+        *,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
     ) -> list[OhlcvBar]:
         limit = max(1, limit)
-        df = await self.store.get_df(symbol, timeframe, limit=limit)
+        # Один шлях для live і історичних завантажень графіка (скрол назад).
+        df = await self.store.get_range(
+            symbol, timeframe, start_ms, end_ms, limit=limit
+        )
         if df is None or df.empty:
             raise OhlcvNotFoundError(f"OHLCV порожній для {symbol} {timeframe}")
 
@@ -25,7 +25,7 @@ except Exception:  # pragma: no cover
 from prometheus_client import Counter, Histogram
 
 from core.contracts import normalize_smc_schema_version
-from core.serialization import json_dumps, json_loads, to_jsonable
+from core.serialization import json_dumps_bytes, json_loads, to_jsonable
 from core.contracts.viewer_state import (
     SmcViewerState,
     UiSmcAssetPayload,
@@ -237,10 +237,8 @@ class SmcViewerBroadcaster:
             )
             return {}
 
-        if isinstance(raw, bytes):
-            raw = raw.decode("utf-8", errors="replace")
-
         try:
+            # bytes ідуть у кодек напряму, без decode у str.
             payload: UiSmcStatePayload = json_loads(raw)  # type: ignore[assignment]
         except Exception:
             logger.warning(
@@ -269,7 +267,7 @@ class SmcViewerBroadcaster:
     async def _save_viewer_snapshot(self) -> None:
         """Зберігає поточний snapshot_by_symbol як один JSON у Redis."""
         try:
-            payload_json = json_dumps(to_jsonable(self.snapshot_by_symbol))
+            payload_json = json_dumps_bytes(to_jsonable(self.snapshot_by_symbol))
             await self.redis.set(self.cfg.viewer_snapshot_key, payload_json)
         except Exception:
             SMC_VIEWER_ERRORS_TOTAL.inc()
@@ -314,9 +312,6 @@ class SmcViewerBroadcaster:
                         continue
 
                     data = message.get("data")
-                    if isinstance(data, bytes):
-                        data = data.decode("utf-8", errors="replace")
-
                     try:
                         payload_raw = data if data is not None else ""
                         payload: UiSmcStatePayload = json_loads(  # type: ignore[assignment]
@@ -376,7 +371,7 @@ class SmcViewerBroadcaster:
                     "symbol": symbol,
                     "viewer_state": state,
                 }
-                payload_json = json_dumps(to_jsonable(payload))
+                payload_json = json_dumps_bytes(to_jsonable(payload))
                 await self.redis.publish(self.cfg.viewer_state_channel, payload_json)
             except Exception:
                 SMC_VIEWER_ERRORS_TOTAL.inc()
@@ -358,8 +358,29 @@ class ViewerStateHttpServer:
                 400,
             )
 
+        # Історичне завантаження: from/to — open_time у мс, to exclusive.
+        range_kwargs: dict[str, int] = {}
         try:
-            bars = list(await self.ohlcv_provider.fetch_ohlcv(symbol, timeframe, limit))
+            for name, kwarg in (("from", "start_ms"), ("to", "end_ms")):
+                raw = (query.get(name) or "").strip()
+                if raw:
+                    range_kwargs[kwarg] = int(raw)
+        except ValueError:
+            return (
+                self._build_response(
+                    status_code=400,
+                    reason="Bad Request",
+                    body={"error": "invalid_range"},
+                ),
+                400,
+            )
+
+        try:
+            bars = list(
+                await self.ohlcv_provider.fetch_ohlcv(
+                    symbol, timeframe, limit, **range_kwargs
+                )
+            )
         except OhlcvNotFoundError:
             return (
                 self._build_response(
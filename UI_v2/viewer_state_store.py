@@ -41,10 +41,8 @@ class ViewerStateStore:
         if not raw:
             return {}
 
-        if isinstance(raw, bytes):
-            raw = raw.decode("utf-8", errors="replace")
-
         try:
+            # bytes ідуть у кодек напряму, без decode у str.
             data = json_loads(raw)
         except Exception:
             logger.warning(
@@ -207,7 +207,7 @@ async def compute_history_status(
     stale_k: float = 3.0,
     now_ms: int | None = None,
 ) -> HistoryStatus:
-    """Зчитує tail з UDS та повертає HistoryStatus для (symbol, tf)."""
+    """Зчитує метадані (або tail) з UDS та повертає HistoryStatus для (symbol, tf)."""
 
     sym = (symbol or "").strip().lower()
     tf = (timeframe or "").strip().lower()
@@ -215,16 +215,24 @@ async def compute_history_status(
 
     tf_ms = timeframe_to_ms(tf) or 60_000
 
-    # Важливо: get_df(limit=N) повертає останні N барів (якщо вони є).
     # Нам достатньо знати "чи є >=min_history_bars" та last_open_time.
     limit = max(1, int(min_history_bars))
-    df = await store.get_df(sym, tf, limit=limit)
-    bars_count = int(len(df)) if df is not None else 0
-
+    meta_fn = getattr(store, "get_series_meta", None)
+    meta = meta_fn(sym, tf) if callable(meta_fn) else None
     last_open_time_ms = None
-    if df is not None and not df.empty:
-        row = df.iloc[-1]
-        last_open_time_ms = _epoch_to_ms(row.get("open_time") or row.get("close_time"))
+    if meta is not None:
+        # O(1) метадані UDS: без матеріалізації DataFrame.
+        bars_count = min(int(meta.rows), limit)
+        last_open_time_ms = _epoch_to_ms(meta.last_open_time)
+    else:
+        # Fallback: get_df(limit=N) повертає останні N барів (якщо вони є).
+        df = await store.get_df(sym, tf, limit=limit)
+        bars_count = int(len(df)) if df is not None else 0
+        if df is not None and not df.empty:
+            row = df.iloc[-1]
+            last_open_time_ms = _epoch_to_ms(
+                row.get("open_time") or row.get("close_time")
+            )
 
     s2 = classify_history(
         now_ms=now_ms_val,
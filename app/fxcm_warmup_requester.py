@@ -3,6 +3,8 @@
 Призначення:
 - періодично проходить по whitelist (symbol, tf) з fxcm_contract;
 - виконує S2-перевірку history (insufficient/stale_tail);
+- для stale_tail і внутрішніх пропусків просить лише відсутні діапазони
+  (range-планувальник UDS поверх індексу gaps), а не повний lookback;
 - публікує команди в Redis (rate-limited), не лізучи у внутрішній кеш конектора.
 
 Це best-effort механізм: навіть якщо FXCM market/price/ohlcv не ок,
@@ -184,6 +186,19 @@ class FxcmWarmupRequester:
                 now_ms=now_ms,
             )
 
+            # Range-планувальник UDS (індекс gaps): замість повного lookback
+            # просимо лише відсутні діапазони. None — серія ще не індексована.
+            ranges: list[Any] | None = None
+            planner = getattr(self.store, "plan_backfill", None)
+            if callable(planner) and (status.state == "ok" or status.needs_backfill):
+                ranges = planner(
+                    sym,
+                    tf_norm,
+                    now_ms=now_ms,
+                    since_ms=now_ms - request_bars * tf_ms,
+                    include_tail=bool(status.needs_backfill),
+                )
+
             # Якщо мінімум для роботи є, але контрактна ціль більша — просимо
             # підтягнути історію у фоні (rate-limited).
             if status.state == "ok":
@@ -192,6 +207,18 @@ class FxcmWarmupRequester:
                 ):
                     cmd_type = "fxcm_warmup"
                     reason = "prefetch_history"
+                elif ranges:
+                    await self._send_ranges(
+                        ranges,
+                        sym=sym,
+                        tf_norm=tf_norm,
+                        tf_ms=tf_ms,
+                        request_bars=request_bars,
+                        status=status,
+                        fxcm_status=fxcm_status,
+                        now_ms=now_ms,
+                    )
+                    continue
                 else:
                     self._clear_active_issue(sym=sym, tf=tf_norm)
                     continue
@@ -201,6 +228,20 @@ class FxcmWarmupRequester:
                 if status.needs_warmup:
                     cmd_type = "fxcm_warmup"
                     reason = "insufficient_history"
+                elif status.needs_backfill and ranges is not None:
+                    # Порожній план = у відкриті години ринку нічого не бракує
+                    # (напр. вихідні) — команда не потрібна.
+                    await self._send_ranges(
+                        ranges,
+                        sym=sym,
+                        tf_norm=tf_norm,
+                        tf_ms=tf_ms,
+                        request_bars=request_bars,
+                        status=status,
+                        fxcm_status=fxcm_status,
+                        now_ms=now_ms,
+                    )
+                    continue
                 elif status.needs_backfill:
                     # Практика інтеграції: у FXCM конекторі backfill для 1m може бути не
                     # реалізований (позначається як tick TF). Щоб не «стріляти в нікуди»,
@@ -238,45 +279,107 @@ class FxcmWarmupRequester:
                 },
                 "fxcm_status": fxcm_status,
             }
+            await self._publish(payload, key=key, status=status, now_ms=now_ms)
+
+    async def _send_ranges(
+        self,
+        ranges: list[Any],
+        *,
+        sym: str,
+        tf_norm: str,
+        tf_ms: int,
+        request_bars: int,
+        status: Any,
+        fxcm_status: dict[str, str],
+        now_ms: int,
+    ) -> None:
+        """Публікує range-команди планувальника UDS (спільний rate-limit на тип).
+
+        ``lookback_*`` покривають діапазон від його початку до «зараз», тож
+        конектор без підтримки ``range`` усе одно дотягне потрібні бари.
+        """
 
-            try:
-                await self.redis.publish(
-                    self.commands_channel,
-                    json_dumps(payload),
-                )
-                self._last_request_ms[key] = now_ms
-
-                prev_total = int(_S3_RUNTIME_SNAPSHOT.get("sent_total") or 0)
-                _update_s3_runtime_snapshot(
-                    sent_total=prev_total + 1,
-                    last_command={
-                        "ts_ms": now_ms,
-                        "type": cmd_type,
-                        "symbol": sym.upper(),
-                        "tf": tf_norm,
-                        "reason": reason,
-                        "channel": self.commands_channel,
-                    },
-                    active_issues=int(len(self._last_request_ms)),
-                )
+        sent: set[tuple[str, str, str]] = set()
+        for rng in ranges:
+            key = (sym, tf_norm, str(rng.cmd_type))
+            if key not in sent and not self._rate_limit_ok(key=key, now_ms=now_ms):
+                continue
+            lookback_bars = max(1, math.ceil((now_ms - int(rng.start_ms)) / tf_ms))
+            payload: dict[str, Any] = {
+                "type": rng.cmd_type,
+                "symbol": sym.upper(),
+                "tf": tf_norm,
+                "min_history_bars": request_bars,
+                "lookback_bars": lookback_bars,
+                "lookback_minutes": _compute_lookback_minutes(
+                    tf_ms=tf_ms, min_history_bars=lookback_bars
+                ),
+                "reason": rng.reason,
+                "range": {
+                    "start_ms": int(rng.start_ms),
+                    "end_ms": int(rng.end_ms),
+                    "bars": int(rng.bars),
+                },
+                "s2": {
+                    "history_state": status.state,
+                    "bars_count": status.bars_count,
+                    "last_open_time_ms": status.last_open_time_ms,
+                },
+                "fxcm_status": fxcm_status,
+            }
+            if await self._publish(payload, key=key, status=status, now_ms=now_ms):
+                sent.add(key)
+
+    async def _publish(
+        self,
+        payload: dict[str, Any],
+        *,
+        key: tuple[str, str, str],
+        status: Any,
+        now_ms: int,
+    ) -> bool:
+        sym, tf_norm, cmd_type = key
+        reason = payload.get("reason")
+        try:
+            await self.redis.publish(
+                self.commands_channel,
+                json_dumps(payload),
+            )
+            self._last_request_ms[key] = now_ms
+
+            prev_total = int(_S3_RUNTIME_SNAPSHOT.get("sent_total") or 0)
+            _update_s3_runtime_snapshot(
+                sent_total=prev_total + 1,
+                last_command={
+                    "ts_ms": now_ms,
+                    "type": cmd_type,
+                    "symbol": sym.upper(),
+                    "tf": tf_norm,
+                    "reason": reason,
+                    "channel": self.commands_channel,
+                },
+                active_issues=int(len(self._last_request_ms)),
+            )
 
-                logger.info(
-                    "S3: send %s for %s %s (bars=%d, last_open=%s, reason=%s, channel=%s)",
-                    cmd_type,
-                    sym.upper(),
-                    _pretty_tf(tf_norm),
-                    int(status.bars_count),
-                    str(status.last_open_time_ms),
-                    reason,
-                    self.commands_channel,
-                )
-            except Exception:
-                logger.warning(
-                    "[S3] Не вдалося publish команду (%s) у %s",
-                    cmd_type,
-                    self.commands_channel,
-                    exc_info=True,
-                )
+            logger.info(
+                "S3: send %s for %s %s (bars=%d, last_open=%s, reason=%s, channel=%s)",
+                cmd_type,
+                sym.upper(),
+                _pretty_tf(tf_norm),
+                int(status.bars_count),
+                str(status.last_open_time_ms),
+                reason,
+                self.commands_channel,
+            )
+            return True
+        except Exception:
+            logger.warning(
+                "[S3] Не вдалося publish команду (%s) у %s",
+                cmd_type,
+                self.commands_channel,
+                exc_info=True,
+            )
+            return False
 
     def _rate_limit_ok(self, *, key: tuple[str, str, str], now_ms: int) -> bool:
         last = self._last_request_ms.get(key)
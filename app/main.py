@@ -146,6 +146,25 @@ async def _init_fast_symbols(store, *, fast_symbols: list[str]) -> list[str]:
     return [sym.lower() for sym in confirmed]
 
 
+async def _warmup_from_disk(
+    store, symbols: list[str], allowed_pairs: set[tuple[str, str]] | None
+) -> None:
+    """Прогріває RAM хвостами snapshot-ів для (symbol, tf) пайплайна."""
+
+    if allowed_pairs is None:
+        pairs = [(sym, "1m") for sym in symbols]
+    else:
+        wanted = set(symbols)
+        pairs = sorted(pair for pair in allowed_pairs if pair[0] in wanted)
+    if not pairs:
+        return
+    try:
+        # Тривалості (сумарна і по ключах) — у логах UDS і metrics_snapshot().
+        await store.warmup_many(pairs, bars_needed=int(store.cfg.profile.ram_max_bars))
+    except Exception as exc:
+        logger.warning("[SMC] Boot warmup з диска не вдався: %s", exc)
+
+
 async def run_pipeline() -> None:
     """Запускає мінімальний SMC пайплайн."""
 
@@ -173,6 +192,7 @@ async def run_pipeline() -> None:
         allowed_pairs = _build_allowed_pairs(cfg)
         contract_min_bars = _build_contract_min_history_bars(cfg)
         _validate_fast_symbols_against_universe(symbols, allowed_pairs)
+        await _warmup_from_disk(datastore, symbols, allowed_pairs)
         fxcm_tasks = start_fxcm_tasks(datastore, allowed_pairs=allowed_pairs)
 
         requester = build_requester_from_config(
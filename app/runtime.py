@@ -146,6 +146,16 @@ def start_fxcm_tasks(
             hmac_algo=settings.fxcm_hmac_algo,
             hmac_required=settings.fxcm_hmac_required,
             allowed_pairs=allowed_pairs,
+            transport=settings.fxcm_ohlcv_transport,
+            stream_key=settings.fxcm_ohlcv_stream_key,
+            stream_group=settings.fxcm_ohlcv_stream_group,
+            stream_consumer=settings.fxcm_ohlcv_stream_consumer,
+            stream_max_deliveries=settings.fxcm_ohlcv_stream_max_deliveries,
+            stream_dead_letter_key=settings.fxcm_ohlcv_stream_dead_letter_key,
+            shards=settings.fxcm_ingest_shards,
+            shard_queue_maxsize=settings.fxcm_ingest_shard_queue_maxsize,
+            backpressure_linger_ms=settings.fxcm_ingest_backpressure_linger_ms,
+            backpressure_pause_ms=settings.fxcm_ingest_backpressure_pause_ms,
         ),
         "[Pipeline] FXCM інжестор запущено",
         "[Pipeline] Не вдалося запустити FXCM інжестор",
@@ -227,8 +237,33 @@ async def bootstrap() -> tuple[UnifiedDataStore, Any]:
         validate_on_write=cfg.validate_on_write,
         io_retry_attempts=cfg.io_retry_attempts,
         io_retry_backoff=cfg.io_retry_backoff,
+        snapshot_segments=cfg.snapshot_segments,
+        segment_max_rows=cfg.segment_max_rows,
+        segment_compact_rows=cfg.segment_compact_rows,
+        snapshot_format=cfg.snapshot_format,
+        ram_ring_buffer=cfg.ram_ring_buffer,
+        redis_write_behind=cfg.redis_write_behind,
+        redis_flush_interval_ms=cfg.redis_flush_interval_ms,
+        redis_flush_max_keys=cfg.redis_flush_max_keys,
+        negative_cache_ttl_sec=cfg.negative_cache_ttl_sec,
+        gap_index=cfg.gap_index,
+        gap_market_hours=cfg.gap_market_hours,
+        gap_daily_breaks_utc=tuple(cfg.gap_daily_breaks_utc),
+        gap_merge_slack_bars=cfg.gap_merge_slack_bars,
+        gap_max_bars_per_command=cfg.gap_max_bars_per_command,
+        flush_stall_soft_sec=cfg.flush_stall_soft_sec,
+        flush_stall_hard_sec=cfg.flush_stall_hard_sec,
+        wal=cfg.wal,
+        wal_dir=cfg.wal_dir,
+        wal_fsync=cfg.wal_fsync,
+        wal_file_max_bytes=cfg.wal_file_max_bytes,
+        flush_interval_sec=cfg.flush_interval_sec,
+        warmup_concurrency=cfg.warmup_concurrency,
+        snapshot_index_step=cfg.snapshot_index_step,
     )
     store = UnifiedDataStore(redis=redis, cfg=store_cfg)
+    # WAL поверх snapshot-ів — до maintenance і будь-якого warmup/get_df.
+    await store.replay_wal()
     await store.start_maintenance()
     logger.info("[Launch] UnifiedDataStore maintenance loop started")
     return store, cfg
@@ -69,6 +69,21 @@ class Settings(BaseSettings):
     fxcm_hmac_required: bool = True  # чи вимагати HMAC-підписи від FXCM
     fxcm_price_tick_channel: str = FXCM_PRICE_TICK_CHANNEL
     fxcm_status_channel: str = FXCM_STATUS_CHANNEL
+    # Транспорт fxcm:ohlcv: pub/sub (дефолт) або Redis Stream з consumer group
+    # (ack після коміту в UDS, продовження з pending після рестарту).
+    fxcm_ohlcv_transport: Literal["pubsub", "stream"] = "pubsub"
+    fxcm_ohlcv_stream_key: str | None = None  # None → збігається з каналом
+    fxcm_ohlcv_stream_group: str = "ai_one_ingestor"
+    fxcm_ohlcv_stream_consumer: str = "ingestor-1"
+    # Отруйні записи: після N невдалих комітів — у dead-letter стрім і XACK.
+    fxcm_ohlcv_stream_max_deliveries: int = 5
+    fxcm_ohlcv_stream_dead_letter_key: str | None = None  # None → <stream>:dead
+    # Шардований інжест: >1 — окремі воркери з обмеженими чергами на (symbol, tf).
+    fxcm_ingest_shards: int = 1
+    fxcm_ingest_shard_queue_maxsize: int = 1_000
+    # Реакція інжестора на backpressure UDS (soft/hard): добір батча та пауза.
+    fxcm_ingest_backpressure_linger_ms: float = 250.0
+    fxcm_ingest_backpressure_pause_ms: float = 500.0
 
     # Проста валідація полів перенесена на рівень запуску/конфігів; додаткові
     # pydantic-валідатори не використовуємо тут для сумісності зі stubs mypy.
@@ -122,6 +137,14 @@ class Settings(BaseSettings):
                 return False
         return bool(v)
 
+    @field_validator("fxcm_ohlcv_transport", mode="before")
+    @classmethod
+    def _normalize_fxcm_ohlcv_transport(cls, v):  # type: ignore[no-untyped-def]
+        if v is None:
+            return "pubsub"
+        value = str(v).strip().lower()
+        return value or "pubsub"
+
     @field_validator(
         "fxcm_price_tick_channel",
         "fxcm_status_channel",
@@ -238,6 +261,7 @@ class Profile(BaseModel):
     flush_batch_max: int = 8
     flush_queue_soft: int = 200
     flush_queue_hard: int = 1000
+    ram_max_bars: int = 30000
 
 
 class TradeUpdaterCfg(BaseModel):
@@ -316,6 +340,29 @@ class DataStoreCfg(BaseModel):
     validate_on_read: bool = True
     io_retry_attempts: int = 3
     io_retry_backoff: float = 0.25
+    snapshot_segments: bool = True
+    segment_max_rows: int = 2000
+    segment_compact_rows: int = 10000
+    snapshot_format: Literal["jsonl", "columnar"] = "jsonl"
+    ram_ring_buffer: bool = True
+    redis_write_behind: bool = True
+    redis_flush_interval_ms: float = 5.0
+    redis_flush_max_keys: int = 256
+    negative_cache_ttl_sec: float = 2.0
+    gap_index: bool = True
+    gap_market_hours: Literal["fx", "24x7"] = "fx"
+    gap_daily_breaks_utc: list[str] = Field(default_factory=list)
+    gap_merge_slack_bars: int = 5
+    gap_max_bars_per_command: int = 5000
+    flush_stall_soft_sec: float = 5.0
+    flush_stall_hard_sec: float = 30.0
+    wal: bool = False
+    wal_dir: str = "wal"
+    wal_fsync: bool = False
+    wal_file_max_bytes: int = 64 * 1024 * 1024
+    flush_interval_sec: float = 0.0
+    warmup_concurrency: int = 8
+    snapshot_index_step: int = 1000
     admin: AdminCfg = AdminCfg()
     smc_universe: SmcUniverseCfg = SmcUniverseCfg()
 
@@ -23,6 +23,9 @@ from config.config import (
     DEFAULT_LOOKBACK,
     DEFAULT_TIMEFRAME,
     MIN_READY_PCT,
+    SMC_BACKPRESSURE_HARD_INTERVAL_MULT,
+    SMC_BACKPRESSURE_HARD_MAX_ASSETS,
+    SMC_BACKPRESSURE_SOFT_INTERVAL_MULT,
     SMC_BATCH_SIZE,
     SMC_CYCLE_BUDGET_MS,
     SMC_MAX_ASSETS_PER_CYCLE,
@@ -38,7 +41,7 @@ from core.serialization import (
     utc_seconds_to_human_utc,
 )
 from data.fxcm_status_listener import get_fxcm_feed_state
-from data.unified_store import UnifiedDataStore
+from data.unified_store import Backpressure, Priority, UnifiedDataStore
 from UI.publish_smc_state import publish_smc_state
 
 if TYPE_CHECKING:  # pragma: no cover - лише для тайпінгів
@@ -101,8 +104,9 @@ async def _get_smc_engine() -> SmcCoreEngine | None:
     try:
         module_engine = importlib.import_module("smc_core.engine")
         engine_cls = module_engine.SmcCoreEngine
-        _SMC_ENGINE = engine_cls()
-        logger.info("[SMC] SmcCoreEngine ініціалізовано")
+        incremental = bool(SMC_RUNTIME_PARAMS.get("incremental", True))
+        _SMC_ENGINE = engine_cls(incremental=incremental)
+        logger.info("[SMC] SmcCoreEngine ініціалізовано (incremental=%s)", incremental)
     except Exception as exc:  # pragma: no cover - best-effort
         logger.warning("[SMC] Не вдалося ініціалізувати SmcCoreEngine: %s", exc)
         _SMC_ENGINE = None
@@ -276,6 +280,44 @@ def _select_symbols_for_cycle(
     return selected, skipped
 
 
+def _apply_backpressure_to_cycle(
+    *,
+    selected: list[str],
+    level: str,
+    priority_of: Callable[[str], int],
+    hard_max_assets: int,
+) -> tuple[list[str], list[str]]:
+    """Звужує вибір циклу під backpressure: повертає (selected, deferred).
+
+    soft — пропускаємо COLD-активи; hard — лишаємо ``hard_max_assets``
+    найпріоритетніших (порядок scheduler-а в межах пріоритету зберігається).
+    """
+
+    if level == Backpressure.NORMAL or not selected:
+        return list(selected), []
+    prio = {sym: int(priority_of(sym)) for sym in selected}
+    kept = [sym for sym in selected if prio[sym] > Priority.COLD]
+    if level == Backpressure.HARD:
+        kept.sort(key=lambda sym: -prio[sym])
+        if hard_max_assets > 0:
+            kept = kept[: int(hard_max_assets)]
+    kept_set = set(kept)
+    return (
+        [sym for sym in selected if sym in kept_set],
+        [sym for sym in selected if sym not in kept_set],
+    )
+
+
+def _backpressure_interval(interval_sec: float, level: str) -> float:
+    """Тривалість циклу з урахуванням backpressure UDS."""
+
+    if level == Backpressure.HARD:
+        return float(interval_sec) * float(SMC_BACKPRESSURE_HARD_INTERVAL_MULT)
+    if level == Backpressure.SOFT:
+        return float(interval_sec) * float(SMC_BACKPRESSURE_SOFT_INTERVAL_MULT)
+    return float(interval_sec)
+
+
 def _build_capacity_meta(*, ready_assets: int, processed_assets: int) -> dict[str, Any]:
     """Мета-поля для capacity guard (processed/skipped)."""
 
@@ -658,20 +700,31 @@ async def smc_producer(
                 mins.append(min_bars)
                 targets.append(target_bars)
 
-                df_tmp = await store.get_df(symbol, timeframe, limit=target_bars)
-                bars_count = int(len(df_tmp)) if df_tmp is not None else 0
+                # Readiness без DataFrame: O(1) метадані UDS; fallback на get_df,
+                # якщо серія ще не завантажена або store їх не підтримує.
+                meta_fn = getattr(store, "get_series_meta", None)
+                meta = meta_fn(symbol, timeframe) if callable(meta_fn) else None
+                last_open_raw: Any = None
+                if meta is not None:
+                    bars_count = min(int(meta.rows), target_bars)
+                    last_open_raw = meta.last_open_time
+                else:
+                    df_tmp = await store.get_df(symbol, timeframe, limit=target_bars)
+                    bars_count = int(len(df_tmp)) if df_tmp is not None else 0
+                    if df_tmp is not None and not df_tmp.empty:
+                        try:
+                            last_row = df_tmp.iloc[-1]
+                            last_open_raw = last_row.get("open_time") or last_row.get(
+                                "close_time"
+                            )
+                        except Exception:
+                            last_open_raw = None
                 bars_by_symbol[sym_norm] = bars_count
 
                 # S2: перевірка stale_tail (хвіст протух) поверх UDS.
                 tf_ms = timeframe_to_ms(timeframe) or 60_000
                 last_open_time_ms = None
-                if df_tmp is not None and not df_tmp.empty:
-                    try:
-                        last_open_raw = df_tmp.iloc[-1].get("open_time") or df_tmp.iloc[
-                            -1
-                        ].get("close_time")
-                    except Exception:
-                        last_open_raw = None
+                if bars_count > 0:
                     # Heuristic: значення в UDS може бути у секундах або мс.
                     try:
                         if last_open_raw is None:
@@ -708,8 +761,7 @@ async def smc_producer(
                     ready_assets_min_count += 1
                     ready_symbols_min.append(sym_norm)
                 if (
-                    df_tmp is not None
-                    and not df_tmp.empty
+                    bars_count > 0
                     and bars_count >= target_bars
                     and _history_ok_for_compute(
                         history_state=s2.state,
@@ -824,6 +876,29 @@ async def smc_producer(
                 SMC_MAX_ASSETS_PER_CYCLE,
             )
 
+        # Backpressure UDS: диск не встигає → менше роботи й рідші цикли.
+        backpressure = Backpressure.level_of(store)
+        ram_layer = getattr(store, "ram", None)
+        selected_symbols, deferred_symbols = _apply_backpressure_to_cycle(
+            selected=selected_symbols,
+            level=backpressure,
+            priority_of=(
+                ram_layer.get_priority
+                if ram_layer is not None
+                else (lambda _sym: Priority.NORMAL)
+            ),
+            hard_max_assets=SMC_BACKPRESSURE_HARD_MAX_ASSETS,
+        )
+        if deferred_symbols:
+            skipped_symbols = skipped_symbols + deferred_symbols
+            logger.warning(
+                "[SMC] cycle=%d backpressure=%s: processed=%d deferred=%d",
+                cycle_seq,
+                backpressure,
+                len(selected_symbols),
+                len(deferred_symbols),
+            )
+
         tasks: list[asyncio.Task[Any]] = []
         for i in range(0, len(selected_symbols), SMC_BATCH_SIZE):
             batch = selected_symbols[i : i + SMC_BATCH_SIZE]
@@ -881,6 +956,7 @@ async def smc_producer(
                     (cycle_ready_ts - cycle_started_ts) * 1000.0, 2
                 ),
                 "cycle_reason": "smc_screening",
+                "uds_backpressure": backpressure,
                 **pipeline_meta,
                 **capacity_meta,
                 **s2_meta,
@@ -903,7 +979,8 @@ async def smc_producer(
         )
 
         elapsed = time.time() - cycle_started_ts
+        cycle_interval = _backpressure_interval(interval_sec, backpressure)
         sleep_time = (
-            max(1, int(interval_sec - elapsed)) if elapsed < interval_sec else 1
+            max(1, int(cycle_interval - elapsed)) if elapsed < cycle_interval else 1
         )
         await asyncio.sleep(sleep_time)
@@ -38,6 +38,19 @@ def _hot_symbol_count(store: UnifiedDataStore) -> int | None:
         return None
 
 
+def _backpressure_snapshot(store: UnifiedDataStore) -> dict[str, Any] | None:
+    """Стан backpressure write-behind, якщо store його надає."""
+
+    snapshot_fn = getattr(store, "backpressure_snapshot", None)
+    if not callable(snapshot_fn):
+        return None
+    try:
+        snapshot = snapshot_fn()
+    except Exception:
+        return None
+    return dict(snapshot) if isinstance(snapshot, Mapping) else None
+
+
 async def publish_ui_metrics(
     store: UnifiedDataStore,
     redis_pub: Any | None,
@@ -63,6 +76,8 @@ async def publish_ui_metrics(
         else:
             snapshot = {"value": snapshot_raw}
         snapshot["hot_symbols"] = _hot_symbol_count(store)
+        if "backpressure" not in snapshot:
+            snapshot["backpressure"] = _backpressure_snapshot(store)
 
         if redis_pub is not None:
             try:
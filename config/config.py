@@ -56,6 +56,9 @@ __all__ = [
     "SMC_BATCH_SIZE",
     "SMC_MAX_ASSETS_PER_CYCLE",
     "SMC_CYCLE_BUDGET_MS",
+    "SMC_BACKPRESSURE_SOFT_INTERVAL_MULT",
+    "SMC_BACKPRESSURE_HARD_INTERVAL_MULT",
+    "SMC_BACKPRESSURE_HARD_MAX_ASSETS",
     "_FALSE_ENV_VALUES",
 ]
 
@@ -229,6 +232,13 @@ SMC_MAX_ASSETS_PER_CYCLE: int = 4
 # М'який бюджет тривалості циклу (поки лише для логів/телеметрії)
 SMC_CYCLE_BUDGET_MS: int = 400
 
+# Реакція на backpressure UDS (write-behind на диск не встигає):
+# soft → цикл розтягується, COLD-активи пропускаються;
+# hard → ще довший цикл і лише N найпріоритетніших активів.
+SMC_BACKPRESSURE_SOFT_INTERVAL_MULT: float = 2.0
+SMC_BACKPRESSURE_HARD_INTERVAL_MULT: float = 4.0
+SMC_BACKPRESSURE_HARD_MAX_ASSETS: int = 2
+
 
 # ───────────────────────────── Логування / Метрики ───────────────────────────
 
@@ -248,6 +258,10 @@ SMC_RUNTIME_PARAMS: dict[str, Any] = {
     "limit": 50,
     "max_concurrency": 4,
     "log_latency": True,
+    # Мемоізація SmcCoreEngine на (symbol, tf): без нового бару hint не
+    # перераховується; новий бар — повний прохід (кешуються лише свінги).
+    # Результат ідентичний пакетному; False — повний прохід щоцикла.
+    "incremental": True,
 }
 INTERVAL_TTL_MAP = {
     "1m": 90,
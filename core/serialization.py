@@ -8,6 +8,14 @@
 - без "магії" та прихованих перетворень;
 - максимально сумісно зі stdlib `json` (allow_nan=True, без жорстких заборон);
 - fallback у `str(obj)` тільки коли інакше не можна.
+
+JSON-кодеки: реєстр зі stdlib-кодеком і швидким бекендом (`orjson`), який
+стає активним автоматично, якщо пакет встановлено. `AI_ONE_JSON_CODEC=stdlib`
+(або `set_json_codec("stdlib")`) повертає stdlib. Швидкий кодек пише ті самі
+байти, що й stdlib; все, де orjson записав би інакше (float в експоненційній
+формі, NaN/Infinity, Enum, numpy, dataclass/set, нестрокові ключі, великі int),
+іде через stdlib. datetime серіалізується orjson-ом через той самий
+`to_jsonable` (`OPT_PASSTHROUGH_DATETIME`).
 """
 
 from __future__ import annotations
@@ -15,12 +23,15 @@ from __future__ import annotations
 # ── Imports ───────────────────────────────────────────────────────────────
 import json
 import math
-from dataclasses import asdict, is_dataclass
-from datetime import UTC, date, datetime
+import os
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import UTC, date, datetime, time
 from decimal import Decimal
 from enum import Enum
-from pathlib import Path
+from pathlib import Path, PurePath
 from typing import Any
+from uuid import UUID
 
 # ── Time ──────────────────────────────────────────────────────────────────
 
@@ -318,10 +329,168 @@ def to_jsonable(obj: Any) -> Any:
     return str(obj)
 
 
+# ── JSON codecs ───────────────────────────────────────────────────────────
+
+JsonBytes = bytes | bytearray | memoryview
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        sort_keys=True,
+        allow_nan=True,
+        separators=(",", ":"),
+        default=to_jsonable,
+    ).encode("utf-8")
+
+
+def _stdlib_loads_bytes(data: JsonBytes | str, errors: str = "replace") -> Any:
+    if isinstance(data, str):
+        return json.loads(data)
+    return json.loads(bytes(data).decode("utf-8", errors=errors))
+
+
+@dataclass(frozen=True, slots=True)
+class JsonCodec:
+    """Компактний JSON ↔ bytes (sort_keys, UTF-8, без пробілів).
+
+    ``loads_bytes(data, errors)`` приймає bytes/str; ``errors`` — політика
+    декодування невалідного UTF-8 (як у ``bytes.decode``).
+    """
+
+    name: str
+    dumps_bytes: Callable[[Any], bytes]
+    loads_bytes: Callable[[JsonBytes | str, str], Any]
+
+
+STDLIB_JSON_CODEC = JsonCodec("stdlib", _stdlib_dumps_bytes, _stdlib_loads_bytes)
+
+_JSON_CODECS: dict[str, JsonCodec] = {STDLIB_JSON_CODEC.name: STDLIB_JSON_CODEC}
+_ACTIVE_JSON_CODEC = STDLIB_JSON_CODEC
+
+# Типи, які orjson пише так само, як stdlib (для float — див. нижче).
+_ORJSON_SCALARS = frozenset((str, int, bool, type(None)))
+# Через ``default=to_jsonable`` (OPT_PASSTHROUGH_DATETIME) або нативно стають
+# тим самим рядком, що й у stdlib-шляху.
+_ORJSON_STRING_TYPES = (date, time, Decimal, PurePath, UUID)
+
+
+def _orjson_plain(obj: Any) -> bool:
+    """True, якщо orjson запише об'єкт байт-у-байт як stdlib.
+
+    Обхід перевіряє лише те, що orjson пише інакше: float поза позиційним
+    записом і NaN/Infinity, Enum (orjson — value, ``to_jsonable`` — name) і
+    типи, чий вміст ``to_jsonable`` перетворює без перевірки (dataclass, set,
+    numpy тощо). datetime/Decimal/Path/UUID і підкласи str/int/dict/list
+    лишаються на orjson; нестрокові ключі та int > 64 біт ловить ``TypeError``.
+    """
+
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is float:
+            # Поза [1e-4, 1e16) repr пише експоненту (``1e-05``, ``1e+16``),
+            # а orjson — ні (``0.00001``, ``1e16``); NaN/Infinity теж сюди.
+            if value != 0.0 and not 1e-4 <= abs(value) < 1e16:
+                return False
+        elif kind in _ORJSON_SCALARS:
+            continue
+        elif kind is dict:
+            extend(value.values())
+        elif kind is list or kind is tuple:
+            extend(value)
+        elif isinstance(value, Enum):
+            return False
+        elif isinstance(value, dict):
+            extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            extend(value)
+        elif not isinstance(value, (str, int, *_ORJSON_STRING_TYPES)):
+            # float-підкласи (numpy) orjson і так відхиляє через TypeError
+            return False
+    return True
+
+
+def _build_orjson_codec() -> JsonCodec | None:
+    try:  # pragma: no cover - опціональна залежність
+        import orjson
+    except Exception:  # pragma: no cover - бекенд не встановлено
+        return None
+
+    # datetime/date/time — через той самий to_jsonable, що й у stdlib-шляху.
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    encode = orjson.dumps
+    decode = orjson.loads
+    decode_error = orjson.JSONDecodeError
+
+    def dumps_bytes(obj: Any) -> bytes:
+        if _orjson_plain(obj):
+            try:
+                return encode(obj, default=to_jsonable, option=option)
+            except TypeError:
+                pass  # нестрокові ключі, int > 64 біт, сурогати, numpy
+        return _stdlib_dumps_bytes(obj)
+
+    def loads_bytes(data: JsonBytes | str, errors: str = "replace") -> Any:
+        try:
+            return decode(data)
+        except decode_error:
+            # NaN/Infinity, великі int, невалідний UTF-8 — як у stdlib.
+            return _stdlib_loads_bytes(data, errors)
+
+    return JsonCodec("orjson", dumps_bytes, loads_bytes)
+
+
+def register_json_codec(codec: JsonCodec, *, activate: bool = False) -> None:
+    """Реєструє кодек; ``activate=True`` одразу робить його активним."""
+
+    _JSON_CODECS[codec.name] = codec
+    if activate:
+        set_json_codec(codec.name)
+
+
+def set_json_codec(name: str) -> JsonCodec:
+    """Перемикає активний кодек (``ValueError`` для незареєстрованого)."""
+
+    global _ACTIVE_JSON_CODEC
+    _ACTIVE_JSON_CODEC = get_json_codec(name)
+    return _ACTIVE_JSON_CODEC
+
+
+def get_json_codec(name: str | None = None) -> JsonCodec:
+    """Активний кодек або зареєстрований за назвою."""
+
+    if name is None:
+        return _ACTIVE_JSON_CODEC
+    codec = _JSON_CODECS.get(name)
+    if codec is None:
+        raise ValueError(
+            f"Невідомий JSON-кодек {name!r}; доступні: {sorted(_JSON_CODECS)}"
+        )
+    return codec
+
+
+def available_json_codecs() -> tuple[str, ...]:
+    return tuple(sorted(_JSON_CODECS))
+
+
+_ORJSON_CODEC = _build_orjson_codec()
+if _ORJSON_CODEC is not None:
+    register_json_codec(_ORJSON_CODEC, activate=True)
+# Типово orjson, якщо встановлений; AI_ONE_JSON_CODEC=stdlib — перевизначення.
+_REQUESTED_JSON_CODEC = os.getenv("AI_ONE_JSON_CODEC", "").strip().lower()
+if _REQUESTED_JSON_CODEC in _JSON_CODECS:
+    set_json_codec(_REQUESTED_JSON_CODEC)
+
+
 # ── JSON I/O ──────────────────────────────────────────────────────────────
 
 
-def json_dumps(obj: Any, *, pretty: bool = False) -> str:
+def json_dumps(obj: Any, *, pretty: bool = False, codec: str | None = None) -> str:
     """Серіалізує об'єкт у JSON-рядок (deterministic, UTF-8 friendly).
 
     - ensure_ascii=False: українські символи та нормальні строки без escape.
@@ -330,6 +499,8 @@ def json_dumps(obj: Any, *, pretty: bool = False) -> str:
     - default=to_jsonable: мінімальні перетворення для складних типів.
 
     `pretty=True` додає індентацію (для debug/файлів), не для гарячого I/O.
+    `codec="stdlib"` явно фіксує stdlib-шлях (підписи/HMAC) незалежно від
+    активного кодека.
     """
 
     if pretty:
@@ -342,14 +513,13 @@ def json_dumps(obj: Any, *, pretty: bool = False) -> str:
             default=to_jsonable,
         )
 
-    return json.dumps(
-        obj,
-        ensure_ascii=False,
-        sort_keys=True,
-        allow_nan=True,
-        separators=(",", ":"),
-        default=to_jsonable,
-    )
+    return get_json_codec(codec).dumps_bytes(obj).decode("utf-8")
+
+
+def json_dumps_bytes(obj: Any, *, codec: str | None = None) -> bytes:
+    """Як ``json_dumps``, але одразу UTF-8 bytes (Redis SET/PUBLISH без str)."""
+
+    return get_json_codec(codec).dumps_bytes(obj)
 
 
 def json_loads(data: str | bytes | bytearray) -> Any:
@@ -360,8 +530,14 @@ def json_loads(data: str | bytes | bytearray) -> Any:
     ``errors='replace'`` (консервативно, без винятків на декодуванні).
     """
 
-    if isinstance(data, (bytes, bytearray)):
-        text = data.decode("utf-8", errors="replace")
-    else:
-        text = data
-    return json.loads(text)
+    return _ACTIVE_JSON_CODEC.loads_bytes(data, "replace")
+
+
+def json_loads_bytes(data: JsonBytes | str, *, errors: str = "replace") -> Any:
+    """Десеріалізує bytes із Redis без проміжного ``decode`` у str.
+
+    ``errors`` — політика для невалідного UTF-8 (``replace``/``ignore``),
+    як у ``bytes.decode`` на старих call-site.
+    """
+
+    return _ACTIVE_JSON_CODEC.loads_bytes(data, errors)
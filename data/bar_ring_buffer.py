@@ -0,0 +1,279 @@
+"""Колонковий буфер барів для RAM-шару UDS.
+
+Один буфер на (symbol, interval): numpy-масив на колонку з обмеженою
+ємністю. Бари по порядку дописуються за амортизоване O(1), останній бар
+оновлюється на місці, а DataFrame для читачів — це view без копії.
+Неупорядковані бекфіли і ріст понад ємність буфер не обробляє:
+``try_merge`` повертає False, і сховище робить звичайне DataFrame-злиття
+(довгий ключ далі живе як DataFrame — історія ніколи не відкидається).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_MIN_ALLOC = 64
+# Лише числові колонки фіксованої ширини: int/uint/float/bool.
+_SUPPORTED_KINDS = frozenset("iufb")
+
+
+def _numpy_dtype(series: pd.Series) -> np.dtype | None:
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        return dtype if dtype.kind in _SUPPORTED_KINDS else None
+    # Nullable Int64/Float64/boolean (ingestor віддає Int64 для часу)
+    numpy_dtype = getattr(dtype, "numpy_dtype", None)
+    if not isinstance(numpy_dtype, np.dtype):
+        return None
+    return numpy_dtype if numpy_dtype.kind in _SUPPORTED_KINDS else None
+
+
+def _as_array(series: pd.Series, dtype: np.dtype) -> np.ndarray | None:
+    """Колонка як numpy-масив ``dtype`` або None, якщо каст втрачає дані."""
+    src = _numpy_dtype(series)
+    if src is None or not np.can_cast(src, dtype, casting="safe"):
+        return None
+    if src != series.dtype and series.isna().any():
+        return None  # pd.NA у nullable колонці
+    out: np.ndarray = series.to_numpy(dtype=dtype)
+    return out
+
+
+class BarRingBuffer:
+    """Обмежений колонковий буфер із view-доступом.
+
+    Буфер ніколи не відкидає бари: злиття, після якого рядків стало б
+    більше за ``capacity``, відхиляється без змін. Дані лежать у
+    ``[start, end)`` лінійних масивів розміром до 2×capacity; коли місце
+    закінчується, живі рядки переносяться в **нові** масиви.
+    Видані раніше DataFrame-view ніколи не змінюються: дописування йде за
+    їхні межі, а оновлення останнього бару при виданому view робить копію.
+    """
+
+    __slots__ = (
+        "_alloc",
+        "_arrays",
+        "_capacity",
+        "_columns",
+        "_end",
+        "_exported",
+        "_start",
+        "_view",
+    )
+
+    def __init__(self, dtypes: Mapping[str, np.dtype], capacity: int) -> None:
+        if "open_time" not in dtypes:
+            raise ValueError("BarRingBuffer потребує колонку open_time")
+        self._capacity = max(1, int(capacity))
+        self._columns: tuple[str, ...] = tuple(dtypes)
+        self._alloc = _MIN_ALLOC
+        self._arrays: dict[str, np.ndarray] = {
+            name: np.empty(self._alloc, dtype=dt) for name, dt in dtypes.items()
+        }
+        self._start = 0
+        self._end = 0
+        self._view: pd.DataFrame | None = None
+        self._exported = False
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, capacity: int) -> BarRingBuffer | None:
+        """Будує буфер із відсортованого фрейму; None — фрейм не підходить.
+
+        Підходить лише фрейм не довший за ``capacity`` зі строковими назвами
+        колонок, числовими dtype без пропусків і строго зростаючим
+        ``open_time``.
+        """
+        if len(df) > max(1, int(capacity)):
+            return None
+        if "open_time" not in df.columns or df.columns.has_duplicates:
+            return None
+        dtypes: dict[str, np.dtype] = {}
+        for name in df.columns:
+            if not isinstance(name, str):
+                return None
+            dtype = _numpy_dtype(df[name])
+            if dtype is None:
+                return None
+            dtypes[name] = dtype
+        buf = cls(dtypes, capacity)
+        if len(df) and not buf._append_frame(df):
+            return None
+        return buf
+
+    # ── Інспектори ──────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._columns
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Виділена пам'ять (O(1), без ``memory_usage(deep=True)``)."""
+        return sum(arr.nbytes for arr in self._arrays.values())
+
+    def first_open_time(self) -> int | None:
+        if self._end == self._start:
+            return None
+        return int(self._arrays["open_time"][self._start])
+
+    def last_open_time(self) -> int | None:
+        if self._end == self._start:
+            return None
+        return int(self._arrays["open_time"][self._end - 1])
+
+    def last_row(self) -> dict[str, Any]:
+        """Останній бар як dict python-скалярів (для Redis last-bar)."""
+        pos = self._end - 1
+        return {name: self._arrays[name][pos].item() for name in self._columns}
+
+    def view(self) -> pd.DataFrame:
+        """DataFrame поверх живих рядків без копіювання (кешується до зміни).
+
+        Після видачі view наступний upsert останнього бару копіює масиви,
+        тож гарячий шлях запису view не будує — лише читачі та флуш.
+        """
+        if self._view is None:
+            data = {
+                name: self._arrays[name][self._start : self._end]
+                for name in self._columns
+            }
+            self._view = pd.DataFrame(data, copy=False)
+        self._exported = True
+        return self._view
+
+    # ── Мутації ─────────────────────────────────────────────────────────
+
+    def try_merge(self, new: pd.DataFrame) -> bool:
+        """Вливає ``new`` на місці, якщо це append/upsert останнього бару.
+
+        Повертає False без жодних змін, коли потрібне повне злиття:
+        інший набір колонок, несумісні dtype, неупорядкований батч,
+        бекфіл у середину історії або ріст понад ``capacity``.
+        """
+        if not len(new) or set(new.columns) != set(self._columns):
+            return False
+        if new.columns.has_duplicates:
+            return False
+        arrays = self._coerce(new)
+        if arrays is None:
+            return False
+        return self._merge_arrays(arrays)
+
+    def try_merge_arrays(self, columns: Mapping[str, np.ndarray]) -> bool:
+        """``try_merge`` для готових numpy-колонок (інжест без DataFrame).
+
+        Колонки мають збігатися з буфером і безпечно кастуватися в його dtype.
+        """
+        if set(columns) != set(self._columns):
+            return False
+        arrays: dict[str, np.ndarray] = {}
+        size: int | None = None
+        for name in self._columns:
+            arr = np.asarray(columns[name])
+            dtype = self._arrays[name].dtype
+            if arr.ndim != 1 or arr.dtype.kind not in _SUPPORTED_KINDS:
+                return False
+            if not np.can_cast(arr.dtype, dtype, casting="safe"):
+                return False
+            if size is None:
+                size = len(arr)
+            elif len(arr) != size:
+                return False
+            arrays[name] = arr.astype(dtype, copy=False)
+        if not size:
+            return False
+        return self._merge_arrays(arrays)
+
+    def _merge_arrays(self, arrays: Mapping[str, np.ndarray]) -> bool:
+        ot = arrays["open_time"]
+        if len(ot) > 1 and not bool((ot[1:] > ot[:-1]).all()):
+            return False
+        last = self.last_open_time()
+        if last is None or int(ot[0]) > last:
+            if len(self) + len(ot) > self._capacity:
+                return False
+            self._append_arrays(arrays, len(ot))
+            return True
+        if int(ot[0]) != last or len(self) + len(ot) - 1 > self._capacity:
+            return False
+        self._upsert_last(arrays)
+        if len(ot) > 1:
+            self._append_arrays({k: v[1:] for k, v in arrays.items()}, len(ot) - 1)
+        return True
+
+    def _coerce(self, df: pd.DataFrame) -> dict[str, np.ndarray] | None:
+        out: dict[str, np.ndarray] = {}
+        for name in self._columns:
+            arr = _as_array(df[name], self._arrays[name].dtype)
+            if arr is None:
+                return None
+            out[name] = arr
+        return out
+
+    def _append_frame(self, df: pd.DataFrame) -> bool:
+        arrays = self._coerce(df)
+        if arrays is None:
+            return False
+        ot = arrays["open_time"]
+        if len(ot) > 1 and not bool((ot[1:] > ot[:-1]).all()):
+            return False
+        self._append_arrays(arrays, len(ot))
+        return True
+
+    def _upsert_last(self, arrays: Mapping[str, np.ndarray]) -> None:
+        pos = self._end - 1
+        if "is_closed" in arrays:
+            # Політика _dedup_sort: фіналізований бар не перетирається live-баром.
+            if bool(self._arrays["is_closed"][pos]) and not bool(
+                arrays["is_closed"][0]
+            ):
+                return
+        else:
+            # Без is_closed _dedup_sort тримає перший рядок (keep="first").
+            return
+        if self._exported:
+            # Видані view мають лишатися незмінними → копія перед записом.
+            self._relocate(self._alloc)
+            pos = self._end - 1
+        for name in self._columns:
+            self._arrays[name][pos] = arrays[name][0]
+        self._view = None
+
+    def _append_arrays(self, arrays: Mapping[str, np.ndarray], count: int) -> None:
+        # Ємність перевіряють викликачі (from_frame/_merge_arrays).
+        if self._end + count > self._alloc:
+            kept = len(self) + count
+            self._relocate(max(_MIN_ALLOC, min(2 * kept, 2 * self._capacity)))
+        for name in self._columns:
+            self._arrays[name][self._end : self._end + count] = arrays[name]
+        self._end += count
+        self._view = None
+
+    def _relocate(self, alloc: int) -> None:
+        """Переносить живі рядки на початок нових масивів розміру ``alloc``."""
+        size = len(self)
+        fresh: dict[str, np.ndarray] = {}
+        for name in self._columns:
+            arr = np.empty(alloc, dtype=self._arrays[name].dtype)
+            arr[:size] = self._arrays[name][self._start : self._end]
+            fresh[name] = arr
+        self._arrays = fresh
+        self._alloc = alloc
+        self._start = 0
+        self._end = size
+        self._view = None
+        self._exported = False
+
+
+__all__ = ["BarRingBuffer"]
@@ -0,0 +1,350 @@
+"""Append-only WAL дельт барів для write-behind UDS.
+
+Кожен ``put_bars`` дописує в WAL лише нові рядки (а ``enforce_tail_limit`` —
+маркер обрізання), тож snapshot-и на диск можна скидати рідко: після краху
+процесу бари між останнім флушем і крашем відновлюються ``replay``-ем поверх
+snapshot-а ще до warmup.
+
+Формат: файли ``wal_000001.jsonl`` у каталозі WAL, один JSON-рядок на запис:
+``{"q": seq, "s": symbol, "i": interval, "c": [колонки], "r": [[рядок], ...]}``
+або ``{"q": seq, "s": ..., "i": ..., "t": first_open_time}`` для trim.
+Обірваний останній рядок (краш посеред запису) при читанні пропускається.
+
+Чекпоінт: для кожного ключа пам'ятаємо перший seq, ще не покритий
+записаним snapshot-ом; закриті файли, старші за мінімум по всіх ключах,
+видаляються. Коли брудних ключів немає — видаляється і активний файл.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from core.serialization import json_dumps_bytes, json_loads_bytes
+
+_FILE_PREFIX = "wal_"
+_FILE_SUFFIX = ".jsonl"
+
+
+@dataclass
+class WalRecord:
+    """Один запис WAL: дельта барів (``columns``/``rows``) або trim."""
+
+    seq: int
+    symbol: str
+    interval: str
+    columns: list[str] | None = None
+    rows: list[list[Any]] | None = None
+    trim_from: int | None = None
+
+    def frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.rows or [], columns=self.columns or [])
+        # Колонка з одних null (напр. close_time лише NA) стає object з None;
+        # float NaN злиттям із числовою історією лишає її числовою.
+        for column in frame.columns:
+            values = frame[column]
+            if values.dtype == object and len(values) and bool(values.isna().all()):
+                frame[column] = np.nan
+        return frame
+
+
+@dataclass
+class _WalFile:
+    path: Path
+    max_seq: int  # -1 — файл з попереднього запуску, ще не перечитаний
+
+
+class BarWal:
+    """Append-only журнал дельт барів із чекпоінтом за flush-ами snapshot-ів.
+
+    Запис синхронний (``write`` + ``flush`` у page cache — переживає падіння
+    процесу). ``fsync`` сам журнал не робить: з ``fsync=True`` власник
+    (``UnifiedDataStore``) синкає дописане group commit-ом поза event loop-ом
+    через ``sync_handle``/``mark_synced``. Лише закриття файлу (ротація,
+    ``close``) синкає його одразу. Файли, що лишилися з попереднього запуску,
+    не видаляються, доки їх не перечитано через ``replay``.
+    """
+
+    def __init__(
+        self, directory: str | Path, *, fsync: bool = False, file_max_bytes: int
+    ) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._fsync = bool(fsync)
+        self._file_max_bytes = max(1, int(file_max_bytes))
+        self._files: list[_WalFile] = [
+            _WalFile(path, -1) for path in self._existing_paths()
+        ]
+        self._next_file = self._file_no(self._files[-1].path) + 1 if self._files else 1
+        self._fh: Any = None
+        self._active: _WalFile | None = None
+        self._active_bytes = 0
+        self._seq = 0
+        self._synced_seq = 0
+        self._dirty: dict[tuple[str, str], int] = {}
+        self._last: dict[tuple[str, str], int] = {}
+        self._stats: dict[str, float] = {
+            "appended_records": 0,
+            "appended_bytes": 0,
+            "syncs": 0,
+            "checkpoints": 0,
+            "removed_files": 0,
+        }
+
+    # ── Файли ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _file_no(path: Path) -> int:
+        return int(path.name[len(_FILE_PREFIX) : -len(_FILE_SUFFIX)])
+
+    def _existing_paths(self) -> list[Path]:
+        paths = [
+            p
+            for p in self.dir.glob(f"{_FILE_PREFIX}*{_FILE_SUFFIX}")
+            if p.name[len(_FILE_PREFIX) : -len(_FILE_SUFFIX)].isdigit()
+        ]
+        return sorted(paths, key=self._file_no)
+
+    def _open_active(self) -> None:
+        path = self.dir / f"{_FILE_PREFIX}{self._next_file:06d}{_FILE_SUFFIX}"
+        self._next_file += 1
+        self._fh = path.open("ab")
+        self._active = _WalFile(path, self._seq)
+        self._active_bytes = 0
+        self._files.append(self._active)
+
+    def _close_active(self) -> None:
+        if self._fh is not None:
+            if self._fsync and self._synced_seq < self._seq:
+                os.fsync(self._fh.fileno())
+                self.mark_synced(self._seq)
+            self._fh.close()
+        self._fh = None
+        self._active = None
+        self._active_bytes = 0
+
+    def close(self) -> None:
+        self._close_active()
+
+    # ── Запис ────────────────────────────────────────────────────────────
+
+    def _append(self, key: tuple[str, str], record: dict[str, Any]) -> int:
+        if self._fh is None or self._active_bytes >= self._file_max_bytes:
+            self._close_active()
+            self._open_active()
+        self._seq += 1
+        record["q"] = self._seq
+        line = json_dumps_bytes(record) + b"\n"
+        self._fh.write(line)
+        self._fh.flush()
+        assert self._active is not None
+        self._active.max_seq = self._seq
+        self._active_bytes += len(line)
+        self._dirty.setdefault(key, self._seq)
+        self._last[key] = self._seq
+        self._stats["appended_records"] += 1
+        self._stats["appended_bytes"] += len(line)
+        return self._seq
+
+    def append_bars(
+        self,
+        symbol: str,
+        interval: str,
+        bars: pd.DataFrame | Mapping[str, np.ndarray],
+    ) -> int:
+        """Дописує нові рядки барів; повертає seq запису."""
+        if isinstance(bars, pd.DataFrame):
+            columns = [str(c) for c in bars.columns]
+            values = [_column_values(bars[c]) for c in bars.columns]
+        else:
+            columns = list(bars)
+            values = [np.asarray(bars[c]).tolist() for c in columns]
+        rows = [list(row) for row in zip(*values, strict=True)]
+        return self._append(
+            (symbol, interval),
+            {"s": symbol, "i": interval, "c": columns, "r": rows},
+        )
+
+    def append_trim(self, symbol: str, interval: str, first_open_time: int) -> int:
+        """Фіксує обрізання історії ключа до бару ``first_open_time``."""
+        return self._append(
+            (symbol, interval),
+            {"s": symbol, "i": interval, "t": int(first_open_time)},
+        )
+
+    # ── Group commit ─────────────────────────────────────────────────────
+
+    @property
+    def fsync(self) -> bool:
+        return self._fsync
+
+    @property
+    def synced_seq(self) -> int:
+        """Усі записи до цього seq уже на диску (fsync)."""
+        return self._synced_seq
+
+    def sync_handle(self) -> tuple[int, int] | None:
+        """(seq, fd) для ``os.fsync`` в іншому потоці; None — синкати нічого.
+
+        ``fd`` — дублікат дескриптора активного файлу: ротація під час синку
+        його не закриває. Викликач закриває ``fd`` і передає ``seq`` у
+        ``mark_synced``.
+        """
+        if self._synced_seq >= self._seq:
+            return None
+        if self._fh is None:
+            # закриті файли синкнуто при закритті, відновлені — вже на диску
+            self._synced_seq = self._seq
+            return None
+        return self._seq, os.dup(self._fh.fileno())
+
+    def mark_synced(self, seq: int) -> None:
+        if seq > self._synced_seq:
+            self._synced_seq = seq
+            self._stats["syncs"] += 1
+
+    # ── Чекпоінт ─────────────────────────────────────────────────────────
+
+    def last_seq(self, symbol: str, interval: str) -> int:
+        """Seq останнього запису ключа (0 — записів немає)."""
+        return self._last.get((symbol, interval), 0)
+
+    def mark_flushed(self, symbol: str, interval: str, covered_seq: int) -> None:
+        """Snapshot ключа, записаний на диск, покриває записи до ``covered_seq``."""
+        key = (symbol, interval)
+        if key not in self._dirty:
+            return
+        if self._last.get(key, 0) <= covered_seq:
+            self._dirty.pop(key, None)
+            self._last.pop(key, None)
+        else:
+            self._dirty[key] = max(self._dirty[key], covered_seq + 1)
+
+    def checkpoint(self) -> int:
+        """Видаляє файли, всі записи яких уже покриті snapshot-ами."""
+        if not self._files:
+            return 0
+        if not self._dirty and self._active is not None:
+            self._close_active()
+        floor = min(self._dirty.values(), default=self._seq + 1)
+        removed = 0
+        keep: list[_WalFile] = []
+        for wal_file in self._files:
+            # -1: файл попереднього запуску, ще не перечитаний — не чіпаємо
+            if (
+                wal_file is not self._active
+                and wal_file.max_seq >= 0
+                and wal_file.max_seq < floor
+            ):
+                try:
+                    wal_file.path.unlink()
+                except FileNotFoundError:
+                    pass
+                removed += 1
+            else:
+                keep.append(wal_file)
+        self._files = keep
+        if removed:
+            self._stats["checkpoints"] += 1
+            self._stats["removed_files"] += removed
+        return removed
+
+    # ── Відновлення ──────────────────────────────────────────────────────
+
+    def replay(self) -> Iterator[WalRecord]:
+        """Читає всі записи у порядку запису; ключі стають брудними.
+
+        Після повного проходу файли попереднього запуску підпадають під
+        звичайний чекпоінт (видаляються, коли ключі скинуто на диск).
+        """
+        for wal_file in list(self._files):
+            if wal_file is self._active:
+                continue
+            max_seq = wal_file.max_seq
+            for record in self._read_file(wal_file.path):
+                # seq продовжує нумерацію: відновлені записи старші за нові
+                self._seq += 1
+                record.seq = self._seq
+                key = (record.symbol, record.interval)
+                self._dirty.setdefault(key, self._seq)
+                self._last[key] = self._seq
+                max_seq = self._seq
+                yield record
+            wal_file.max_seq = max(max_seq, 0)
+
+    @staticmethod
+    def _read_file(path: Path) -> Iterator[WalRecord]:
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError:
+            return
+        with handle:
+            for raw in handle:
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    payload = json_loads_bytes(line, errors="strict")
+                except ValueError:
+                    continue  # обірваний append
+                if not isinstance(payload, dict):
+                    continue
+                symbol = payload.get("s")
+                interval = payload.get("i")
+                if not isinstance(symbol, str) or not isinstance(interval, str):
+                    continue
+                if "t" in payload:
+                    yield WalRecord(0, symbol, interval, trim_from=int(payload["t"]))
+                elif isinstance(payload.get("r"), list):
+                    yield WalRecord(
+                        0,
+                        symbol,
+                        interval,
+                        columns=list(payload.get("c") or []),
+                        rows=payload["r"],
+                    )
+
+    # ── Інспектори ───────────────────────────────────────────────────────
+
+    def size_bytes(self) -> int:
+        total = 0
+        for wal_file in self._files:
+            try:
+                total += wal_file.path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def stats(self) -> dict[str, Any]:
+        st = self._stats
+        return {
+            "files": len(self._files),
+            "bytes": self.size_bytes(),
+            "dirty_keys": len(self._dirty),
+            "appended_records": int(st["appended_records"]),
+            "appended_bytes": int(st["appended_bytes"]),
+            "syncs": int(st["syncs"]),
+            "checkpoints": int(st["checkpoints"]),
+            "removed_files": int(st["removed_files"]),
+        }
+
+
+def _column_values(series: pd.Series) -> list[Any]:
+    """Значення колонки для JSON; NA/NaN → ``None``.
+
+    ``tolist()`` nullable-колонки (``Int64`` у часі інжестора) повертає
+    ``pd.NA``, який серіалізується рядком ``"<NA>"``.
+    """
+    if series.hasnans:
+        series = series.astype(object).where(series.notna(), None)
+    values: list[Any] = series.tolist()
+    return values
+
+
+__all__ = ["BarWal", "WalRecord"]
@@ -0,0 +1,189 @@
+"""Колонковий бінарний формат snapshot-ів барів для дискового шару UDS.
+
+Файл = magic + довжина заголовка + JSON-заголовок + вирівняні (64 байти)
+масиви фіксованої ширини по одному на колонку. Читання через ``np.memmap``
+будує DataFrame без парсингу й копіювання, а ``tail`` зачіпає лише останні
+сторінки файла. JSONL лишається форматом імпорту/експорту.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.serialization import json_dumps, json_loads
+
+MAGIC = b"UDSCOL1\n"
+FORMAT_VERSION = 1
+_ALIGN = 64
+_PREFIX = struct.Struct("<8sQ")  # magic + довжина JSON-заголовка
+# Лише числові колонки фіксованої ширини: int/uint/float/bool.
+_SUPPORTED_KINDS = frozenset("iufb")
+# На Windows відкритий mmap блокує os.replace snapshot-а наступним флушем,
+# тому там читаємо буфер у пам'ять (без парсингу, але з копією).
+_MMAP_READS = os.name != "nt"
+
+
+class UnsupportedFrameError(ValueError):
+    """Фрейм містить колонки, які не можна записати у фіксованій ширині."""
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    name: str
+    dtype: str
+    offset: int
+
+
+@dataclass(frozen=True)
+class ColumnarHeader:
+    rows: int
+    columns: tuple[ColumnSpec, ...]
+
+    def column(self, name: str) -> ColumnSpec | None:
+        for spec in self.columns:
+            if spec.name == name:
+                return spec
+        return None
+
+
+def _align(pos: int) -> int:
+    return (pos + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _column_array(series: pd.Series) -> np.ndarray:
+    """Повертає numpy-масив фіксованої ширини або кидає UnsupportedFrameError."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind not in _SUPPORTED_KINDS:
+            raise UnsupportedFrameError(f"{series.name}: dtype {dtype}")
+        return np.ascontiguousarray(series.to_numpy(), dtype=dtype.newbyteorder("<"))
+    # Nullable Int64/Float64/boolean (ingestor віддає Int64 для часу):
+    # пишемо як звичайний numpy dtype, якщо пропусків немає.
+    numpy_dtype = getattr(dtype, "numpy_dtype", None)
+    if numpy_dtype is None or numpy_dtype.kind not in _SUPPORTED_KINDS:
+        raise UnsupportedFrameError(f"{series.name}: dtype {dtype}")
+    if series.isna().any():
+        raise UnsupportedFrameError(f"{series.name}: NA у nullable колонці")
+    return np.ascontiguousarray(
+        series.to_numpy(dtype=numpy_dtype), dtype=numpy_dtype.newbyteorder("<")
+    )
+
+
+def write_columnar(path: Path, df: pd.DataFrame) -> None:
+    """Атомарно записує фрейм у колонковий формат (tmp + os.replace)."""
+    arrays: list[tuple[str, np.ndarray]] = []
+    for name in df.columns:
+        if not isinstance(name, str):
+            raise UnsupportedFrameError(f"нестрокова назва колонки: {name!r}")
+        arrays.append((name, _column_array(df[name])))
+
+    rows = len(df)
+    # Офсети залежать від довжини заголовка, а заголовок — від офсетів:
+    # фіксуємо точку, коли довжина перестала змінюватись.
+    data_start = _align(_PREFIX.size + 256)
+    while True:
+        specs: list[dict[str, object]] = []
+        pos = data_start
+        for name, arr in arrays:
+            specs.append({"name": name, "dtype": arr.dtype.str, "offset": pos})
+            pos = _align(pos + arr.nbytes)
+        header = json_dumps(
+            {"version": FORMAT_VERSION, "rows": rows, "columns": specs}
+        ).encode("utf-8")
+        needed = _align(_PREFIX.size + len(header))
+        if needed <= data_start:
+            break
+        data_start = needed
+
+    tmp = path.with_suffix(path.suffix + f".tmp.{os.getpid()}.{threading.get_ident()}")
+    with tmp.open("wb") as handle:
+        handle.write(_PREFIX.pack(MAGIC, len(header)))
+        handle.write(header)
+        cursor = _PREFIX.size + len(header)
+        for spec, (_, arr) in zip(specs, arrays, strict=True):
+            offset = int(spec["offset"])  # type: ignore[call-overload]
+            handle.write(b"\0" * (offset - cursor))
+            handle.write(arr.view(np.uint8).data)
+            cursor = offset + arr.nbytes
+
+    # Windows: ціль може бути тимчасово відкрита читачем (WinError 32).
+    for attempt in range(10):
+        try:
+            tmp.replace(path)
+            return
+        except PermissionError:
+            if attempt == 9:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+def read_header(path: Path) -> ColumnarHeader:
+    """Читає лише заголовок (кількість рядків, dtype і офсети колонок)."""
+    with path.open("rb") as handle:
+        prefix = handle.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError(f"обрізаний columnar snapshot: {path}")
+        magic, header_len = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"не columnar snapshot: {path}")
+        payload = json_loads(handle.read(header_len).decode("utf-8"))
+    if not isinstance(payload, dict) or payload.get("version") != FORMAT_VERSION:
+        raise ValueError(f"невідома версія columnar snapshot: {path}")
+    columns = tuple(
+        ColumnSpec(name=str(c["name"]), dtype=str(c["dtype"]), offset=int(c["offset"]))
+        for c in payload.get("columns") or []
+    )
+    return ColumnarHeader(rows=int(payload.get("rows") or 0), columns=columns)
+
+
+def read_columnar(path: Path, *, tail: int | None = None) -> pd.DataFrame:
+    """Будує DataFrame поверх memmap (mode="c": правки не потрапляють у файл).
+
+    ``tail`` обмежує результат останніми рядками — решта файла не читається.
+    """
+    header = read_header(path)
+    start = header.rows - tail if tail is not None and tail < header.rows else 0
+    count = header.rows - max(start, 0)
+    if _MMAP_READS and count:
+        buf: np.ndarray = np.memmap(path, dtype=np.uint8, mode="c")
+    else:
+        buf = np.fromfile(path, dtype=np.uint8)
+    data: dict[str, np.ndarray] = {}
+    for spec in header.columns:
+        dtype = np.dtype(spec.dtype)
+        lo = spec.offset + start * dtype.itemsize
+        # asarray знімає підклас memmap (pandas його не очікує), не копіюючи.
+        data[spec.name] = np.asarray(buf[lo : lo + count * dtype.itemsize]).view(dtype)
+    # copy=False + окремий блок на колонку → pandas не консолідує (без копії).
+    return pd.DataFrame(data, copy=False)
+
+
+def last_value(path: Path, column: str) -> float | None:
+    """Значення колонки в останньому рядку (для inspect без завантаження)."""
+    header = read_header(path)
+    spec = header.column(column)
+    if spec is None or header.rows == 0:
+        return None
+    dtype = np.dtype(spec.dtype)
+    with path.open("rb") as handle:
+        handle.seek(spec.offset + (header.rows - 1) * dtype.itemsize)
+        raw = handle.read(dtype.itemsize)
+    return float(np.frombuffer(raw, dtype=dtype)[0])
+
+
+__all__ = [
+    "ColumnarHeader",
+    "UnsupportedFrameError",
+    "last_value",
+    "read_columnar",
+    "read_header",
+    "write_columnar",
+]
@@ -3,9 +3,14 @@
 Шлях: ``data/fxcm_ingestor.py``
 
 Призначення:
-    • слухає Redis-канал з OHLCV-пакетами від окремого FXCM-конектора (Python 3.7);
-    • перетворює JSON-повідомлення у DataFrame;
-    • записує бари у UnifiedDataStore через put_bars(symbol, interval, bars).
+    • слухає Redis-канал з OHLCV-пакетами від окремого FXCM-конектора (Python 3.7)
+      або (transport="stream") читає Redis Stream через consumer group;
+    • перетворює JSON-повідомлення у типізовані numpy-колонки (без DataFrame);
+    • записує бари у UnifiedDataStore через put_bars(symbol, interval, bars);
+    • під навалою (warmup/backfill) зливає всі вже доступні повідомлення
+      мікробатчем і комітить кожну групу (symbol, tf) одним записом;
+    • читає ``store.backpressure_level()``: під soft/hard навмисно збирає
+      більші батчі (коалесинг), а під hard ще й пригальмовує читання.
 
 Очікуваний формат повідомлення (JSON):
     {
@@ -36,22 +41,38 @@ import asyncio
 import hashlib
 import hmac
 import logging
-from collections.abc import Mapping, Sequence
+import time
+import zlib
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
 from json import JSONDecodeError
-from typing import Any
+from typing import Any, Literal
 
+import numpy as np
 import pandas as pd
 from redis.asyncio import Redis
+from redis.exceptions import ResponseError
 
 from app.settings import settings
-from core.serialization import json_dumps, json_loads, safe_int
+from core.serialization import (
+    json_dumps_bytes,
+    json_loads,
+    json_loads_bytes,
+    safe_int,
+)
 from data.fxcm_status_listener import get_fxcm_feed_state, note_fxcm_bar_close
-from data.unified_store import UnifiedDataStore
+from data.unified_store import Backpressure, PutBarsManyError, UnifiedDataStore
 
 try:  # pragma: no cover - опціональна залежність
-    from prometheus_client import Counter as PromCounter  # type: ignore[import]
+    from prometheus_client import (  # type: ignore[import]
+        Counter as PromCounter,
+        Gauge as PromGauge,
+        Histogram as PromHistogram,
+    )
 except Exception:  # pragma: no cover - у тестах/CI клієнта може не бути
     PromCounter = None
+    PromGauge = None
+    PromHistogram = None
 
 logger = logging.getLogger("fxcm_ingestor")
 if not logger.handlers:  # guard від подвійного підключення
@@ -60,6 +81,13 @@ if not logger.handlers:  # guard від подвійного підключен
     logger.propagate = False
 
 FXCM_OHLCV_CHANNEL = "fxcm:ohlcv"
+# Поле запису Redis Stream з JSON-пакетом (той самий формат, що й у pub/sub).
+FXCM_OHLCV_STREAM_FIELD = "data"
+FXCM_OHLCV_STREAM_GROUP = "ai_one_ingestor"
+FXCM_OHLCV_STREAM_CONSUMER = "ingestor-1"
+# Скільки разів запис може не закомітитись, перш ніж піде в dead-letter стрім.
+FXCM_OHLCV_STREAM_MAX_DELIVERIES = 5
+FXCM_OHLCV_STREAM_DEAD_LETTER_SUFFIX = ":dead"
 
 
 class _NoopCounter:
@@ -70,6 +98,19 @@ class _NoopCounter:
         return None
 
 
+class _NoopGauge:
+    def labels(self, *args: Any, **kwargs: Any) -> _NoopGauge:
+        return self
+
+    def set(self, value: float) -> None:
+        return None
+
+
+class _NoopHistogram:
+    def observe(self, value: float) -> None:
+        return None
+
+
 def _build_counter(
     name: str, description: str, *, labelnames: tuple[str, ...] = ()
 ) -> Any:
@@ -81,6 +122,26 @@ def _build_counter(
         return _NoopCounter()
 
 
+def _build_gauge(
+    name: str, description: str, *, labelnames: tuple[str, ...] = ()
+) -> Any:
+    if PromGauge is None:
+        return _NoopGauge()
+    try:
+        return PromGauge(name, description, labelnames=labelnames)
+    except Exception:  # pragma: no cover - реєстр уже містить метрику
+        return _NoopGauge()
+
+
+def _build_histogram(name: str, description: str, *, buckets: tuple[float, ...]) -> Any:
+    if PromHistogram is None:
+        return _NoopHistogram()
+    try:
+        return PromHistogram(name, description, buckets=buckets)
+    except Exception:  # pragma: no cover - реєстр уже містить метрику
+        return _NoopHistogram()
+
+
 PROM_FXCM_INVALID_SIG = _build_counter(
     "ai_one_fxcm_invalid_sig_total",
     "Кількість FXCM пакетів з некоректним або відсутнім HMAC.",
@@ -101,12 +162,52 @@ PROM_FXCM_OHLCV_INCOMPLETE_SKIPPED_TOTAL = _build_counter(
     labelnames=("tf",),
 )
 
+PROM_FXCM_INGEST_BATCH_SIZE = _build_histogram(
+    "ai_one_fxcm_ingest_batch_size",
+    "Кількість FXCM повідомлень в одному мікробатчі інжестора.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+PROM_FXCM_INGEST_QUEUE_DEPTH = _build_gauge(
+    "ai_one_fxcm_ingest_queue_depth",
+    "Глибина черги FXCM повідомлень між читачем pub/sub і консюмером.",
+)
+PROM_FXCM_INGEST_LATENCY = _build_histogram(
+    "ai_one_fxcm_ingest_latency_seconds",
+    "Час від отримання FXCM повідомлення до коміту його барів в UDS.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+PROM_FXCM_INGEST_BACKPRESSURE_LEVEL = _build_gauge(
+    "ai_one_fxcm_ingest_backpressure_level",
+    "Рівень backpressure UDS, який бачить інжестор (0=normal, 1=soft, 2=hard).",
+)
+PROM_FXCM_INGEST_SHARD_QUEUE_DEPTH = _build_gauge(
+    "ai_one_fxcm_ingest_shard_queue_depth",
+    "Глибина черги шард-воркера FXCM інжестора.",
+    labelnames=("shard",),
+)
+PROM_FXCM_INGEST_SHARD_LAG = _build_gauge(
+    "ai_one_fxcm_ingest_shard_lag_seconds",
+    "Вік найстаршого пакета в останньому коміті шард-воркера (с).",
+    labelnames=("shard",),
+)
+PROM_FXCM_INGEST_SHARD_BACKPRESSURE = _build_counter(
+    "ai_one_fxcm_ingest_shard_backpressure_total",
+    "Скільки разів диспетчер чекав на повну чергу шард-воркера.",
+    labelnames=("shard",),
+)
+PROM_FXCM_INGEST_SHARD_DROPPED = _build_counter(
+    "ai_one_fxcm_ingest_shard_dropped_total",
+    "FXCM пакети, які шард-воркер не зміг записати в UDS.",
+    labelnames=("shard",),
+)
+
 _UNEXPECTED_SIG_LOGGED = False
 _NON_CONTRACT_LOGGED = 0
 _NON_CONTRACT_LOG_LIMIT = 5
 
 _LAST_GATE_ALLOWED: bool | None = None
 _LAST_GATE_REASON: str | None = None
+_LAST_BACKPRESSURE: str = Backpressure.NORMAL
 
 # Якщо FXCM-конектор публікує лише live-бар (complete=false) і не надсилає
 # окремий complete=true на закритті, ми фіналізуємо попередній бар при появі
@@ -117,6 +218,55 @@ _LAST_LIVE_SYNTHETIC_BY_PAIR: dict[tuple[str, str], bool] = {}
 _LAST_FINALIZED_OPEN_TIME_BY_PAIR: dict[tuple[str, str], int] = {}
 
 
+# Локальна статистика мікробатчингу (дублює Prometheus для тестів/діагностики).
+_INGEST_STATS: dict[str, float] = {
+    "batches": 0,
+    "messages": 0,
+    "commits": 0,
+    "max_batch": 0,
+    "queue_depth": 0,
+    "max_queue_depth": 0,
+    "last_latency_ms": 0.0,
+    "max_latency_ms": 0.0,
+    "stream_acked": 0,
+    "stream_replayed": 0,
+    "stream_retry": 0,
+    "stream_dead_lettered": 0,
+    "backpressure_level": 0,
+    "backpressure_soft_batches": 0,
+    "backpressure_hard_batches": 0,
+    "backpressure_pause_ms": 0.0,
+}
+# Статистика шард-воркерів (shard → лічильники), заповнюється в шардованому режимі.
+_SHARD_STATS: dict[int, dict[str, float]] = {}
+
+
+@dataclass
+class _PreparedBars:
+    """Пакет, що пройшов валідацію і готовий до запису в UDS."""
+
+    symbol: str
+    interval: str
+    bars: dict[str, np.ndarray]
+    synthetic_flags: list[bool]
+
+    @property
+    def rows(self) -> int:
+        return len(self.bars["open_time"])
+
+
+def get_fxcm_ingest_stats() -> dict[str, float]:
+    """Повертає копію статистики мікробатчингу інжестора."""
+
+    return dict(_INGEST_STATS)
+
+
+def get_fxcm_shard_stats() -> dict[int, dict[str, float]]:
+    """Повертає копію статистики шард-воркерів (порожньо без шардування)."""
+
+    return {shard: dict(stats) for shard, stats in _SHARD_STATS.items()}
+
+
 def _reset_live_cache_for_tests() -> None:  # pragma: no cover
     _LAST_LIVE_BAR_BY_PAIR.clear()
     _LAST_LIVE_SYNTHETIC_BY_PAIR.clear()
@@ -201,6 +351,9 @@ def _sanitize_bar(bar: Mapping[str, Any]) -> dict[str, Any] | None:
 def _bars_payload_to_df(bars: Sequence[Mapping[str, Any]]) -> pd.DataFrame:
     """Конвертує список барів у DataFrame з очікуваними колонками.
 
+    Еталонний DataFrame-шлях (бенчмарк/сумісність); гарячий шлях інжесту —
+    ``_bars_payload_to_columns``.
+
     Навмисно не робимо складної валідації, щоб не гальмувати гарячий шлях.
     Перевірка схеми/монотонності покривається validate_on_write у UnifiedDataStore.
     """
@@ -269,6 +422,53 @@ def _bars_payload_to_df(bars: Sequence[Mapping[str, Any]]) -> pd.DataFrame:
     ]
 
 
+_BAR_COLUMNS: tuple[tuple[str, type], ...] = (
+    ("open_time", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+    ("close_time", np.int64),
+)
+
+
+def _bars_payload_to_columns(
+    bars: Sequence[Mapping[str, Any]],
+) -> dict[str, np.ndarray]:
+    """Колонковий шлях: санітизовані бари → типізовані numpy-масиви.
+
+    Без DataFrame, ``pd.to_numeric`` і ``Int64``: час — int64 мс, ціни й
+    об'єм — float64. Бари мають пройти ``_sanitize_bar`` (усі поля вже
+    приведені). Сортування по open_time — лише якщо пакет неупорядкований.
+    """
+    count = len(bars)
+    columns: dict[str, np.ndarray] = {
+        name: np.fromiter((bar[name] for bar in bars), dtype=dtype, count=count)
+        for name, dtype in _BAR_COLUMNS
+    }
+    open_time = columns["open_time"]
+    if count > 1 and not bool((open_time[1:] >= open_time[:-1]).all()):
+        order = np.argsort(open_time, kind="stable")
+        columns = {name: arr[order] for name, arr in columns.items()}
+    return columns
+
+
+def _columns_to_frame(columns: Mapping[str, np.ndarray]) -> pd.DataFrame:
+    """DataFrame із колонок — для сховищ, що приймають лише DataFrame."""
+
+    return pd.DataFrame({name: columns[name] for name, _dtype in _BAR_COLUMNS})
+
+
+def _store_bars(
+    store: UnifiedDataStore, columns: dict[str, np.ndarray]
+) -> pd.DataFrame | dict[str, np.ndarray]:
+    # UDS приймає numpy-колонки напряму; сторонні/тестові сховища — DataFrame.
+    if isinstance(store, UnifiedDataStore):
+        return columns
+    return _columns_to_frame(columns)
+
+
 def _normalize_signature(sig: Any) -> str | None:
     if sig is None:
         return None
@@ -313,7 +513,8 @@ def _verify_hmac_signature(
         return False
 
     try:
-        serialized = json_dumps(payload).encode("utf-8")
+        # Підпис рахується над stdlib-виводом байт-у-байт (як у конекторі).
+        serialized = json_dumps_bytes(payload, codec="stdlib")
     except (TypeError, ValueError):
         return False
 
@@ -326,15 +527,19 @@ def _verify_hmac_signature(
     return hmac.compare_digest(digest.hexdigest(), sig)
 
 
-async def _process_payload(
-    store: UnifiedDataStore,
+def _prepare_payload(
     payload: Mapping[str, Any],
     *,
     hmac_secret: str | None,
     hmac_algo: str,
     hmac_required: bool,
     allowed_pairs: set[tuple[str, str]] | None = None,
-) -> tuple[int, str | None, str | None]:
+) -> _PreparedBars | None:
+    """Валідація/HMAC/gate/фільтрація барів пакету без запису в UDS.
+
+    Оновлює live-кеш (фіналізація попереднього live-бару), тому пакети
+    мають проходити через неї строго в порядку надходження.
+    """
     symbol = payload.get("symbol")
     interval = payload.get("tf")
     bars = payload.get("bars")
@@ -351,7 +556,7 @@ async def _process_payload(
             interval,
             type(bars),
         )
-        return 0, None, None
+        return None
 
     sig = _normalize_signature(payload.get("sig"))
     base_payload = {"symbol": symbol, "tf": interval, "bars": bars}
@@ -367,7 +572,7 @@ async def _process_payload(
                     symbol,
                     interval,
                 )
-                return 0, None, None
+                return None
             logger.warning(
                 "[FXCM_INGEST] FXCM-пакет без HMAC (symbol=%r, tf=%r) — приймаємо, "
                 "бо FXCM_HMAC_REQUIRED=False",
@@ -384,7 +589,7 @@ async def _process_payload(
                 symbol,
                 interval,
             )
-            return 0, None, None
+            return None
     else:
         if sig:
             _log_unexpected_sig_once(symbol, interval)
@@ -400,12 +605,12 @@ async def _process_payload(
                 interval_norm,
             )
             _NON_CONTRACT_LOGGED += 1
-        return 0, None, None
+        return None
 
     allowed, reason = _is_ingest_allowed_by_status()
     _maybe_log_gate_transition(allowed, reason)
     if not allowed:
-        return 0, None, None
+        return None
 
     normalized_bars: list[dict[str, Any]] = []
     synthetic_flags: list[bool] = []
@@ -481,38 +686,762 @@ async def _process_payload(
         )
 
     if not normalized_bars:
-        return 0, None, None
+        return None
+
+    columns = _bars_payload_to_columns(normalized_bars)
+    return _PreparedBars(symbol_norm, interval_norm, columns, synthetic_flags)
+
+
+def _note_committed(prepared: _PreparedBars) -> None:
+    """Метрики інкрементуємо лише після успішного запису в UDS."""
+
+    for is_synth in prepared.synthetic_flags:
+        PROM_FXCM_OHLCV_BARS_TOTAL.labels(
+            tf=prepared.interval,
+            synthetic="true" if is_synth else "false",
+        ).inc()
 
-    df = _bars_payload_to_df(normalized_bars)
-    if df.empty:
+    try:
+        note_fxcm_bar_close(int(prepared.bars["close_time"][-1]))
+    except Exception:
+        pass
+
+
+async def _process_payload(
+    store: UnifiedDataStore,
+    payload: Mapping[str, Any],
+    *,
+    hmac_secret: str | None,
+    hmac_algo: str,
+    hmac_required: bool,
+    allowed_pairs: set[tuple[str, str]] | None = None,
+) -> tuple[int, str | None, str | None]:
+    prepared = _prepare_payload(
+        payload,
+        hmac_secret=hmac_secret,
+        hmac_algo=hmac_algo,
+        hmac_required=hmac_required,
+        allowed_pairs=allowed_pairs,
+    )
+    if prepared is None:
         return 0, None, None
 
     try:
-        await store.put_bars(symbol_norm, interval_norm, df)
+        await store.put_bars(
+            prepared.symbol, prepared.interval, _store_bars(store, prepared.bars)
+        )
     except Exception as exc:  # noqa: BLE001
         logger.warning(
             "[FXCM_INGEST] Помилка під час put_bars(%s, %s): %s",
-            symbol_norm,
-            interval_norm,
+            prepared.symbol,
+            prepared.interval,
             exc,
         )
         return 0, None, None
 
-    # Метрики інкрементуємо лише після успішного запису в UDS.
-    for is_synth in synthetic_flags:
-        PROM_FXCM_OHLCV_BARS_TOTAL.labels(
-            tf=interval_norm,
-            synthetic="true" if is_synth else "false",
-        ).inc()
+    _note_committed(prepared)
+    return prepared.rows, prepared.symbol, prepared.interval
+
+
+# ── Мікробатчинг ──
+
 
+def _decode_message(raw_data: Any, channel: str) -> dict[str, Any] | None:
     try:
-        close_series = df["close_time"].dropna()
-        if not close_series.empty:
-            note_fxcm_bar_close(int(close_series.iloc[-1]))
-    except Exception:
-        pass
+        if isinstance(raw_data, (bytes, bytearray)):
+            payload = json_loads_bytes(raw_data, errors="strict")
+        elif isinstance(raw_data, str):
+            payload = json_loads(raw_data)
+        else:
+            # Нестандартний тип від Redis — намагаємось привести до str
+            payload = json_loads(str(raw_data))
+    except JSONDecodeError:
+        logger.warning(
+            "[FXCM_INGEST] Некоректний JSON у повідомленні з каналу %s",
+            channel,
+        )
+        return None
 
-    return len(df), symbol_norm, interval_norm
+    if not isinstance(payload, dict):
+        logger.warning(
+            "[FXCM_INGEST] Очікував dict у payload, отримав %r",
+            type(payload),
+        )
+        return None
+    return payload
+
+
+async def _pump_pubsub(pubsub: Any, queue: asyncio.Queue[tuple[float, Any]]) -> None:
+    """Читач pub/sub: лише кладе сирі повідомлення в обмежену чергу.
+
+    Коли черга повна, читач чекає — backpressure доходить до Redis-клієнта,
+    а не до пам'яті процесу.
+    """
+
+    async for message in pubsub.listen():
+        if message is None or message.get("type") != "message":
+            # subscribe/unsubscribe та інші службові події ігноруємо
+            continue
+        raw_data = message.get("data")
+        if not raw_data:
+            continue
+        await queue.put((time.perf_counter(), raw_data))
+
+
+def _drain_batch(
+    first: tuple[float, Any],
+    queue: asyncio.Queue[tuple[float, Any]],
+    *,
+    max_messages: int,
+    window_sec: float,
+) -> list[tuple[float, Any]]:
+    """Забирає все, що вже лежить у черзі, у межах ліміту кількості/часу.
+
+    Додаткового очікування немає: одиночне повідомлення комітиться одразу,
+    тож латентність live-потоку не зростає.
+    """
+
+    batch = [first]
+    deadline = time.perf_counter() + window_sec
+    while len(batch) < max_messages and not queue.empty():
+        if time.perf_counter() >= deadline:
+            break
+        batch.append(queue.get_nowait())
+    return batch
+
+
+async def _linger_batch(
+    batch: list[tuple[float, Any]],
+    queue: asyncio.Queue[tuple[float, Any]],
+    *,
+    max_messages: int,
+    linger_sec: float,
+) -> None:
+    """Під backpressure добирає батч, чекаючи до ``linger_sec`` нових повідомлень."""
+
+    deadline = time.perf_counter() + linger_sec
+    while len(batch) < max_messages:
+        if not queue.empty():
+            batch.append(queue.get_nowait())
+            continue
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+        except TimeoutError:
+            return
+
+
+async def _backpressure_pace(
+    store: UnifiedDataStore, *, linger_sec: float, pause_sec: float
+) -> float:
+    """Реакція на backpressure перед черговим батчем.
+
+    Повертає бюджет очікування (с) на добір більшого батча: 0 у normal,
+    ``linger_sec`` у soft/hard. У hard додатково чекає ``pause_sec`` перед
+    читанням — записи накопичуються в Redis/черзі, а не в ``_flush_pending``.
+    """
+
+    global _LAST_BACKPRESSURE
+    level = Backpressure.level_of(store)
+    rank = Backpressure.RANK[level]
+    PROM_FXCM_INGEST_BACKPRESSURE_LEVEL.set(rank)
+    _INGEST_STATS["backpressure_level"] = rank
+    if level != _LAST_BACKPRESSURE:
+        logger.log(
+            logging.WARNING if level != Backpressure.NORMAL else logging.INFO,
+            "[FXCM_INGEST] Backpressure UDS %s→%s: %s",
+            _LAST_BACKPRESSURE,
+            level,
+            "звичайний режим"
+            if level == Backpressure.NORMAL
+            else "коалесований батч-режим",
+        )
+        _LAST_BACKPRESSURE = level
+    if level == Backpressure.NORMAL:
+        return 0.0
+    if level == Backpressure.HARD:
+        _INGEST_STATS["backpressure_hard_batches"] += 1
+        if pause_sec > 0:
+            await asyncio.sleep(pause_sec)
+            _INGEST_STATS["backpressure_pause_ms"] += pause_sec * 1000.0
+    else:
+        _INGEST_STATS["backpressure_soft_batches"] += 1
+    return linger_sec
+
+
+async def _commit_prepared(
+    store: UnifiedDataStore, prepared: list[_PreparedBars]
+) -> list[_PreparedBars]:
+    """Комітить підготовлені пакети: одна операція запису на (symbol, tf).
+
+    Порядок пакетів у межах ключа зберігається. Повертає пакети, які реально
+    потрапили в UDS (у порядку надходження). Якщо ``put_bars_many`` записав
+    лише частину ключів (``PutBarsManyError``), окремо повторюються тільки
+    незаписані — закомічене не потрапляє в UDS/WAL вдруге.
+    """
+
+    if not prepared:
+        return []
+
+    pending = prepared
+    committed: set[int] = set()
+    put_many = getattr(store, "put_bars_many", None)
+    if callable(put_many) and len(prepared) > 1:
+        try:
+            await put_many(
+                [(p.symbol, p.interval, _store_bars(store, p.bars)) for p in prepared]
+            )
+            return prepared
+        except PutBarsManyError as exc:
+            logger.warning(
+                "[FXCM_INGEST] put_bars_many не записав %d ключ(ів), повторюю лише їх",
+                len(exc.failed),
+            )
+            pending = [p for p in prepared if (p.symbol, p.interval) in exc.failed]
+            committed.update(
+                id(p) for p in prepared if (p.symbol, p.interval) not in exc.failed
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "[FXCM_INGEST] put_bars_many впав (%s), комічу групи окремо",
+                exc,
+            )
+
+    groups: dict[tuple[str, str], list[_PreparedBars]] = {}
+    for item in pending:
+        groups.setdefault((item.symbol, item.interval), []).append(item)
+
+    for (symbol, interval), items in groups.items():
+        columns = (
+            items[0].bars
+            if len(items) == 1
+            else {
+                name: np.concatenate([p.bars[name] for p in items])
+                for name in items[0].bars
+            }
+        )
+        try:
+            await store.put_bars(symbol, interval, _store_bars(store, columns))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "[FXCM_INGEST] Помилка під час put_bars(%s, %s): %s",
+                symbol,
+                interval,
+                exc,
+            )
+            continue
+        committed.update(id(p) for p in items)
+    return [p for p in prepared if id(p) in committed]
+
+
+async def _ingest_batch(
+    store: UnifiedDataStore,
+    batch: list[tuple[float, Any]],
+    *,
+    channel: str,
+    hmac_secret: str | None,
+    hmac_algo: str,
+    hmac_required: bool,
+    allowed_pairs: set[tuple[str, str]] | None,
+) -> tuple[list[_PreparedBars], set[int]]:
+    """Декодує, валідує і комітить мікробатч.
+
+    Повертає закомічені пакети та позиції в ``batch``, чиї бари не вдалося
+    записати в UDS (їх можна повторити; відкинуті валідацією — ні).
+    """
+
+    prepared, received, positions = _prepare_batch(
+        batch,
+        channel=channel,
+        hmac_secret=hmac_secret,
+        hmac_algo=hmac_algo,
+        hmac_required=hmac_required,
+        allowed_pairs=allowed_pairs,
+    )
+    committed = await _commit_prepared(store, prepared)
+    committed_ids = {id(p) for p in committed}
+    failed = {
+        pos
+        for item, pos in zip(prepared, positions, strict=True)
+        if id(item) not in committed_ids
+    }
+    _record_commits(prepared, received, committed)
+    _note_batch(len(batch))
+    return committed, failed
+
+
+def _prepare_batch(
+    batch: list[tuple[float, Any]],
+    *,
+    channel: str,
+    hmac_secret: str | None,
+    hmac_algo: str,
+    hmac_required: bool,
+    allowed_pairs: set[tuple[str, str]] | None,
+) -> tuple[list[_PreparedBars], list[float], list[int]]:
+    """Декодує і валідує мікробатч: (пакети, час отримання, позиції в batch)."""
+
+    prepared: list[_PreparedBars] = []
+    received: list[float] = []
+    positions: list[int] = []
+    for pos, (received_at, raw_data) in enumerate(batch):
+        payload = _decode_message(raw_data, channel)
+        if payload is None:
+            continue
+        # Live-кеш оновлюється тут, строго в порядку надходження.
+        item = _prepare_payload(
+            payload,
+            hmac_secret=hmac_secret,
+            hmac_algo=hmac_algo,
+            hmac_required=hmac_required,
+            allowed_pairs=allowed_pairs,
+        )
+        if item is not None:
+            prepared.append(item)
+            received.append(received_at)
+            positions.append(pos)
+    return prepared, received, positions
+
+
+def _record_commits(
+    prepared: list[_PreparedBars],
+    received: list[float],
+    committed: list[_PreparedBars],
+) -> None:
+    committed_ids = {id(p) for p in committed}
+    for item in committed:
+        _note_committed(item)
+
+    now = time.perf_counter()
+    latency_ms = 0.0
+    for item, received_at in zip(prepared, received, strict=True):
+        if id(item) not in committed_ids:
+            continue
+        latency = max(0.0, now - received_at)
+        PROM_FXCM_INGEST_LATENCY.observe(latency)
+        latency_ms = max(latency_ms, latency * 1000.0)
+
+    _INGEST_STATS["commits"] += len(committed)
+    if committed:
+        _INGEST_STATS["last_latency_ms"] = latency_ms
+        _INGEST_STATS["max_latency_ms"] = max(
+            _INGEST_STATS["max_latency_ms"], latency_ms
+        )
+
+
+def _note_batch(size: int) -> None:
+    PROM_FXCM_INGEST_BATCH_SIZE.observe(size)
+    _INGEST_STATS["batches"] += 1
+    _INGEST_STATS["messages"] += size
+    _INGEST_STATS["max_batch"] = max(_INGEST_STATS["max_batch"], size)
+
+
+def _note_queue_depth(depth: int) -> None:
+    PROM_FXCM_INGEST_QUEUE_DEPTH.set(depth)
+    _INGEST_STATS["queue_depth"] = depth
+    _INGEST_STATS["max_queue_depth"] = max(_INGEST_STATS["max_queue_depth"], depth)
+
+
+IngestFn = Callable[[list[tuple[float, Any]]], Awaitable[set[int]]]
+PaceFn = Callable[[], Awaitable[float]]
+
+
+async def _no_pace() -> float:
+    return 0.0
+
+
+# ── Шардування ──
+
+
+@dataclass
+class _ShardItem:
+    prepared: _PreparedBars
+    received_at: float
+    done: asyncio.Future[bool] | None = None
+
+
+def _shard_of(symbol: str, interval: str, shards: int) -> int:
+    """Стабільний (між процесами) номер шарда для ключа (symbol, tf)."""
+
+    return zlib.crc32(f"{symbol}:{interval}".encode()) % shards
+
+
+class _IngestShards:
+    """N воркерів з обмеженими чергами; ключ (symbol, tf) завжди в одному шарді.
+
+    Диспетчер (транспорт) декодує/валідує пакети в порядку надходження і
+    розкладає їх по шардах: порядок у межах ключа зберігається, а повільний
+    ``put_bars`` одного символу не тримає інші шарди. Повна черга шарда —
+    backpressure: диспетчер чекає (без втрат), лічильник зростає.
+    ``on_commit`` викликається воркером із реально закоміченими пакетами.
+    """
+
+    def __init__(
+        self,
+        store: UnifiedDataStore,
+        *,
+        shards: int,
+        queue_maxsize: int,
+        batch_max_messages: int,
+        on_commit: Callable[[list[_PreparedBars]], None] | None = None,
+    ) -> None:
+        self._store = store
+        self._on_commit = on_commit
+        self._batch_max = max(1, int(batch_max_messages))
+        self._queues: list[asyncio.Queue[_ShardItem]] = [
+            asyncio.Queue(maxsize=max(1, int(queue_maxsize)))
+            for _ in range(max(1, int(shards)))
+        ]
+        self._workers: list[asyncio.Task[None]] = []
+        _SHARD_STATS.clear()
+        for shard in range(len(self._queues)):
+            _SHARD_STATS[shard] = {
+                "queue_depth": 0,
+                "max_queue_depth": 0,
+                "lag_ms": 0.0,
+                "max_lag_ms": 0.0,
+                "commits": 0,
+                "dropped": 0,
+                "backpressure": 0,
+            }
+
+    @property
+    def size(self) -> int:
+        return len(self._queues)
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._run_worker(shard))
+                for shard in range(self.size)
+            ]
+
+    async def close(self) -> None:
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        for task in workers:
+            try:
+                await task
+            except BaseException:  # noqa: BLE001
+                pass
+
+    async def submit(
+        self,
+        prepared: list[_PreparedBars],
+        received: list[float],
+        *,
+        wait: bool,
+    ) -> list[bool]:
+        """Розкладає пакети по шардах.
+
+        ``wait=True`` — дочекатися комітів і повернути успіх по кожному пакету
+        (stream-транспорт акає лише закомічене); інакше — одразу ``True``.
+        """
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[bool]] = []
+        for item, received_at in zip(prepared, received, strict=True):
+            done = loop.create_future() if wait else None
+            shard = _shard_of(item.symbol, item.interval, self.size)
+            queue = self._queues[shard]
+            entry = _ShardItem(item, received_at, done)
+            try:
+                queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                PROM_FXCM_INGEST_SHARD_BACKPRESSURE.labels(shard=str(shard)).inc()
+                _SHARD_STATS[shard]["backpressure"] += 1
+                await queue.put(entry)
+            self._note_depth(shard)
+            if done is not None:
+                futures.append(done)
+        if not wait:
+            return [True] * len(prepared)
+        return list(await asyncio.gather(*futures))
+
+    def _note_depth(self, shard: int) -> None:
+        depth = self._queues[shard].qsize()
+        stats = _SHARD_STATS[shard]
+        stats["queue_depth"] = depth
+        stats["max_queue_depth"] = max(stats["max_queue_depth"], depth)
+        PROM_FXCM_INGEST_SHARD_QUEUE_DEPTH.labels(shard=str(shard)).set(depth)
+
+    async def _run_worker(self, shard: int) -> None:
+        queue = self._queues[shard]
+        stats = _SHARD_STATS[shard]
+        label = str(shard)
+        while True:
+            entries = [await queue.get()]
+            while len(entries) < self._batch_max and not queue.empty():
+                entries.append(queue.get_nowait())
+            self._note_depth(shard)
+
+            prepared = [e.prepared for e in entries]
+            try:
+                committed = await _commit_prepared(self._store, prepared)
+            except Exception:  # noqa: BLE001 - воркер не має падати
+                logger.warning(
+                    "[FXCM_INGEST] Шард %d: коміт впав", shard, exc_info=True
+                )
+                committed = []
+            _record_commits(prepared, [e.received_at for e in entries], committed)
+            if self._on_commit is not None and committed:
+                self._on_commit(committed)
+
+            committed_ids = {id(p) for p in committed}
+            for entry in entries:
+                ok = id(entry.prepared) in committed_ids
+                if entry.done is not None and not entry.done.done():
+                    entry.done.set_result(ok)
+                if not ok:
+                    stats["dropped"] += 1
+                    PROM_FXCM_INGEST_SHARD_DROPPED.labels(shard=label).inc()
+
+            lag = max(0.0, time.perf_counter() - entries[0].received_at)
+            stats["commits"] += len(committed)
+            stats["lag_ms"] = lag * 1000.0
+            stats["max_lag_ms"] = max(stats["max_lag_ms"], lag * 1000.0)
+            PROM_FXCM_INGEST_SHARD_LAG.labels(shard=label).set(lag)
+
+
+async def _consume_pubsub(
+    redis: Redis,
+    channel: str,
+    *,
+    ingest: IngestFn,
+    on_read: Callable[[], None],
+    batch_max_messages: int,
+    batch_window_sec: float,
+    queue_maxsize: int,
+    pace: PaceFn = _no_pace,
+) -> None:
+    """Pub/sub транспорт: читач → обмежена черга → мікробатчі.
+
+    ``pace`` — реакція на backpressure UDS: повертає бюджет на добір батча.
+    Повертається, коли listen() штатно завершився (→ перепідключення).
+    """
+
+    pubsub = redis.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+        logger.info("[FXCM_INGEST] Підписка активна (channel=%s)", channel)
+
+        queue: asyncio.Queue[tuple[float, Any]] = asyncio.Queue(
+            maxsize=max(1, int(queue_maxsize))
+        )
+        reader = asyncio.create_task(_pump_pubsub(pubsub, queue))
+        try:
+            while True:
+                if queue.empty() and reader.done():
+                    # Прокидаємо помилку/cancel читача; штатне завершення
+                    # listen() → перепідключення.
+                    reader.result()
+                    return
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, reader}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                    continue
+                on_read()
+                linger_sec = await pace()
+                batch = _drain_batch(
+                    getter.result(),
+                    queue,
+                    max_messages=batch_max_messages,
+                    window_sec=batch_window_sec,
+                )
+                if linger_sec > 0:
+                    await _linger_batch(
+                        batch,
+                        queue,
+                        max_messages=batch_max_messages,
+                        linger_sec=linger_sec,
+                    )
+                _note_queue_depth(queue.qsize())
+                await ingest(batch)
+        finally:
+            reader.cancel()
+            try:
+                await reader
+            except BaseException:  # noqa: BLE001
+                pass
+    finally:
+        try:
+            await pubsub.unsubscribe(channel)
+        except Exception:  # noqa: BLE001
+            pass
+        try:
+            await pubsub.close()
+        except Exception:
+            pass
+
+
+async def _ensure_stream_group(redis: Redis, stream_key: str, group: str) -> None:
+    """Створює consumer group (і сам стрім) з початку історії, якщо її немає."""
+
+    try:
+        await redis.xgroup_create(stream_key, group, id="0", mkstream=True)
+        logger.info(
+            "[FXCM_INGEST] Створено consumer group %s для стріму %s",
+            group,
+            stream_key,
+        )
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def _stream_entry_data(fields: Any) -> Any:
+    if not isinstance(fields, Mapping):
+        return None  # запис видалено/обрізано, поки був у pending
+    data = fields.get(FXCM_OHLCV_STREAM_FIELD.encode())
+    if data is None:
+        data = fields.get(FXCM_OHLCV_STREAM_FIELD)
+    return data
+
+
+async def _dead_letter(
+    redis: Redis,
+    stream_key: str,
+    dead_letter_key: str,
+    entry_id: Any,
+    data: Any,
+    deliveries: int,
+) -> None:
+    """Перекладає запис у dead-letter стрім (для ручного розбору/повтору)."""
+
+    logger.error(
+        "[FXCM_INGEST] Запис %s стріму %s не закомічено після %d спроб — "
+        "переносимо в %s",
+        entry_id,
+        stream_key,
+        deliveries,
+        dead_letter_key,
+    )
+    source_id = entry_id.decode() if isinstance(entry_id, bytes) else str(entry_id)
+    await redis.xadd(
+        dead_letter_key,
+        {
+            FXCM_OHLCV_STREAM_FIELD: data,
+            "source_stream": stream_key,
+            "source_id": source_id,
+            "deliveries": str(deliveries),
+        },
+    )
+    _INGEST_STATS["stream_dead_lettered"] += 1
+
+
+async def _consume_stream(
+    redis: Redis,
+    stream_key: str,
+    *,
+    group: str,
+    consumer: str,
+    ingest: IngestFn,
+    on_read: Callable[[], None],
+    count: int,
+    block_ms: int,
+    retry_sec: float = 1.0,
+    pace: PaceFn = _no_pace,
+    max_deliveries: int = FXCM_OHLCV_STREAM_MAX_DELIVERIES,
+    dead_letter_key: str | None = None,
+) -> None:
+    """Redis Streams транспорт: XREADGROUP батчами, XACK після коміту в UDS.
+
+    Після старту спершу перечитуємо pending цього consumer-а (id ``0``) —
+    записи, отримані до рестарту/обриву, але не заакані. Далі читаємо нові
+    (``>``). Записи, чиї бари не вдалося закомітити, лишаються в pending і
+    повторюються по одному (збійний запис не тягне за собою сусідів);
+    відкинуті валідацією/фільтром — акаються одразу. Запис, що не
+    закомітився ``max_deliveries`` разів поспіль, логується, переноситься в
+    ``dead_letter_key`` (типово ``<stream>:dead``) і акається — отруйний
+    запис не зупиняє стрім. Під backpressure UDS (``pace``) читання
+    відкладається: записи чекають у стрімі й приходять одним більшим
+    XREADGROUP.
+    """
+
+    await _ensure_stream_group(redis, stream_key, group)
+    logger.info(
+        "[FXCM_INGEST] Stream-споживач активний (stream=%s group=%s consumer=%s)",
+        stream_key,
+        group,
+        consumer,
+    )
+    dead_key = dead_letter_key or stream_key + FXCM_OHLCV_STREAM_DEAD_LETTER_SUFFIX
+    max_deliveries = max(1, int(max_deliveries))
+    # Невдалі спроби коміту по id запису (лише для записів у pending).
+    attempts: dict[Any, int] = {}
+    cursor = "0"
+    retrying = False
+    while True:
+        linger_sec = await pace()
+        if linger_sec > 0:
+            await asyncio.sleep(linger_sec)
+        response = await redis.xreadgroup(
+            group,
+            consumer,
+            {stream_key: cursor},
+            count=1 if retrying else count,
+            block=block_ms,
+        )
+        on_read()
+        entries = response[0][1] if response else []
+        if not entries:
+            if cursor == "0":
+                cursor = ">"
+                retrying = False
+            continue
+        if cursor == "0":
+            _INGEST_STATS["stream_replayed"] += len(entries)
+
+        received_at = time.perf_counter()
+        batch: list[tuple[float, Any]] = []
+        batch_ids: list[Any] = []
+        ack_ids: list[Any] = []
+        for entry_id, fields in entries:
+            data = _stream_entry_data(fields)
+            if not data:
+                ack_ids.append(entry_id)
+                continue
+            batch.append((received_at, data))
+            batch_ids.append(entry_id)
+
+        try:
+            failed = await ingest(batch) if batch else set()
+        except Exception:  # noqa: BLE001 - рахуємо як невдалу спробу всього батча
+            logger.warning("[FXCM_INGEST] Інжест батча зі стріму впав", exc_info=True)
+            failed = set(range(len(batch)))
+        retry = False
+        for pos, entry_id in enumerate(batch_ids):
+            if pos not in failed:
+                attempts.pop(entry_id, None)
+                ack_ids.append(entry_id)
+                continue
+            tries = attempts.get(entry_id, 0) + 1
+            if tries < max_deliveries:
+                attempts[entry_id] = tries
+                retry = True
+                continue
+            await _dead_letter(
+                redis, stream_key, dead_key, entry_id, batch[pos][1], tries
+            )
+            attempts.pop(entry_id, None)
+            ack_ids.append(entry_id)
+        if ack_ids:
+            await redis.xack(stream_key, group, *ack_ids)
+            _INGEST_STATS["stream_acked"] += len(ack_ids)
+        if failed:
+            _INGEST_STATS["stream_retry"] += len(failed)
+        if retry:
+            # Незакомічені записи лишились у pending — повторюємо їх з id 0.
+            cursor = "0"
+            retrying = True
+            await asyncio.sleep(retry_sec)
 
 
 async def run_fxcm_ingestor(
@@ -526,6 +1455,20 @@ async def run_fxcm_ingestor(
     hmac_algo: str = "sha256",
     hmac_required: bool = False,
     allowed_pairs: set[tuple[str, str]] | None = None,
+    batch_max_messages: int = 500,
+    batch_window_ms: float = 50.0,
+    queue_maxsize: int = 10_000,
+    transport: Literal["pubsub", "stream"] = "pubsub",
+    stream_key: str | None = None,
+    stream_group: str = FXCM_OHLCV_STREAM_GROUP,
+    stream_consumer: str = FXCM_OHLCV_STREAM_CONSUMER,
+    stream_block_ms: int = 1_000,
+    stream_max_deliveries: int = FXCM_OHLCV_STREAM_MAX_DELIVERIES,
+    stream_dead_letter_key: str | None = None,
+    shards: int = 1,
+    shard_queue_maxsize: int = 1_000,
+    backpressure_linger_ms: float = 250.0,
+    backpressure_pause_ms: float = 500.0,
 ) -> None:
     """Основний цикл інжестора FXCM → UnifiedDataStore.
 
@@ -538,6 +1481,26 @@ async def run_fxcm_ingestor(
         hmac_secret: Якщо задано — перевіряємо HMAC-підпис FXCM payload.
         hmac_algo: Назва алгоритму (наприклад, "sha256").
         hmac_required: True → усі пакети без валідного підпису відкидаємо.
+        batch_max_messages: Максимум повідомлень в одному мікробатчі.
+        batch_window_ms: Бюджет часу на збирання мікробатчу з черги.
+        queue_maxsize: Розмір черги між читачем pub/sub і консюмером.
+        transport: "pubsub" (дефолт, сумісність) або "stream" — Redis Stream
+            з consumer group: без втрат на рестарті, ack після коміту в UDS.
+        stream_key: Ключ стріму; за замовчуванням збігається з ``channel``.
+        stream_group: Consumer group (позиція читання зберігається в Redis).
+        stream_consumer: Стабільне ім'я споживача — за ним після рестарту
+            перечитуються незаакані (pending) записи.
+        stream_block_ms: BLOCK для XREADGROUP, мс.
+        stream_max_deliveries: Після стількох невдалих комітів запис
+            переноситься в dead-letter стрім і акається.
+        stream_dead_letter_key: Dead-letter стрім; за замовчуванням
+            ``<stream_key>:dead``.
+        shards: Кількість шард-воркерів; >1 — ключі (symbol, tf) комітяться
+            паралельно (хеш-афінність, порядок у межах ключа зберігається).
+        shard_queue_maxsize: Розмір обмеженої черги кожного шарда.
+        backpressure_linger_ms: Під soft/hard backpressure UDS — скільки
+            чекати на добір більшого (коалесованого) батча.
+        backpressure_pause_ms: Під hard — пауза перед кожним читанням.
     """
     host = redis_host or settings.redis_host
     port = redis_port or settings.redis_port
@@ -546,11 +1509,15 @@ async def run_fxcm_ingestor(
     )
     normalized_algo = (hmac_algo or "sha256").strip().lower() or "sha256"
 
+    transport_name = "stream" if transport == "stream" else "pubsub"
+    stream_name = stream_key or channel
     logger.info(
-        "[FXCM_INGEST] Старт інжестора: host=%s port=%s channel=%s",
+        "[FXCM_INGEST] Старт інжестора: host=%s port=%s transport=%s %s=%s",
         host,
         port,
-        channel,
+        transport_name,
+        "stream" if transport_name == "stream" else "channel",
+        stream_name if transport_name == "stream" else channel,
     )
     if allowed_pairs is None:
         logger.info(
@@ -565,97 +1532,139 @@ async def run_fxcm_ingestor(
     processed = 0
     log_every_n = max(1, int(log_every_n))
     hmac_required = bool(hmac_required)
+    batch_max_messages = max(1, int(batch_max_messages))
+    batch_window_sec = max(0.0, float(batch_window_ms)) / 1000.0
 
     backoff_sec = 1.0
-    while True:
-        redis = Redis(host=host, port=port)
-        pubsub = redis.pubsub()
-        try:
-            await pubsub.subscribe(channel)
-            logger.info("[FXCM_INGEST] Підписка активна (channel=%s)", channel)
-
-            async for message in pubsub.listen():
-                backoff_sec = 1.0
-                if message is None:
-                    continue
 
-                mtype = message.get("type")
-                if mtype != "message":
-                    # subscribe/unsubscribe та інші службові події ігноруємо
-                    continue
-
-                raw_data = message.get("data")
-                if not raw_data:
-                    continue
+    def _reset_backoff() -> None:
+        nonlocal backoff_sec
+        backoff_sec = 1.0
 
-                try:
-                    if isinstance(raw_data, bytes):
-                        payload = json_loads(raw_data.decode("utf-8"))
-                    elif isinstance(raw_data, str):
-                        payload = json_loads(raw_data)
-                    else:
-                        # Нестандартний тип від Redis — намагаємось привести до str
-                        payload = json_loads(str(raw_data))
-                except JSONDecodeError:
-                    logger.warning(
-                        "[FXCM_INGEST] Некоректний JSON у повідомленні з каналу %s",
-                        channel,
-                    )
-                    continue
+    linger_sec = max(0.0, float(backpressure_linger_ms)) / 1000.0
+    pause_sec = max(0.0, float(backpressure_pause_ms)) / 1000.0
 
-                if not isinstance(payload, dict):
-                    logger.warning(
-                        "[FXCM_INGEST] Очікував dict у payload, отримав %r",
-                        type(payload),
-                    )
-                    continue
+    async def _pace() -> float:
+        return await _backpressure_pace(
+            store, linger_sec=linger_sec, pause_sec=pause_sec
+        )
 
-                rows, symbol, interval = await _process_payload(
-                    store,
-                    payload,
-                    hmac_secret=normalized_secret,
-                    hmac_algo=normalized_algo,
-                    hmac_required=hmac_required,
-                    allowed_pairs=allowed_pairs,
+    def _log_processed(committed: list[_PreparedBars]) -> None:
+        nonlocal processed
+        for item in committed:
+            rows = item.rows
+            before = processed
+            processed += rows
+            if processed // log_every_n != before // log_every_n:
+                logger.info(
+                    "[FXCM_INGEST] Інгестовано барів: %d (останній пакет: %s %s, rows=%d)",
+                    processed,
+                    item.symbol,
+                    item.interval,
+                    rows,
                 )
 
-                if rows <= 0:
-                    continue
+    source = stream_name if transport_name == "stream" else channel
+    sharded = (
+        _IngestShards(
+            store,
+            shards=shards,
+            queue_maxsize=shard_queue_maxsize,
+            batch_max_messages=batch_max_messages,
+            # Лог лише після коміту: у pub/sub submit не чекає воркерів.
+            on_commit=_log_processed,
+        )
+        if int(shards) > 1
+        else None
+    )
 
-                processed += rows
-                if processed % log_every_n == 0 and symbol and interval:
-                    logger.info(
-                        "[FXCM_INGEST] Інгестовано барів: %d (останній пакет: %s %s, rows=%d)",
-                        processed,
-                        symbol,
-                        interval,
-                        rows,
-                    )
-        except asyncio.CancelledError:
-            # Очікуваний шлях завершення при зупинці пайплайна
-            logger.info("[FXCM_INGEST] Отримано CancelledError, завершуємо роботу.")
-            raise
-        except Exception:
-            logger.warning(
-                "[FXCM_INGEST] Втрачено з'єднання з Redis. Повтор через %.1f с.",
-                backoff_sec,
-                exc_info=True,
+    async def _ingest(batch: list[tuple[float, Any]]) -> set[int]:
+        if sharded is None:
+            committed, failed = await _ingest_batch(
+                store,
+                batch,
+                channel=source,
+                hmac_secret=normalized_secret,
+                hmac_algo=normalized_algo,
+                hmac_required=hmac_required,
+                allowed_pairs=allowed_pairs,
             )
-            await asyncio.sleep(backoff_sec)
-            backoff_sec = min(backoff_sec * 2.0, 60.0)
-        finally:
-            try:
-                await pubsub.unsubscribe(channel)
-            except Exception:  # noqa: BLE001
-                pass
-            try:
-                await pubsub.close()
-            except Exception:
-                pass
+            _log_processed(committed)
+            return failed
+
+        prepared, received, positions = _prepare_batch(
+            batch,
+            channel=source,
+            hmac_secret=normalized_secret,
+            hmac_algo=normalized_algo,
+            hmac_required=hmac_required,
+            allowed_pairs=allowed_pairs,
+        )
+        _note_batch(len(batch))
+        results = await sharded.submit(
+            prepared, received, wait=transport_name == "stream"
+        )
+        return {pos for pos, ok in zip(positions, results, strict=True) if not ok}
+
+    async def _run_transport_loop() -> None:
+        nonlocal backoff_sec
+        while True:
+            redis = Redis(host=host, port=port)
             try:
-                await redis.close()
+                if transport_name == "stream":
+                    await _consume_stream(
+                        redis,
+                        stream_name,
+                        group=stream_group,
+                        consumer=stream_consumer,
+                        ingest=_ingest,
+                        on_read=_reset_backoff,
+                        count=batch_max_messages,
+                        block_ms=max(0, int(stream_block_ms)),
+                        pace=_pace,
+                        max_deliveries=stream_max_deliveries,
+                        dead_letter_key=stream_dead_letter_key,
+                    )
+                else:
+                    await _consume_pubsub(
+                        redis,
+                        channel,
+                        ingest=_ingest,
+                        on_read=_reset_backoff,
+                        batch_max_messages=batch_max_messages,
+                        batch_window_sec=batch_window_sec,
+                        queue_maxsize=queue_maxsize,
+                        pace=_pace,
+                    )
+            except asyncio.CancelledError:
+                # Очікуваний шлях завершення при зупинці пайплайна
+                logger.info("[FXCM_INGEST] Отримано CancelledError, завершуємо роботу.")
+                raise
             except Exception:
-                pass
+                logger.warning(
+                    "[FXCM_INGEST] Втрачено з'єднання з Redis. Повтор через %.1f с.",
+                    backoff_sec,
+                    exc_info=True,
+                )
+                await asyncio.sleep(backoff_sec)
+                backoff_sec = min(backoff_sec * 2.0, 60.0)
+            finally:
+                try:
+                    await redis.close()
+                except Exception:
+                    pass
+
+    if sharded is not None:
+        logger.info(
+            "[FXCM_INGEST] Шардований інжест: %d воркерів, черга=%d",
+            sharded.size,
+            shard_queue_maxsize,
+        )
+    try:
+        await _run_transport_loop()
+    finally:
+        if sharded is not None:
+            await sharded.close()
 
 
-__all__ = ["run_fxcm_ingestor"]
+__all__ = ["get_fxcm_ingest_stats", "get_fxcm_shard_stats", "run_fxcm_ingestor"]
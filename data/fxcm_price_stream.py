@@ -17,7 +17,7 @@ from typing import Any
 from redis.asyncio import Redis
 
 from app.settings import settings
-from core.serialization import json_loads
+from core.serialization import json_loads, json_loads_bytes
 from data.unified_store import UnifiedDataStore
 
 logger = logging.getLogger("fxcm_price_stream")
@@ -79,13 +79,12 @@ async def run_fxcm_price_stream_listener(
                 raw_data = message.get("data")
                 if raw_data is None:
                     continue
-                if isinstance(raw_data, bytes):
-                    raw_text = raw_data.decode("utf-8", errors="ignore")
-                else:
-                    raw_text = str(raw_data)
                 payload_obj: Mapping[str, Any] | None = None
                 try:
-                    decoded = json_loads(raw_text)
+                    if isinstance(raw_data, bytes):
+                        decoded = json_loads_bytes(raw_data, errors="ignore")
+                    else:
+                        decoded = json_loads(str(raw_data))
                     if isinstance(decoded, Mapping):
                         payload_obj = decoded
                 except JSONDecodeError:
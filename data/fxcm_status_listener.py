@@ -29,6 +29,7 @@ from core.contracts.fxcm_telemetry import (
 from core.serialization import (
     duration_seconds_to_hms,
     json_loads,
+    json_loads_bytes,
     utc_ms_to_human_utc,
     utc_seconds_to_human_utc,
 )
@@ -367,12 +368,11 @@ async def run_fxcm_status_listener(
                 except Exception:
                     continue
                 payload: Mapping[str, Any] | None = None
-                if isinstance(data_raw, bytes):
-                    raw_text = data_raw.decode("utf-8", errors="ignore")
-                else:
-                    raw_text = str(data_raw)
                 try:
-                    obj = json_loads(raw_text)
+                    if isinstance(data_raw, bytes):
+                        obj = json_loads_bytes(data_raw, errors="ignore")
+                    else:
+                        obj = json_loads(str(data_raw))
                     if isinstance(obj, dict):
                         payload = obj
                 except JSONDecodeError:
@@ -0,0 +1,422 @@
+"""Інкрементальний індекс пропусків (gaps) OHLCV та планувальник backfill.
+
+Індекс живе поруч із UDS: кожен ``put_bars``/warmup віддає сюди open_time
+нових барів, а індекс тримає для (symbol, interval) відсортований список
+діапазонів відсутніх барів відносно сітки TF. Слоти, що припадають на
+закритий ринок (вихідні FX, щоденні перерви), пропусками не вважаються.
+
+``plan_backfill`` перетворює набір gaps (+ опційно протухлий хвіст) у
+мінімальний список range-команд ``fxcm_backfill``/``fxcm_warmup``: близькі
+діапазони зливаються, завеликі — ріжуться на частини.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+import numpy as np
+
+_MINUTE_MS = 60_000
+_DAY_MS = 86_400_000
+_WEEK_MS = 7 * _DAY_MS
+# 1970-01-05 00:00 UTC — понеділок; від нього рахуємо тижневі вікна.
+_MONDAY_ANCHOR_MS = 4 * _DAY_MS
+# Пн=0 … Нд=6
+_WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+Range = tuple[int, int]
+
+
+def interval_to_ms(interval: str) -> int | None:
+    """Парсить TF (1m/5m/1h/4h/1d) у мілісекунди; None — невідомий формат."""
+
+    tf = (interval or "").strip().lower()
+    if len(tf) < 2 or not tf[:-1].isdigit():
+        return None
+    value = int(tf[:-1])
+    unit = {"m": _MINUTE_MS, "h": 60 * _MINUTE_MS, "d": _DAY_MS}.get(tf[-1])
+    if unit is None or value <= 0:
+        return None
+    return value * unit
+
+
+def _parse_hhmm(text: str) -> int:
+    hh, _, mm = text.strip().partition(":")
+    return (int(hh) * 60 + int(mm or 0)) * _MINUTE_MS
+
+
+def _parse_weekly_point(text: str) -> int:
+    """``"fri 21:00"`` → зсув від понеділка 00:00 UTC у мс."""
+
+    day, _, hhmm = text.strip().lower().partition(" ")
+    return _WEEKDAYS.index(day[:3]) * _DAY_MS + _parse_hhmm(hhmm or "0:00")
+
+
+def _merge(ranges: Iterable[Range]) -> list[Range]:
+    out: list[Range] = []
+    for start, end in sorted(ranges):
+        if out and start <= out[-1][1]:
+            if end > out[-1][1]:
+                out[-1] = (out[-1][0], end)
+        else:
+            out.append((start, end))
+    return out
+
+
+def _ceil_slot(anchor: int, ts: int, tf_ms: int) -> int:
+    """Перший слот сітки ``anchor + k*tf_ms``, що не раніше ``ts``."""
+
+    if ts <= anchor:
+        return anchor
+    return anchor + -(-(ts - anchor) // tf_ms) * tf_ms
+
+
+# ── Години ринку ────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class MarketHours:
+    """Тижневий розклад закритого ринку (UTC).
+
+    ``closed`` — вікна ``[start, end)`` у мс від понеділка 00:00 UTC; вікно
+    може виходити за межі тижня (перехід через неділю → понеділок).
+    """
+
+    closed: tuple[Range, ...] = ()
+
+    @classmethod
+    def always_open(cls) -> MarketHours:
+        return cls(())
+
+    @classmethod
+    def fx(
+        cls,
+        *,
+        weekly_close: str = "fri 21:00",
+        weekly_open: str = "sun 22:00",
+        daily_breaks: Iterable[str] = (),
+    ) -> MarketHours:
+        """FX-календар: вихідні + опційні щоденні перерви ``"HH:MM-HH:MM"``.
+
+        Дефолт покриває обидва DST-варіанти FXCM (закриття 21:00/22:00 UTC,
+        відкриття 21:00/22:00 UTC), тож літні/зимові години не дають
+        фантомних gaps на межах тижня.
+        """
+
+        start = _parse_weekly_point(weekly_close)
+        end = _parse_weekly_point(weekly_open)
+        if end <= start:
+            end += _WEEK_MS
+        windows: list[Range] = [(start, end)]
+        for spec in daily_breaks:
+            left, _, right = spec.partition("-")
+            b_start, b_end = _parse_hhmm(left), _parse_hhmm(right)
+            if b_end <= b_start:
+                b_end += _DAY_MS
+            windows.extend(
+                (day * _DAY_MS + b_start, day * _DAY_MS + b_end) for day in range(7)
+            )
+        return cls(tuple(_merge(windows)))
+
+    @classmethod
+    def from_name(
+        cls, name: str | None, *, daily_breaks: Iterable[str] = ()
+    ) -> MarketHours:
+        """``"fx"`` — FX-календар, ``"24x7"``/порожньо — ринок завжди відкритий."""
+
+        token = (name or "").strip().lower()
+        if token == "fx":
+            return cls.fx(daily_breaks=daily_breaks)
+        if token in {"", "24x7", "always", "none"}:
+            return cls.always_open()
+        raise ValueError(f"Невідомий календар ринку: {name!r}")
+
+    def closed_windows(self, start_ms: int, end_ms: int) -> Iterator[Range]:
+        """Абсолютні закриті вікна, що перетинають ``[start_ms, end_ms)``."""
+
+        if not self.closed or end_ms <= start_ms:
+            return
+        week = start_ms - ((start_ms - _MONDAY_ANCHOR_MS) % _WEEK_MS) - _WEEK_MS
+        pending: list[Range] = []
+        while week < end_ms:
+            for w_start, w_end in self.closed:
+                a, b = week + w_start, week + w_end
+                if b > start_ms and a < end_ms:
+                    pending.append((a, b))
+            week += _WEEK_MS
+        yield from _merge(pending)
+
+    def is_open(self, ts_ms: int) -> bool:
+        return next(self.closed_windows(ts_ms, ts_ms + 1), None) is None
+
+    def open_slot_ranges(self, start_ms: int, end_ms: int, tf_ms: int) -> list[Range]:
+        """Слоти сітки ``start_ms + k*tf_ms`` у ``[start_ms, end_ms)`` з відкритим ринком.
+
+        Повертає діапазони ``[перший_слот, останній_слот + tf_ms)``.
+        """
+
+        if end_ms <= start_ms:
+            return []
+        out: list[Range] = []
+        cursor = start_ms
+        for c_start, c_end in self.closed_windows(start_ms, end_ms):
+            if c_start > cursor:
+                last = _ceil_slot(start_ms, min(c_start, end_ms), tf_ms)
+                if last > cursor:
+                    out.append((cursor, last))
+            cursor = max(cursor, _ceil_slot(start_ms, c_end, tf_ms))
+            if cursor >= end_ms:
+                return out
+        last = _ceil_slot(start_ms, end_ms, tf_ms)
+        if last > cursor:
+            out.append((cursor, last))
+        return out
+
+    def count_open_slots(self, start_ms: int, end_ms: int, tf_ms: int) -> int:
+        return sum(
+            (b - a) // tf_ms for a, b in self.open_slot_ranges(start_ms, end_ms, tf_ms)
+        )
+
+
+# ── Індекс пропусків ────────────────────────────────────────────────────
+
+
+@dataclass
+class _SeriesGaps:
+    tf_ms: int
+    first: int
+    last: int
+    gaps: list[Range] = field(default_factory=list)
+
+
+class GapIndex:
+    """Пропуски по (symbol, interval), що оновлюються інкрементально.
+
+    ``observe`` коштує O(batch + зачеплені gaps): нові бари після хвоста
+    додають gaps лише на стиках, бекфіл у середину «вирізає» заповнені
+    слоти з наявних діапазонів.
+    """
+
+    def __init__(self, market_hours: MarketHours, *, max_gaps: int = 4_096) -> None:
+        self.market_hours = market_hours
+        self.max_gaps = max(1, int(max_gaps))
+        self._series: dict[tuple[str, str], _SeriesGaps] = {}
+
+    def observe(self, key: tuple[str, str], tf_ms: int, open_times: np.ndarray) -> None:
+        """Враховує open_time (мс) нових/завантажених барів серії ``key``."""
+
+        times = np.unique(np.asarray(open_times, dtype=np.int64))
+        if not len(times) or tf_ms <= 0:
+            return
+        state = self._series.get(key)
+        if state is None or state.tf_ms != tf_ms:
+            state = _SeriesGaps(tf_ms=tf_ms, first=int(times[0]), last=int(times[-1]))
+            state.gaps = self._scan(times, tf_ms)
+            self._series[key] = state
+            self._cap(state)
+            return
+
+        before = times[times < state.first]
+        inside = times[(times >= state.first) & (times <= state.last)]
+        after = times[times > state.last]
+        if len(inside) and state.gaps:
+            self._fill(state, inside)
+        if len(after):
+            state.gaps.extend(self._scan(np.insert(after, 0, state.last), tf_ms))
+            state.last = int(after[-1])
+        if len(before):
+            head = self._scan(np.append(before, state.first), tf_ms)
+            state.gaps[:0] = head
+            state.first = int(before[0])
+        self._cap(state)
+
+    def gaps(self, key: tuple[str, str], *, since_ms: int | None = None) -> list[Range]:
+        state = self._series.get(key)
+        if state is None:
+            return []
+        if since_ms is None:
+            return list(state.gaps)
+        return [(max(a, since_ms), b) for a, b in state.gaps if b > since_ms]
+
+    def bounds(self, key: tuple[str, str]) -> Range | None:
+        state = self._series.get(key)
+        return (state.first, state.last) if state is not None else None
+
+    def trim_before(self, key: tuple[str, str], first_ms: int) -> None:
+        """Забуває історію до ``first_ms`` (після обрізання хвоста)."""
+
+        state = self._series.get(key)
+        if state is None or first_ms <= state.first:
+            return
+        state.first = first_ms
+        state.gaps = [(max(a, first_ms), b) for a, b in state.gaps if b > first_ms]
+
+    def forget(self, key: tuple[str, str]) -> None:
+        self._series.pop(key, None)
+
+    def missing_bars(self, key: tuple[str, str]) -> int:
+        state = self._series.get(key)
+        if state is None:
+            return 0
+        return sum(
+            self.market_hours.count_open_slots(a, b, state.tf_ms) for a, b in state.gaps
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "series": len(self._series),
+            "gaps": sum(len(s.gaps) for s in self._series.values()),
+        }
+
+    # ── Внутрішнє ──────────────────────────────────────────────────────
+
+    def _scan(self, times: np.ndarray, tf_ms: int) -> list[Range]:
+        """Gaps усередині відсортованого масиву open_time."""
+
+        if len(times) < 2:
+            return []
+        holes = np.flatnonzero(np.diff(times) > tf_ms)
+        out: list[Range] = []
+        for i in holes.tolist():
+            start = int(times[i]) + tf_ms
+            out.extend(
+                self.market_hours.open_slot_ranges(start, int(times[i + 1]), tf_ms)
+            )
+        return out
+
+    def _fill(self, state: _SeriesGaps, present: np.ndarray) -> None:
+        lo, hi = int(present[0]), int(present[-1])
+        # Перший gap, що може містити lo (gaps відсортовані й не перетинаються).
+        idx = bisect.bisect_right(state.gaps, (lo, lo)) - 1
+        idx = max(idx, 0)
+        rebuilt: list[Range] = []
+        end_idx = idx
+        while end_idx < len(state.gaps) and state.gaps[end_idx][0] <= hi:
+            g_start, g_end = state.gaps[end_idx]
+            left = int(np.searchsorted(present, g_start, side="left"))
+            right = int(np.searchsorted(present, g_end, side="left"))
+            if left == right:
+                rebuilt.append((g_start, g_end))
+            else:
+                cursor = g_start
+                for ts in present[left:right].tolist():
+                    if ts > cursor:
+                        rebuilt.append((cursor, _ceil_slot(g_start, ts, state.tf_ms)))
+                    cursor = max(cursor, _ceil_slot(g_start, ts + 1, state.tf_ms))
+                if cursor < g_end:
+                    rebuilt.append((cursor, g_end))
+            end_idx += 1
+        state.gaps[idx:end_idx] = [r for r in rebuilt if r[1] > r[0]]
+
+    def _cap(self, state: _SeriesGaps) -> None:
+        overflow = len(state.gaps) - self.max_gaps
+        if overflow > 0:
+            # Найстаріші пропуски найменш цінні для backfill.
+            del state.gaps[:overflow]
+
+
+# ── Планувальник backfill ───────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class BackfillRange:
+    """Одна range-команда для конектора: бари ``[start_ms, end_ms)``."""
+
+    cmd_type: str  # fxcm_backfill | fxcm_warmup
+    start_ms: int
+    end_ms: int
+    bars: int
+    reason: str  # gap | stale_tail
+
+
+def backfill_cmd_type(interval: str) -> str:
+    """Тип команди для TF.
+
+    Практика інтеграції: backfill для 1m у конекторі може бути не
+    реалізований (tick TF), тому для 1m просимо warmup.
+    """
+
+    return (
+        "fxcm_warmup" if (interval or "").strip().lower() == "1m" else "fxcm_backfill"
+    )
+
+
+def plan_backfill(
+    gaps: Iterable[Range],
+    *,
+    interval: str,
+    tf_ms: int,
+    market_hours: MarketHours,
+    tail: Range | None = None,
+    merge_slack_bars: int = 5,
+    max_bars_per_command: int = 5_000,
+) -> list[BackfillRange]:
+    """Мінімальний список range-команд, що покриває ``gaps`` (+ ``tail``).
+
+    - Діапазони, між якими ≤ ``merge_slack_bars`` відкритих слотів,
+      зливаються (дешевше перезавантажити кілька барів, ніж слати команду).
+    - Закритий ринок між діапазонами злиттю не заважає.
+    - Діапазон більший за ``max_bars_per_command`` ріжеться на частини.
+    """
+
+    ranges = [(int(a), int(b)) for a, b in gaps if b > a]
+    tail_start: int | None = None
+    if tail is not None:
+        for a, b in market_hours.open_slot_ranges(tail[0], tail[1], tf_ms):
+            ranges.append((a, b))
+            tail_start = a if tail_start is None else tail_start
+    if not ranges:
+        return []
+    ranges.sort()
+
+    merged: list[Range] = [ranges[0]]
+    slack = max(0, int(merge_slack_bars))
+    for start, end in ranges[1:]:
+        prev_start, prev_end = merged[-1]
+        between = market_hours.count_open_slots(prev_end, start, tf_ms)
+        if start <= prev_end or between <= slack:
+            merged[-1] = (prev_start, max(prev_end, end))
+        else:
+            merged.append((start, end))
+
+    cmd_type = backfill_cmd_type(interval)
+    limit = max(1, int(max_bars_per_command))
+    out: list[BackfillRange] = []
+    for start, end in merged:
+        reason = "stale_tail" if tail_start is not None and end > tail_start else "gap"
+        chunk_start: int | None = None
+        chunk_end = start
+        chunk_bars = 0
+        for a, b in market_hours.open_slot_ranges(start, end, tf_ms):
+            cursor = a
+            while cursor < b:
+                if chunk_start is None:
+                    chunk_start = cursor
+                take = min((b - cursor) // tf_ms, limit - chunk_bars)
+                cursor += take * tf_ms
+                chunk_end = cursor
+                chunk_bars += take
+                if chunk_bars >= limit:
+                    out.append(
+                        BackfillRange(
+                            cmd_type, chunk_start, chunk_end, chunk_bars, reason
+                        )
+                    )
+                    chunk_start, chunk_bars = None, 0
+        if chunk_start is not None and chunk_bars:
+            out.append(
+                BackfillRange(cmd_type, chunk_start, chunk_end, chunk_bars, reason)
+            )
+    return out
+
+
+__all__ = [
+    "BackfillRange",
+    "GapIndex",
+    "MarketHours",
+    "backfill_cmd_type",
+    "interval_to_ms",
+    "plan_backfill",
+]
@@ -0,0 +1,260 @@
+"""Розріджений offset-індекс (sidecar) для JSONL snapshot-ів барів.
+
+Поруч зі snapshot-ом ``X_snapshot.jsonl`` лежить ``X_snapshot.jsonl.idx`` —
+JSON з байтовими зміщеннями кожного ``step``-го рядка та їхніми ``open_time``.
+За індексом діапазон ``[start_ms, end_ms)`` читається seek-ом: парситься лише
+потрібний зріз файла, а не весь snapshot.
+
+Індекс прив'язаний до розміру й mtime snapshot-а: застарілий або відсутній
+sidecar перебудовується ліниво при першому читанні (одним проходом по
+рядках, JSON-парсинг — лише для кожного ``step``-го).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from core.serialization import json_dumps_bytes, json_loads_bytes
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+DEFAULT_STEP = 1000
+# Межі валідного open_time у мс: інакше snapshot старого формату (секунди/нс),
+# і порівняння з start_ms/end_ms без нормалізації некоректне.
+_MS_MIN = 10**11
+_MS_MAX = 10**14
+
+
+@dataclass
+class SnapshotIndex:
+    """Зміщення кожного ``step``-го рядка snapshot-а та їхні ``open_time``."""
+
+    step: int
+    size: int
+    mtime_ns: int
+    rows: int = 0
+    offsets: list[int] = field(default_factory=list)
+    open_times: list[int] = field(default_factory=list)
+    last_open_time: int | None = None
+    # False — open_time не в мс або не зростає: лише повне читання
+    seekable: bool = True
+
+    def matches(self, path: Path) -> bool:
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+    def byte_range(
+        self,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        tail: int | None = None,
+    ) -> tuple[int, int]:
+        """Байтовий зріз, що гарантовано містить усі рядки ``[start_ms, end_ms)``.
+
+        З ``tail`` зріз додатково обмежується так, щоб вистачило останніх
+        ``tail`` рядків діапазону (з запасом в один блок).
+        """
+        first = 0
+        last = len(self.offsets)  # блоки [first, last)
+        if start_ms is not None:
+            # останній блок, що стартує не пізніше start_ms
+            first = max(bisect_right(self.open_times, start_ms) - 1, 0)
+        if end_ms is not None:
+            # блоки, що стартують з open_time >= end_ms, уже не потрібні
+            last = bisect_left(self.open_times, end_ms)
+        if tail is not None and last:
+            rows_before = last * self.step if last < len(self.offsets) else self.rows
+            need_from = max(0, rows_before - self.step - tail)
+            first = max(first, need_from // self.step)
+        lo = self.offsets[first] if first < len(self.offsets) else self.size
+        hi = self.offsets[last] if last < len(self.offsets) else self.size
+        return lo, max(lo, hi)
+
+    def to_bytes(self) -> bytes:
+        return json_dumps_bytes(
+            {
+                "v": INDEX_VERSION,
+                "step": self.step,
+                "size": self.size,
+                "mtime_ns": self.mtime_ns,
+                "rows": self.rows,
+                "offsets": self.offsets,
+                "open_times": self.open_times,
+                "last_open_time": self.last_open_time,
+                "seekable": self.seekable,
+            }
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> SnapshotIndex | None:
+        try:
+            payload = json_loads_bytes(raw, errors="strict")
+        except ValueError:
+            return None
+        if not isinstance(payload, dict) or payload.get("v") != INDEX_VERSION:
+            return None
+        try:
+            return cls(
+                step=int(payload["step"]),
+                size=int(payload["size"]),
+                mtime_ns=int(payload["mtime_ns"]),
+                rows=int(payload["rows"]),
+                offsets=[int(v) for v in payload["offsets"]],
+                open_times=[int(v) for v in payload["open_times"]],
+                last_open_time=(
+                    None
+                    if payload.get("last_open_time") is None
+                    else int(payload["last_open_time"])
+                ),
+                seekable=bool(payload.get("seekable", True)),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def index_path(snapshot: Path) -> Path:
+    return snapshot.with_name(snapshot.name + INDEX_SUFFIX)
+
+
+def _open_time_ms(line: bytes) -> int | None:
+    try:
+        payload = json_loads_bytes(line, errors="strict")
+        value = int(payload["open_time"])
+    except (ValueError, TypeError, KeyError):
+        return None
+    return value if _MS_MIN <= value < _MS_MAX else None
+
+
+def build_index(path: Path, step: int) -> SnapshotIndex:
+    """Один прохід по рядках snapshot-а; парсить лише кожен ``step``-й."""
+    step = max(1, int(step))
+    st = path.stat()
+    index = SnapshotIndex(step=step, size=st.st_size, mtime_ns=st.st_mtime_ns)
+    offset = 0
+    last_line = b""
+    with path.open("rb") as handle:
+        for raw in handle:
+            start = offset
+            offset += len(raw)
+            if not raw.strip():
+                continue
+            if index.rows % step == 0:
+                open_time = _open_time_ms(raw)
+                prev = index.open_times[-1] if index.open_times else None
+                if open_time is None or (prev is not None and open_time < prev):
+                    index.seekable = False
+                else:
+                    index.offsets.append(start)
+                    index.open_times.append(open_time)
+            index.rows += 1
+            last_line = raw
+    if last_line:
+        index.last_open_time = _open_time_ms(last_line)
+        if index.last_open_time is None:
+            index.seekable = False
+    if not index.seekable:
+        index.offsets.clear()
+        index.open_times.clear()
+    return index
+
+
+def write_index(path: Path, step: int) -> SnapshotIndex:
+    """Будує індекс і атомарно записує sidecar поруч зі snapshot-ом."""
+    index = build_index(path, step)
+    target = index_path(path)
+    tmp = target.with_name(f"{target.name}.tmp.{os.getpid()}")
+    tmp.write_bytes(index.to_bytes())
+    tmp.replace(target)
+    return index
+
+
+def load_index(path: Path, step: int | None = None) -> SnapshotIndex:
+    """Актуальний індекс snapshot-а; відсутній/застарілий — перебудовується.
+
+    ``step=None`` приймає sidecar з будь-яким кроком (для CLI-інструментів,
+    щоб не перебудовувати індекс, записаний UDS з іншим кроком).
+    """
+    try:
+        cached = SnapshotIndex.from_bytes(index_path(path).read_bytes())
+    except OSError:
+        cached = None
+    if (
+        cached is not None
+        and (step is None or cached.step == max(1, int(step)))
+        and cached.matches(path)
+    ):
+        return cached
+    if step is None:
+        step = DEFAULT_STEP
+    try:
+        return write_index(path, step)
+    except OSError:
+        # Каталог лише для читання — індекс живе до кінця виклику.
+        return build_index(path, step)
+
+
+def read_lines(path: Path, lo: int, hi: int | None = None) -> bytes:
+    """Сирі байти ``[lo, hi)`` snapshot-а (межі — початки рядків)."""
+    with path.open("rb") as handle:
+        handle.seek(lo)
+        return handle.read() if hi is None else handle.read(max(0, hi - lo))
+
+
+def read_range_bytes(
+    path: Path,
+    step: int | None,
+    *,
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    tail: int | None = None,
+) -> bytes | None:
+    """Сирі JSONL-рядки зрізу за індексом; None — індекс непридатний.
+
+    Зріз вирівняний на блоки індексу, тобто є надмножиною рядків
+    діапазону: точна фільтрація за ``open_time`` і ``tail`` — на викликачі.
+    """
+    index = load_index(path, step)
+    if not index.seekable:
+        return None
+    lo, hi = index.byte_range(start_ms, end_ms, tail)
+    return read_lines(path, lo, hi)
+
+
+def read_jsonl_range(
+    path: Path,
+    step: int,
+    *,
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    tail: int | None = None,
+) -> pd.DataFrame | None:
+    """Те саме, що ``read_range_bytes``, але розпарсене як при повному читанні."""
+    payload = read_range_bytes(path, step, start_ms=start_ms, end_ms=end_ms, tail=tail)
+    if payload is None:
+        return None
+    if not payload.strip():
+        return pd.DataFrame()
+    return pd.read_json(io.BytesIO(payload), orient="records", lines=True)
+
+
+__all__ = [
+    "DEFAULT_STEP",
+    "INDEX_SUFFIX",
+    "SnapshotIndex",
+    "build_index",
+    "index_path",
+    "load_index",
+    "read_jsonl_range",
+    "read_lines",
+    "read_range_bytes",
+    "write_index",
+]
@@ -6,6 +6,8 @@
     • швидкий RAM‑кеш (TTL, LRU, пріоритет активів, квоти профілю);
     • Redis як шар спільного стану (namespace ``ai_one:``) та останні бари;
     • write‑behind збереження на диск (Parquet | JSONL) зі згладженим тиском;
+    • append-only сегменти snapshot-ів (флуш дописує лише нові бари + компакція);
+    • опційний WAL дельт барів: рідкі флуші snapshot-ів без втрат на краші;
     • метрики (optionally Prometheus), евікшен та перевірки валідності (схема, NaT, монотонність);
     • уніфіковане API для Stage1/WebSocket/UI компонентів.
 
@@ -13,7 +15,8 @@
         get_df / get_last / put_bars / warmup / set_priority / metrics_snapshot.
 
 Особливості реалізації:
-    • write-behind черга з адаптивним backpressure (soft/hard пороги);
+    • write-behind черга з адаптивним backpressure (soft/hard пороги) і
+      сигналом ``backpressure_level()`` для інжесту/SMC/UI;
     • sum‑тип TTL для інтервалів (cfg.intervals_ttl) + профіль гарячості;
     • агрегація/валідація не виконується тут — лише зберігання та читання.
 """
@@ -21,16 +24,22 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import io
 import logging
 import math
 import os
 import time
+import zlib
 from collections import OrderedDict, deque
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Any, Protocol, runtime_checkable
 
+import numpy as np
 import pandas as pd
 from redis.asyncio import Redis
 
@@ -40,8 +49,25 @@ from config.config import (
     PRICE_TICK_DROP_SECONDS,
     PRICE_TICK_STALE_SECONDS,
 )
-from core.serialization import json_dumps, json_loads
+from core.serialization import json_dumps_bytes, json_loads, json_loads_bytes
+from data.bar_ring_buffer import BarRingBuffer
+from data.bar_wal import BarWal
+from data.columnar_snapshot import (
+    UnsupportedFrameError,
+    last_value,
+    read_columnar,
+    read_header,
+    write_columnar,
+)
 from data.fxcm_status_listener import get_fxcm_feed_state
+from data.gap_index import (
+    BackfillRange,
+    GapIndex,
+    MarketHours,
+    interval_to_ms,
+    plan_backfill,
+)
+from data.snapshot_index import read_jsonl_range, write_index
 
 # ── Логування ──
 logger = logging.getLogger("data.unified_store")
@@ -57,6 +83,7 @@ DEFAULT_NAMESPACE = NAMESPACE
 _HAS_PARQUET = (
     False  # підтримка pyarrow прибрана (раніше була опціональним плейсхолдером)
 )
+COLUMNAR_EXT = "bin"
 
 REQUIRED_OHLCV_COLS = (
     "open_time",
@@ -80,6 +107,139 @@ class SnapshotStats:
     modified_ts: float | None
 
 
+@dataclass(frozen=True)
+class SeriesMeta:
+    """Метадані серії барів (symbol, interval) без доступу до DataFrame.
+
+    ``rows`` — кількість барів у робочому наборі сховища (RAM); час —
+    у тих самих одиницях, що й колонка ``open_time``; ``last_put_ts`` —
+    wall-clock секунди останнього ``put_bars``; ``version`` зростає на
+    кожному оновленні (put, trim, warmup, read-through).
+    """
+
+    rows: int
+    first_open_time: int | float | None
+    last_open_time: int | float | None
+    last_close: float | None
+    last_put_ts: float | None
+    version: int
+
+
+# Бари у колонковому вигляді: назва колонки → 1-D numpy-масив однакової
+# довжини. Інжестор віддає їх у put_bars без проміжного DataFrame.
+BarColumns = Mapping[str, np.ndarray]
+
+
+class PutBarsManyError(RuntimeError):
+    """``put_bars_many`` не записав частину ключів; решта батча вже закомічена.
+
+    ``failed`` — (symbol, interval) → виняток; викликач повторює лише їх.
+    """
+
+    def __init__(self, failed: Mapping[tuple[str, str], Exception]) -> None:
+        self.failed: dict[tuple[str, str], Exception] = dict(failed)
+        keys = ", ".join(f"{symbol}:{interval}" for symbol, interval in self.failed)
+        super().__init__(f"put_bars_many: не записано ключі {keys}")
+
+
+def _bars_len(bars: pd.DataFrame | BarColumns | None) -> int:
+    if bars is None:
+        return 0
+    if isinstance(bars, pd.DataFrame):
+        return len(bars)
+    open_time = bars.get("open_time")
+    return 0 if open_time is None else len(open_time)
+
+
+def _bars_frame(bars: pd.DataFrame | BarColumns) -> pd.DataFrame:
+    """DataFrame для повільного шляху (повне злиття); колонки без копії."""
+    if isinstance(bars, pd.DataFrame):
+        return bars
+    return pd.DataFrame({name: np.asarray(col) for name, col in bars.items()})
+
+
+def _concat_bars(
+    parts: list[pd.DataFrame | BarColumns],
+) -> pd.DataFrame | BarColumns:
+    if len(parts) == 1:
+        return parts[0]
+    first = parts[0]
+    if not isinstance(first, pd.DataFrame) and all(
+        not isinstance(p, pd.DataFrame) and p.keys() == first.keys() for p in parts
+    ):
+        return {
+            name: np.concatenate([np.asarray(p[name]) for p in parts]) for name in first
+        }
+    return pd.concat([_bars_frame(p) for p in parts], ignore_index=True)
+
+
+def _open_times_ms(df: pd.DataFrame | BarColumns) -> np.ndarray | None:
+    """open_time фрейму як int64 мс (секунди з fallback-шляхів домножуються)."""
+    if isinstance(df, pd.DataFrame):
+        if "open_time" not in df.columns or not len(df):
+            return None
+        values = pd.to_numeric(df["open_time"], errors="coerce").to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+    else:
+        raw = df.get("open_time")
+        if raw is None or not len(raw):
+            return None
+        values = np.asarray(raw, dtype="float64")
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    if values.max() < 1e12:
+        values = values * 1000.0
+    out: np.ndarray = values.astype(np.int64)
+    return out
+
+
+def _snapshot_frame(value: pd.DataFrame | BarRingBuffer) -> pd.DataFrame:
+    """Фрейм для запису на диск: view буфера будується лише тут (флуш)."""
+    return value.view() if isinstance(value, BarRingBuffer) else value
+
+
+def _frame_scalar(df: pd.DataFrame, column: str, pos: int) -> Any:
+    if column not in df.columns or not len(df):
+        return None
+    value = df[column].iat[pos]
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+@dataclass
+class _LockWaitStats:
+    """Очікування страйп-локу для одного (symbol, interval)."""
+
+    acquires: int = 0
+    contended: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+
+@dataclass
+class _SegmentState:
+    """Що вже персистовано для (symbol, interval) у сегментному режимі.
+
+    Стан описує записаний фрейм (base + сегменти мінус trim-маніфест): за
+    ним ``save_bars`` визначає, чи новий фрейм є продовженням, можливо з
+    обрізаною головою (дописуємо хвіст у сегмент, обрізку — в маніфест),
+    чи історію переписано (повна компакція). ``partial`` — відомий лише
+    хвіст персистованого фрейму (tail-читання/``save_tail``): такий стан
+    годиться тільки для ``save_tail``.
+    """
+
+    open_times: np.ndarray  # int64, у порядку запису
+    last_row_sig: tuple[str, ...]
+    trim_before: int | None = None
+    active_seq: int = 0
+    active_rows: int = 0
+    segment_rows: int = 0
+    partial: bool = False
+
+
 def _normalize_epoch(value: Any) -> float | None:
     """Конвертує різні представлення часу в секунди UNIX."""
 
@@ -140,6 +300,9 @@ class StoreProfile:
     flush_batch_max: int = 8
     flush_queue_soft: int = 200
     flush_queue_hard: int = 1000
+    # ємність колонкового RAM-буфера на (symbol, interval); довший ключ
+    # зберігається як DataFrame, бари не відкидаються
+    ram_max_bars: int = 30_000
 
 
 @dataclass
@@ -165,6 +328,44 @@ class StoreConfig:
     # retry для Redis/диска
     io_retry_attempts: int = 3
     io_retry_backoff: float = 0.25  # секунди, експоненційно
+    # append-only сегменти: флуш дописує лише нові рядки замість перезапису snapshot
+    snapshot_segments: bool = True
+    segment_max_rows: int = 2_000  # ротація активного сегмента
+    segment_compact_rows: int = 10_000  # поріг компакції сегментів у базовий snapshot
+    # формат base snapshot: "jsonl" (текст, імпорт/експорт) або "columnar" (memmap)
+    snapshot_format: str = "jsonl"
+    # RAM-шар тримає числові бари в колонковому буфері (append/upsert на місці)
+    ram_ring_buffer: bool = True
+    # кількість страйпів локів (symbol, interval) для put_bars/enforce_tail_limit
+    lock_stripes: int = 64
+    # write-behind останнього бару в Redis: коалесинг по ключу + pipeline
+    redis_write_behind: bool = True
+    redis_flush_interval_ms: float = 5.0
+    redis_flush_max_keys: int = 256
+    # TTL негативного кешу get_df для ключів без даних у Redis і на диску
+    negative_cache_ttl_sec: float = 2.0
+    # Інкрементальний індекс пропусків (gaps) + планувальник range-backfill
+    gap_index: bool = True
+    gap_market_hours: str = "fx"  # fx | 24x7
+    gap_daily_breaks_utc: tuple[str, ...] = ()  # напр. ("21:00-22:00",)
+    gap_merge_slack_bars: int = 5
+    gap_max_bars_per_command: int = 5_000
+    # Backpressure: вік найстаршого незаписаного на диск ключа (дисковий стал).
+    # Рівень за кількістю ключів — profile.flush_queue_soft/hard.
+    flush_stall_soft_sec: float = 5.0
+    flush_stall_hard_sec: float = 30.0
+    # WAL дельт барів (лише з write_behind): put_bars дописує нові рядки,
+    # на буті replay_wal() відновлює їх поверх snapshot-ів.
+    wal: bool = False
+    wal_dir: str = "wal"  # відносно base_dir
+    wal_fsync: bool = False
+    wal_file_max_bytes: int = 64 * 1024 * 1024
+    # Мінімальна затримка флушу ключа на диск (коалесинг); з WAL — хвилини.
+    flush_interval_sec: float = 0.0
+    # Крок sidecar offset-індексу jsonl snapshot-ів (рядків); 0 — вимкнено
+    snapshot_index_step: int = 1000
+    # warmup: скільки (symbol, interval) читаються з диска паралельно
+    warmup_concurrency: int = 8
 
 
 class Priority:
@@ -175,6 +376,36 @@ class Priority:
     COLD = 0
 
 
+class Backpressure:
+    """Рівні backpressure write-behind черги диска.
+
+    NORMAL — черга встигає; SOFT — споживачі мають коалесувати записи й
+    розтягувати цикли; HARD — диск не встигає/завис, писати якомога менше.
+    """
+
+    NORMAL = "normal"
+    SOFT = "soft"
+    HARD = "hard"
+
+    RANK = {NORMAL: 0, SOFT: 1, HARD: 2}
+
+    @classmethod
+    def level_of(cls, store: object) -> str:
+        """Рівень ``store.backpressure_level()`` для споживачів; без сигналу → normal.
+
+        Store без методу, виняток або невідоме значення дають NORMAL: сигнал
+        лише підказка і не має ламати інжест чи цикл SMC.
+        """
+        level_fn = getattr(store, "backpressure_level", None)
+        if not callable(level_fn):
+            return cls.NORMAL
+        try:
+            level = str(level_fn())
+        except Exception:  # noqa: BLE001 - сигнал не має ламати споживача
+            return cls.NORMAL
+        return level if level in cls.RANK else cls.NORMAL
+
+
 # ── Ключі / імена ───────────────────────────────────────────────────────────
 def k(namespace: str, *parts: str) -> str:
     """Будує стабільний Redis-ключ: ai_one:part1:part2..."""
@@ -245,28 +476,76 @@ class Metrics:
         self.evictions: CounterLike = _Noop()
         self.errors: CounterLike = _Noop()
         self.last_put_ts: GaugeLike = _Noop()
+        self.lock_wait: HistogramLike = _Noop()
+        self.redis_flush_latency: HistogramLike = _Noop()
+        self.redis_flush_batch: HistogramLike = _Noop()
+        self.put_many_latency: HistogramLike = _Noop()
+        self.put_many_rows_per_sec: GaugeLike = _Noop()
+        self.backpressure_level: GaugeLike = _Noop()  # 0/1/2 = normal/soft/hard
+        self.wal_bytes: GaugeLike = _Noop()
+        self.wal_replay_seconds: GaugeLike = _Noop()
 
 
 # ── RAM Layer ────────────────────────────────────────────────────────────────
 class RamLayer:
-    """RAM-кеш з TTL, LRU, квотами, пріоритетами й приблизною оцінкою пам'яті."""
+    """RAM-кеш з TTL, LRU, квотами, пріоритетами й приблизною оцінкою пам'яті.
 
-    def __init__(self, profile: StoreProfile) -> None:
-        self._store: dict[tuple[str, str], tuple[pd.DataFrame, float, int]] = {}
+    Числові бари зберігаються у ``BarRingBuffer`` (view без копій, append на
+    місці); фрейми з нечисловими колонками — як звичайні DataFrame.
+
+    Індекс евікшену: min-heap ``(priority, touch_seq, key)`` з лінивою
+    інвалідацією (застарілий запис відкидається при pop) і TTL timer wheel
+    (кошики по ``_TTL_BUCKET_SEC`` + heap номерів кошиків). put/get/evict —
+    O(log n), ``sweep`` — O(протухлих), лічильник символів і байти —
+    інкрементні.
+    """
+
+    _TTL_BUCKET_SEC = 1.0
+
+    def __init__(
+        self,
+        profile: StoreProfile,
+        *,
+        ring_buffer: bool = True,
+        metrics: Metrics | None = None,
+    ) -> None:
+        self._store: dict[
+            tuple[str, str], tuple[BarRingBuffer | pd.DataFrame, float, int]
+        ] = {}
+        self._entry_bytes: dict[tuple[str, str], int] = {}
         self._lru: OrderedDict[tuple[str, str], None] = OrderedDict()
         self._prio: dict[str, int] = {}  # symbol -> Priority
         self._profile = profile
+        self._ring_buffer = ring_buffer
+        self._metrics = metrics
         self._bytes_in_ram: int = 0
+        # symbol -> ключі в RAM (кількість гарячих символів = len)
+        self._sym_keys: dict[str, set[tuple[str, str]]] = {}
+        # Евікшн за пріоритетом: валідний запис — той, чий seq == _touch_seq[key]
+        self._touch_seq: dict[tuple[str, str], int] = {}
+        self._seq = 0
+        self._evict_heap: list[tuple[int, int, tuple[str, str]]] = []
+        # TTL timer wheel: кошик -> ключі, що протухають у ньому
+        self._wheel: dict[int, set[tuple[str, str]]] = {}
+        self._wheel_heap: list[int] = []
+        self._key_bucket: dict[tuple[str, str], int] = {}
+        self._evictions: dict[str, int] = {}
 
     # ── Утиліти ─────────────────────────────────────────────────────────────
 
     @staticmethod
-    def _estimate_bytes(df: pd.DataFrame) -> int:
+    def _estimate_bytes(df: pd.DataFrame | BarRingBuffer) -> int:
+        if isinstance(df, BarRingBuffer):
+            return df.nbytes
         try:
             return int(df.memory_usage(index=True, deep=True).sum())
         except Exception:
             return max(1024, len(df) * 128)
 
+    @staticmethod
+    def _frame(value: BarRingBuffer | pd.DataFrame) -> pd.DataFrame:
+        return value.view() if isinstance(value, BarRingBuffer) else value
+
     def _ttl_for(self, interval: str) -> int:
         # hot vs warm залежно від інтервалу
         if interval in ("1m", "5m"):
@@ -276,59 +555,113 @@ class RamLayer:
     # ── API ─────────────────────────────────────────────────────────────────
 
     def set_priority(self, symbol: str, level: int) -> None:
+        if self._prio.get(symbol) == level:
+            return
         self._prio[symbol] = level
+        # Старі записи heap для ключів символу стають невалідними.
+        for key in self._sym_keys.get(symbol, ()):
+            self._push_evict(key)
 
     def get_priority(self, symbol: str) -> int:
         return self._prio.get(symbol, Priority.NORMAL)
 
     def get(self, symbol: str, interval: str) -> pd.DataFrame | None:
-        key = (symbol, interval)
+        value = self._lookup((symbol, interval))
+        return None if value is None else self._frame(value)
+
+    def get_buffer(self, symbol: str, interval: str) -> BarRingBuffer | None:
+        """Буфер для злиття на місці (None — запису нема або це DataFrame)."""
+        value = self._lookup((symbol, interval))
+        return value if isinstance(value, BarRingBuffer) else None
+
+    def _lookup(self, key: tuple[str, str]) -> BarRingBuffer | pd.DataFrame | None:
         item = self._store.get(key)
         if not item:
             return None
-        df, ts, ttl = item
+        value, ts, ttl = item
         if time.time() - ts > ttl:
             self.delete(key, reason="ttl_expired")
             return None
         # LRU touch
         self._lru.move_to_end(key, last=True)
-        return df
+        self._push_evict(key)
+        return value
 
     def put(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        value: BarRingBuffer | pd.DataFrame = df
+        if self._ring_buffer:
+            buf = BarRingBuffer.from_frame(df, self._profile.ram_max_bars)
+            if buf is not None:
+                value = buf
+        self._store_value((symbol, interval), value)
+
+    def touch(self, symbol: str, interval: str) -> None:
+        """Оновлює TTL/LRU/байти після зміни буфера на місці."""
         key = (symbol, interval)
-        ttl = self._ttl_for(interval)
+        item = self._store.get(key)
+        if item:
+            self._store_value(key, item[0])
+
+    def _store_value(
+        self, key: tuple[str, str], value: BarRingBuffer | pd.DataFrame
+    ) -> None:
+        ttl = self._ttl_for(key[1])
         now = time.time()
 
-        old = self._store.get(key)
-        if old:
-            old_df, _, _ = old
-            self._bytes_in_ram -= self._estimate_bytes(old_df)
+        self._bytes_in_ram -= self._entry_bytes.get(key, 0)
+        size = self._estimate_bytes(value)
+        self._entry_bytes[key] = size
 
-        self._store[key] = (df, now, ttl)
+        if key not in self._store:
+            self._sym_keys.setdefault(key[0], set()).add(key)
+        self._store[key] = (value, now, ttl)
         self._lru[key] = None
         self._lru.move_to_end(key, last=True)
-        self._bytes_in_ram += self._estimate_bytes(df)
+        self._bytes_in_ram += size
+        self._push_evict(key)
+        self._schedule_ttl(key, now + ttl)
 
         self._enforce_quotas()
 
     def delete(self, key: tuple[str, str], *, reason: str = "evict") -> None:
-        item = self._store.pop(key, None)
-        if item:
-            df, _, _ = item
-            self._bytes_in_ram -= self._estimate_bytes(df)
+        if self._store.pop(key, None) is None:
+            return
+        self._bytes_in_ram -= self._entry_bytes.pop(key, 0)
         if key in self._lru:
             del self._lru[key]
+        keys = self._sym_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._sym_keys[key[0]]
+        # heap-запис відкинеться ліниво: seq ключа більше не існує
+        self._touch_seq.pop(key, None)
+        bucket = self._key_bucket.pop(key, None)
+        if bucket is not None:
+            self._wheel.get(bucket, set()).discard(key)
+        self._evictions[reason] = self._evictions.get(reason, 0) + 1
+        if self._metrics is not None:
+            self._metrics.evictions.labels(reason=reason).inc()
 
     def sweep(self, metrics: Metrics) -> None:
-        """Прибрати протухлі ключі/зайві записи."""
+        """Прибрати протухлі ключі/зайві записи (лише кошики, що настали)."""
         now = time.time()
-        expired: list[tuple[str, str]] = []
-        for key, (_df, ts, ttl) in list(self._store.items()):
-            if now - ts > ttl:
-                expired.append(key)
-        for key in expired:
-            self.delete(key, reason="ttl_expired")
-            metrics.evictions.labels(reason="ttl_expired").inc()
+        due = int(now // self._TTL_BUCKET_SEC)
+        while self._wheel_heap and self._wheel_heap[0] <= due:
+            bucket = heapq.heappop(self._wheel_heap)
+            for key in self._wheel.pop(bucket, ()):
+                item = self._store.get(key)
+                if item is None:
+                    continue
+                _value, ts, ttl = item
+                if now - ts > ttl:
+                    self.delete(key, reason="ttl_expired")
+                    if self._metrics is None:
+                        metrics.evictions.labels(reason="ttl_expired").inc()
+                else:
+                    # межа кошика раніша за точний TTL — переносимо
+                    self._key_bucket.pop(key, None)
+                    self._schedule_ttl(key, ts + ttl)
 
         self._enforce_quotas()
 
@@ -336,44 +669,57 @@ class RamLayer:
 
     # ── Внутрішнє ───────────────────────────────────────────────────────────
 
+    def _push_evict(self, key: tuple[str, str]) -> None:
+        self._seq += 1
+        self._touch_seq[key] = self._seq
+        heapq.heappush(self._evict_heap, (self.get_priority(key[0]), self._seq, key))
+        # Компакція: застарілих записів не більше, ніж живих (амортизовано O(1)).
+        if len(self._evict_heap) > 2 * len(self._store) + 64:
+            self._evict_heap = [
+                (self.get_priority(k[0]), seq, k) for k, seq in self._touch_seq.items()
+            ]
+            heapq.heapify(self._evict_heap)
+
+    def _schedule_ttl(self, key: tuple[str, str], expires_at: float) -> None:
+        # Кошик, на початку якого ключ гарантовано протух (now > ts + ttl).
+        bucket = int(expires_at // self._TTL_BUCKET_SEC) + 1
+        old = self._key_bucket.get(key)
+        if old == bucket:
+            return
+        if old is not None:
+            self._wheel.get(old, set()).discard(key)
+        self._key_bucket[key] = bucket
+        keys = self._wheel.get(bucket)
+        if keys is None:
+            keys = self._wheel[bucket] = set()
+            heapq.heappush(self._wheel_heap, bucket)
+        keys.add(key)
+
     def _enforce_quotas(self) -> None:
         """Квоти: обмеження символів у hot та за RAM-обсягом."""
         # ліміт по кількості гарячих символів
-        symbols_in_lru = list(
-            OrderedDict(((s, None) for s, _ in self._lru.keys())).keys()
-        )
-        if len(symbols_in_lru) > self._profile.max_symbols_hot:
-            # евікшн менш пріоритетних і найстаріших
-            to_drop = len(symbols_in_lru) - self._profile.max_symbols_hot
-            self._evict_by_priority(to_drop)
+        if len(self._sym_keys) > self._profile.max_symbols_hot:
+            self._evict_by_priority()
 
         # грубий ліміт по байтах RAM
         ram_limit_bytes = self._profile.ram_limit_mb * 1024 * 1024
         while self._bytes_in_ram > ram_limit_bytes and self._lru:
-            key, _ = self._lru.popitem(last=False)  # найстаріший
+            key = next(iter(self._lru))  # найстаріший
             self.delete(key, reason="ram_quota")
 
-    def _evict_by_priority(self, count: int) -> None:
-        # будуємо список (prio, age_index, key)
-        ranked: list[tuple[int, int, tuple[str, str]]] = []
-        for idx, key in enumerate(self._lru.keys()):
-            sym, _ = key
-            prio = self.get_priority(sym)
-            ranked.append((prio, idx, key))
-        ranked.sort(
-            key=lambda x: (x[0], x[1])
-        )  # пріоритет зростає -> першим викидаємо найнижчий
-
-        removed = 0
-        for _, _, key in ranked:
-            sym, _ = key
-            # не чіпаємо ALERT
-            if self.get_priority(sym) >= Priority.ALERT:
+    def _evict_by_priority(self) -> None:
+        """Викидає ключі (нижчий пріоритет, давніший доступ) до квоти символів."""
+        heap = self._evict_heap
+        while len(self._sym_keys) > self._profile.max_symbols_hot and heap:
+            prio, seq, key = heap[0]
+            if self._touch_seq.get(key) != seq or self.get_priority(key[0]) != prio:
+                heapq.heappop(heap)  # застарілий запис
                 continue
-            self.delete(key, reason="hot_quota")
-            removed += 1
-            if removed >= count:
+            # не чіпаємо ALERT (а все нижче вже викинуто)
+            if prio >= Priority.ALERT:
                 break
+            heapq.heappop(heap)
+            self.delete(key, reason="hot_quota")
 
     # ── Інспектори ──────────────────────────────────────────────────────────
 
@@ -381,8 +727,10 @@ class RamLayer:
     def stats(self) -> dict[str, Any]:
         return {
             "entries": len(self._store),
+            "symbols": len(self._sym_keys),
             "bytes_in_ram": self._bytes_in_ram,
             "lru_len": len(self._lru),
+            "evictions": dict(self._evictions),
         }
 
     def inspect_entry(self, symbol: str, interval: str) -> tuple[int, float | None]:
@@ -391,7 +739,10 @@ class RamLayer:
         item = self._store.get((symbol, interval))
         if not item:
             return 0, None
-        df, _ts, _ttl = item
+        value, _ts, _ttl = item
+        if isinstance(value, BarRingBuffer):
+            return len(value), _normalize_epoch(value.last_open_time())
+        df = value
         if df is None or df.empty:
             return 0, None
         try:
@@ -416,9 +767,12 @@ class RedisAdapter:
                 raw = await self.r.get(key)
                 if raw is None:
                     return default
-                if isinstance(raw, bytes):
-                    raw = raw.decode("utf-8", errors="replace")
-                return json_loads(str(raw))
+                value: object = (
+                    json_loads_bytes(raw)
+                    if isinstance(raw, bytes)
+                    else json_loads(str(raw))
+                )
+                return value
             except Exception as e:
                 await asyncio.sleep(self.cfg.io_retry_backoff * (2**attempt))
                 if attempt == self.cfg.io_retry_attempts - 1:
@@ -428,7 +782,7 @@ class RedisAdapter:
 
     async def jset(self, *parts: str, value: object, ttl: int | None = None) -> None:
         key = k(self.cfg.namespace, *parts)
-        data = json_dumps(value)
+        data = json_dumps_bytes(value)
         for attempt in range(self.cfg.io_retry_attempts):
             try:
                 if ttl:
@@ -453,31 +807,560 @@ class RedisAdapter:
             return None
 
 
+# ── Redis write-behind ──
+class RedisLastBarWriter:
+    """Write-behind останніх барів у Redis через один pipeline на батч.
+
+    ``enqueue`` синхронний і лише кладе значення в словник (нове значення
+    ключа перетирає попереднє — коалесинг). Фонова задача скидає накопичене
+    кожні ``interval_ms`` або одразу при ``max_keys`` ключах одним
+    pipeline без MULTI. Поки задача не запущена, ``running`` = False і
+    викликач пише в Redis синхронно, як раніше.
+
+    Батч, що зараз пишеться, лишається видимим через ``pending_value`` до
+    успішного ``execute()``; невдалий батч повертається в чергу і будить
+    фонову задачу для повтору.
+    """
+
+    def __init__(self, redis: RedisAdapter, metrics: Metrics, cfg: StoreConfig) -> None:
+        self._redis = redis
+        self._metrics = metrics
+        self._interval = max(0.0, cfg.redis_flush_interval_ms) / 1000.0
+        self._max_keys = max(1, cfg.redis_flush_max_keys)
+        self._pending: dict[tuple[str, str], tuple[dict[str, Any], int | None]] = {}
+        self._inflight: dict[tuple[str, str], tuple[dict[str, Any], int | None]] = {}
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task[Any] | None = None
+        self._stats: dict[str, float] = {
+            "flushes": 0,
+            "keys_written": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "last_batch": 0,
+            "max_batch": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def enqueue(
+        self, symbol: str, interval: str, value: dict[str, Any], ttl: int | None
+    ) -> None:
+        key = (symbol, interval)
+        if key in self._pending:
+            self._stats["coalesced"] += 1
+        self._pending[key] = (value, ttl)
+        self._wakeup.set()
+        if len(self._pending) >= self._max_keys:
+            self._full.set()
+
+    def pending_value(self, symbol: str, interval: str) -> dict[str, Any] | None:
+        """Ще не скинуте значення (read-your-writes для get_last/get_df)."""
+        key = (symbol, interval)
+        item = self._pending.get(key) or self._inflight.get(key)
+        return None if item is None else item[0]
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Зупиняє задачу й синхронно скидає залишок черги."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < self._max_keys and self._interval > 0:
+                # Даємо батчу набратися: або інтервал, або max_keys ключів.
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self._interval)
+                except TimeoutError:
+                    pass
+            self._wakeup.clear()
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception as e:  # broad-except: write-behind не має падати
+                logger.warning("Redis write-behind flush failed: %s", e)
+
+    async def flush(self) -> int:
+        """Скидає накопичені ключі одним pipeline; повертає розмір батча."""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        self._inflight.update(batch)
+        t0 = time.perf_counter()
+        cfg = self._redis.cfg
+        items = [
+            (
+                k(cfg.namespace, "candles", symbol, interval),
+                json_dumps_bytes(value),
+                ttl,
+            )
+            for (symbol, interval), (value, ttl) in batch.items()
+        ]
+        written = False
+        try:
+            for attempt in range(cfg.io_retry_attempts):
+                try:
+                    await self._write(items)
+                    written = True
+                    break
+                except Exception as e:
+                    await asyncio.sleep(cfg.io_retry_backoff * (2**attempt))
+                    if attempt == cfg.io_retry_attempts - 1:
+                        self._stats["errors"] += 1
+                        logger.error(
+                            "Redis pipeline SET failed (%d keys): %s", len(items), e
+                        )
+        finally:
+            for key, item in batch.items():
+                if self._inflight.get(key) is item:
+                    del self._inflight[key]
+                if not written:
+                    # Повертаємо в чергу ті ключі, що не оновились за час спроб.
+                    self._pending.setdefault(key, item)
+        if not written:
+            # _run уже скинув _wakeup — без цього повтор чекав би нового enqueue.
+            self._wakeup.set()
+            return 0
+        elapsed = time.perf_counter() - t0
+        size = len(items)
+        self._metrics.redis_flush_latency.observe(elapsed)
+        self._metrics.redis_flush_batch.observe(size)
+        st = self._stats
+        st["flushes"] += 1
+        st["keys_written"] += size
+        st["last_batch"] = size
+        st["max_batch"] = max(st["max_batch"], size)
+        st["last_flush_ms"] = elapsed * 1000.0
+        st["max_flush_ms"] = max(st["max_flush_ms"], elapsed * 1000.0)
+        return size
+
+    async def _write(self, items: list[tuple[str, bytes, int | None]]) -> None:
+        r = self._redis.r
+        pipeline = getattr(r, "pipeline", None)
+        if pipeline is None:
+            # Клієнти без pipeline (тестові стаби) — послідовні SET.
+            for key, data, ttl in items:
+                if ttl:
+                    await r.set(key, data, ex=ttl)
+                else:
+                    await r.set(key, data)
+            return
+        pipe = pipeline(transaction=False)
+        for key, data, ttl in items:
+            if ttl:
+                pipe.set(key, data, ex=ttl)
+            else:
+                pipe.set(key, data)
+        await pipe.execute()
+
+    def snapshot(self) -> dict[str, Any]:
+        st = self._stats
+        return {
+            "running": self.running,
+            "pending": len(self._pending),
+            "inflight": len(self._inflight),
+            "flushes": int(st["flushes"]),
+            "keys_written": int(st["keys_written"]),
+            "coalesced": int(st["coalesced"]),
+            "errors": int(st["errors"]),
+            "last_batch": int(st["last_batch"]),
+            "max_batch": int(st["max_batch"]),
+            "last_flush_ms": round(st["last_flush_ms"], 3),
+            "max_flush_ms": round(st["max_flush_ms"], 3),
+        }
+
+
 # ── Disk Adapter ──
 class StorageAdapter:
-    """Збереження на диск: Parquet (якщо доступний) або JSON. Async через виконавця."""
+    """Збереження на диск: колонковий memmap або JSONL. Async через виконавця."""
 
     def __init__(self, base_dir: str | Path, cfg: StoreConfig) -> None:
         self.base_dir = Path(base_dir)
         self.cfg = cfg
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._segments: dict[tuple[str, str], _SegmentState] = {}
+        self._segment_locks: dict[tuple[str, str], asyncio.Lock] = {}
 
     def snapshot_path(
         self, symbol: str, interval: str, *, ext: str | None = None
     ) -> Path:
         context = f"bars_{interval}"
-        suffix = ext or ("parquet" if _HAS_PARQUET else "jsonl")
+        suffix = ext or self._snapshot_ext()
         return self.base_dir / file_name(symbol, context, "snapshot", suffix)
 
+    def _snapshot_ext(self, fmt: str | None = None) -> str:
+        if _HAS_PARQUET:
+            return "parquet"
+        return (
+            COLUMNAR_EXT if (fmt or self.cfg.snapshot_format) == "columnar" else "jsonl"
+        )
+
+    def base_snapshot(self, symbol: str, interval: str) -> Path | None:
+        """Найсвіжіший наявний base snapshot (columnar/jsonl/legacy json).
+
+        Після перемикання ``snapshot_format`` поруч можуть лежати обидва
+        формати — читаємо той, що записаний пізніше; при рівності mtime
+        перевага за поточним форматом.
+        """
+        exts = [self._snapshot_ext()]
+        for ext in ("parquet", COLUMNAR_EXT, "jsonl", "json"):
+            if ext == "parquet" and not _HAS_PARQUET:
+                continue
+            if ext not in exts:
+                exts.append(ext)
+        best: Path | None = None
+        best_mtime = -1.0
+        for ext in exts:
+            path = self.snapshot_path(symbol, interval, ext=ext)
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if mtime > best_mtime:
+                best, best_mtime = path, mtime
+        return best
+
+    def segment_path(self, symbol: str, interval: str, seq: int) -> Path:
+        """Шлях до append-only сегмента: SYMBOL_bars_TF_segment_000001.jsonl."""
+        return self.base_dir / file_name(
+            symbol, f"bars_{interval}", f"segment_{seq:06d}", "jsonl"
+        )
+
+    def segment_paths(self, symbol: str, interval: str) -> list[Path]:
+        """Повертає наявні сегменти у порядку запису (seq зростає)."""
+        pattern = file_name(symbol, f"bars_{interval}", "segment_*", "jsonl")
+        return sorted(self.base_dir.glob(pattern))
+
+    def manifest_path(self, symbol: str, interval: str) -> Path:
+        """Trim-маніфест сегментів: SYMBOL_bars_TF_manifest.json."""
+        return self.base_dir / file_name(symbol, f"bars_{interval}", "manifest", "json")
+
+    def _read_trim(self, symbol: str, interval: str) -> int | None:
+        """``trim_before`` з маніфесту (None — маніфесту нема або він битий)."""
+        try:
+            payload = json_loads(
+                self.manifest_path(symbol, interval).read_text(encoding="utf-8")
+            )
+            return int(payload["trim_before"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError) as exc:
+            logger.warning(
+                "Segment manifest ignored for %s %s: %s", symbol, interval, exc
+            )
+            return None
+
     async def save_bars(self, symbol: str, interval: str, df: pd.DataFrame) -> str:
-        """Зберігає історію барів. Контекст=f"bars_{interval}", event="snapshot"."""
+        """Зберігає історію барів. Контекст=f"bars_{interval}", event="snapshot".
+
+        У сегментному режимі (``cfg.snapshot_segments``) продовження вже
+        записаного фрейму дописується в активний сегмент (O(нових барів)).
+        Обрізана голова (``enforce_tail_limit``) не переписує історію — межа
+        фіксується в trim-маніфесті, який ``load_bars`` застосовує при читанні.
+        Будь-яка інша зміна історії (backfill, оновлення вже записаного бару)
+        або переповнення сегментів — повний перезапис base snapshot із
+        видаленням сегментів і маніфесту (компакція).
+        """
+        return await self._save(symbol, interval, df, tail_only=False)
+
+    async def save_tail(self, symbol: str, interval: str, df: pd.DataFrame) -> str:
+        """Зберігає ``df`` як хвіст історії: старші за нього бари на диску лишаються.
+
+        Для RAM, прогрітого лише хвостом snapshot-а. Продовження персистованого
+        хвоста дописується в сегмент без читання історії; якщо дописати не
+        можна (сегменти вимкнено, змінено вже записаний бар, бекфіл), дисковий
+        префікс дочитується тут, у флуші, і фрейм компактується цілком.
+        """
+        return await self._save(symbol, interval, df, tail_only=True)
+
+    async def _save(
+        self, symbol: str, interval: str, df: pd.DataFrame, *, tail_only: bool
+    ) -> str:
+        if not self.cfg.snapshot_segments or _HAS_PARQUET:
+            if tail_only:
+                df = await self._with_disk_prefix(symbol, interval, df)
+            await self._drop_manifest(symbol, interval)
+            return await self._write_snapshot(symbol, interval, df)
+
+        key = (symbol, interval)
+        lock = self._segment_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            plan = self._plan_segment_append(key, df, tail_only=tail_only)
+            if plan is not None:
+                tail, trim_before = plan
+                return await self._append_segment(
+                    symbol, interval, df, tail, trim_before, tail_only=tail_only
+                )
+            if tail_only:
+                df = await self._with_disk_prefix(symbol, interval, df)
+            # Маніфест — першим: краш посеред компакції лише поверне старі
+            # бари, а не сховає нові.
+            await self._drop_manifest(symbol, interval)
+            path = await self._write_snapshot(symbol, interval, df)
+            await self._drop_segments(symbol, interval)
+            self._remember_segments(key, df)
+            return path
+
+    async def _with_disk_prefix(
+        self, symbol: str, interval: str, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """``df`` разом зі старшими за його перший бар рядками з диска."""
+        first = self._open_time_array(df)
+        if first is None:
+            return df
+        prefix = await self.load_bars(symbol, interval, end_ms=int(first[0]))
+        if prefix is None or prefix.empty:
+            return df
+        return pd.concat([prefix, df], ignore_index=True)
+
+    # ── Append-only сегменти ─────────────────────────────────────────────
+
+    @staticmethod
+    def _row_sig(df: pd.DataFrame, pos: int) -> tuple[str, ...]:
+        return tuple(str(v) for v in df.iloc[pos].tolist())
+
+    @staticmethod
+    def _open_time_array(df: pd.DataFrame) -> np.ndarray | None:
+        if df.empty or "open_time" not in df.columns:
+            return None
+        try:
+            out: np.ndarray = df["open_time"].to_numpy(dtype=np.int64)
+        except (TypeError, ValueError):
+            return None
+        return out
+
+    def _remember_segments(
+        self,
+        key: tuple[str, str],
+        df: pd.DataFrame | None,
+        *,
+        trim_before: int | None = None,
+        active_seq: int = 0,
+        active_rows: int = 0,
+        segment_rows: int = 0,
+        partial: bool = False,
+    ) -> None:
+        """Фіксує, який фрейм зараз персистовано (або скидає стан)."""
+        open_times = None if df is None else self._open_time_array(df)
+        if df is None or open_times is None:
+            self._segments.pop(key, None)
+            return
+        self._segments[key] = _SegmentState(
+            # копія: фрейм може бути view на RAM-буфер
+            open_times=open_times.copy(),
+            last_row_sig=self._row_sig(df, len(df) - 1),
+            trim_before=trim_before,
+            active_seq=active_seq,
+            active_rows=active_rows,
+            segment_rows=segment_rows,
+            partial=partial,
+        )
+
+    def _plan_segment_append(
+        self, key: tuple[str, str], df: pd.DataFrame, *, tail_only: bool = False
+    ) -> tuple[pd.DataFrame, int | None] | None:
+        """(хвіст для дописування, trim_before) або None — потрібна компакція.
+
+        Фрейм має повторювати персистовані open_time, починаючи з будь-якого
+        з них: відкинута голова стає новою межею trim-маніфесту. Для
+        ``tail_only`` голова не обрізається — старші бари лишаються на диску.
+        """
+        state = self._segments.get(key)
+        current = self._open_time_array(df)
+        if state is None or current is None:
+            return None
+        if state.partial and not tail_only:
+            return None
+        persisted = state.open_times
+        start = int(np.searchsorted(persisted, current[0]))
+        kept = len(persisted) - start
+        if kept <= 0 or kept > len(current):
+            return None
+        # Вставка/видалення барів всередині історії → компакція.
+        if not np.array_equal(current[:kept], persisted[start:]):
+            return None
+        # Останній записаний бар міг бути оновлений in-place (is_closed/OHLC) —
+        # тоді дописування хвоста загубило б зміну.
+        if self._row_sig(df, kept - 1) != state.last_row_sig:
+            return None
+        tail = df.iloc[kept:]
+        if state.segment_rows + len(tail) > self.cfg.segment_compact_rows:
+            return None
+        if start > 0 and not tail_only:
+            return tail, int(current[0])
+        return tail, state.trim_before
+
+    async def _append_segment(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        tail: pd.DataFrame,
+        trim_before: int | None,
+        *,
+        tail_only: bool = False,
+    ) -> str:
+        key = (symbol, interval)
+        state = self._segments[key]
+        if tail.empty and trim_before == state.trim_before:
+            return str(self.snapshot_path(symbol, interval))
+        if tail.empty:
+            path = self.manifest_path(symbol, interval)
+        else:
+            if state.active_seq == 0 or state.active_rows >= self.cfg.segment_max_rows:
+                state.active_seq += 1
+                state.active_rows = 0
+            path = self.segment_path(symbol, interval, state.active_seq)
+
+        def _append(p: Path, frame: pd.DataFrame) -> None:
+            payload = frame.to_json(
+                orient="records",
+                lines=True,
+                date_format="iso",
+                date_unit="ms",
+                force_ascii=False,
+                index=False,
+            )
+            if payload and not payload.endswith("\n"):
+                payload += "\n"
+            with p.open("a", encoding="utf-8") as handle:
+                handle.write(payload)
+
+        def _write_manifest(p: Path, value: int) -> None:
+            tmp = p.with_suffix(p.suffix + ".tmp")
+            tmp.write_bytes(json_dumps_bytes({"trim_before": value}))
+            tmp.replace(p)
+
+        loop = asyncio.get_running_loop()
+        try:
+            if trim_before is not None and trim_before != state.trim_before:
+                await loop.run_in_executor(
+                    None,
+                    _write_manifest,
+                    self.manifest_path(symbol, interval),
+                    trim_before,
+                )
+            if not tail.empty:
+                await loop.run_in_executor(None, _append, path, tail)
+        except Exception:
+            # Стан невідомий (можливий частковий запис) → наступний флуш компактує.
+            self._segments.pop(key, None)
+            logger.exception("Segment append failed for %s %s", symbol, interval)
+            raise
+        self._remember_segments(
+            key,
+            df,
+            trim_before=trim_before,
+            active_seq=state.active_seq,
+            active_rows=state.active_rows + len(tail),
+            segment_rows=state.segment_rows + len(tail),
+            partial=state.partial or tail_only,
+        )
+        return str(path)
+
+    async def _drop_manifest(self, symbol: str, interval: str) -> None:
+        path = self.manifest_path(symbol, interval)
+        if not path.exists():
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(path.unlink, missing_ok=True))
+
+    async def _drop_segments(self, symbol: str, interval: str) -> None:
+        paths = self.segment_paths(symbol, interval)
+        if not paths:
+            return
+
+        def _unlink_all(items: list[Path]) -> None:
+            for p in items:
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _unlink_all, paths)
+
+    @staticmethod
+    def _read_jsonl_tail(path: Path, rows: int) -> pd.DataFrame:
+        """Останні ``rows`` записів JSONL: скан блоками з кінця файла.
+
+        Парсинг той самий, що й для повного файла (``pd.read_json``), тож
+        типи колонок збігаються з повним читанням.
+        """
+        block = 64 * 1024
+        chunks: list[bytes] = []
+        newlines = 0
+        with path.open("rb") as handle:
+            pos = handle.seek(0, os.SEEK_END)
+            while pos > 0 and newlines <= rows:
+                step = min(block, pos)
+                pos -= step
+                handle.seek(pos)
+                chunk = handle.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+        lines = b"".join(reversed(chunks)).split(b"\n")
+        if pos > 0:
+            lines = lines[1:]  # перший рядок блоку може бути обрізаним
+        lines = [line for line in lines if line.strip()][-rows:] if rows > 0 else []
+        if not lines:
+            return pd.DataFrame()
+        return pd.read_json(io.BytesIO(b"\n".join(lines)), orient="records", lines=True)
+
+    @staticmethod
+    def _read_segments(paths: list[Path]) -> tuple[pd.DataFrame | None, int]:
+        """Читає сегменти (толерантно до обірваного останнього рядка).
+
+        Повертає (фрейм, кількість рядків в останньому сегменті).
+        """
+        records: list[Any] = []
+        last_rows = 0
+        for path in paths:
+            last_rows = 0
+            try:
+                with path.open("r", encoding="utf-8") as handle:
+                    for raw in handle:
+                        line = raw.strip()
+                        if not line:
+                            continue
+                        try:
+                            records.append(json_loads(line))
+                        except ValueError:
+                            # обірваний append (краш посеред запису) — пропускаємо
+                            continue
+                        last_rows += 1
+            except FileNotFoundError:
+                continue
+        if not records:
+            return None, last_rows
+        return pd.DataFrame.from_records(records), last_rows
+
+    async def _write_snapshot(
+        self, symbol: str, interval: str, df: pd.DataFrame, *, fmt: str | None = None
+    ) -> str:
+        """Атомарно перезаписує base snapshot повним фреймом."""
         context = f"bars_{interval}"
         # Використовуємо pathlib для побудови шляху + атомічний запис
         from pathlib import Path
 
-        path = Path(self.base_dir) / file_name(
-            symbol, context, "snapshot", ("parquet" if _HAS_PARQUET else "jsonl")
-        )
+        ext = self._snapshot_ext(fmt)
+        path = Path(self.base_dir) / file_name(symbol, context, "snapshot", ext)
         path.parent.mkdir(parents=True, exist_ok=True)
 
         loop = asyncio.get_running_loop()
@@ -573,8 +1456,23 @@ class StorageAdapter:
         try:
             if _HAS_PARQUET:
                 await loop.run_in_executor(None, _write_parquet, path, df)
+            elif ext == COLUMNAR_EXT:
+                try:
+                    await loop.run_in_executor(None, write_columnar, path, df)
+                except UnsupportedFrameError as exc:
+                    # Нечислові колонки — лишаємось на JSONL (його читає load_bars).
+                    logger.debug(
+                        "Columnar snapshot недоступний для %s %s: %s",
+                        symbol,
+                        interval,
+                        exc,
+                    )
+                    path = path.with_suffix(".jsonl")
+                    await loop.run_in_executor(None, _write_jsonl, path, df)
             else:
                 await loop.run_in_executor(None, _write_jsonl, path, df)
+            if path.suffix == ".jsonl" and self.cfg.snapshot_index_step > 0:
+                await loop.run_in_executor(None, self._write_index, path)
             return str(path)
         except Exception:
             # pragma: no cover
@@ -582,18 +1480,37 @@ class StorageAdapter:
             logger.exception("Disk flush failed for %s %s", symbol, interval)
             raise
 
-    async def load_bars(self, symbol: str, interval: str) -> pd.DataFrame | None:
-        """Завантажує історію барів, якщо файл існує."""
-        context = f"bars_{interval}"
-        base_dir = str(self.base_dir)
-        parquet = os.path.join(
-            base_dir, file_name(symbol, context, "snapshot", "parquet")
-        )
-        jsonl = os.path.join(base_dir, file_name(symbol, context, "snapshot", "jsonl"))
-        legacy_json = os.path.join(
-            base_dir, file_name(symbol, context, "snapshot", "json")
-        )
+    def _write_index(self, path: Path) -> None:
+        """Sidecar-індекс щойно записаного jsonl; збій не валить флуш."""
+        try:
+            write_index(path, self.cfg.snapshot_index_step)
+        except Exception as exc:
+            # Індекс перебудується ліниво при першому читанні діапазону.
+            logger.debug("Snapshot index write failed for %s: %s", path, exc)
+
+    async def load_bars(
+        self,
+        symbol: str,
+        interval: str,
+        *,
+        tail: int | None = None,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> pd.DataFrame | None:
+        """Завантажує історію барів, якщо файл існує.
+
+        ``start_ms``/``end_ms`` обмежують результат діапазоном
+        ``start_ms <= open_time < end_ms``: jsonl читається seek-ом за
+        sidecar offset-індексом (``data.snapshot_index``), решта форматів —
+        повністю з фільтрацією. ``tail`` лишає останні рядки (діапазону):
+        columnar читає лише хвіст memmap, jsonl — скан рядків з кінця файла;
+        якщо сегменти вже покривають потрібне, base snapshot не читається.
+        """
+        base_path = self.base_snapshot(symbol, interval)
         loop = asyncio.get_running_loop()
+        ranged = start_ms is not None or end_ms is not None
+        # Хвіст файла = хвіст діапазону лише без верхньої межі.
+        file_tail = tail if end_ms is None else None
 
         def _postfix_df(df: pd.DataFrame) -> pd.DataFrame:
             """Мінімальний guard для старих снапшотів часу.
@@ -657,76 +1574,308 @@ class StorageAdapter:
                 return df
             return df
 
-        if _HAS_PARQUET and os.path.exists(parquet):
-            df = await loop.run_in_executor(None, pd.read_parquet, parquet)
-            return _postfix_df(df)
-        # Спочатку читаємо новий jsonl формат
-        if os.path.exists(jsonl):
-            df = await loop.run_in_executor(
-                None, lambda: pd.read_json(jsonl, orient="records", lines=True)
+        def _postfix_columnar(df: pd.DataFrame) -> pd.DataFrame:
+            """Той самий guard для columnar без копій, якщо час уже в мс.
+
+            Snapshot пишеться з RAM-фрейму (відсортований, мс), тож достатньо
+            перевірити краї й відрізати вікно бінарним пошуком (view, не copy).
+            """
+            if df.empty or "open_time" not in df.columns:
+                return df
+            ot = df["open_time"].to_numpy()
+            ms_range = ot.dtype.kind == "i" and 1e11 <= ot[0] and ot[-1] < 1e14
+            if not ms_range or (len(ot) > 1 and bool((ot[1:] < ot[:-1]).any())):
+                return _postfix_df(df.copy())
+            now_ms = int(time.time() * 1000)
+            lo = int(np.searchsorted(ot, now_ms - int(400 * 24 * 3600 * 1000)))
+            hi = int(np.searchsorted(ot, now_ms + int(12 * 3600 * 1000), "right"))
+            if lo >= hi or (lo == 0 and hi == len(ot)):
+                return df
+            return df.iloc[lo:hi].reset_index(drop=True)
+
+        def _in_range(df: pd.DataFrame) -> pd.DataFrame:
+            if not ranged or df.empty or "open_time" not in df.columns:
+                return df
+            ot = pd.to_numeric(df["open_time"], errors="coerce")
+            mask = ot.notna()
+            if start_ms is not None:
+                mask &= ot >= start_ms
+            if end_ms is not None:
+                mask &= ot < end_ms
+            if bool(mask.all()):
+                return df
+            return df[mask.to_numpy()].reset_index(drop=True)
+
+        # Голова, обрізана без компакції (див. save_bars), — не частина історії.
+        trim_before = self._read_trim(symbol, interval)
+
+        def _trimmed(df: pd.DataFrame) -> pd.DataFrame:
+            if trim_before is None or df.empty or "open_time" not in df.columns:
+                return df
+            keep = pd.to_numeric(df["open_time"], errors="coerce") >= trim_before
+            if bool(keep.all()):
+                return df
+            return df[keep.to_numpy()].reset_index(drop=True)
+
+        segments = self.segment_paths(symbol, interval)
+        seg_df: pd.DataFrame | None = None
+        last_rows = 0
+        if segments:
+            seg_df, last_rows = await loop.run_in_executor(
+                None, self._read_segments, segments
             )
-            return _postfix_df(df)
-        # Fallback на старий json (без lines)
-        if os.path.exists(legacy_json):
-            df = await loop.run_in_executor(None, pd.read_json, legacy_json)
-            return _postfix_df(df)
-        return None
+            if seg_df is not None and not seg_df.empty:
+                # сегменти — сирі int; нормалізуємо, щоб concat не змішав типи
+                seg_df = _trimmed(_postfix_df(seg_df))
+        if seg_df is not None and not seg_df.empty:
+            # Сегменти — строго новіші за base бари: base не потрібен, якщо
+            # хвіст цілком у сегментах або діапазон починається в них.
+            if tail is not None and len(_in_range(seg_df)) >= tail:
+                base_path = None
+            elif start_ms is not None and "open_time" in seg_df.columns:
+                first_seg = pd.to_numeric(seg_df["open_time"], errors="coerce").min()
+                if pd.notna(first_seg) and first_seg <= start_ms:
+                    base_path = None
+
+        base: pd.DataFrame | None = None
+        if base_path is not None:
+            suffix = base_path.suffix
+            if suffix == ".parquet":
+                base = await loop.run_in_executor(None, pd.read_parquet, base_path)
+            elif suffix == f".{COLUMNAR_EXT}":
+                raw = await loop.run_in_executor(
+                    None, lambda: read_columnar(base_path, tail=file_tail)
+                )
+                base = _postfix_columnar(raw)
+            # Текстовий jsonl формат (імпорт/експорт)
+            elif suffix == ".jsonl":
+                step = self.cfg.snapshot_index_step
+                if ranged and step > 0:
+                    base = await loop.run_in_executor(
+                        None,
+                        lambda: read_jsonl_range(
+                            base_path,
+                            step,
+                            start_ms=start_ms,
+                            end_ms=end_ms,
+                            tail=tail,
+                        ),
+                    )
+                if base is None and file_tail is not None:
+                    base = await loop.run_in_executor(
+                        None, self._read_jsonl_tail, base_path, file_tail
+                    )
+                elif base is None:
+                    # немає індексу (вимкнено/непридатний) — повне читання
+                    base = await loop.run_in_executor(
+                        None,
+                        lambda: pd.read_json(base_path, orient="records", lines=True),
+                    )
+                base = _postfix_df(base)
+            # Fallback на старий json (без lines)
+            else:
+                base = await loop.run_in_executor(None, pd.read_json, base_path)
+                base = _postfix_df(base)
+            base = _trimmed(base)
+
+        if not segments:
+            if base is None:
+                return None
+            if ranged:
+                base = _in_range(base)
+            if tail is not None:
+                out = base.tail(tail).reset_index(drop=True)
+                if not ranged:
+                    self._remember_tail((symbol, interval), out, trim_before)
+                return out
+            if self.cfg.snapshot_segments and not ranged:
+                self._remember_segments(
+                    (symbol, interval), base, trim_before=trim_before
+                )
+            return base
+
+        # pd.read_json конвертує *_time у datetime, сегменти — сирі int;
+        # кожна частина нормалізована окремо, щоб concat не змішав типи.
+        frames = [f for f in (base, seg_df) if f is not None and not f.empty]
+        if not frames:
+            return base
+        merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if "open_time" in merged.columns:
+            # сегмент новіший за base → при дублі open_time перемагає сегмент
+            merged = merged.drop_duplicates(subset=["open_time"], keep="last")
+            merged = merged.sort_values("open_time", kind="stable")
+        out = merged.reset_index(drop=True)
+        # Після рестарту продовжуємо дописувати в той самий активний сегмент.
+        seq_raw = segments[-1].stem.rsplit("_", 1)[-1]
+        active_seq = int(seq_raw) if seq_raw.isdigit() else len(segments)
+        segment_rows = 0 if seg_df is None else len(seg_df)
+        if tail is not None or ranged:
+            # Частковий фрейм годиться лише як хвостовий стан (для save_tail).
+            out = _in_range(out)
+            if tail is None:
+                return out
+            out = out.tail(tail).reset_index(drop=True)
+            if not ranged:
+                self._remember_tail(
+                    (symbol, interval),
+                    out,
+                    trim_before,
+                    active_seq=active_seq,
+                    active_rows=last_rows,
+                    segment_rows=segment_rows,
+                )
+            return out
+        if self.cfg.snapshot_segments and seg_df is not None:
+            self._remember_segments(
+                (symbol, interval),
+                out,
+                trim_before=trim_before,
+                active_seq=active_seq,
+                active_rows=last_rows,
+                segment_rows=segment_rows,
+            )
+        return out
+
+    def _remember_tail(
+        self,
+        key: tuple[str, str],
+        df: pd.DataFrame,
+        trim_before: int | None,
+        *,
+        active_seq: int = 0,
+        active_rows: int = 0,
+        segment_rows: int = 0,
+    ) -> None:
+        """Хвостовий (partial) стан після tail-читання, якщо стану ще нема.
+
+        Наявний стан точніший (його веде сам ``save_bars``) — не перетираємо.
+        """
+        if not self.cfg.snapshot_segments or key in self._segments or df.empty:
+            return
+        self._remember_segments(
+            key,
+            df,
+            trim_before=trim_before,
+            active_seq=active_seq,
+            active_rows=active_rows,
+            segment_rows=segment_rows,
+            partial=True,
+        )
+
+    async def convert_snapshot(
+        self, symbol: str, interval: str, *, fmt: str = "columnar"
+    ) -> str | None:
+        """Переписує base snapshot (разом із сегментами) у формат ``fmt``.
+
+        Для одноразової міграції наявних JSONL; вихідний файл не видаляється.
+        """
+        df = await self.load_bars(symbol, interval)
+        if df is None or df.empty:
+            return None
+        key = (symbol, interval)
+        lock = self._segment_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            await self._drop_manifest(symbol, interval)
+            path = await self._write_snapshot(symbol, interval, df, fmt=fmt)
+            await self._drop_segments(symbol, interval)
+            self._remember_segments(key, df)
+        return path
 
     async def inspect_snapshot(
         self, symbol: str, interval: str
     ) -> SnapshotStats | None:
-        """Повертає кількість рядків і останній open_time без повного warmup."""
+        """Повертає кількість рядків і останній open_time без повного warmup.
 
-        candidates: list[Path] = []
-        if _HAS_PARQUET:
-            candidates.append(self.snapshot_path(symbol, interval, ext="parquet"))
-        candidates.append(self.snapshot_path(symbol, interval, ext="jsonl"))
-        candidates.append(self.snapshot_path(symbol, interval, ext="json"))
-
-        target: Path | None = None
-        for path in candidates:
-            if path.exists():
-                target = path
-                break
-        if target is None:
+        Як і ``load_bars``, не рахує голову, обрізану trim-маніфестом.
+        """
+
+        target = self.base_snapshot(symbol, interval)
+        segments = self.segment_paths(symbol, interval)
+        if target is None and not segments:
             return None
 
         loop = asyncio.get_running_loop()
+        trim_before = self._read_trim(symbol, interval)
+        # _normalize_epoch повертає секунди; маніфест зберігає мс.
+        cutoff = None if trim_before is None else trim_before / 1000.0
+
+        def _trimmed_head(value: Any) -> bool:
+            if cutoff is None:
+                return False
+            epoch = _normalize_epoch(value)
+            return epoch is not None and epoch < cutoff
 
         def _inspect(path: Path) -> SnapshotStats:
             rows = 0
             last_open: float | None = None
             if path.suffix == ".jsonl":
                 last_line: str | None = None
+                # Обрізана голова — на початку файла: парсимо рядки лише до
+                # першого бару за межею, далі тільки рахуємо.
+                in_head = cutoff is not None
                 with path.open("r", encoding="utf-8") as handle:
                     for raw in handle:
                         line = raw.strip()
                         if not line:
                             continue
+                        if in_head:
+                            try:
+                                head_open = json_loads(line).get("open_time")
+                            except Exception:
+                                head_open = None
+                            if _trimmed_head(head_open):
+                                continue
+                            in_head = False
                         rows += 1
                         last_line = line
                 if last_line:
                     try:
                         payload = json_loads(last_line)
-                        last_open = _normalize_epoch(payload.get("open_time"))  # type: ignore[arg-type]
+                        last_open = _normalize_epoch(payload.get("open_time"))
                     except Exception:
                         last_open = None
             elif path.suffix == ".json":
                 try:
                     payload = json_loads(path.read_text(encoding="utf-8"))
                     if isinstance(payload, list):
-                        rows = len(payload)
+                        kept = [
+                            row
+                            for row in payload
+                            if not _trimmed_head(row.get("open_time"))
+                        ]
+                        rows = len(kept)
                         if rows:
-                            last_open = _normalize_epoch(payload[-1].get("open_time"))
+                            last_open = _normalize_epoch(kept[-1].get("open_time"))
                     elif isinstance(payload, dict):
-                        rows = 1
-                        last_open = _normalize_epoch(payload.get("open_time"))
+                        if not _trimmed_head(payload.get("open_time")):
+                            rows = 1
+                            last_open = _normalize_epoch(payload.get("open_time"))
+                except Exception:
+                    rows = 0
+                    last_open = None
+            elif path.suffix == f".{COLUMNAR_EXT}":
+                try:
+                    rows = read_header(path).rows
+                    last_open = _normalize_epoch(last_value(path, "open_time"))
+                    if trim_before is not None and rows:
+                        # base пишеться з відсортованого RAM-фрейму в мс:
+                        # межа — бінарний пошук по memmap колонки open_time.
+                        open_times = read_columnar(path)["open_time"].to_numpy()
+                        rows -= int(np.searchsorted(open_times, trim_before))
+                        if rows == 0:
+                            last_open = None
                 except Exception:
                     rows = 0
                     last_open = None
             elif path.suffix == ".parquet":
                 try:
                     df = pd.read_parquet(path)
+                    if trim_before is not None and "open_time" in df.columns:
+                        keep = (
+                            pd.to_numeric(df["open_time"], errors="coerce")
+                            >= trim_before
+                        )
+                        df = df[keep.to_numpy()]
                     rows = len(df)
                     if rows and "open_time" in df.columns:
                         last_open = _normalize_epoch(df.iloc[-1]["open_time"])
@@ -741,7 +1890,25 @@ class StorageAdapter:
                 modified_ts=stat.st_mtime,
             )
 
-        return await loop.run_in_executor(None, _inspect, target)
+        def _inspect_all(base: Path | None, segs: list[Path]) -> SnapshotStats:
+            stats = _inspect(base) if base is not None else None
+            for seg in segs:
+                seg_stats = _inspect(seg)
+                if stats is None:
+                    stats = seg_stats
+                    continue
+                # сегменти містять лише бари, новіші за base → рядки сумуються
+                # (обрізану голову вже відкинуто в кожній частині)
+                stats.rows += seg_stats.rows
+                if seg_stats.last_open_time is not None:
+                    stats.last_open_time = seg_stats.last_open_time
+                stats.modified_ts = max(
+                    stats.modified_ts or 0.0, seg_stats.modified_ts or 0.0
+                )
+            assert stats is not None
+            return stats
+
+        return await loop.run_in_executor(None, _inspect_all, target, segments)
 
 
 # ── Unified DataStore ──
@@ -766,20 +1933,65 @@ class UnifiedDataStore:
 
     # Публічні поля-атрибути з анотаціями типів
     _flush_q: deque[tuple[str, str]]
-    _flush_pending: dict[tuple[str, str], pd.DataFrame]
+    _flush_pending: dict[tuple[str, str], pd.DataFrame | BarRingBuffer]
     _maint_task: asyncio.Task[Any] | None
 
     def __init__(self, *, redis: Redis[Any], cfg: StoreConfig | None = None) -> None:
         self.cfg = cfg or StoreConfig()
-        self.ram = RamLayer(self.cfg.profile)
+        self.metrics = Metrics()
+        self.ram = RamLayer(
+            self.cfg.profile,
+            ring_buffer=self.cfg.ram_ring_buffer,
+            metrics=self.metrics,
+        )
         self.redis = RedisAdapter(redis, self.cfg)
         self.disk = StorageAdapter(self.cfg.base_dir, self.cfg)
-        self.metrics = Metrics()
+        self._redis_wb = RedisLastBarWriter(self.redis, self.metrics, self.cfg)
 
         # write-behind черга для диска
         self._flush_q = deque()
         self._flush_pending = {}
         self._flush_batch_limit = self.cfg.profile.flush_batch_max
+        # backpressure: час першої постановки ключа в чергу + поточний флуш
+        self._flush_enqueued_at: dict[tuple[str, str], float] = {}
+        self._flush_inflight_since: float | None = None
+        self._bp_level = Backpressure.NORMAL
+        self._bp_since = time.time()
+        self._bp_transitions: dict[str, int] = {
+            Backpressure.SOFT: 0,
+            Backpressure.HARD: 0,
+        }
+        self._wal: BarWal | None = None
+        if self.cfg.wal and self.cfg.write_behind:
+            self._wal = BarWal(
+                Path(self.cfg.base_dir) / self.cfg.wal_dir,
+                fsync=self.cfg.wal_fsync,
+                file_max_bytes=self.cfg.wal_file_max_bytes,
+            )
+        # Group commit WAL (wal_fsync): один fsync у executor-і на всіх, хто
+        # дописав до його старту.
+        self._wal_sync_task: asyncio.Future[None] | None = None
+        # Ключі, чий RAM прогріто лише хвостом диска: флуш пише їх через
+        # save_tail (дописує новіші за диск бари), щоб не обрізати історію.
+        self._ram_tail_only: set[tuple[str, str]] = set()
+        self._warmup_stats: dict[str, Any] = {
+            "runs": 0,
+            "keys": 0,
+            "loaded": 0,
+            "failed": 0,
+            "rows": 0,
+            "last_ms": 0.0,
+            "total_ms": 0.0,
+            "max_key_ms": 0.0,
+            "slowest": None,
+            "per_key_ms": {},
+        }
+        self._wal_replay: dict[str, float] = {
+            "ms": 0.0,
+            "records": 0,
+            "keys": 0,
+            "rows": 0,
+        }
         self._ram_hits = 0
         self._ram_miss = 0
         self._redis_hits = 0
@@ -796,7 +2008,33 @@ class UnifiedDataStore:
             else 0.0
         )
 
-        self._mtx = asyncio.Lock()
+        # Страйпи замість глобального локу: повільний Redis для одного ключа
+        # не серіалізує інжест інших (symbol, interval).
+        self._lock_stripes = [
+            asyncio.Lock() for _ in range(max(1, self.cfg.lock_stripes))
+        ]
+        self._lock_waits: dict[tuple[str, str], _LockWaitStats] = {}
+        # read-through промахи: single-flight + негативний кеш
+        self._inflight: dict[tuple[str, str], asyncio.Future[pd.DataFrame]] = {}
+        self._negative: dict[tuple[str, str], float] = {}
+        self._miss_loads = 0
+        self._series_meta: dict[tuple[str, str], SeriesMeta] = {}
+        self._put_many_stats: dict[str, float] = {
+            "calls": 0,
+            "items": 0,
+            "keys": 0,
+            "rows": 0,
+            "last_ms": 0.0,
+            "max_ms": 0.0,
+            "last_rows_per_sec": 0.0,
+            "max_rows_per_sec": 0.0,
+        }
+        self.market_hours = MarketHours.from_name(
+            self.cfg.gap_market_hours, daily_breaks=self.cfg.gap_daily_breaks_utc
+        )
+        self._gaps = GapIndex(self.market_hours)
+        self._miss_coalesced = 0
+        self._negative_hits = 0
         self._maint_task = None
 
     # ── Публічний API ───────────────────────────────────────────────────────
@@ -805,6 +2043,8 @@ class UnifiedDataStore:
         """Запустити фонову задачку обслуговування."""
         if not self._maint_task:
             self._maint_task = asyncio.create_task(self._maintenance_loop())
+        if self.cfg.redis_write_behind:
+            await self._redis_wb.start()
 
     async def stop_maintenance(self) -> None:
         if self._maint_task:
@@ -814,11 +2054,91 @@ class UnifiedDataStore:
             except asyncio.CancelledError:
                 pass
             self._maint_task = None
+        await self._redis_wb.stop()
+        if self._wal is not None:
+            self._wal.close()
+
+    async def _publish_last_bar(
+        self,
+        symbol: str,
+        interval: str,
+        last_bar: dict[str, Any],
+        *,
+        defer: bool = False,
+    ) -> None:
+        """Останній бар у Redis: через write-behind, якщо він запущений.
+
+        Якщо ключ уже чекає в черзі writer-а (``defer`` від ``put_bars_many``),
+        нове значення теж іде в чергу, щоб старіше не перетерло його.
+        """
+        ttl = self.cfg.intervals_ttl.get(interval, self.cfg.profile.warm_ttl_sec)
+        if defer or self._redis_wb.running:
+            self._redis_wb.enqueue(symbol, interval, last_bar, ttl)
+            return
+        if self._redis_wb.pending_value(symbol, interval) is not None:
+            self._redis_wb.enqueue(symbol, interval, last_bar, ttl)
+            await self._redis_wb.flush()
+            return
+        await self.redis.jset("candles", symbol, interval, value=last_bar, ttl=ttl)
 
     def set_priority(self, symbol: str, level: int) -> None:
         """Встановити пріоритет для активу (впливає на евікшен)."""
         self.ram.set_priority(symbol, level)
 
+    # ── Локи по ключах ──────────────────────────────────────────────────────
+
+    def _key_lock(self, symbol: str, interval: str) -> asyncio.Lock:
+        # crc32 замість hash(): стабільний між процесами → відтворювана контенція
+        idx = zlib.crc32(f"{symbol}:{interval}".encode()) % len(self._lock_stripes)
+        return self._lock_stripes[idx]
+
+    @asynccontextmanager
+    async def _locked(self, symbol: str, interval: str) -> AsyncIterator[None]:
+        """Серіалізує read-modify-write одного ключа (merge + Redis jset).
+
+        Операції ``RamLayer`` синхронні, тож квоти/евікшн між ключами
+        лишаються атомарними в межах event loop без спільного локу.
+        """
+        lock = self._key_lock(symbol, interval)
+        contended = lock.locked()
+        t0 = time.perf_counter()
+        async with lock:
+            waited = time.perf_counter() - t0
+            stats = self._lock_waits.get((symbol, interval))
+            if stats is None:
+                stats = self._lock_waits[(symbol, interval)] = _LockWaitStats()
+            stats.acquires += 1
+            stats.total_s += waited
+            if contended:
+                stats.contended += 1
+                stats.max_s = max(stats.max_s, waited)
+                self.metrics.lock_wait.observe(waited)
+            yield
+
+    def lock_wait_snapshot(self) -> dict[str, Any]:
+        """Зріз очікування локів: сумарно і по ключах ``symbol:interval``."""
+        keys: dict[str, dict[str, Any]] = {}
+        total_s = 0.0
+        max_s = 0.0
+        contended = 0
+        for (symbol, interval), st in self._lock_waits.items():
+            total_s += st.total_s
+            max_s = max(max_s, st.max_s)
+            contended += st.contended
+            keys[f"{symbol}:{interval}"] = {
+                "acquires": st.acquires,
+                "contended": st.contended,
+                "wait_total_ms": round(st.total_s * 1000.0, 3),
+                "wait_max_ms": round(st.max_s * 1000.0, 3),
+            }
+        return {
+            "stripes": len(self._lock_stripes),
+            "contended": contended,
+            "wait_total_ms": round(total_s * 1000.0, 3),
+            "wait_max_ms": round(max_s * 1000.0, 3),
+            "keys": keys,
+        }
+
     # ── Symbol selection helpers (prefilter integration) ────────────────────
 
     async def set_fast_symbols(self, symbols: list[str], ttl: int = 600) -> None:
@@ -1000,9 +2320,9 @@ class UnifiedDataStore:
 
         self._ram_miss += 1
 
-        # 2) Redis
-        last = await self.redis.jget("candles", symbol, interval, default=None)
-        if isinstance(last, dict):
+        # 2) Redis (або ще не скинутий write-behind)
+        last = await self._last_bar_payload(symbol, interval)
+        if last is not None:
             self._redis_hits += 1
             self.metrics.get_latency.labels(layer="redis").observe(
                 time.perf_counter() - t0
@@ -1117,9 +2437,180 @@ class UnifiedDataStore:
             return df.tail(limit) if limit else df
 
         self._ram_miss += 1
+        key = (symbol, interval)
 
-        # 2) Redis (останній бар) — як доповнення
+        # Негативний кеш: ні Redis, ні диск нічого не мали зовсім недавно.
+        expires = self._negative.get(key)
+        if expires is not None:
+            if time.monotonic() < expires:
+                self._negative_hits += 1
+                return pd.DataFrame(columns=list(MIN_COLUMNS))
+            self._negative.pop(key, None)
+
+        # Single-flight: паралельні промахи по ключу чекають одне завантаження.
+        task = self._inflight.get(key)
+        if task is not None:
+            self._miss_coalesced += 1
+            out = await asyncio.shield(task)
+        else:
+            self._miss_loads += 1
+            task = asyncio.ensure_future(self._read_through(symbol, interval))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._finish_read, key))
+            out = await asyncio.shield(task)
+
+        self.metrics.get_latency.labels(layer="disk").observe(time.perf_counter() - t0)
+        return out.tail(limit) if limit else out
+
+    async def get_range(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        *,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """Бари з ``start_ms <= open_time < end_ms`` (межа None — відкрита).
+
+        RAM-частина вирізається бінарним пошуком по відсортованому
+        ``open_time`` (``iloc``-зріз без копіювання буфера); старіші за RAM
+        бари дочитуються з диска range-читанням (``StorageAdapter.load_bars``).
+        ``limit`` лишає останні N барів діапазону — диск тоді читається лише
+        на нестачу. Промах RAM не наповнює RAM (на відміну від ``get_df``).
+        """
+        t0 = time.perf_counter()
+        ram_df = self.ram.get(symbol, interval)
+        ram_part: pd.DataFrame | None = None
+        disk_end = end_ms
+        disk_needed = True
+        if ram_df is not None and len(ram_df):
+            ot = self._sorted_open_times(ram_df)
+            if ot is not None:
+                lo = 0 if start_ms is None else int(np.searchsorted(ot, start_ms))
+                hi = len(ot) if end_ms is None else int(np.searchsorted(ot, end_ms))
+                ram_part = ram_df.iloc[lo : max(lo, hi)]
+                if limit and len(ram_part) > limit:
+                    ram_part = ram_part.iloc[len(ram_part) - limit :]
+                # RAM тримає все, починаючи з ram_first: з диска — лише старіше
+                ram_first = int(ot[0])
+                if start_ms is not None and start_ms >= ram_first:
+                    disk_needed = False
+                elif end_ms is None or end_ms > ram_first:
+                    disk_end = ram_first
+            else:
+                # Невідсортований/нечисловий open_time — фільтр без пошуку.
+                ram_part = self._filter_range(ram_df, start_ms, end_ms, limit)
+                disk_needed = False
+        if ram_part is not None:
+            self._ram_hits += 1
+        else:
+            self._ram_miss += 1
+
+        need = limit
+        if limit is not None and ram_part is not None:
+            need = limit - len(ram_part)
+            disk_needed = disk_needed and need > 0
+        disk_part: pd.DataFrame | None = None
+        if disk_needed:
+            disk_part = await self.disk.load_bars(
+                symbol, interval, start_ms=start_ms, end_ms=disk_end, tail=need
+            )
+            if ram_part is None and end_ms is None:
+                # Без RAM останній бар може жити лише в Redis (write-behind).
+                disk_part = await self._with_redis_last(
+                    symbol, interval, disk_part, start_ms, limit
+                )
+            if disk_part is not None and not disk_part.empty:
+                if self.cfg.validate_on_read:
+                    self._validate_bars(disk_part, stage="range_read")
+
+        layer = "disk" if disk_part is not None else "ram"
+        self.metrics.get_latency.labels(layer=layer).observe(time.perf_counter() - t0)
+        parts = [f for f in (disk_part, ram_part) if f is not None and len(f)]
+        if not parts:
+            if ram_part is not None:
+                return ram_part
+            return pd.DataFrame(columns=list(MIN_COLUMNS))
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def _sorted_open_times(df: pd.DataFrame) -> np.ndarray | None:
+        """``open_time`` RAM-запису як int-масив без копії (None — не int).
+
+        Сортування — інваріант RAM (``_dedup_sort`` / ``BarRingBuffer``),
+        тож тут не перевіряється: це зробило б пошук O(n).
+        """
+        if "open_time" not in df.columns:
+            return None
+        ot = df["open_time"].to_numpy()
+        return ot if ot.dtype.kind in "iu" else None
+
+    @staticmethod
+    def _filter_range(
+        df: pd.DataFrame,
+        start_ms: int | None,
+        end_ms: int | None,
+        limit: int | None,
+    ) -> pd.DataFrame:
+        if "open_time" not in df.columns:
+            return df.iloc[0:0]
+        ot = pd.to_numeric(df["open_time"], errors="coerce")
+        mask = ot.notna()
+        if start_ms is not None:
+            mask &= ot >= start_ms
+        if end_ms is not None:
+            mask &= ot < end_ms
+        out = df[mask.to_numpy()].sort_values("open_time", kind="stable")
+        out = out.reset_index(drop=True)
+        return out.tail(limit).reset_index(drop=True) if limit else out
+
+    async def _with_redis_last(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame | None,
+        start_ms: int | None,
+        limit: int | None,
+    ) -> pd.DataFrame | None:
+        last = await self._last_bar_payload(symbol, interval)
+        if last is None:
+            return df
+        try:
+            last_ot = int(last["open_time"])
+        except (KeyError, TypeError, ValueError):
+            return df
+        if start_ms is not None and last_ot < start_ms:
+            return df
+        last_df = pd.DataFrame([last])
+        if df is None or df.empty:
+            return last_df
+        out = self._dedup_sort(pd.concat([df, last_df], ignore_index=True))
+        return out.tail(limit).reset_index(drop=True) if limit else out
+
+    async def _last_bar_payload(
+        self, symbol: str, interval: str
+    ) -> dict[str, Any] | None:
+        """Останній бар: ще не скинутий write-behind, інакше ключ у Redis."""
+        pending = self._redis_wb.pending_value(symbol, interval)
+        if pending is not None:
+            return pending
         last = await self.redis.jget("candles", symbol, interval, default=None)
+        return last if isinstance(last, dict) else None
+
+    def _finish_read(self, key: tuple[str, str], task: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Позначаємо виняток як отриманий, якщо всі очікувачі вже скасовані.
+        if not task.cancelled():
+            task.exception()
+
+    async def _read_through(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Промах RAM: Redis last-bar + disk snapshot → RAM (один на ключ)."""
+        # 2) Redis (останній бар) — як доповнення
+        last = await self._last_bar_payload(symbol, interval)
         if last:
             self._redis_hits += 1
             last_df = pd.DataFrame([last])
@@ -1144,64 +2635,142 @@ class UnifiedDataStore:
 
         # кешуємо назад у RAM
         if len(out):
+            if (symbol, interval) not in self._flush_pending:
+                # Хвостовий фрейм у черзі ще має писатися через save_tail.
+                self._ram_tail_only.discard((symbol, interval))
             self.ram.put(symbol, interval, out)
+            self._record_meta(symbol, interval, out)
+            self._observe_gaps(symbol, interval, out)
+        elif self.cfg.negative_cache_ttl_sec > 0:
+            self._negative[(symbol, interval)] = (
+                time.monotonic() + self.cfg.negative_cache_ttl_sec
+            )
 
         self._publish_hit_ratios()
-        self.metrics.get_latency.labels(layer="disk").observe(time.perf_counter() - t0)
-        return out.tail(limit) if limit else out
+        return out
+
+    async def _put_locked(
+        self,
+        symbol: str,
+        interval: str,
+        bars: pd.DataFrame | BarColumns,
+        *,
+        defer_redis: bool = False,
+    ) -> int:
+        """Злиття ``bars`` у RAM + Redis last-bar + write-behind (під локом ключа).
+
+        ``defer_redis`` лише ставить last-bar у чергу writer-а — викликач
+        (``put_bars_many``) скидає всі ключі одним pipeline. Повертає seq
+        запису WAL (0 — без WAL); fsync викликач чекає вже без локу ключа
+        (``_wal_commit``).
+
+        На шляху буфера DataFrame-view не будується: Redis бере ``last_row()``,
+        метадані — скаляри буфера, а write-behind отримує сам буфер і робить
+        view лише під час флушу (інакше кожен upsert копіював би масиви).
+        """
+        self._negative.pop((symbol, interval), None)
+        wal_seq = 0
+        if self._wal is not None:
+            # WAL першим: якщо дельту не записано, put_bars падає до змін у RAM
+            wal_seq = self._wal.append_bars(symbol, interval, bars)
+        # 1) змерджити з RAM: append/upsert у буфері на місці, інакше — повний merge
+        buf = self.ram.get_buffer(symbol, interval)
+        merged: pd.DataFrame | BarRingBuffer
+        if buf is not None and (
+            buf.try_merge(bars)
+            if isinstance(bars, pd.DataFrame)
+            else buf.try_merge_arrays(bars)
+        ):
+            self.ram.touch(symbol, interval)
+            merged = buf
+        else:
+            current = self.ram.get(symbol, interval)
+            merged = self._merge_bars(current, _bars_frame(bars))
+            self.ram.put(symbol, interval, merged)
+
+        # 2) останній бар у Redis (write-behind: put_bars не чекає round-trip)
+        if len(merged):
+            last_bar = (
+                merged.last_row()
+                if isinstance(merged, BarRingBuffer)
+                else merged.iloc[-1].to_dict()
+            )
+            await self._publish_last_bar(symbol, interval, last_bar, defer=defer_redis)
+        else:
+            logger.warning(
+                "[put_bars] Мerged порожній після злиття: %s %s", symbol, interval
+            )
+        self._record_meta(symbol, interval, merged, put=True)
+        self._observe_gaps(symbol, interval, bars)
+
+        # 3) write-behind на диск
+        if self.cfg.write_behind:
+            key = (symbol, interval)
+            if key in self._flush_pending:
+                logger.debug(
+                    "[put_bars] Коалесовано snapshot у черзі: %s %s",
+                    symbol,
+                    interval,
+                )
+            self._enqueue_flush(key, merged)
+        else:
+            await self._save_snapshot(symbol, interval, merged)
+        return wal_seq
+
+    async def _wal_commit(self, seq: int) -> None:
+        """Чекає fsync WAL до ``seq`` (лише з ``wal_fsync``), не блокуючи loop.
+
+        Group commit: ``os.fsync`` іде в executor-і й покриває всі записи,
+        дописані до його старту; ті, що дописалися під час синку, чекають
+        наступного. Помилка fsync піднімається з ``put_bars``.
+        """
+        wal = self._wal
+        if wal is None or not wal.fsync or seq <= 0:
+            return
+        while wal.synced_seq < seq:
+            task = self._wal_sync_task
+            if task is None or task.done():
+                task = self._wal_sync_task = asyncio.ensure_future(self._wal_sync())
+            await asyncio.shield(task)
+
+    async def _wal_sync(self) -> None:
+        wal = self._wal
+        handle = wal.sync_handle() if wal is not None else None
+        if wal is None or handle is None:
+            return
+        seq, fd = handle
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, os.fsync, fd)
+        finally:
+            os.close(fd)
+        wal.mark_synced(seq)
 
-    async def put_bars(self, symbol: str, interval: str, bars: pd.DataFrame) -> None:
+    async def put_bars(
+        self, symbol: str, interval: str, bars: pd.DataFrame | BarColumns
+    ) -> None:
         """
         Записує нові бари: RAM → Redis (write-through), Disk (write-behind).
 
         Args:
             symbol: Символ.
             interval: Інтервал (напр. "1m").
-            bars: DataFrame барів (OHLCV), можна інкрементальні.
+            bars: DataFrame барів (OHLCV), можна інкрементальні, або
+                ``BarColumns`` (numpy-колонки) — тоді append/upsert у
+                RAM-буфер іде без проміжного DataFrame.
         """
         t0 = time.perf_counter()
 
         # Аудит сирих даних: НЕ нормалізуємо час, передаємо як є
-        if bars is None or bars.empty:
+        if _bars_len(bars) == 0:
             logger.warning("[put_bars] Порожній фрейм: %s %s", symbol, interval)
             return
 
         if self.cfg.validate_on_write:
             self._validate_bars(bars, stage="put_bars")
 
-        async with self._mtx:
-            # 1) змерджити з RAM
-            current = self.ram.get(symbol, interval)
-            merged = self._merge_bars(current, bars)
-            self.ram.put(symbol, interval, merged)
-
-            # 2) останній бар у Redis
-            ttl = self.cfg.intervals_ttl.get(interval, self.cfg.profile.warm_ttl_sec)
-            if len(merged):
-                last_bar = merged.iloc[-1].to_dict()
-                await self.redis.jset(
-                    "candles", symbol, interval, value=last_bar, ttl=ttl
-                )
-            else:
-                logger.warning(
-                    "[put_bars] Мerged порожній після злиття: %s %s", symbol, interval
-                )
-
-            # 3) write-behind на диск
-            if self.cfg.write_behind:
-                key = (symbol, interval)
-                if key in self._flush_pending:
-                    logger.debug(
-                        "[put_bars] Коалесовано snapshot у черзі: %s %s",
-                        symbol,
-                        interval,
-                    )
-                else:
-                    self._flush_q.append(key)
-                self._flush_pending[key] = merged
-                self.metrics.flush_backlog.set(len(self._flush_q))
-            else:
-                await self.disk.save_bars(symbol, interval, merged)
+        async with self._locked(symbol, interval):
+            wal_seq = await self._put_locked(symbol, interval, bars)
+        await self._wal_commit(wal_seq)
 
         self.metrics.put_latency.labels(layer="ram+redis").observe(
             time.perf_counter() - t0
@@ -1213,48 +2782,429 @@ class UnifiedDataStore:
         ):  # broad-except: fast-path оптимізація, fallback до загального merge
             pass
 
+    def get_series_meta(self, symbol: str, interval: str) -> SeriesMeta | None:
+        """Метадані серії за O(1) без DataFrame; None — серія ще не завантажена.
+
+        Оновлюється на кожному put/trim/warmup/read-through. Коли None, викликач
+        має зробити звичайний ``get_df`` (він і заповнить метадані).
+        """
+        return self._series_meta.get((symbol, interval))
+
+    def _record_meta(
+        self,
+        symbol: str,
+        interval: str,
+        frame: pd.DataFrame | BarRingBuffer,
+        *,
+        put: bool = False,
+    ) -> None:
+        key = (symbol, interval)
+        prev = self._series_meta.get(key)
+        if isinstance(frame, BarRingBuffer):
+            # скаляри буфера — без view (див. _put_locked)
+            last = frame.last_row() if len(frame) else {}
+            close = last.get("close")
+            first_open = frame.first_open_time()
+            last_open = frame.last_open_time()
+        else:
+            close = _frame_scalar(frame, "close", -1)
+            first_open = _frame_scalar(frame, "open_time", 0)
+            last_open = _frame_scalar(frame, "open_time", -1)
+        try:
+            last_close = float(close) if close is not None else None
+        except (TypeError, ValueError):
+            last_close = None
+        self._series_meta[key] = SeriesMeta(
+            rows=len(frame),
+            first_open_time=first_open,
+            last_open_time=last_open,
+            last_close=last_close,
+            last_put_ts=time.time() if put else (prev.last_put_ts if prev else None),
+            version=(prev.version + 1) if prev else 1,
+        )
+
+    # ── Індекс пропусків ────────────────────────────────────────────────────
+
+    def _observe_gaps(
+        self, symbol: str, interval: str, frame: pd.DataFrame | BarColumns
+    ) -> None:
+        if not self.cfg.gap_index:
+            return
+        tf_ms = interval_to_ms(interval)
+        times = _open_times_ms(frame)
+        if tf_ms is None or times is None:
+            return
+        self._gaps.observe((symbol, interval), tf_ms, times)
+
+    def get_gaps(
+        self, symbol: str, interval: str, *, since_ms: int | None = None
+    ) -> list[tuple[int, int]]:
+        """Відомі пропуски серії як ``[start_ms, end_ms)`` (слоти сітки TF).
+
+        Індекс будується з барів, що пройшли через сховище (put/warmup/
+        read-through); закритий ринок пропуском не вважається.
+        """
+        return self._gaps.gaps((symbol, interval), since_ms=since_ms)
+
+    def plan_backfill(
+        self,
+        symbol: str,
+        interval: str,
+        *,
+        now_ms: int | None = None,
+        since_ms: int | None = None,
+        include_tail: bool = True,
+    ) -> list[BackfillRange] | None:
+        """Мінімальні range-команди backfill/warmup для пропусків серії.
+
+        None — серія ще не потрапила в індекс (план невідомий); порожній
+        список — у відкриті години ринку нічого не бракує.
+
+        Args:
+            now_ms: «Зараз» для протухлого хвоста (дефолт — wall clock).
+            since_ms: Ігнорувати пропуски, старші за цю мітку.
+            include_tail: Додати хвіст від останнього бару до ``now_ms``.
+        """
+        tf_ms = interval_to_ms(interval)
+        key = (symbol, interval)
+        bounds = self._gaps.bounds(key)
+        if tf_ms is None or bounds is None:
+            return None
+        tail: tuple[int, int] | None = None
+        if include_tail:
+            now = int(now_ms if now_ms is not None else time.time() * 1000)
+            # Лише завершені бари: слот t готовий, коли t + tf <= now.
+            tail = (bounds[1] + tf_ms, now - tf_ms + 1)
+        return plan_backfill(
+            self._gaps.gaps(key, since_ms=since_ms),
+            interval=interval,
+            tf_ms=tf_ms,
+            market_hours=self.market_hours,
+            tail=tail,
+            merge_slack_bars=self.cfg.gap_merge_slack_bars,
+            max_bars_per_command=self.cfg.gap_max_bars_per_command,
+        )
+
+    async def put_bars_many(
+        self, items: Iterable[tuple[str, str, pd.DataFrame | BarColumns]]
+    ) -> None:
+        """Пакетний ``put_bars`` для батча по різних (symbol, interval).
+
+        Фрейми групуються за ключем у порядку надходження й конкатенуються,
+        тож на ключ — одне злиття, один запис у write-behind черзі диска, а
+        last-bar усіх ключів іде в Redis одним pipeline. Результат такий
+        самий, як у послідовних ``put_bars`` у тому ж порядку.
+
+        Помилка одного ключа не зупиняє решту: після обробки всього батча
+        кидається ``PutBarsManyError`` зі списком незаписаних ключів.
+        """
+        t0 = time.perf_counter()
+        grouped: dict[tuple[str, str], list[pd.DataFrame | BarColumns]] = {}
+        count = 0
+        for symbol, interval, bars in items:
+            count += 1
+            if _bars_len(bars) == 0:
+                logger.warning(
+                    "[put_bars_many] Порожній фрейм: %s %s", symbol, interval
+                )
+                continue
+            grouped.setdefault((symbol, interval), []).append(bars)
+        if not grouped:
+            return
+
+        rows = 0
+        wal_seq = 0
+        failed: dict[tuple[str, str], Exception] = {}
+        for (symbol, interval), frames in grouped.items():
+            try:
+                bars = _concat_bars(frames)
+                if self.cfg.validate_on_write:
+                    self._validate_bars(bars, stage="put_bars_many")
+                async with self._locked(symbol, interval):
+                    seq = await self._put_locked(
+                        symbol, interval, bars, defer_redis=True
+                    )
+                wal_seq = max(wal_seq, seq)
+            except Exception as e:  # broad-except: ключ не зриває решту батча
+                logger.warning(
+                    "[put_bars_many] Не записано %s %s: %s", symbol, interval, e
+                )
+                failed[(symbol, interval)] = e
+                continue
+            rows += _bars_len(bars)
+
+        if not self._redis_wb.running:
+            # Без фонового writer-а скидаємо чергу одразу — один pipeline.
+            await self._redis_wb.flush()
+        # Один fsync WAL на весь батч.
+        await self._wal_commit(wal_seq)
+
+        elapsed = time.perf_counter() - t0
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        self.metrics.put_many_latency.observe(elapsed)
+        self.metrics.put_many_rows_per_sec.set(rate)
+        self.metrics.put_latency.labels(layer="ram+redis").observe(elapsed)
+        try:
+            self.metrics.last_put_ts.set(int(time.time()))
+        except Exception:  # broad-except: метрика не має зривати запис
+            pass
+        st = self._put_many_stats
+        st["calls"] += 1
+        st["items"] += count
+        st["keys"] += len(grouped)
+        st["rows"] += rows
+        st["last_ms"] = elapsed * 1000.0
+        st["max_ms"] = max(st["max_ms"], elapsed * 1000.0)
+        st["last_rows_per_sec"] = rate
+        st["max_rows_per_sec"] = max(st["max_rows_per_sec"], rate)
+        if failed:
+            raise PutBarsManyError(failed)
+
+    def put_many_snapshot(self) -> dict[str, Any]:
+        """Лічильники ``put_bars_many``: батчі, ключі, рядки, latency, rows/sec."""
+        st = self._put_many_stats
+        return {
+            "calls": int(st["calls"]),
+            "items": int(st["items"]),
+            "keys": int(st["keys"]),
+            "rows": int(st["rows"]),
+            "last_ms": round(st["last_ms"], 3),
+            "max_ms": round(st["max_ms"], 3),
+            "last_rows_per_sec": round(st["last_rows_per_sec"], 1),
+            "max_rows_per_sec": round(st["max_rows_per_sec"], 1),
+        }
+
     async def enforce_tail_limit(self, symbol: str, interval: str, limit: int) -> None:
         """Обрізає історію символу до ``limit`` останніх барів у RAM/Redis/диску."""
 
         if limit <= 0:
             return
-        async with self._mtx:
+        wal_seq = 0
+        async with self._locked(symbol, interval):
             current = self.ram.get(symbol, interval)
             if current is None or len(current) <= limit:
                 return
             trimmed = current.tail(limit).copy()
+            # Обрізка навмисна — дисковий префікс не повертаємо.
+            self._ram_tail_only.discard((symbol, interval))
             self.ram.put(symbol, interval, trimmed)
+            self._record_meta(symbol, interval, trimmed)
+            first = _open_times_ms(trimmed.head(1))
+            if first is not None and len(first):
+                self._gaps.trim_before((symbol, interval), int(first[0]))
             if len(trimmed):
-                ttl = self.cfg.intervals_ttl.get(
-                    interval, self.cfg.profile.warm_ttl_sec
-                )
-                last_bar = trimmed.iloc[-1].to_dict()
-                await self.redis.jset(
-                    "candles", symbol, interval, value=last_bar, ttl=ttl
+                await self._publish_last_bar(
+                    symbol, interval, trimmed.iloc[-1].to_dict()
                 )
 
             if self.cfg.write_behind:
-                key = (symbol, interval)
-                if key not in self._flush_q:
-                    self._flush_q.append(key)
-                self._flush_pending[key] = trimmed
+                if self._wal is not None and len(trimmed):
+                    # сире значення open_time: replay фільтрує той самий стовпець
+                    wal_seq = self._wal.append_trim(
+                        symbol, interval, int(trimmed["open_time"].iloc[0])
+                    )
+                self._enqueue_flush((symbol, interval), trimmed)
             else:
                 await self.disk.save_bars(symbol, interval, trimmed)
+        await self._wal_commit(wal_seq)
+
+    async def replay_wal(self) -> dict[str, Any]:
+        """Відновлює бари з WAL поверх snapshot-ів (на буті, до warmup).
+
+        Для кожного ключа з WAL: snapshot з диска + дельти/trim у порядку
+        запису → snapshot одразу записується на диск, після чого покриті
+        файли WAL видаляються. Повертає статистику відновлення.
+        """
+        if self._wal is None:
+            return dict(self._wal_replay)
+        t0 = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        wal = self._wal
+        records = await loop.run_in_executor(None, lambda: list(wal.replay()))
+        by_key: dict[tuple[str, str], list[Any]] = {}
+        for record in records:
+            by_key.setdefault((record.symbol, record.interval), []).append(record)
+
+        rows = 0
+        for (symbol, interval), items in by_key.items():
+            async with self._locked(symbol, interval):
+                frame = await self.disk.load_bars(symbol, interval)
+                for record in items:
+                    if record.trim_from is not None:
+                        if frame is not None and "open_time" in frame.columns:
+                            frame = frame[
+                                frame["open_time"] >= record.trim_from
+                            ].reset_index(drop=True)
+                        continue
+                    delta = record.frame()
+                    rows += len(delta)
+                    frame = self._merge_bars(frame, delta)
+                if frame is None or frame.empty:
+                    continue
+                try:
+                    await self.disk.save_bars(symbol, interval, frame)
+                except Exception as e:
+                    # Ключ лишається брудним — WAL-файли не видаляються.
+                    logger.error(
+                        "[DataStore] WAL replay save failed for %s %s: %s",
+                        symbol,
+                        interval,
+                        e,
+                    )
+                    continue
+                wal.mark_flushed(symbol, interval, wal.last_seq(symbol, interval))
+                self.ram.delete((symbol, interval), reason="wal_replay")
+                self._series_meta.pop((symbol, interval), None)
+        wal.checkpoint()
+
+        elapsed = time.perf_counter() - t0
+        self._wal_replay.update(
+            {
+                "ms": elapsed * 1000.0,
+                "records": len(records),
+                "keys": len(by_key),
+                "rows": rows,
+            }
+        )
+        self.metrics.wal_replay_seconds.set(elapsed)
+        self.metrics.wal_bytes.set(wal.size_bytes())
+        if records:
+            logger.info(
+                "[DataStore] WAL replay: records=%d keys=%d rows=%d за %.1f мс",
+                len(records),
+                len(by_key),
+                rows,
+                elapsed * 1000.0,
+            )
+        return dict(self._wal_replay)
+
+    def wal_snapshot(self) -> dict[str, Any]:
+        """Розмір WAL і статистика останнього replay для UI/телеметрії."""
+        if self._wal is None:
+            return {"enabled": False}
+        replay = self._wal_replay
+        return {
+            "enabled": True,
+            **self._wal.stats(),
+            "replay_ms": round(replay["ms"], 3),
+            "replay_records": int(replay["records"]),
+            "replay_keys": int(replay["keys"]),
+            "replay_rows": int(replay["rows"]),
+        }
 
     async def warmup(self, symbols: list[str], interval: str, bars_needed: int) -> None:
         """
         Прогріває RAM із диска (якщо є snapshot-и), встановлює TTL/пріоритети.
         """
-        for s in symbols:
-            df = await self.disk.load_bars(s, interval)
-            if df is None or df.empty:
-                continue
-            if self.cfg.validate_on_read:
-                self._validate_bars(df, stage="warmup_read")
-            if bars_needed > 0:
-                df = df.tail(bars_needed)
-            # Без нормалізації часу — кладемо як є
-            self.ram.put(s, interval, self._dedup_sort(df))
+        await self.warmup_many([(s, interval) for s in symbols], bars_needed)
+
+    async def warmup_many(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        bars_needed: int,
+        *,
+        concurrency: int | None = None,
+    ) -> dict[str, Any]:
+        """Паралельний прогрів RAM для набору (symbol, interval).
+
+        Не більше ``concurrency`` (типово ``cfg.warmup_concurrency``) ключів
+        читаються одночасно; читання/парсинг — у пулі потоків, з диска
+        береться лише хвіст ``bars_needed`` рядків. Помилка одного ключа
+        логується і не зупиняє решту. Повертає ``warmup_snapshot()``.
+        """
+        t0 = time.perf_counter()
+        keys = list(dict.fromkeys(pairs))
+        tail = bars_needed if bars_needed > 0 else None
+        limit = max(1, int(concurrency or self.cfg.warmup_concurrency))
+        sem = asyncio.Semaphore(limit)
+        per_key: dict[str, float] = {}
+        loaded = 0
+        failed = 0
+        rows = 0
+
+        async def _one(symbol: str, interval: str) -> None:
+            nonlocal loaded, failed, rows
+            async with sem:
+                started = time.perf_counter()
+                try:
+                    count = await self._warmup_one(symbol, interval, tail)
+                except Exception as e:
+                    failed += 1
+                    logger.warning(
+                        "[DataStore] Warmup failed for %s %s: %s", symbol, interval, e
+                    )
+                    return
+                finally:
+                    elapsed_ms = (time.perf_counter() - started) * 1000.0
+                    per_key[f"{symbol}:{interval}"] = round(elapsed_ms, 3)
+                if count:
+                    loaded += 1
+                    rows += count
+                logger.debug(
+                    "[DataStore] Warmup %s %s: rows=%d за %.1f мс",
+                    symbol,
+                    interval,
+                    count,
+                    elapsed_ms,
+                )
+
+        await asyncio.gather(*(_one(s, i) for s, i in keys))
+
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        st = self._warmup_stats
+        st["runs"] += 1
+        st["keys"] += len(keys)
+        st["loaded"] += loaded
+        st["failed"] += failed
+        st["rows"] += rows
+        st["last_ms"] = round(elapsed_ms, 3)
+        st["total_ms"] = round(st["total_ms"] + elapsed_ms, 3)
+        st["per_key_ms"].update(per_key)
+        if per_key:
+            slowest = max(per_key, key=per_key.__getitem__)
+            if per_key[slowest] >= st["max_key_ms"]:
+                st["max_key_ms"] = per_key[slowest]
+                st["slowest"] = slowest
+        if keys:
+            logger.info(
+                "[DataStore] Warmup: keys=%d loaded=%d failed=%d rows=%d за %.1f мс "
+                "(concurrency=%d, найповільніший=%s)",
+                len(keys),
+                loaded,
+                failed,
+                rows,
+                elapsed_ms,
+                limit,
+                st["slowest"],
+            )
+        return self.warmup_snapshot()
+
+    async def _warmup_one(self, symbol: str, interval: str, tail: int | None) -> int:
+        df = await self.disk.load_bars(symbol, interval, tail=tail)
+        if df is None or df.empty:
+            return 0
+        if self.cfg.validate_on_read:
+            self._validate_bars(df, stage="warmup_read")
+        # Хвіст довжиною tail — на диску, ймовірно, є старші бари.
+        partial = tail is not None and len(df) >= tail
+        # Без нормалізації часу — кладемо як є
+        df = self._dedup_sort(df)
+        async with self._locked(symbol, interval):
+            current = self.ram.get(symbol, interval)
+            if current is not None and len(current):
+                # Ключ уже отримав живі бари — вони новіші за snapshot.
+                df = self._merge_bars(df, current)
+            if partial:
+                self._ram_tail_only.add((symbol, interval))
+            self.ram.put(symbol, interval, df)
+            self._record_meta(symbol, interval, df)
+            self._observe_gaps(symbol, interval, df)
+        return len(df)
+
+    def warmup_snapshot(self) -> dict[str, Any]:
+        """Тривалість прогріву (сумарно і по ключах) для UI/телеметрії."""
+        st = self._warmup_stats
+        return {**st, "per_key_ms": dict(st["per_key_ms"])}
 
     # ── Фонова обслуга ──────────────────────────────────────────────────────
 
@@ -1271,7 +3221,9 @@ class UnifiedDataStore:
                 self.ram.sweep(self.metrics)
 
                 # Flush queue
-                await self._drain_flush_queue()
+                if self._flush_due():
+                    await self._drain_flush_queue()
+                self.backpressure_level()
 
                 # Оновити метрики
                 self._publish_hit_ratios()
@@ -1309,13 +3261,6 @@ class UnifiedDataStore:
 
         limit = self._flush_batch_limit
 
-        if size > self.cfg.profile.flush_queue_hard and not force:
-            logger.error(
-                "[DataStore] Severe backpressure: backlog=%s, batch_limit=%s",
-                size,
-                limit,
-            )
-
         iterations = size if force else min(limit, size)
 
         for _ in range(iterations):
@@ -1329,8 +3274,19 @@ class UnifiedDataStore:
                 )
                 continue
             symbol, interval = key
+            started = self._flush_inflight_since = time.monotonic()
+            covered = (
+                self._wal.last_seq(symbol, interval) if self._wal is not None else 0
+            )
             try:
-                await self.disk.save_bars(symbol, interval, df)
+                await self._save_snapshot(symbol, interval, df)
+                if self._wal is not None:
+                    self._wal.mark_flushed(symbol, interval, covered)
+                if key in self._flush_pending:
+                    # під час запису ключ оновили — новий snapshot не старший за старт
+                    self._flush_enqueued_at[key] = started
+                else:
+                    self._flush_enqueued_at.pop(key, None)
             except Exception as e:
                 logger.error(
                     "Disk flush failed for %s %s: %s",
@@ -1339,12 +3295,137 @@ class UnifiedDataStore:
                     e,
                     exc_info=True,
                 )
-                self._flush_pending[key] = df
-                self._flush_q.appendleft(key)
+                if key not in self._flush_pending:
+                    self._flush_pending[key] = df
+                    self._flush_q.appendleft(key)
                 await asyncio.sleep(self.cfg.io_retry_backoff)
                 break
+            finally:
+                self._flush_inflight_since = None
 
         self.metrics.flush_backlog.set(len(self._flush_q))
+        if self._wal is not None:
+            try:
+                self._wal.checkpoint()
+            except OSError as e:
+                logger.warning("[DataStore] WAL checkpoint failed: %s", e)
+            self.metrics.wal_bytes.set(self._wal.size_bytes())
+        self.backpressure_level()
+
+    async def _save_snapshot(
+        self, symbol: str, interval: str, frame: pd.DataFrame | BarRingBuffer
+    ) -> None:
+        """Пише RAM-фрейм ключа на диск (хвостовий RAM — через ``save_tail``)."""
+        df = _snapshot_frame(frame)
+        if (symbol, interval) in self._ram_tail_only:
+            await self.disk.save_tail(symbol, interval, df)
+        else:
+            await self.disk.save_bars(symbol, interval, df)
+
+    def _flush_due(self) -> bool:
+        """Чи пора скидати чергу: найстаріший ключ чекає ≥ flush_interval_sec.
+
+        Під hard backpressure чекати не можна — скидаємо одразу.
+        """
+        if self.cfg.flush_interval_sec <= 0 or not self._flush_q:
+            return True
+        if self._bp_level == Backpressure.HARD:
+            return True
+        queued = self._flush_enqueued_at.get(self._flush_q[0])
+        return queued is None or time.monotonic() - queued >= self.cfg.flush_interval_sec
+
+    def _enqueue_flush(
+        self, key: tuple[str, str], frame: pd.DataFrame | BarRingBuffer
+    ) -> None:
+        """Ставить snapshot ключа у write-behind чергу (коалесинг по ключу)."""
+        if key not in self._flush_pending:
+            self._flush_q.append(key)
+        self._flush_enqueued_at.setdefault(key, time.monotonic())
+        self._flush_pending[key] = frame
+        self.metrics.flush_backlog.set(len(self._flush_q))
+
+    # ── Backpressure ────────────────────────────────────────────────────────
+
+    def _flush_stall_sec(self) -> float:
+        """Вік найстаршого незаписаного snapshot-а понад плановий ``flush_interval_sec``."""
+        now = time.monotonic()
+        oldest = self._flush_inflight_since
+        if self._flush_q:
+            queued = self._flush_enqueued_at.get(self._flush_q[0])
+            if queued is not None and (oldest is None or queued < oldest):
+                oldest = queued
+        if oldest is None:
+            return 0.0
+        # запланована затримка флушу (flush_interval_sec) — не стал
+        return max(0.0, now - oldest - max(0.0, self.cfg.flush_interval_sec))
+
+    def _raw_backpressure(self, backlog: int, stall: float, *, scale: float) -> str:
+        profile = self.cfg.profile
+        if (
+            backlog > profile.flush_queue_hard * scale
+            or stall > self.cfg.flush_stall_hard_sec * scale
+        ):
+            return Backpressure.HARD
+        if (
+            backlog > profile.flush_queue_soft * scale
+            or stall > self.cfg.flush_stall_soft_sec * scale
+        ):
+            return Backpressure.SOFT
+        return Backpressure.NORMAL
+
+    def backpressure_level(self) -> str:
+        """Поточний рівень backpressure write-behind: normal | soft | hard.
+
+        Рівень піднімається, коли backlog черги перевищує
+        ``profile.flush_queue_soft/hard`` або найстаріший незаписаний ключ
+        чекає довше за ``flush_stall_soft/hard_sec``. Опускається з гістерезисом
+        — лише коли обидва показники падають нижче половини порогу поточного
+        рівня. Виклик дешевий (O(1)), споживачі читають його на кожен батч/цикл.
+        """
+        backlog = len(self._flush_q)
+        stall = self._flush_stall_sec()
+        level = self._raw_backpressure(backlog, stall, scale=1.0)
+        current = self._bp_level
+        rank = Backpressure.RANK
+        if rank[level] < rank[current]:
+            # гістерезис: не нижче рівня за половинними порогами
+            held = self._raw_backpressure(backlog, stall, scale=0.5)
+            level = current if rank[held] >= rank[current] else held
+        if level != current:
+            if level == Backpressure.HARD:
+                log_level = logging.ERROR
+            elif rank[level] > rank[current]:
+                log_level = logging.WARNING
+            else:
+                log_level = logging.INFO
+            logger.log(
+                log_level,
+                "[DataStore] Backpressure %s→%s: backlog=%s stall=%.1fs",
+                current,
+                level,
+                backlog,
+                stall,
+            )
+            if level in self._bp_transitions:
+                self._bp_transitions[level] += 1
+            self._bp_level = level
+            self._bp_since = time.time()
+            self.metrics.backpressure_level.set(rank[level])
+        return level
+
+    def backpressure_snapshot(self) -> dict[str, Any]:
+        """Стан backpressure для UI/телеметрії."""
+        level = self.backpressure_level()
+        return {
+            "level": level,
+            "since_ts": int(self._bp_since),
+            "backlog": len(self._flush_q),
+            "stall_sec": round(self._flush_stall_sec(), 3),
+            "soft_threshold": self.cfg.profile.flush_queue_soft,
+            "hard_threshold": self.cfg.profile.flush_queue_hard,
+            "soft_total": self._bp_transitions[Backpressure.SOFT],
+            "hard_total": self._bp_transitions[Backpressure.HARD],
+        }
 
     # ── Внутрішні перевірки / злиття ────────────────────────────────────────
 
@@ -1406,8 +3487,8 @@ class UnifiedDataStore:
             )
         return self._dedup_sort(cat)
 
-    def _validate_bars(self, df: pd.DataFrame, *, stage: str) -> None:
-        cols = set(df.columns)
+    def _validate_bars(self, df: pd.DataFrame | BarColumns, *, stage: str) -> None:
+        cols = set(df.columns) if isinstance(df, pd.DataFrame) else set(df)
         missing = MIN_COLUMNS - cols
         if missing:
             logger.error(
@@ -1438,10 +3519,18 @@ class UnifiedDataStore:
         st.update(
             {
                 "flush_backlog": len(self._flush_q),
+                "backpressure": self.backpressure_level(),
                 "ram_hits": self._ram_hits,
                 "ram_miss": self._ram_miss,
                 "redis_hits": self._redis_hits,
                 "redis_miss": self._redis_miss,
+                "miss_loads": self._miss_loads,
+                "miss_coalesced": self._miss_coalesced,
+                "miss_inflight": len(self._inflight),
+                "negative_hits": self._negative_hits,
+                "negative_entries": len(self._negative),
+                "gap_series": self._gaps.stats()["series"],
+                "gap_ranges": self._gaps.stats()["gaps"],
             }
         )
         return st
@@ -1468,7 +3557,14 @@ class UnifiedDataStore:
                 "ram_hit_ratio": round(ram_ratio, 6),
                 "redis_hit_ratio": round(redis_ratio, 6),
                 "bytes_in_ram": self.ram.stats.get("bytes_in_ram", 0),
+                "ram_evictions": self.ram.stats.get("evictions", {}),
                 "flush_backlog": len(self._flush_q),
+                "backpressure": self.backpressure_snapshot(),
+                "wal": self.wal_snapshot(),
+                "warmup": self.warmup_snapshot(),
+                "lock_wait": self.lock_wait_snapshot(),
+                "redis_write_behind": self._redis_wb.snapshot(),
+                "put_bars_many": self.put_many_snapshot(),
                 "timestamp": int(time.time()),
             }
             fxcm_block: dict[str, Any]
@@ -1503,6 +3599,10 @@ class UnifiedDataStore:
 
 # ── Публічні експортовані символи ─────────────────────────────────────────
 __all__ = [
+    "Backpressure",
+    "BarColumns",
+    "PutBarsManyError",
+    "SeriesMeta",
     "StoreConfig",
     "StoreProfile",
     "UnifiedDataStore",
@@ -2,23 +2,54 @@
 
 from __future__ import annotations
 
+import copy
 import logging
+from dataclasses import dataclass, field
 from typing import Any
 
+import pandas as pd
+
 import smc_liquidity
 import smc_structure
 import smc_zones
 from smc_core.config import SMC_CORE_CONFIG, SmcCoreConfig
 from smc_core.smc_types import SmcHint, SmcInput
+from smc_structure.event_history import EVENT_HISTORY
+from smc_structure.swing_detector import SwingCache
 
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class _SeriesState:
+    """Мемоізований стан однієї пари (symbol, tf)."""
+
+    swings: SwingCache = field(default_factory=SwingCache)
+    frame: pd.DataFrame | None = None
+    context: dict[str, Any] | None = None
+    hint: SmcHint | None = None
+    history_revision: int = 0
+    reused: int = 0
+    computed: int = 0
+
+
 class SmcCoreEngine:
-    """Оркеструє виклик окремих SMC-підмодулів."""
+    """Оркеструє виклик окремих SMC-підмодулів.
 
-    def __init__(self, cfg: SmcCoreConfig | None = None) -> None:
+    ``incremental=True`` вмикає мемоізацію на пару (symbol, tf), а не
+    поетапний інкрементальний розрахунок: незмінний знімок (між закриттями
+    барів) повертає попередній hint, а новий бар перераховує всі етапи —
+    повторно використовуються лише рішення детектора свінгів (``SwingCache``).
+    Результат ідентичний пакетному режиму (replay і потік по одному бару
+    у ``tests/test_smc_core_incremental.py``).
+    """
+
+    def __init__(
+        self, cfg: SmcCoreConfig | None = None, *, incremental: bool = False
+    ) -> None:
         self._cfg = cfg or SMC_CORE_CONFIG
+        self._incremental = incremental
+        self._series: dict[tuple[str, str], _SeriesState] = {}
 
     def process_snapshot(self, snapshot: SmcInput) -> SmcHint:
         """Будує підказку по знімку даних, використовуючи всі підмодулі."""
@@ -27,7 +58,82 @@ class SmcCoreEngine:
             "SMC обробляє знімок",
             extra={"symbol": snapshot.symbol, "tf": snapshot.tf_primary},
         )
-        structure_state = smc_structure.compute_structure_state(snapshot, self._cfg)
+        if not self._incremental:
+            return self._build_hint(snapshot)
+
+        key = (snapshot.symbol, snapshot.tf_primary)
+        state = self._series.get(key)
+        if state is None:
+            state = self._series[key] = _SeriesState()
+        frame = snapshot.ohlc_by_tf.get(snapshot.tf_primary)
+        if state.hint is not None and self._same_input(state, frame, snapshot):
+            state.reused += 1
+            return state.hint
+
+        hint = self._build_hint(snapshot, swing_cache=state.swings)
+        state.computed += 1
+        state.hint = hint
+        state.history_revision = EVENT_HISTORY.revision(
+            snapshot.symbol, snapshot.tf_primary
+        )
+        state.frame = None if frame is None else frame.copy()
+        try:
+            state.context = copy.deepcopy(snapshot.context)
+        except Exception:
+            # Контекст, що не копіюється, не дає гарантії незмінності.
+            state.hint = None
+        return hint
+
+    def reset(self, symbol: str | None = None, tf: str | None = None) -> None:
+        """Скидає мемоізований стан (усіх пар або вибраних)."""
+
+        for key in list(self._series):
+            if symbol is not None and key[0].lower() != symbol.lower():
+                continue
+            if tf is not None and key[1].lower() != tf.lower():
+                continue
+            del self._series[key]
+
+    def incremental_stats(self) -> dict[str, Any]:
+        """Лічильники мемоізації для діагностики/latency smoke."""
+
+        states = self._series.values()
+        return {
+            "enabled": self._incremental,
+            "series": len(self._series),
+            "hints_reused": sum(state.reused for state in states),
+            "hints_computed": sum(state.computed for state in states),
+            "swings_reused": sum(state.swings.reused for state in states),
+            "swings_computed": sum(state.swings.computed for state in states),
+        }
+
+    def _same_input(
+        self,
+        state: _SeriesState,
+        frame: pd.DataFrame | None,
+        snapshot: SmcInput,
+    ) -> bool:
+        """Чи дасть пакетний прохід той самий hint, що й попередній."""
+
+        if frame is None or state.frame is None or not frame.equals(state.frame):
+            return False
+        try:
+            if snapshot.context != state.context:
+                return False
+        except Exception:
+            return False
+        # Повторне оновлення історії BOS/CHOCH тими ж подіями й тим самим
+        # snapshot_end_ts нічого не змінює, тож його пропускаємо. Якщо історію
+        # з того часу скинули чи оновили ззовні — hint перебудовується.
+        revision = EVENT_HISTORY.revision(snapshot.symbol, snapshot.tf_primary)
+        return revision == state.history_revision
+
+    def _build_hint(
+        self, snapshot: SmcInput, *, swing_cache: SwingCache | None = None
+    ) -> SmcHint:
+        structure_state = smc_structure.compute_structure_state(
+            snapshot, self._cfg, swing_cache=swing_cache
+        )
         liquidity_state = smc_liquidity.compute_liquidity_state(
             snapshot, structure_state, self._cfg
         )
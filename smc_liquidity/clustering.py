@@ -0,0 +1,128 @@
+"""Кластеризація рівнів ліквідності за ціною з відносним допуском.
+
+Спільний рушій для EQH/EQL-пулів (`pools`) і магнітів (`magnets`). Середнє
+кластера тримається як накопичена сума, тож перевірка кандидата — O(1)
+замість ``sum(...) / len(...)`` на кожне порівняння.
+
+Режими:
+- ``"sweep"`` — одне сортування за ціною і один прохід: кандидат
+  порівнюється лише з поточним (останнім) кластером. На відсортованому
+  вході це дає рівно той самий результат, що й жадібний first-fit: кластер,
+  якому відмовив вищий рівень, уже не прийме жоден наступний.
+- ``"greedy"`` — сумісність зі старою семантикою для довільного порядку
+  входу: перший за часом створення кластер, чиє поточне середнє в допуску.
+  Кандидати шукаються бінарним пошуком у відсортованому індексі середніх.
+
+Нескінченні/NaN ціни не проходять жодну перевірку допуску, тому завжди
+утворюють окремий кластер (у ``"sweep"`` — наприкінці, в порядку входу).
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Sequence
+from typing import Literal, TypeVar
+
+T = TypeVar("T")
+
+ClusterMode = Literal["sweep", "greedy"]
+
+# Запас для меж бінарного пошуку: фінальна перевірка все одно йде через
+# within_tolerance, тож вікно має бути лише не вужчим за точну умову.
+_BAND_SLACK = 1e-9
+
+
+def within_tolerance(price: float, ref: float, tolerance_pct: float) -> bool:
+    """Чи лежить ``price`` у відносному допуску від ``ref``."""
+
+    if ref == 0:
+        return abs(price - ref) <= tolerance_pct
+    diff_ratio = abs(price - ref) / max(abs(ref), 1e-6)
+    return diff_ratio <= tolerance_pct
+
+
+def cluster_by_price(
+    items: Sequence[T],
+    price: Callable[[T], float],
+    tolerance_pct: float,
+    *,
+    mode: ClusterMode = "sweep",
+) -> list[list[T]]:
+    """Групує ``items`` за ціною; порядок членів — порядок приєднання."""
+
+    prices = [price(item) for item in items]
+    if mode == "sweep":
+        groups = _sweep(prices, tolerance_pct)
+    elif mode == "greedy":
+        groups = _greedy(prices, tolerance_pct)
+    else:
+        raise ValueError(f"Невідомий режим кластеризації: {mode!r}")
+    return [[items[pos] for pos in group] for group in groups]
+
+
+def _sweep(prices: list[float], tolerance_pct: float) -> list[list[int]]:
+    finite = [pos for pos, value in enumerate(prices) if math.isfinite(value)]
+    finite.sort(key=prices.__getitem__)
+    groups: list[list[int]] = []
+    current: list[int] = []
+    total = 0.0
+    for pos in finite:
+        value = prices[pos]
+        if current and within_tolerance(value, total / len(current), tolerance_pct):
+            current.append(pos)
+            total += value
+            continue
+        current = [pos]
+        total = value
+        groups.append(current)
+    groups.extend([pos] for pos, value in enumerate(prices) if not math.isfinite(value))
+    return groups
+
+
+def _greedy(prices: list[float], tolerance_pct: float) -> list[list[int]]:
+    groups: list[list[int]] = []
+    totals: list[float] = []
+    # (середнє, id кластера) — відсортовано; лише кластери зі скінченним середнім
+    index: list[tuple[float, int]] = []
+    for pos, value in enumerate(prices):
+        match = (
+            _first_match(index, value, tolerance_pct) if math.isfinite(value) else None
+        )
+        if match is None:
+            groups.append([pos])
+            totals.append(value)
+            if math.isfinite(value):
+                insort(index, (value, len(groups) - 1))
+            continue
+        old_mean = totals[match] / len(groups[match])
+        del index[bisect_left(index, (old_mean, match))]
+        groups[match].append(pos)
+        totals[match] += value
+        new_mean = totals[match] / len(groups[match])
+        if math.isfinite(new_mean):
+            insort(index, (new_mean, match))
+    return groups
+
+
+def _first_match(
+    index: list[tuple[float, int]], value: float, tolerance_pct: float
+) -> int | None:
+    """Найстаріший кластер, чиє середнє в допуску від ``value``."""
+
+    if tolerance_pct >= 1:
+        candidates = index
+    else:
+        # |value - mean| <= tol * max(|mean|, 1e-6)  ⇒  |value - mean| <= radius
+        radius = max(tolerance_pct * abs(value) / (1 - tolerance_pct), tolerance_pct)
+        radius *= 1 + _BAND_SLACK
+        lo = bisect_left(index, (value - radius,))
+        hi = bisect_right(index, (value + radius, math.inf))
+        candidates = index[lo:hi]
+    best: int | None = None
+    for mean, cluster_id in candidates:
+        if (best is None or cluster_id < best) and within_tolerance(
+            value, mean, tolerance_pct
+        ):
+            best = cluster_id
+    return best
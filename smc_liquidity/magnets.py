@@ -14,6 +14,8 @@ from smc_core.smc_types import (
     SmcStructureState,
 )
 
+from .clustering import cluster_by_price
+
 
 def build_magnets_from_pools_and_range(
     pools: list[SmcLiquidityPool],
@@ -59,25 +61,11 @@ def build_magnets_from_pools_and_range(
 def _cluster_pools(
     pools: Iterable[SmcLiquidityPool], tolerance_pct: float
 ) -> list[list[SmcLiquidityPool]]:
-    clusters: list[list[SmcLiquidityPool]] = []
-    for pool in sorted(pools, key=lambda p: p.level):
-        matched = False
-        for cluster in clusters:
-            center = sum(entry.level for entry in cluster) / len(cluster)
-            if _within_tolerance(pool.level, center, tolerance_pct):
-                cluster.append(pool)
-                matched = True
-                break
-        if not matched:
-            clusters.append([pool])
-    return clusters
-
-
-def _within_tolerance(price: float, ref: float, tolerance_pct: float) -> bool:
-    if ref == 0:
-        return abs(price - ref) <= tolerance_pct
-    diff_ratio = abs(price - ref) / max(abs(ref), 1e-6)
-    return diff_ratio <= tolerance_pct
+    return cluster_by_price(list(pools), _pool_level, tolerance_pct, mode="sweep")
+
+
+def _pool_level(pool: SmcLiquidityPool) -> float:
+    return pool.level
 
 
 def _infer_magnet_type(cluster: list[SmcLiquidityPool]) -> SmcLiquidityType:
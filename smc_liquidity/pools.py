@@ -21,6 +21,8 @@ from smc_core.smc_types import (
     SmcSwing,
 )
 
+from .clustering import cluster_by_price
+
 
 def build_eq_pools_from_swings(
     structure: SmcStructureState, cfg: SmcCoreConfig
@@ -129,26 +131,14 @@ def _clusters_to_pools(
 def _cluster_swings(
     swings: list[SmcSwing], tolerance_pct: float
 ) -> list[list[SmcSwing]]:
-    clusters: list[list[SmcSwing]] = []
-    for swing in swings:
-        matched = False
-        for cluster in clusters:
-            avg_price = sum(sw.price for sw in cluster) / len(cluster)
-            if _within_tolerance(swing.price, avg_price, tolerance_pct):
-                cluster.append(swing)
-                matched = True
-                break
-        if not matched:
-            clusters.append([swing])
+    # Порядок свінгів (за часом) визначає склад кластерів — лишаємо жадібний режим
+    clusters = cluster_by_price(swings, _swing_price, tolerance_pct, mode="greedy")
     # Потрібні мінімум два торкання для EQH/EQL
     return [cluster for cluster in clusters if len(cluster) >= 2]
 
 
-def _within_tolerance(price: float, ref: float, tolerance_pct: float) -> bool:
-    if ref == 0:
-        return abs(price - ref) <= tolerance_pct
-    diff_ratio = abs(price - ref) / max(abs(ref), 1e-6)
-    return diff_ratio <= tolerance_pct
+def _swing_price(swing: SmcSwing) -> float:
+    return swing.price
 
 
 def _last_swing(swings: Iterable[SmcSwing], kind: str) -> SmcSwing | None:
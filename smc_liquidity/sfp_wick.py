@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Literal
 
+import numpy as np
 import pandas as pd
 
 from smc_core.config import SmcCoreConfig
@@ -48,147 +49,88 @@ def detect_sfp_and_wicks(
     tolerance_pct = max(cfg.eq_tolerance_pct, 0.001)
     break_pct = max(tolerance_pct * SFP_BREAK_FRACTION, MIN_BREAK_PCT)
 
+    timestamps = df["timestamp"].reset_index(drop=True)
+    opens = df["open"].to_numpy(dtype=float)
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
+    closes = df["close"].to_numpy(dtype=float)
+    hits = _scan_levels(levels, break_pct, opens, highs, lows, closes)
+    # Timestamp матеріалізуємо лише для барів-влучань, одним зрізом.
+    hit_rows = sorted(
+        {idx for idx, _ in hits.sfp}
+        | {cluster.first_idx for cluster in hits.wick_clusters}
+        | {cluster.last_idx for cluster in hits.wick_clusters}
+    )
+    stamp_at = {
+        idx: pd.Timestamp(value)
+        for idx, value in zip(hit_rows, timestamps.iloc[hit_rows].tolist(), strict=True)
+    }
+
     sfp_events: list[dict[str, Any]] = []
     extra_pools: list[SmcLiquidityPool] = []
-    sfp_recorded: set[str] = set()
-
-    wick_clusters: dict[str, dict[str, Any]] = {}
-
-    timestamps = df["timestamp"].reset_index(drop=True)
-    opens = df["open"].astype(float).reset_index(drop=True)
-    highs = df["high"].astype(float).reset_index(drop=True)
-    lows = df["low"].astype(float).reset_index(drop=True)
-    closes = df["close"].astype(float).reset_index(drop=True)
-
-    for idx in range(len(df)):
-        ts = pd.Timestamp(timestamps.iloc[idx])
-        open_price = float(opens.iloc[idx])
-        high_price = float(highs.iloc[idx])
-        low_price = float(lows.iloc[idx])
-        close_price = float(closes.iloc[idx])
-        body = max(abs(close_price - open_price), 1e-6)
-        upper_wick = max(high_price - max(open_price, close_price), 0.0)
-        lower_wick = max(min(open_price, close_price) - low_price, 0.0)
-
-        for level in levels:
-            price_tol = max(level.level * break_pct, MIN_BREAK_PCT)
-            if (
-                level.side == "HIGH"
-                and high_price >= level.level + price_tol
-                and close_price < level.level
-                and level.key not in sfp_recorded
-            ):
-                sfp_events.append(
-                    {
-                        "level": level.level,
-                        "side": level.side,
-                        "time": ts.isoformat(),
-                        "close": close_price,
-                        "source": level.source,
-                    }
-                )
-                extra_pools.append(
-                    SmcLiquidityPool(
-                        level=level.level,
-                        liq_type=SmcLiquidityType.SFP,
-                        strength=1.0,
-                        n_touches=1,
-                        first_time=ts,
-                        last_time=ts,
-                        role=resolve_role_for_bias(
-                            structure.bias, SmcLiquidityType.SFP, side=level.side
-                        ),
-                        meta={
-                            "source": "sfp",
-                            "side": level.side,
-                            "level_source": level.source,
-                        },
-                    )
-                )
-                sfp_recorded.add(level.key)
-                continue
-            if (
-                level.side == "LOW"
-                and low_price <= level.level - price_tol
-                and close_price > level.level
-                and level.key not in sfp_recorded
-            ):
-                sfp_events.append(
-                    {
-                        "level": level.level,
-                        "side": level.side,
-                        "time": ts.isoformat(),
-                        "close": close_price,
-                        "source": level.source,
-                    }
-                )
-                extra_pools.append(
-                    SmcLiquidityPool(
-                        level=level.level,
-                        liq_type=SmcLiquidityType.SFP,
-                        strength=1.0,
-                        n_touches=1,
-                        first_time=ts,
-                        last_time=ts,
-                        role=resolve_role_for_bias(
-                            structure.bias, SmcLiquidityType.SFP, side=level.side
-                        ),
-                        meta={
-                            "source": "sfp",
-                            "side": level.side,
-                            "level_source": level.source,
-                        },
-                    )
-                )
-                sfp_recorded.add(level.key)
-                continue
-
-            if level.side == "HIGH":
-                if (
-                    upper_wick >= body * WICK_RATIO
-                    and abs(level.level - high_price) <= price_tol
-                ):
-                    _collect_wick(wick_clusters, level, ts, upper_wick)
-            else:
-                if (
-                    lower_wick >= body * WICK_RATIO
-                    and abs(level.level - low_price) <= price_tol
-                ):
-                    _collect_wick(wick_clusters, level, ts, lower_wick)
+    for idx, pos in hits.sfp:
+        level = levels[pos]
+        ts = stamp_at[idx]
+        sfp_events.append(
+            {
+                "level": level.level,
+                "side": level.side,
+                "time": ts.isoformat(),
+                "close": float(closes[idx]),
+                "source": level.source,
+            }
+        )
+        extra_pools.append(
+            SmcLiquidityPool(
+                level=level.level,
+                liq_type=SmcLiquidityType.SFP,
+                strength=1.0,
+                n_touches=1,
+                first_time=ts,
+                last_time=ts,
+                role=resolve_role_for_bias(
+                    structure.bias, SmcLiquidityType.SFP, side=level.side
+                ),
+                meta={
+                    "source": "sfp",
+                    "side": level.side,
+                    "level_source": level.source,
+                },
+            )
+        )
 
     wick_meta: list[dict[str, Any]] = []
-    for cluster in wick_clusters.values():
+    for cluster in hits.wick_clusters:
+        level = levels[cluster.pos]
+        first_ts = stamp_at[cluster.first_idx]
+        last_ts = stamp_at[cluster.last_idx]
         wick_meta.append(
             {
-                "level": cluster["level"],
-                "side": cluster["side"],
-                "count": cluster["count"],
-                "max_wick": cluster["max_wick"],
-                "source": cluster["source"],
-                "first_ts": (
-                    cluster["first_ts"].isoformat() if cluster["first_ts"] else None
-                ),
-                "last_ts": (
-                    cluster["last_ts"].isoformat() if cluster["last_ts"] else None
-                ),
+                "level": level.level,
+                "side": level.side,
+                "count": cluster.count,
+                "max_wick": cluster.max_wick,
+                "source": level.source,
+                "first_ts": first_ts.isoformat(),
+                "last_ts": last_ts.isoformat(),
             }
         )
         extra_pools.append(
             SmcLiquidityPool(
-                level=cluster["level"],
+                level=level.level,
                 liq_type=SmcLiquidityType.WICK_CLUSTER,
-                strength=float(cluster["max_wick"]),
-                n_touches=cluster["count"],
-                first_time=cluster["first_ts"],
-                last_time=cluster["last_ts"],
+                strength=float(cluster.max_wick),
+                n_touches=cluster.count,
+                first_time=first_ts,
+                last_time=last_ts,
                 role=resolve_role_for_bias(
-                    structure.bias, SmcLiquidityType.WICK_CLUSTER, side=cluster["side"]
+                    structure.bias, SmcLiquidityType.WICK_CLUSTER, side=level.side
                 ),
                 meta={
                     "source": "wick_cluster",
-                    "side": cluster["side"],
-                    "level_source": cluster["source"],
-                    "count": cluster["count"],
+                    "side": level.side,
+                    "level_source": level.source,
+                    "count": cluster.count,
                 },
             )
         )
@@ -196,6 +138,96 @@ def detect_sfp_and_wicks(
     return extra_pools, sfp_events, wick_meta
 
 
+@dataclass(slots=True)
+class _WickCluster:
+    pos: int
+    first_idx: int
+    last_idx: int
+    count: int
+    max_wick: float
+
+
+@dataclass(slots=True)
+class _LevelHits:
+    # (бар, позиція рівня) першого SFP кожного рівня — у порядку появи
+    sfp: list[tuple[int, int]]
+    # кластери у порядку першого wick-торкання
+    wick_clusters: list[_WickCluster]
+
+
+def _scan_levels(
+    levels: list[_LevelInfo],
+    break_pct: float,
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+) -> _LevelHits:
+    """Матриця bars × levels для sweep/close-back та wick-умов.
+
+    Семантика послідовного проходу «бар за баром, рівень за рівнем»:
+    - SFP фіксується лише на першому барі, де рівень пробито й закрито назад
+      (ключ рівня більше не бере участі в SFP);
+    - на цьому барі wick-умова для рівня не перевіряється, на всіх інших —
+      так, зокрема й на пізніших повторних sweep-ах;
+    - NaN у цінах дає False у всіх порівняннях, тож такі бари не рахуються.
+    """
+
+    level_values = np.array([level.level for level in levels], dtype=float)
+    is_high = np.array([level.side == "HIGH" for level in levels], dtype=bool)
+    price_tol = np.maximum(level_values * break_pct, MIN_BREAK_PCT)
+
+    h = highs[:, None]
+    lo = lows[:, None]
+    c = closes[:, None]
+    sfp = np.where(
+        is_high,
+        (h >= level_values + price_tol) & (c < level_values),
+        (lo <= level_values - price_tol) & (c > level_values),
+    )
+
+    body = np.maximum(np.abs(closes - opens), 1e-6)
+    upper_wick = np.maximum(highs - np.maximum(opens, closes), 0.0)
+    lower_wick = np.maximum(np.minimum(opens, closes) - lows, 0.0)
+    wick_size = np.where(is_high, upper_wick[:, None], lower_wick[:, None])
+    wick = np.where(
+        is_high,
+        (upper_wick >= body * WICK_RATIO)[:, None]
+        & (np.abs(level_values - h) <= price_tol),
+        (lower_wick >= body * WICK_RATIO)[:, None]
+        & (np.abs(level_values - lo) <= price_tol),
+    )
+
+    bars = len(closes)
+    has_sfp = sfp.any(axis=0)
+    first_sfp = np.where(has_sfp, sfp.argmax(axis=0), bars)
+    wick[first_sfp[has_sfp], np.flatnonzero(has_sfp)] = False
+
+    sfp_pos = np.flatnonzero(has_sfp)
+    order = np.lexsort((sfp_pos, first_sfp[sfp_pos]))
+    sfp_hits = [(int(first_sfp[sfp_pos[k]]), int(sfp_pos[k])) for k in order.tolist()]
+
+    clusters: list[_WickCluster] = []
+    has_wick = wick.any(axis=0)
+    if has_wick.any():
+        wick_pos = np.flatnonzero(has_wick)
+        first_wick = wick[:, wick_pos].argmax(axis=0)
+        last_wick = bars - 1 - wick[::-1, wick_pos].argmax(axis=0)
+        counts = wick[:, wick_pos].sum(axis=0)
+        max_wick = np.where(wick[:, wick_pos], wick_size[:, wick_pos], 0.0).max(axis=0)
+        for k in np.lexsort((wick_pos, first_wick)).tolist():
+            clusters.append(
+                _WickCluster(
+                    pos=int(wick_pos[k]),
+                    first_idx=int(first_wick[k]),
+                    last_idx=int(last_wick[k]),
+                    count=int(counts[k]),
+                    max_wick=float(max_wick[k]),
+                )
+            )
+    return _LevelHits(sfp=sfp_hits, wick_clusters=clusters)
+
+
 def _collect_levels(structure: SmcStructureState) -> list[_LevelInfo]:
     levels: dict[str, _LevelInfo] = {}
     for swing in structure.swings or []:
@@ -223,29 +255,6 @@ def _collect_levels(structure: SmcStructureState) -> list[_LevelInfo]:
     return list(levels.values())
 
 
-def _collect_wick(
-    clusters: dict[str, dict[str, Any]],
-    level: _LevelInfo,
-    ts: pd.Timestamp,
-    wick_size: float,
-) -> None:
-    cluster = clusters.get(level.key)
-    if cluster is None:
-        cluster = {
-            "level": level.level,
-            "side": level.side,
-            "source": level.source,
-            "count": 0,
-            "max_wick": 0.0,
-            "first_ts": ts,
-            "last_ts": ts,
-        }
-        clusters[level.key] = cluster
-    cluster["count"] += 1
-    cluster["max_wick"] = max(cluster["max_wick"], float(wick_size))
-    cluster["last_ts"] = ts
-
-
 def _prepare_price_frame(snapshot: SmcInput, max_bars: int) -> pd.DataFrame | None:
     df = snapshot.ohlc_by_tf.get(snapshot.tf_primary)
     if df is None or df.empty:
@@ -26,13 +26,16 @@ ATR_PERIOD_M1 = 14
 
 
 def compute_structure_state(
-    snapshot: SmcInput, cfg: SmcCoreConfig
+    snapshot: SmcInput,
+    cfg: SmcCoreConfig,
+    *,
+    swing_cache: swing_detector.SwingCache | None = None,
 ) -> SmcStructureState:
     df = _prepare_frame(
         snapshot.ohlc_by_tf.get(snapshot.tf_primary), cfg.max_lookback_bars
     )
     snapshot_start_ts, snapshot_end_ts = _snapshot_bounds(df)
-    swings = swing_detector.detect_swings(df, cfg.min_swing_bars)
+    swings = swing_detector.detect_swings(df, cfg.min_swing_bars, cache=swing_cache)
     legs = structure_engine.build_legs(swings)
     trend = structure_engine.infer_trend(legs)
     atr_series = metrics.compute_atr(df, ATR_PERIOD_M1)
@@ -35,6 +35,9 @@ class StructureEventHistory:
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._store: dict[tuple[str, str], OrderedDict[str, _TrackedEvent]] = {}
+        # Номер останньої зміни кошика: дешева перевірка «історію не чіпали».
+        self._revision = 0
+        self._revisions: dict[tuple[str, str], int] = {}
 
     def update_history(
         self,
@@ -51,6 +54,7 @@ class StructureEventHistory:
         new_events = list(events or [])
         with self._lock:
             bucket = self._store.setdefault(key, OrderedDict())
+            self._bump(key)
             added = 0
             for event in new_events:
                 event_key = self._event_key(event)
@@ -89,9 +93,17 @@ class StructureEventHistory:
                 return []
             return [tracked.event for tracked in bucket.values()]
 
+    def revision(self, symbol: str, timeframe: str) -> int:
+        """Номер останнього оновлення/скидання історії пари (0 — не було)."""
+
+        with self._lock:
+            return self._revisions.get((symbol.lower(), timeframe.lower()), 0)
+
     def clear(self, symbol: str | None = None, timeframe: str | None = None) -> None:
         with self._lock:
             if symbol is None and timeframe is None:
+                for existing in self._store:
+                    self._bump(existing)
                 self._store.clear()
                 return
             symbol_key = symbol.lower() if symbol else None
@@ -104,8 +116,13 @@ class StructureEventHistory:
                     continue
                 keys_to_delete.append((existing_symbol, existing_tf))
             for candidate in keys_to_delete:
+                self._bump(candidate)
                 self._store.pop(candidate, None)
 
+    def _bump(self, key: tuple[str, str]) -> None:
+        self._revision += 1
+        self._revisions[key] = self._revision
+
     def _prune_bucket(
         self,
         bucket: OrderedDict[str, _TrackedEvent],
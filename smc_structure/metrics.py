@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 
 def compute_atr(df: pd.DataFrame | None, period: int = 14) -> pd.Series | None:
-    """Обчислює ATR для переданого DataFrame та повертає серію, вирівняну по індексу."""
+    """Обчислює ATR для переданого DataFrame та повертає серію, вирівняну по індексу.
+
+    TR — найбільше з ``high - low``, ``|high - prev_close|`` і
+    ``|low - prev_close|`` без урахування NaN (як ``DataFrame.max``). ATR —
+    середнє ``period`` останніх TR; NaN, якщо барів менше або у вікні є NaN.
+    Сума вікна рахується зліва направо для кожного бару окремо (``period``
+    векторних додавань), а не ковзним акумулятором ``rolling``, тож значення
+    бару не залежить від того, де почався кадр.
+    """
 
     if df is None or df.empty:
         return None
@@ -14,19 +23,23 @@ def compute_atr(df: pd.DataFrame | None, period: int = 14) -> pd.Series | None:
     if not required.issubset(df.columns):
         return None
 
-    highs = df["high"].astype(float)
-    lows = df["low"].astype(float)
-    closes = df["close"].astype(float)
-    prev_close = closes.shift(1)
-
-    true_range = pd.concat(
-        [
-            highs - lows,
-            (highs - prev_close).abs(),
-            (lows - prev_close).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
-
-    atr = true_range.rolling(window=period, min_periods=period).mean()
-    return atr
+    highs = df["high"].astype(float).to_numpy()
+    lows = df["low"].astype(float).to_numpy()
+    closes = df["close"].astype(float).to_numpy()
+    prev_close = np.empty(len(closes))
+    prev_close[0] = np.nan
+    prev_close[1:] = closes[:-1]
+
+    true_range = np.fmax(
+        np.fmax(highs - lows, np.abs(highs - prev_close)),
+        np.abs(lows - prev_close),
+    )
+
+    atr = np.full(len(true_range), np.nan)
+    count = len(true_range) - period + 1
+    if period > 0 and count > 0:
+        acc = true_range[:count].copy()
+        for offset in range(1, period):
+            acc += true_range[offset : offset + count]
+        atr[period - 1 :] = acc / period
+    return pd.Series(atr, index=df.index)
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from collections.abc import Sequence
 
+import numpy as np
 import pandas as pd
 
 from smc_core.config import SmcCoreConfig
@@ -105,7 +106,9 @@ def detect_events(
     structural_bias = SmcTrend.UNKNOWN
     closes = None
     if df is not None and "close" in df.columns:
-        closes = df["close"].astype(float)
+        closes = df["close"].astype(float).to_numpy()
+    # Пошук close/ATR по індексу свінга — у масивах NumPy, а не ``iloc``.
+    atr_values = None if atr_series is None else atr_series.to_numpy(dtype=float)
 
     LOGGER.debug(
         "Старт обробки BOS/CHOCH",
@@ -127,7 +130,7 @@ def detect_events(
         if not _passes_break_threshold(
             close_value,
             baseline_price,
-            _value_at_index(atr_series, leg.to_swing.index),
+            _value_at_index(atr_values, leg.to_swing.index),
             cfg,
         ):
             continue
@@ -188,11 +191,11 @@ def _last_label_for_kind(
     return None
 
 
-def _value_at_index(series: pd.Series | None, idx: int) -> float | None:
-    if series is None or idx < 0 or idx >= len(series):
+def _value_at_index(values: np.ndarray | None, idx: int) -> float | None:
+    if values is None or idx < 0 or idx >= len(values):
         return None
-    value = series.iloc[idx]
-    return float(value) if pd.notna(value) else None
+    value = float(values[idx])
+    return None if np.isnan(value) else value
 
 
 def _passes_break_threshold(
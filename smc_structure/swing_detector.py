@@ -2,19 +2,57 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from smc_core.smc_types import SmcSwing
 
 
-def detect_swings(df: pd.DataFrame | None, min_separation: int) -> list[SmcSwing]:
+@dataclass
+class SwingCache:
+    """Рішення «свінг / не свінг» попереднього вікна для інкрементального режиму.
+
+    Рішення для бару залежить лише від ``window`` сусідів з кожного боку, тож
+    після зсуву вікна на нові бари перевіряти треба тільки ті, чиє праве
+    сусідство щойно закрилося. Решта рішень береться за ``timestamp`` бару,
+    якщо перекриття вікон збігається побайтово (timestamp/high/low).
+    """
+
+    window: int = 0
+    keys: np.ndarray = field(default_factory=lambda: np.empty(0, dtype="int64"))
+    highs: np.ndarray = field(default_factory=lambda: np.empty(0))
+    lows: np.ndarray = field(default_factory=lambda: np.empty(0))
+    is_high: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=bool))
+    is_low: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=bool))
+    reused: int = 0
+    computed: int = 0
+
+    def reset(self) -> None:
+        self.window = 0
+        self.keys = np.empty(0, dtype="int64")
+
+
+def detect_swings(
+    df: pd.DataFrame | None,
+    min_separation: int,
+    *,
+    cache: SwingCache | None = None,
+) -> list[SmcSwing]:
     """Повертає список свінгів, використовуючи симетричне вікно навколо свічки.
 
     Вважаємо свінгом точку, де high (для HIGH) або low (для LOW) є екстремумом
     серед ``min_separation`` сусідніх барів ліворуч і праворуч. Це дає стабільну
     основу для побудови HH/LL навіть на шумних рядах.
+
+    Екстремуми сусідів рахуються ковзним вікном NumPy; нічия (рівний high/low
+    у сусіда) лишається свінгом, NaN у сусідах пропускається, як у pandas
+    ``max``/``min``. Timestamp матеріалізується лише для рядків-свінгів.
+    З ``cache`` рішення для барів, чиє сусідство не змінилося з попереднього
+    виклику, не перераховуються; результат ідентичний виклику без кешу.
     """
 
     if df is None or df.empty or "high" not in df.columns or "low" not in df.columns:
@@ -23,46 +61,171 @@ def detect_swings(df: pd.DataFrame | None, min_separation: int) -> list[SmcSwing
     window = max(1, min_separation)
     total = len(df)
     if total < window * 2 + 1:
+        if cache is not None:
+            cache.reset()
         return []
 
-    highs = df["high"].astype(float)
-    lows = df["low"].astype(float)
-    times = [_extract_timestamp(df, idx) for idx in range(total)]
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
+    flags = None
+    if cache is not None:
+        flags = _cached_flags(df, highs, lows, window, cache)
+    if flags is None:
+        is_high = np.zeros(total, dtype=bool)
+        is_low = np.zeros(total, dtype=bool)
+        is_high[window : total - window] = _extremum_flags(
+            highs, window, window, total - window, high=True
+        )
+        is_low[window : total - window] = _extremum_flags(
+            lows, window, window, total - window, high=False
+        )
+    else:
+        is_high, is_low = flags
 
+    positions = np.flatnonzero(is_high | is_low).tolist()
+    times = _swing_times(df, positions)
     swings: list[SmcSwing] = []
-    for idx in range(window, total - window):
-        local_high = highs.iloc[idx]
-        left_high = highs.iloc[idx - window : idx].max()
-        right_high = highs.iloc[idx + 1 : idx + 1 + window].max()
-        if local_high >= left_high and local_high >= right_high:
+    for idx, ts in zip(positions, times, strict=True):
+        if is_high[idx]:
             swings.append(
                 SmcSwing(
                     index=idx,
-                    time=times[idx],
-                    price=float(local_high),
+                    time=ts,
+                    price=float(highs[idx]),
                     kind="HIGH",
                     strength=window,
                 )
             )
-
-        local_low = lows.iloc[idx]
-        left_low = lows.iloc[idx - window : idx].min()
-        right_low = lows.iloc[idx + 1 : idx + 1 + window].min()
-        if local_low <= left_low and local_low <= right_low:
+        if is_low[idx]:
             swings.append(
                 SmcSwing(
                     index=idx,
-                    time=times[idx],
-                    price=float(local_low),
+                    time=ts,
+                    price=float(lows[idx]),
                     kind="LOW",
                     strength=window,
                 )
             )
-
-    swings.sort(key=lambda swing: swing.index)
     return swings
 
 
+def _extremum_flags(
+    values: np.ndarray, window: int, start: int, stop: int, *, high: bool
+) -> np.ndarray:
+    """Прапорці екстремуму для позицій ``[start, stop)``.
+
+    Бар — HIGH-свінг, якщо його значення >= максимуму ``window`` барів
+    ліворуч і >= максимуму ``window`` барів праворуч (для LOW — навпаки).
+    ``fmax``/``fmin`` пропускають NaN, тож повністю NaN-сусідство дає NaN і
+    порівняння False — так само, як ``Series.max()`` у попередній реалізації.
+    """
+
+    count = stop - start
+    if count <= 0:
+        return np.zeros(0, dtype=bool)
+    segment = values[start - window : stop + window]
+    windows = sliding_window_view(segment, window)
+    reduce = np.fmax.reduce if high else np.fmin.reduce
+    extremes: np.ndarray = np.asarray(reduce(windows, axis=1))
+    left = extremes[:count]
+    right = extremes[window + 1 : window + 1 + count]
+    local = segment[window : window + count]
+    if high:
+        return np.asarray((local >= left) & (local >= right), dtype=bool)
+    return np.asarray((local <= left) & (local <= right), dtype=bool)
+
+
+def _cached_flags(
+    df: pd.DataFrame,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    window: int,
+    cache: SwingCache,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Інкрементальний шлях; None — кадр без придатного ``timestamp``."""
+
+    timestamps = df["timestamp"] if "timestamp" in df.columns else None
+    if timestamps is None or not pd.api.types.is_datetime64_any_dtype(timestamps):
+        cache.reset()
+        return None
+    keys = pd.DatetimeIndex(timestamps.array).as_unit("ns").asi8
+    total = len(keys)
+    # NaT — найменше int64: не першим він ламає строге зростання.
+    if (total and keys[0] == pd.NaT.value) or (
+        total > 1 and not bool(np.all(keys[1:] > keys[:-1]))
+    ):
+        cache.reset()
+        return None
+
+    overlap = _aligned_overlap(cache, window, keys, highs, lows)
+    shift = int(np.searchsorted(cache.keys, keys[0])) if overlap else 0
+
+    is_high = np.zeros(total, dtype=bool)
+    is_low = np.zeros(total, dtype=bool)
+    # Рішення для idx < overlap - window спираються лише на бари перекриття.
+    reuse_stop = max(window, overlap - window)
+    if reuse_stop > window:
+        src = slice(shift + window, shift + reuse_stop)
+        is_high[window:reuse_stop] = cache.is_high[src]
+        is_low[window:reuse_stop] = cache.is_low[src]
+    is_high[reuse_stop : total - window] = _extremum_flags(
+        highs, window, reuse_stop, total - window, high=True
+    )
+    is_low[reuse_stop : total - window] = _extremum_flags(
+        lows, window, reuse_stop, total - window, high=False
+    )
+    cache.reused += max(0, reuse_stop - window)
+    cache.computed += max(0, total - window - reuse_stop)
+
+    cache.window = window
+    cache.keys = keys.copy()
+    cache.highs = highs.copy()
+    cache.lows = lows.copy()
+    cache.is_high = is_high
+    cache.is_low = is_low
+    return is_high, is_low
+
+
+def _aligned_overlap(
+    cache: SwingCache,
+    window: int,
+    keys: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+) -> int:
+    """Довжина спільного префікса нового вікна з хвостом попереднього."""
+
+    if cache.window != window or not len(cache.keys) or not len(keys):
+        return 0
+    shift = int(np.searchsorted(cache.keys, keys[0]))
+    if shift >= len(cache.keys) or cache.keys[shift] != keys[0]:
+        return 0
+    overlap = min(len(cache.keys) - shift, len(keys))
+    prev = slice(shift, shift + overlap)
+    if not (
+        np.array_equal(cache.keys[prev], keys[:overlap])
+        and np.array_equal(cache.highs[prev], highs[:overlap], equal_nan=True)
+        and np.array_equal(cache.lows[prev], lows[:overlap], equal_nan=True)
+    ):
+        return 0
+    return overlap
+
+
+def _swing_times(df: pd.DataFrame, positions: list[int]) -> list[pd.Timestamp]:
+    """Timestamp лише для рядків-свінгів (семантика ``_extract_timestamp``)."""
+
+    if not positions:
+        return []
+    if "timestamp" not in df.columns:
+        return [_extract_timestamp(df, idx) for idx in positions]
+    values = df["timestamp"].iloc[positions].tolist()
+    times: list[pd.Timestamp] = []
+    for idx, value in zip(positions, values, strict=True):
+        ts = _coerce_scalar_timestamp(value)
+        times.append(ts if ts is not None else _extract_timestamp(df, idx))
+    return times
+
+
 def _extract_timestamp(df: pd.DataFrame, idx: int) -> pd.Timestamp:
     if "timestamp" in df.columns:
         ts = df["timestamp"].iloc[idx]
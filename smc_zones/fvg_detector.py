@@ -6,6 +6,7 @@ import logging
 from collections.abc import Sequence
 from typing import Any, Literal
 
+import numpy as np
 import pandas as pd
 
 from core.serialization import safe_float
@@ -37,13 +38,20 @@ def detect_fvg_zones(
     bias_context = _resolve_bias(meta.get("bias"), getattr(structure, "bias", None))
     last_timestamp = _row_timestamp(frame.iloc[-1])
 
+    highs, highs_missing = _float_column(frame, "high")
+    lows, lows_missing = _float_column(frame, "low")
+    missing = highs_missing | lows_missing
+    candidates = _gap_candidates(highs, lows, atr, cfg)
     zones: list[SmcZone] = []
-    for idx in range(len(frame) - 2):
-        first = frame.iloc[idx]
-        third = frame.iloc[idx + 2]
+    for idx in candidates.tolist():
+        if missing[idx] or missing[idx + 2]:
+            continue
         zone = _build_fvg_zone(
-            first_row=first,
-            third_row=third,
+            high_first=highs[idx],
+            low_first=lows[idx],
+            high_third=highs[idx + 2],
+            low_third=lows[idx + 2],
+            third_row=frame.iloc[idx + 2],
             idx=idx,
             structure=structure,
             atr=atr,
@@ -56,9 +64,64 @@ def detect_fvg_zones(
     return zones
 
 
+def _float_column(frame: pd.DataFrame, column: str) -> tuple[np.ndarray, np.ndarray]:
+    """Колонка як float-масив і маска значень, для яких ``safe_float`` дає None.
+
+    NaN у числовій колонці — звичайне значення (порівняння з ним False), а
+    None/нечисловий рядок в object-колонці відкидає всю трійку барів.
+    """
+
+    series = frame[column]
+    if pd.api.types.is_numeric_dtype(series):
+        if pd.api.types.is_extension_array_dtype(series):
+            # pd.NA у nullable-колонках: float(pd.NA) падає → safe_float None
+            return (
+                series.to_numpy(dtype=float, na_value=np.nan),
+                series.isna().to_numpy(),
+            )
+        values = series.to_numpy(dtype=float)
+        return values, np.zeros(len(values), dtype=bool)
+    parsed = [safe_float(value) for value in series.tolist()]
+    missing = np.array([value is None for value in parsed], dtype=bool)
+    values = np.array(
+        [np.nan if value is None else value for value in parsed], dtype=float
+    )
+    return values, missing
+
+
+def _gap_candidates(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    atr: float | None,
+    cfg: SmcCoreConfig,
+) -> np.ndarray:
+    """Індекси першої свічки 3-барних gap-ів, що проходять поріг ATR/%.
+
+    Маска відтворює умови ``_build_fvg_zone`` поелементно; NaN дає False.
+    Вік зони й timestamp перевіряються вже лише для влучань.
+    """
+
+    high_first, low_first = highs[:-2], lows[:-2]
+    high_third, low_third = highs[2:], lows[2:]
+    is_long = low_third > high_first
+    is_short = ~is_long & (high_third < low_first)
+    price_min = np.where(is_long, high_first, high_third)
+    price_max = np.where(is_long, low_third, low_first)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        gap = np.abs(price_max - price_min)
+        price_ref = (price_min + price_max) / 2.0
+        passes = (price_ref > 0) & (gap / price_ref >= cfg.fvg_min_gap_pct)
+        if atr and atr > 0:
+            passes |= gap >= cfg.fvg_min_gap_atr * atr
+    return np.flatnonzero((is_long | is_short) & (gap > 0) & passes)
+
+
 def _build_fvg_zone(
     *,
-    first_row: pd.Series,
+    high_first: float,
+    low_first: float,
+    high_third: float,
+    low_third: float,
     third_row: pd.Series,
     idx: int,
     structure: SmcStructureState,
@@ -67,18 +130,10 @@ def _build_fvg_zone(
     last_timestamp: pd.Timestamp | None,
     cfg: SmcCoreConfig,
 ) -> SmcZone | None:
-    high_first = safe_float(first_row.get("high"))
-    low_first = safe_float(first_row.get("low"))
-    high_third = safe_float(third_row.get("high"))
-    low_third = safe_float(third_row.get("low"))
-    if (
-        high_first is None
-        or low_first is None
-        or high_third is None
-        or low_third is None
-    ):
-        return None
-
+    high_first = float(high_first)
+    low_first = float(low_first)
+    high_third = float(high_third)
+    low_third = float(low_third)
     direction: Literal["LONG", "SHORT"] | None = None
     price_min: float | None = None
     price_max: float | None = None
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Literal, cast
 
+import numpy as np
 import pandas as pd
 
 from smc_core.config import SmcCoreConfig
@@ -102,7 +103,10 @@ def detect_order_blocks(
         structure.meta.get("atr_last") or structure.meta.get("atr_median") or 0.0
     )
     bias = str(structure.meta.get("bias") or structure.bias or "NEUTRAL").upper()
-    structure_events = list(structure.event_history or structure.events or [])
+    structure_events = _index_break_events(
+        list(structure.event_history or structure.events or [])
+    )
+    prices = _price_arrays(frame)
     zones: list[SmcZone] = []
 
     logger.debug(
@@ -178,7 +182,7 @@ def detect_order_blocks(
         if amplitude <= 0:
             continue
 
-        candidate_pos = _find_ob_candidate(frame, start_pos, direction, cfg)
+        candidate_pos = _find_ob_candidate(prices, start_pos, direction, cfg)
         if candidate_pos is None:
             logger.debug(
                 "OB_v1: не знайдено candlestick для ноги %s",
@@ -302,51 +306,67 @@ def _resolve_position(frame: pd.DataFrame, raw_index: int) -> int | None:
     return None
 
 
+def _price_arrays(frame: pd.DataFrame) -> dict[str, np.ndarray]:
+    """OHLC-колонки як float-масиви — один раз на виклик детектора."""
+
+    return {
+        column: frame[column].astype(float).to_numpy()
+        for column in ("open", "close", "high", "low")
+    }
+
+
 def _find_ob_candidate(
-    frame: pd.DataFrame,
+    prices: dict[str, np.ndarray],
     start_pos: int,
     direction: Literal["LONG", "SHORT"],
     cfg: SmcCoreConfig,
 ) -> int | None:
-    pre_start = max(0, start_pos - cfg.ob_prelude_max_bars)
-    window = frame.iloc[pre_start : start_pos + 1]
-    if window.empty:
-        return None
+    """Остання протилежна свічка у prelude-вікні ``[start - N, start]``.
 
-    def _is_opposite(row: pd.Series) -> bool:
-        open_v = float(row["open"])
-        close_v = float(row["close"])
-        return close_v < open_v if direction == "LONG" else close_v > open_v
+    Скан іде з кінця вікна по індексах масивів, без рядків ``iloc``; якщо
+    протилежної свічки немає — найбільш екстремальна свічка вікна.
+    """
 
-    for rel in range(len(window) - 1, -1, -1):
-        row = window.iloc[rel]
-        if _is_opposite(row):
-            return pre_start + rel
+    pre_start = max(0, start_pos - cfg.ob_prelude_max_bars)
+    stop = start_pos + 1
+    opens = prices["open"][pre_start:stop]
+    if not len(opens):
+        return None
+    closes = prices["close"][pre_start:stop]
+    opposite = closes < opens if direction == "LONG" else closes > opens
+    hits = np.flatnonzero(opposite)
+    if len(hits):
+        return pre_start + int(hits[-1])
 
     # fallback: найбільш екстремальна свічка у вікні
     if direction == "LONG":
-        rel_pos = int(window["low"].astype(float).to_numpy().argmin())
+        rel_pos = int(prices["low"][pre_start:stop].argmin())
     else:
-        rel_pos = int(window["high"].astype(float).to_numpy().argmax())
+        rel_pos = int(prices["high"][pre_start:stop].argmax())
     return pre_start + rel_pos
 
 
-def _leg_break_event(
+def _index_break_events(
     events: list[SmcStructureEvent],
-    leg: SmcStructureLeg,
-    direction: Literal["LONG", "SHORT"],
-) -> SmcStructureEvent | None:
-    target_sig = _leg_signature(leg)
+) -> dict[tuple[str, tuple[int, int, str]], SmcStructureEvent]:
+    """BOS/CHOCH за (напрям, сигнатура ноги); перша подія в списку виграє."""
+
+    index: dict[tuple[str, tuple[int, int, str]], SmcStructureEvent] = {}
     for event in events:
         if event.event_type not in {"BOS", "CHOCH"}:
             continue
-        if event.direction != direction:
-            continue
         if event.source_leg is None:
             continue
-        if _leg_signature(event.source_leg) == target_sig:
-            return event
-    return None
+        index.setdefault((event.direction, _leg_signature(event.source_leg)), event)
+    return index
+
+
+def _leg_break_event(
+    events: dict[tuple[str, tuple[int, int, str]], SmcStructureEvent],
+    leg: SmcStructureLeg,
+    direction: Literal["LONG", "SHORT"],
+) -> SmcStructureEvent | None:
+    return events.get((direction, _leg_signature(leg)))
 
 
 def _leg_signature(leg: SmcStructureLeg) -> tuple[int, int, str]:
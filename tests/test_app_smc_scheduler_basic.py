@@ -32,3 +32,46 @@ def test_scheduler_legacy_mode_processes_all_when_max_nonpositive() -> None:
     meta = _build_capacity_meta(ready_assets=len(ready), processed_assets=len(selected))
     assert meta["pipeline_processed_assets"] == 2
     assert meta["pipeline_skipped_assets"] == 0
+
+
+def test_backpressure_narrows_cycle_to_priority_symbols() -> None:
+    from app.smc_producer import _apply_backpressure_to_cycle, _backpressure_interval
+    from data.unified_store import Backpressure, Priority
+
+    prio = {
+        "xauusd": Priority.NORMAL,
+        "eurusd": Priority.COLD,
+        "gbpusd": Priority.ALERT,
+    }
+    selected = ["xauusd", "eurusd", "gbpusd"]
+
+    kept, deferred = _apply_backpressure_to_cycle(
+        selected=selected,
+        level=Backpressure.NORMAL,
+        priority_of=prio.__getitem__,
+        hard_max_assets=1,
+    )
+    assert kept == selected and deferred == []
+
+    kept, deferred = _apply_backpressure_to_cycle(
+        selected=selected,
+        level=Backpressure.SOFT,
+        priority_of=prio.__getitem__,
+        hard_max_assets=1,
+    )
+    assert kept == ["xauusd", "gbpusd"]
+    assert deferred == ["eurusd"]
+
+    kept, deferred = _apply_backpressure_to_cycle(
+        selected=selected,
+        level=Backpressure.HARD,
+        priority_of=prio.__getitem__,
+        hard_max_assets=1,
+    )
+    assert kept == ["gbpusd"]
+    assert deferred == ["xauusd", "eurusd"]
+
+    assert _backpressure_interval(5, Backpressure.NORMAL) == 5.0
+    assert _backpressure_interval(5, Backpressure.HARD) > _backpressure_interval(
+        5, Backpressure.SOFT
+    )
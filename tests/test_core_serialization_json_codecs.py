@@ -0,0 +1,201 @@
+"""Тести реєстру JSON-кодеків і bytes-API у core.serialization."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import math
+import os
+import random
+from collections.abc import Iterator
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+from core import serialization as ser
+from data import fxcm_ingestor as fxcm
+
+
+class _Side(Enum):
+    BUY = "buy"
+
+
+def _stdlib(obj: object) -> bytes:
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        sort_keys=True,
+        allow_nan=True,
+        separators=(",", ":"),
+        default=ser.to_jsonable,
+    ).encode("utf-8")
+
+
+def _random_payload(rng: random.Random, depth: int = 0) -> object:
+    roll = rng.random()
+    if depth < 3 and roll < 0.25:
+        return {
+            rng.choice(["a", "b", "ї", "z1", "Z"]) + str(i): _random_payload(
+                rng, depth + 1
+            )
+            for i in range(rng.randint(0, 5))
+        }
+    if depth < 3 and roll < 0.4:
+        return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+    return rng.choice(
+        [
+            None,
+            True,
+            rng.randint(-(2**63), 2**63 - 1),
+            rng.random() * 10 ** rng.randint(-9, 20),
+            round(rng.uniform(0, 3000), rng.randint(0, 6)),
+            'рядок \n\t"',
+        ]
+    )
+
+
+@pytest.fixture()
+def fast_codec() -> Iterator[ser.JsonCodec]:
+    pytest.importorskip("orjson")
+    previous = ser.get_json_codec()
+    codec = ser.set_json_codec("orjson")
+    try:
+        yield codec
+    finally:
+        ser.set_json_codec(previous.name)
+
+
+def test_stdlib_codec_is_byte_identical_to_json_dumps() -> None:
+    payload = {"b": [1, 1e-05, float("nan")], "a": "ї", "t": datetime(2024, 1, 1)}
+    assert ser.json_dumps_bytes(payload, codec="stdlib") == _stdlib(payload)
+    assert ser.json_dumps(payload, codec="stdlib") == _stdlib(payload).decode()
+
+
+def test_fast_codec_is_the_default_when_installed() -> None:
+    if os.getenv("AI_ONE_JSON_CODEC"):
+        pytest.skip("кодек перевизначено через AI_ONE_JSON_CODEC")
+    expected = "orjson" if "orjson" in ser.available_json_codecs() else "stdlib"
+    assert ser.get_json_codec().name == expected
+
+
+def test_fast_codec_skips_stdlib_for_plain_payloads(
+    fast_codec: ser.JsonCodec, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    bars = [
+        {"open_time": 1_764_002_100_000 + i, "open": 1.15 + i, "complete": True}
+        for i in range(3)
+    ]
+    payload = {"bars": bars, "meta": None, "ts": datetime(2024, 1, 1, tzinfo=UTC)}
+    expected = _stdlib(payload)
+
+    def _unexpected(obj: object) -> bytes:
+        raise AssertionError("stdlib fallback для простого payload")
+
+    monkeypatch.setattr(ser, "_stdlib_dumps_bytes", _unexpected)
+    assert fast_codec.dumps_bytes(payload) == expected
+
+
+def test_fast_codec_is_byte_identical_on_random_payloads(
+    fast_codec: ser.JsonCodec,
+) -> None:
+    rng = random.Random(7)
+    for _ in range(500):
+        payload = _random_payload(rng)
+        fast = ser.json_dumps_bytes(payload)
+        assert fast == _stdlib(payload)
+        assert ser.json_loads_bytes(fast) == json.loads(fast)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"open": 1e-05, "close": 9.999e-05, "tiny": 5e-324, "neg": -2.5e-07},
+        {"volume": 1e16, "huge": 1.7976931348623157e308, "big": -3.2e21},
+        {"edge": [1e-4, 9999999999999998.0, 0.0, -0.0, 0.1, 1e15]},
+        {10: 1e-05, 2: "int-key", 1: [1e16]},
+        {2.5: "float-key", 1e-05: None},
+        {True: 1e-07, False: 0.5},
+        {"ключ": {"ї": 1e-06, "a": [1e-05, {3: 2e20}]}},
+    ],
+)
+def test_codecs_round_trip_byte_for_byte(
+    fast_codec: ser.JsonCodec, payload: object
+) -> None:
+    fast = fast_codec.dumps_bytes(payload)
+    assert fast == ser.STDLIB_JSON_CODEC.dumps_bytes(payload) == _stdlib(payload)
+    decoded = fast_codec.loads_bytes(fast, "replace")
+    assert decoded == ser.STDLIB_JSON_CODEC.loads_bytes(fast, "replace")
+    # повторне кодування декодованого теж збігається (рядкові ключі після JSON)
+    assert fast_codec.dumps_bytes(decoded) == _stdlib(decoded)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"close": float("nan"), "high": float("inf")},
+        {"side": _Side.BUY},
+        {"nested": [{"side": _Side.BUY, "px": 1.5}], "none": None},
+        {"close": [None, 1.5, float("-inf")]},
+        {"id": "fvg_1e5", "px": 0.5, "at": Decimal("1.50"), "p": Path("a/b")},
+        {"ts": datetime(2024, 1, 1, tzinfo=UTC), "d": date(2024, 1, 2)},
+        {"ts": [datetime(2024, 1, 1), {"set": {1e-05}}]},
+        {1: "int-key"},
+        {"big": 2**70},
+        {"nested": [{"ok": 1}, (1, {2, 3})]},
+    ],
+)
+def test_fast_codec_falls_back_to_stdlib_output(
+    fast_codec: ser.JsonCodec, payload: object
+) -> None:
+    assert fast_codec.dumps_bytes(payload) == _stdlib(payload)
+
+
+def test_fast_codec_loads_matches_stdlib_edge_cases(
+    fast_codec: ser.JsonCodec,
+) -> None:
+    loaded = ser.json_loads_bytes(b'{"a":NaN,"b":Infinity,"c":123456789012345678901}')
+    assert math.isnan(loaded["a"]) and loaded["b"] == math.inf
+    assert loaded["c"] == 123456789012345678901
+    raw = b'{"s":"a\xffb"}'
+    assert ser.json_loads_bytes(raw) == {"s": "a�b"}
+    assert ser.json_loads_bytes(raw, errors="ignore") == {"s": "ab"}
+    with pytest.raises(json.JSONDecodeError):
+        ser.json_loads_bytes(b"{broken")
+
+
+def test_registry_switch_and_unknown_codec() -> None:
+    previous = ser.get_json_codec()
+    calls: list[object] = []
+
+    def dumps(obj: object) -> bytes:
+        calls.append(obj)
+        return b"{}"
+
+    ser.register_json_codec(
+        ser.JsonCodec("test", dumps, lambda data, errors: {}), activate=True
+    )
+    try:
+        assert ser.json_dumps({"a": 1}) == "{}"
+        assert ser.json_loads("[1]") == {}
+        assert "test" in ser.available_json_codecs()
+    finally:
+        ser.set_json_codec(previous.name)
+        ser._JSON_CODECS.pop("test", None)
+    assert calls == [{"a": 1}]
+    with pytest.raises(ValueError):
+        ser.set_json_codec("missing")
+
+
+def test_hmac_verification_stays_on_stdlib_bytes(fast_codec: ser.JsonCodec) -> None:
+    # 1e-05 — експоненційна форма: і stdlib, і fast-кодек пишуть "1e-05".
+    payload = {"symbol": "EURUSD", "tf": "1m", "bars": [{"open": 1e-05}]}
+    raw = json.dumps(
+        payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
+    assert fast_codec.dumps_bytes(payload) == raw
+    sig = hmac.new(b"secret", raw, hashlib.sha256).hexdigest()
+    assert fxcm._verify_hmac_signature(payload, sig, secret="secret")
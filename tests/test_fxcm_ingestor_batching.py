@@ -0,0 +1,212 @@
+"""Тести мікробатчингу FXCM інжестора (групування по (symbol, tf))."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from data import fxcm_ingestor as fxcm
+from data.unified_store import PutBarsManyError
+
+
+class _FakeFeedState:
+    market_state = "open"
+    price_state = "ok"
+    ohlcv_state = "ok"
+
+
+class _BurstPubSub:
+    """Віддає всі повідомлення одразу (як warmup-навала), потім cancel."""
+
+    def __init__(self, messages: list[Any]) -> None:
+        self._messages = messages
+
+    async def subscribe(self, *_channels: str) -> None:
+        return None
+
+    async def unsubscribe(self, *_channels: str) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def listen(self):  # type: ignore[override]
+        yield {"type": "subscribe", "data": 1}
+        for data in self._messages:
+            yield {"type": "message", "data": data}
+        # Даємо консюмеру вибрати чергу до завершення читача.
+        await asyncio.sleep(0.05)
+        raise asyncio.CancelledError()
+
+
+class _FakeRedis:
+    def __init__(self, pubsub: _BurstPubSub) -> None:
+        self._pubsub = pubsub
+
+    def pubsub(self) -> _BurstPubSub:
+        return self._pubsub
+
+    async def close(self) -> None:
+        return None
+
+
+class _ManyStore:
+    def __init__(self) -> None:
+        self.many_calls: list[list[tuple[str, str, pd.DataFrame]]] = []
+        self.put_calls: list[tuple[str, str, pd.DataFrame]] = []
+
+    async def put_bars(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        self.put_calls.append((symbol, interval, df.copy()))
+
+    async def put_bars_many(self, items: Any) -> None:
+        self.many_calls.append([(s, tf, df.copy()) for s, tf, df in items])
+
+
+class _PartialManyStore(_ManyStore):
+    """put_bars_many комітить усе, крім ключів із ``failing`` (як UDS)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failing: set[str] = set()
+
+    async def put_bars_many(self, items: Any) -> None:
+        items = list(items)
+        await super().put_bars_many(
+            [(s, tf, df) for s, tf, df in items if s not in self.failing]
+        )
+        failed = {(s, tf): RuntimeError("disk full") for s, tf, _df in items}
+        failed = {k: e for k, e in failed.items() if k[0] in self.failing}
+        if failed:
+            raise PutBarsManyError(failed)
+
+
+class _PutOnlyStore:
+    def __init__(self) -> None:
+        self.put_calls: list[tuple[str, str, pd.DataFrame]] = []
+
+    async def put_bars(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        self.put_calls.append((symbol, interval, df.copy()))
+
+
+def _message(symbol: str, open_time: int, *, complete: bool = True) -> bytes:
+    bar = {
+        "open_time": open_time,
+        "close_time": open_time + 59_999,
+        "open": 1.0,
+        "high": 1.1,
+        "low": 0.9,
+        "close": 1.05,
+        "volume": 10.0,
+        "complete": complete,
+    }
+    return json.dumps({"symbol": symbol, "tf": "1m", "bars": [bar]}).encode()
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch: pytest.MonkeyPatch) -> None:
+    fxcm._reset_live_cache_for_tests()
+    monkeypatch.setattr(fxcm, "get_fxcm_feed_state", lambda: _FakeFeedState())
+    monkeypatch.setattr(fxcm, "_INGEST_STATS", dict(fxcm._INGEST_STATS))
+    for key in fxcm._INGEST_STATS:
+        fxcm._INGEST_STATS[key] = 0
+
+
+async def _run(
+    monkeypatch: pytest.MonkeyPatch, store: Any, messages: list[Any], **kwargs: Any
+) -> None:
+    pubsub = _BurstPubSub(messages)
+    monkeypatch.setattr(fxcm, "Redis", lambda **_kw: _FakeRedis(pubsub))
+    with pytest.raises(asyncio.CancelledError):
+        await fxcm.run_fxcm_ingestor(store, **kwargs)
+
+
+async def test_burst_is_committed_as_one_grouped_write(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    messages = []
+    for i in range(50):
+        messages.append(_message("xauusd", i * 60_000))
+        messages.append(_message("eurusd", i * 60_000))
+    messages.insert(10, b"not-json")
+
+    store = _ManyStore()
+    await _run(monkeypatch, store, messages)
+
+    assert store.put_calls == []
+    items = [item for call in store.many_calls for item in call]
+    assert len(store.many_calls) < len(messages) / 10
+    for symbol in ("xauusd", "eurusd"):
+        opens = [int(df["open_time"].iloc[0]) for s, _tf, df in items if s == symbol]
+        # Порядок у межах ключа збережено.
+        assert opens == [i * 60_000 for i in range(50)]
+
+    stats = fxcm.get_fxcm_ingest_stats()
+    assert stats["messages"] == len(messages)
+    assert stats["commits"] == 100
+    assert stats["batches"] == len(store.many_calls)
+    assert stats["max_batch"] > 1
+
+
+async def test_partial_put_many_retries_only_failed_keys() -> None:
+    store = _PartialManyStore()
+    store.failing = {"eurusd"}
+    batch = [
+        (0.0, _message("xauusd", 0)),
+        (0.0, _message("eurusd", 0)),
+        (0.0, _message("xauusd", 60_000)),
+    ]
+    committed, failed = await fxcm._ingest_batch(
+        store,
+        batch,
+        channel="fxcm:ohlcv",
+        hmac_secret=None,
+        hmac_algo="sha256",
+        hmac_required=False,
+        allowed_pairs=None,
+    )
+
+    # Закомічені ключі не пишуться вдруге — повтор лише для eurusd.
+    assert [s for s, _tf, _df in store.put_calls] == ["eurusd"]
+    assert [s for s, _tf, _df in store.many_calls[0]] == ["xauusd", "xauusd"]
+    assert [p.symbol for p in committed] == ["xauusd", "eurusd", "xauusd"]
+    assert failed == set()
+    assert fxcm.get_fxcm_ingest_stats()["commits"] == 3
+
+
+async def test_batch_limit_and_put_bars_fallback(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    messages = [_message("xauusd", i * 60_000) for i in range(30)]
+    store = _PutOnlyStore()
+    await _run(monkeypatch, store, messages, batch_max_messages=8)
+
+    stats = fxcm.get_fxcm_ingest_stats()
+    assert stats["max_batch"] <= 8
+    assert stats["batches"] >= 4
+    # Без put_bars_many кожна група комітиться одним конкатенованим put_bars.
+    assert len(store.put_calls) == stats["batches"]
+    opens = [int(t) for _s, _tf, df in store.put_calls for t in df["open_time"]]
+    assert opens == [i * 60_000 for i in range(30)]
+
+
+async def test_live_bar_finalization_semantics_unchanged(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Лише live-бари: попередній фіналізується при появі нового open_time.
+    base = 1_700_000_040_000
+    messages = [
+        _message("xauusd", base, complete=False),
+        _message("xauusd", base, complete=False),
+        _message("xauusd", base + 60_000, complete=False),
+        _message("xauusd", base + 120_000, complete=False),
+    ]
+    store = _ManyStore()
+    await _run(monkeypatch, store, messages)
+
+    items = [item for call in store.many_calls for item in call]
+    opens = [int(t) for _s, _tf, df in items for t in df["open_time"]]
+    assert opens == [base, base + 60_000]
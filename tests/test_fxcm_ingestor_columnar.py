@@ -0,0 +1,115 @@
+"""Тести колонкового (без DataFrame) шляху FXCM інжесту в UDS."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+import pytest
+from redis.asyncio import Redis
+
+from data import fxcm_ingestor as fxcm
+from data.bar_ring_buffer import BarRingBuffer
+from data.unified_store import StoreConfig, UnifiedDataStore
+
+
+class _InMemoryRedis:
+    def __init__(self) -> None:
+        self._store: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self._store[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+
+class _FakeFeedState:
+    market_state = "open"
+    price_state = "ok"
+    ohlcv_state = "ok"
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch: pytest.MonkeyPatch) -> None:
+    fxcm._reset_live_cache_for_tests()
+    monkeypatch.setattr(fxcm, "get_fxcm_feed_state", lambda: _FakeFeedState())
+
+
+def _raw_bar(open_time: int, *, complete: bool = True) -> dict[str, Any]:
+    return {
+        "open_time": open_time,
+        "close_time": open_time + 59_999,
+        "open": 1.0,
+        "high": 1.5,
+        "low": 0.5,
+        "close": 1.2 + open_time / 1e9,
+        "volume": 3,
+        "complete": complete,
+    }
+
+
+def test_columns_match_dataframe_path() -> None:
+    raw = [_raw_bar(t) for t in (180_000, 60_000, 120_000)]
+    sanitized = [b for b in (fxcm._sanitize_bar(r) for r in raw) if b is not None]
+
+    columns = fxcm._bars_payload_to_columns(sanitized)
+    frame = fxcm._bars_payload_to_df(sanitized)
+
+    assert columns["open_time"].dtype == np.int64
+    assert columns["close"].dtype == np.float64
+    assert list(columns) == list(frame.columns)
+    for name, values in columns.items():
+        assert values.tolist() == frame[name].astype(values.dtype).tolist()
+    assert columns["open_time"].tolist() == [60_000, 120_000, 180_000]
+
+
+def test_buffer_rejects_unsafe_column_cast() -> None:
+    base = fxcm._bars_payload_to_columns(
+        [b for b in [fxcm._sanitize_bar(_raw_bar(60_000))] if b is not None]
+    )
+    buf = BarRingBuffer.from_frame(pd.DataFrame(base), capacity=8)
+    assert buf is not None
+
+    bad = dict(base, open_time=base["open_time"].astype(np.float64) + 60_000)
+    assert not buf.try_merge_arrays(bad)
+    good = dict(base, open_time=base["open_time"] + 60_000)
+    assert buf.try_merge_arrays(good)
+    assert buf.view()["open_time"].tolist() == [60_000, 120_000]
+
+
+async def test_process_payload_appends_columns_into_store(tmp_path: Path) -> None:
+    store = UnifiedDataStore(
+        redis=cast(Redis, _InMemoryRedis()),
+        cfg=StoreConfig(
+            base_dir=str(tmp_path), validate_on_read=False, validate_on_write=False
+        ),
+    )
+    base = 1_700_000_040_000
+
+    async def ingest(*bars: dict[str, Any]) -> int:
+        rows, _sym, _tf = await fxcm._process_payload(
+            store,
+            {"symbol": "XAUUSD", "tf": "1m", "bars": list(bars)},
+            hmac_secret=None,
+            hmac_algo="sha256",
+            hmac_required=False,
+        )
+        return rows
+
+    assert await ingest(_raw_bar(base), _raw_bar(base + 60_000)) == 2
+    buf = store.ram.get_buffer("xauusd", "1m")
+    assert buf is not None
+    # Наступні пакети (включно з фіналізацією live-бару) йдуть у буфер на місці.
+    assert await ingest(_raw_bar(base + 120_000, complete=False)) == 0
+    assert await ingest(_raw_bar(base + 180_000, complete=False)) == 1
+    assert store.ram.get_buffer("xauusd", "1m") is buf
+
+    df = await store.get_df("xauusd", "1m", limit=10)
+    assert df["open_time"].tolist() == [base + i * 60_000 for i in range(3)]
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None and meta.rows == 3
+    assert meta.last_open_time == base + 120_000
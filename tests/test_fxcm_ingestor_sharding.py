@@ -0,0 +1,254 @@
+"""Тести шардованого FXCM інжесту: афінність (symbol, tf), черги, лічильники."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import fxcm_ingestor as fxcm
+
+
+class _FakeFeedState:
+    market_state = "open"
+    price_state = "ok"
+    ohlcv_state = "ok"
+
+
+class _GatedStore:
+    """put_bars для символів із ``blocked`` чекає на gate; ``failing`` — падає."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.blocked: set[str] = set()
+        self.failing: set[str] = set()
+        self.rows: list[tuple[str, int]] = []
+
+    async def put_bars(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        if symbol in self.blocked:
+            await self.gate.wait()
+        if symbol in self.failing:
+            raise RuntimeError("disk full")
+        self.rows.extend((symbol, int(t)) for t in df["open_time"])
+
+
+class _BurstPubSub:
+    def __init__(self, messages: list[bytes]) -> None:
+        self._messages = messages
+
+    async def subscribe(self, *_channels: str) -> None:
+        return None
+
+    async def unsubscribe(self, *_channels: str) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def listen(self):  # type: ignore[override]
+        for data in self._messages:
+            yield {"type": "message", "data": data}
+        await asyncio.sleep(0.05)
+        raise asyncio.CancelledError()
+
+
+class _FakeRedis:
+    def __init__(self, pubsub: _BurstPubSub) -> None:
+        self._pubsub = pubsub
+
+    def pubsub(self) -> _BurstPubSub:
+        return self._pubsub
+
+    async def close(self) -> None:
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch: pytest.MonkeyPatch) -> None:
+    fxcm._reset_live_cache_for_tests()
+    monkeypatch.setattr(fxcm, "get_fxcm_feed_state", lambda: _FakeFeedState())
+    monkeypatch.setattr(fxcm, "_INGEST_STATS", dict(fxcm._INGEST_STATS))
+    monkeypatch.setattr(fxcm, "_SHARD_STATS", {})
+
+
+def _distinct_symbols(shards: int) -> tuple[str, str]:
+    """Два символи, що гарантовано потрапляють у різні шарди."""
+
+    candidates = ["xauusd", "eurusd", "gbpusd", "usdjpy", "audusd", "nzdusd"]
+    first = candidates[0]
+    home = fxcm._shard_of(first, "1m", shards)
+    other = next(s for s in candidates if fxcm._shard_of(s, "1m", shards) != home)
+    return first, other
+
+
+def _prepared(symbol: str, open_time: int) -> fxcm._PreparedBars:
+    bars = {
+        "open_time": np.array([open_time], dtype=np.int64),
+        "open": np.array([1.0]),
+        "high": np.array([1.1]),
+        "low": np.array([0.9]),
+        "close": np.array([1.05]),
+        "volume": np.array([10.0]),
+        "close_time": np.array([open_time + 59_999], dtype=np.int64),
+    }
+    return fxcm._PreparedBars(symbol, "1m", bars, [False])
+
+
+async def _submit(
+    shards: fxcm._IngestShards, items: list[fxcm._PreparedBars], *, wait: bool
+) -> list[bool]:
+    return await shards.submit(items, [time.perf_counter()] * len(items), wait=wait)
+
+
+async def _until(predicate: Any, timeout: float = 2.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "умова не виконалась вчасно"
+        await asyncio.sleep(0.001)
+
+
+async def test_slow_symbol_does_not_block_other_shards() -> None:
+    slow, fast = _distinct_symbols(2)
+    store = _GatedStore()
+    store.blocked = {slow}
+    shards = fxcm._IngestShards(
+        store, shards=2, queue_maxsize=100, batch_max_messages=1
+    )
+    try:
+        items = []
+        for i in range(5):
+            items.append(_prepared(slow, i * 60_000))
+            items.append(_prepared(fast, i * 60_000))
+        assert await _submit(shards, items, wait=False) == [True] * 10
+
+        await _until(lambda: len(store.rows) == 5)
+        assert {s for s, _t in store.rows} == {fast}
+
+        store.gate.set()
+        await _until(lambda: len(store.rows) == 10)
+        for symbol in (slow, fast):
+            opens = [t for s, t in store.rows if s == symbol]
+            assert opens == [i * 60_000 for i in range(5)]
+    finally:
+        await shards.close()
+
+    stats = fxcm.get_fxcm_shard_stats()
+    assert sum(s["commits"] for s in stats.values()) == 10
+
+
+async def test_full_shard_queue_counts_backpressure() -> None:
+    slow, _fast = _distinct_symbols(2)
+    store = _GatedStore()
+    store.blocked = {slow}
+    shards = fxcm._IngestShards(store, shards=2, queue_maxsize=1, batch_max_messages=1)
+    home = fxcm._shard_of(slow, "1m", 2)
+    try:
+        task = asyncio.create_task(
+            _submit(shards, [_prepared(slow, i * 60_000) for i in range(4)], wait=False)
+        )
+        await _until(lambda: fxcm.get_fxcm_shard_stats()[home]["backpressure"] > 0)
+        assert not task.done()
+        assert fxcm.get_fxcm_shard_stats()[home]["max_queue_depth"] == 1
+
+        store.gate.set()
+        await task
+        await _until(lambda: len(store.rows) == 4)
+    finally:
+        await shards.close()
+
+
+async def test_wait_mode_reports_failed_commits_as_dropped() -> None:
+    bad, good = _distinct_symbols(3)
+    store = _GatedStore()
+    store.failing = {bad}
+    shards = fxcm._IngestShards(store, shards=3, queue_maxsize=10, batch_max_messages=8)
+    try:
+        results = await _submit(
+            shards, [_prepared(good, 0), _prepared(bad, 0)], wait=True
+        )
+    finally:
+        await shards.close()
+
+    assert results == [True, False]
+    stats = fxcm.get_fxcm_shard_stats()
+    assert stats[fxcm._shard_of(bad, "1m", 3)]["dropped"] == 1
+    assert store.rows == [(good, 0)]
+
+
+async def test_run_ingestor_with_shards_preserves_per_key_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    symbols = ["xauusd", "eurusd", "gbpusd", "usdjpy"]
+    messages = []
+    for i in range(20):
+        for symbol in symbols:
+            bar = {
+                "open_time": i * 60_000,
+                "close_time": i * 60_000 + 59_999,
+                "open": 1.0,
+                "high": 1.1,
+                "low": 0.9,
+                "close": 1.05,
+                "volume": 10.0,
+                "complete": True,
+            }
+            payload = {"symbol": symbol, "tf": "1m", "bars": [bar]}
+            messages.append(json.dumps(payload).encode())
+    pubsub = _BurstPubSub(messages)
+    monkeypatch.setattr(fxcm, "Redis", lambda **_kw: _FakeRedis(pubsub))
+
+    store = _GatedStore()
+    with pytest.raises(asyncio.CancelledError):
+        await fxcm.run_fxcm_ingestor(store, shards=4)
+
+    for symbol in symbols:
+        assert [t for s, t in store.rows if s == symbol] == [
+            i * 60_000 for i in range(20)
+        ]
+    assert len(fxcm.get_fxcm_shard_stats()) == 4
+
+
+async def test_pubsub_shards_log_only_committed_bars(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    bad, good = _distinct_symbols(2)
+    messages = []
+    for i in range(5):
+        for symbol in (good, bad):
+            bar = {
+                "open_time": i * 60_000,
+                "close_time": i * 60_000 + 59_999,
+                "open": 1.0,
+                "high": 1.1,
+                "low": 0.9,
+                "close": 1.05,
+                "volume": 10.0,
+                "complete": True,
+            }
+            payload = {"symbol": symbol, "tf": "1m", "bars": [bar]}
+            messages.append(json.dumps(payload).encode())
+    pubsub = _BurstPubSub(messages)
+    monkeypatch.setattr(fxcm, "Redis", lambda **_kw: _FakeRedis(pubsub))
+
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = records.append  # type: ignore[method-assign]
+    fxcm.logger.addHandler(handler)
+    store = _GatedStore()
+    store.failing = {bad}
+    try:
+        with pytest.raises(asyncio.CancelledError):
+            await fxcm.run_fxcm_ingestor(store, shards=2, log_every_n=1)
+    finally:
+        fxcm.logger.removeHandler(handler)
+
+    logged = [r.args for r in records if "Інгестовано барів" in r.msg]
+    assert logged, "закомічені бари мають логуватись"
+    assert {args[1] for args in logged} == {good}
+    assert logged[-1][0] == 5
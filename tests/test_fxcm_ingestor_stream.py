@@ -0,0 +1,316 @@
+"""Тести Redis Streams транспорту FXCM інжестора (XREADGROUP/XACK/pending)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import uuid
+from functools import partial
+from typing import Any
+
+import pandas as pd
+import pytest
+from redis.exceptions import ResponseError
+
+from data import fxcm_ingestor as fxcm
+
+
+class _FakeFeedState:
+    market_state = "open"
+    price_state = "ok"
+    ohlcv_state = "ok"
+
+
+class _FakeStreamRedis:
+    """Мінімальна модель стріму з однією consumer group.
+
+    ">" віддає записи після last-delivered і кладе їх у pending споживача;
+    "0" віддає pending цього споживача. Порожнє читання ">" (або вичерпаний
+    ліміт читань) завершує споживача через CancelledError — як зупинка пайплайна.
+    """
+
+    def __init__(self, *, max_reads: int = 100) -> None:
+        self.entries: list[tuple[bytes, dict[bytes, bytes]]] = []
+        self.groups: dict[str, int] = {}
+        self.pending: dict[str, list[bytes]] = {}
+        self.reads: list[tuple[str, str, int | None]] = []
+        self.dead: dict[str, list[dict[str, Any]]] = {}
+        self.max_reads = max_reads
+
+    def add(self, data: bytes) -> bytes:
+        entry_id = f"{len(self.entries) + 1}-0".encode()
+        self.entries.append((entry_id, {b"data": data}))
+        return entry_id
+
+    async def xgroup_create(
+        self, name: str, groupname: str, id: str = "$", mkstream: bool = False
+    ) -> bool:
+        if groupname in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups[groupname] = 0 if id == "0" else len(self.entries)
+        return True
+
+    async def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: dict[str, str],
+        count: int | None = None,
+        block: int | None = None,
+    ) -> list[Any]:
+        ((key, cursor),) = streams.items()
+        self.reads.append((consumername, cursor, count))
+        if len(self.reads) > self.max_reads:
+            raise asyncio.CancelledError()
+        limit = count or len(self.entries)
+        pending = self.pending.setdefault(consumername, [])
+        if cursor == "0":
+            by_id = dict(self.entries)
+            batch = [(eid, by_id[eid]) for eid in pending[:limit]]
+        else:
+            start = self.groups[groupname]
+            batch = self.entries[start : start + limit]
+            self.groups[groupname] = start + len(batch)
+            pending.extend(eid for eid, _fields in batch)
+            if not batch:
+                raise asyncio.CancelledError()
+        return [[key.encode(), batch]] if batch else []
+
+    async def xack(self, name: str, groupname: str, *ids: bytes) -> int:
+        acked = 0
+        for pending in self.pending.values():
+            for entry_id in ids:
+                if entry_id in pending:
+                    pending.remove(entry_id)
+                    acked += 1
+        return acked
+
+    async def xadd(self, name: str, fields: dict[str, Any]) -> bytes:
+        self.dead.setdefault(name, []).append(fields)
+        return f"{len(self.dead[name])}-0".encode()
+
+    async def close(self) -> None:
+        return None
+
+
+class _ManyStore:
+    def __init__(self) -> None:
+        self.fail_symbols: set[str] = set()
+        self.rows: list[tuple[str, int]] = []
+
+    async def put_bars(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        if symbol in self.fail_symbols:
+            raise RuntimeError("disk full")
+        self.rows.extend((symbol, int(t)) for t in df["open_time"])
+
+    async def put_bars_many(self, items: Any) -> None:
+        if any(symbol in self.fail_symbols for symbol, _tf, _df in items):
+            raise RuntimeError("disk full")
+        for symbol, interval, df in items:
+            await self.put_bars(symbol, interval, df)
+
+
+def _message(symbol: str, open_time: int) -> bytes:
+    bar = {
+        "open_time": open_time,
+        "close_time": open_time + 59_999,
+        "open": 1.0,
+        "high": 1.1,
+        "low": 0.9,
+        "close": 1.05,
+        "volume": 10.0,
+        "complete": True,
+    }
+    return json.dumps({"symbol": symbol, "tf": "1m", "bars": [bar]}).encode()
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch: pytest.MonkeyPatch) -> None:
+    fxcm._reset_live_cache_for_tests()
+    monkeypatch.setattr(fxcm, "get_fxcm_feed_state", lambda: _FakeFeedState())
+    monkeypatch.setattr(fxcm, "_INGEST_STATS", dict(fxcm._INGEST_STATS))
+    for key in fxcm._INGEST_STATS:
+        fxcm._INGEST_STATS[key] = 0
+
+
+async def _ingest(store: Any, batch: list[tuple[float, Any]]) -> set[int]:
+    _committed, failed = await fxcm._ingest_batch(
+        store,
+        batch,
+        channel="fxcm:ohlcv",
+        hmac_secret=None,
+        hmac_algo="sha256",
+        hmac_required=False,
+        allowed_pairs=None,
+    )
+    return failed
+
+
+async def _consume(redis: Any, store: Any, *, consumer: str = "ingestor-1") -> None:
+    with pytest.raises(asyncio.CancelledError):
+        await fxcm._consume_stream(
+            redis,
+            "fxcm:ohlcv",
+            group="ai_one_ingestor",
+            consumer=consumer,
+            ingest=partial(_ingest, store),
+            on_read=lambda: None,
+            count=8,
+            block_ms=0,
+            retry_sec=0.0,
+        )
+
+
+async def test_stream_batches_are_acked_after_commit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis = _FakeStreamRedis()
+    for i in range(20):
+        redis.add(_message("xauusd", i * 60_000))
+    redis.add(b"not-json")
+    monkeypatch.setattr(fxcm, "Redis", lambda **_kw: redis)
+
+    store = _ManyStore()
+    with pytest.raises(asyncio.CancelledError):
+        await fxcm.run_fxcm_ingestor(store, transport="stream", batch_max_messages=8)
+
+    assert store.rows == [("xauusd", i * 60_000) for i in range(20)]
+    assert redis.pending["ingestor-1"] == []
+    assert {count for _c, _cursor, count in redis.reads} == {8}
+    stats = fxcm.get_fxcm_ingest_stats()
+    # Відкинутий (битий) запис теж акається — повтор його не виправить.
+    assert stats["stream_acked"] == 21
+    assert stats["max_batch"] <= 8
+
+
+async def test_failed_commit_stays_pending_and_replays_after_restart() -> None:
+    # 5 читань: одна невдача на першому батчі + 3 повтори < max_deliveries
+    redis = _FakeStreamRedis(max_reads=5)
+    for i in range(4):
+        redis.add(_message("xauusd", i * 60_000))
+        redis.add(_message("eurusd", i * 60_000))
+    store = _ManyStore()
+    store.fail_symbols = {"eurusd"}
+
+    await _consume(redis, store)
+
+    assert [s for s, _t in store.rows] == ["xauusd"] * 4
+    assert len(redis.pending["ingestor-1"]) == 4
+    assert fxcm.get_fxcm_ingest_stats()["stream_retry"] > 0
+
+    # Рестарт зі здоровим стором: pending перечитується з id 0 і акається.
+    store.fail_symbols = set()
+    redis.reads.clear()
+    await _consume(redis, store)
+
+    assert redis.reads[0][1] == "0"
+    eurusd = [t for s, t in store.rows if s == "eurusd"]
+    assert eurusd == [i * 60_000 for i in range(4)]
+    assert redis.pending["ingestor-1"] == []
+    assert fxcm.get_fxcm_ingest_stats()["stream_replayed"] >= 4
+
+
+async def test_poison_entry_goes_to_dead_letter_and_stream_moves_on() -> None:
+    redis = _FakeStreamRedis()
+    redis.add(_message("xauusd", 0))
+    poison = redis.add(_message("eurusd", 0))
+    redis.add(_message("xauusd", 60_000))
+    store = _ManyStore()
+    store.fail_symbols = {"eurusd"}
+    await _consume(redis, store)
+
+    for i in range(2, 12):
+        redis.add(_message("xauusd", i * 60_000))
+    await _consume(redis, store)
+
+    assert [t for s, t in store.rows if s == "xauusd"] == [
+        i * 60_000 for i in range(12)
+    ]
+    assert redis.pending["ingestor-1"] == []
+    (dead,) = redis.dead["fxcm:ohlcv:dead"]
+    assert dead["data"] == _message("eurusd", 0)
+    assert dead["source_id"] == poison.decode()
+    assert dead["deliveries"] == str(fxcm.FXCM_OHLCV_STREAM_MAX_DELIVERIES)
+    assert fxcm.get_fxcm_ingest_stats()["stream_dead_lettered"] == 1
+
+
+async def test_raising_ingest_is_retried_one_by_one() -> None:
+    redis = _FakeStreamRedis()
+    for i in range(4):
+        redis.add(_message("xauusd", i * 60_000))
+    store = _ManyStore()
+
+    async def _explode_on_poison(batch: list[tuple[float, Any]]) -> set[int]:
+        if any(b'"open_time": 120000' in data for _t, data in batch):
+            raise ValueError("poison")
+        return await _ingest(store, batch)
+
+    with pytest.raises(asyncio.CancelledError):
+        await fxcm._consume_stream(
+            redis,
+            "fxcm:ohlcv",
+            group="ai_one_ingestor",
+            consumer="ingestor-1",
+            ingest=_explode_on_poison,
+            on_read=lambda: None,
+            count=8,
+            block_ms=0,
+            retry_sec=0.0,
+            max_deliveries=2,
+            dead_letter_key="fxcm:ohlcv:dlq",
+        )
+
+    # Сусіди отруйного запису закомічені по одному, сам він — у DLQ.
+    assert [t for _s, t in store.rows] == [0, 60_000, 180_000]
+    assert redis.pending["ingestor-1"] == []
+    assert len(redis.dead["fxcm:ohlcv:dlq"]) == 1
+
+
+async def test_restart_resumes_after_last_acked_entry() -> None:
+    redis = _FakeStreamRedis()
+    for i in range(5):
+        redis.add(_message("xauusd", i * 60_000))
+    store = _ManyStore()
+    await _consume(redis, store)
+
+    for i in range(5, 8):
+        redis.add(_message("xauusd", i * 60_000))
+    await _consume(redis, store)
+
+    # Кожен бар записано рівно один раз: група пам'ятає позицію в Redis.
+    assert [t for _s, t in store.rows] == [i * 60_000 for i in range(8)]
+
+
+@pytest.mark.skipif(
+    not os.getenv("AI_ONE_TEST_REDIS_URL"),
+    reason="потрібен локальний Redis (AI_ONE_TEST_REDIS_URL=redis://localhost:6379/15)",
+)
+async def test_stream_against_local_redis() -> None:
+    from redis.asyncio import Redis
+
+    redis = Redis.from_url(os.environ["AI_ONE_TEST_REDIS_URL"])
+    key = f"test:fxcm:ohlcv:{uuid.uuid4().hex}"
+    store = _ManyStore()
+    try:
+        for i in range(10):
+            await redis.xadd(key, {"data": _message("xauusd", i * 60_000)})
+        consumer = fxcm._consume_stream(
+            redis,
+            key,
+            group="ai_one_ingestor",
+            consumer="ingestor-1",
+            ingest=partial(_ingest, store),
+            on_read=lambda: None,
+            count=4,
+            block_ms=50,
+            retry_sec=0.0,
+        )
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(consumer, timeout=0.5)
+        pending = await redis.xpending(key, "ai_one_ingestor")
+        assert pending["pending"] == 0
+        assert [t for _s, t in store.rows] == [i * 60_000 for i in range(10)]
+    finally:
+        await redis.delete(key)
+        await redis.close()
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import time
+from pathlib import Path
+from typing import Any, cast
 
 import pandas as pd
+from redis.asyncio import Redis
 
 from app.fxcm_history_state import (
     FxcmHistoryState,
@@ -13,6 +16,7 @@ from app.fxcm_history_state import (
     compute_history_status,
     timeframe_to_ms,
 )
+from data.unified_store import StoreConfig, UnifiedDataStore
 
 
 class _FakeStore:
@@ -109,3 +113,47 @@ async def test_compute_history_status_reads_tail_and_counts() -> None:
     assert status.bars_count == 1
     assert status.last_open_time_ms is not None
     assert status.state in {"ok", "unknown"}
+
+
+async def test_compute_history_status_prefers_series_meta(tmp_path: Path) -> None:
+    class _Redis:
+        async def get(self, key: str) -> None:
+            return None
+
+        async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+            return True
+
+    store = UnifiedDataStore(
+        redis=cast(Redis, _Redis()),
+        cfg=StoreConfig(
+            base_dir=str(tmp_path), validate_on_read=False, validate_on_write=False
+        ),
+    )
+    now_ms = 1_700_000_000_000
+    times = [now_ms - 60_000 * i for i in range(5, 0, -1)]
+    await store.put_bars(
+        "xauusd",
+        "1m",
+        pd.DataFrame(
+            {
+                "open_time": times,
+                "open": 1.0,
+                "high": 1.0,
+                "low": 1.0,
+                "close": 1.0,
+                "volume": 1.0,
+                "close_time": [t + 59_999 for t in times],
+            }
+        ),
+    )
+
+    async def _no_df(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("get_df не має викликатися, коли є метадані")
+
+    store.get_df = _no_df  # type: ignore[method-assign]
+    status = await compute_history_status(
+        store=store, symbol="xauusd", timeframe="1m", min_history_bars=3, now_ms=now_ms
+    )
+    assert status.bars_count == 3
+    assert status.last_open_time_ms == times[-1]
+    assert status.state == "ok"
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
 
 import pandas as pd
 import pytest
+from redis.asyncio import Redis
 
 from app.fxcm_warmup_requester import FxcmWarmupRequester
+from data.unified_store import StoreConfig, UnifiedDataStore
 
 
 class _FakeRedis:
@@ -262,3 +267,72 @@ async def test_requester_prefetches_when_ok_but_contract_wants_more(
     assert payload["reason"] == "prefetch_history"
     assert payload["s2"]["history_state"] == "ok"
     assert payload["lookback_bars"] == 2000
+
+
+class _KvRedis:
+    async def get(self, key: str) -> None:
+        return None
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_requester_sends_only_missing_ranges_from_gap_index(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    fake_redis = _FakeRedis()
+    store = UnifiedDataStore(
+        redis=cast(Redis, _KvRedis()),
+        cfg=StoreConfig(
+            base_dir=str(tmp_path), validate_on_read=False, validate_on_write=False
+        ),
+    )
+    monday = int(datetime(2024, 1, 8, tzinfo=UTC).timestamp() * 1000)
+    times = [monday + i * 60_000 for i in [*range(150), *range(160, 320)]]
+    await store.put_bars(
+        "xauusd",
+        "1m",
+        pd.DataFrame(
+            {
+                "open_time": times,
+                "open": 1.0,
+                "high": 1.0,
+                "low": 1.0,
+                "close": 1.0,
+                "volume": 1.0,
+                "close_time": [t + 59_999 for t in times],
+            }
+        ),
+    )
+    # Хвіст протух на 10 завершених барів.
+    now_ms = monday + 330 * 60_000 + 30_000
+    monkeypatch.setattr("app.fxcm_warmup_requester.utc_now_ms", lambda: now_ms)
+    monkeypatch.setattr(
+        "app.fxcm_warmup_requester.get_fxcm_feed_state", lambda: _FakeFeed("open")
+    )
+
+    requester = FxcmWarmupRequester(
+        redis=fake_redis,  # type: ignore[arg-type]
+        store=store,
+        allowed_pairs={("xauusd", "1m")},
+        # Контракт (300 барів) задає вікно, у якому шукаємо пропуски.
+        min_history_bars_by_symbol={"xauusd": 300},
+        cooldown_sec=900,
+        stale_k=3.0,
+    )
+
+    await requester._run_once()
+    payloads = [json.loads(msg) for _, msg in fake_redis.published]
+    assert [(p["reason"], p["range"]["bars"]) for p in payloads] == [
+        ("gap", 10),
+        ("stale_tail", 10),
+    ]
+    assert payloads[0]["range"]["start_ms"] == monday + 150 * 60_000
+    assert payloads[1]["range"]["end_ms"] == monday + 330 * 60_000
+    assert all(p["type"] == "fxcm_warmup" for p in payloads)
+    # lookback покриває діапазон до «зараз» для конекторів без range.
+    assert payloads[0]["lookback_bars"] == 181
+
+    await requester._run_once()
+    assert len(fake_redis.published) == 2
@@ -0,0 +1,171 @@
+"""Мемоізований SmcCoreEngine дає той самий hint, що й пакетний (replay)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smc_core.engine import SmcCoreEngine
+from smc_core.serializers import to_plain_smc_hint
+from smc_core.smc_types import SmcInput
+from smc_structure.event_history import EVENT_HISTORY, reset_structure_event_history
+
+BASE_MS = 1_700_000_000_000
+
+
+def _series(count: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 2000.0 + np.cumsum(rng.normal(0.0, 1.2, count))
+    # плоскі ділянки — рівні high/low, тобто «нічиї» у вікні свінгів
+    close[200:215] = close[199]
+    opens = np.r_[close[0], close[:-1]]
+    highs = np.maximum(opens, close) + rng.random(count).round(1)
+    lows = np.minimum(opens, close) - rng.random(count).round(1)
+    times = BASE_MS + np.arange(count) * 60_000
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": close,
+            "volume": rng.random(count) * 100,
+            "close_time": times + 59_999,
+        }
+    )
+
+
+def _snapshot(frame: pd.DataFrame, context: dict[str, Any] | None = None) -> SmcInput:
+    df = frame.reset_index(drop=True).copy()
+    df["timestamp"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+    return SmcInput(
+        symbol="xauusd",
+        tf_primary="1m",
+        ohlc_by_tf={"1m": df},
+        context=context or {},
+    )
+
+
+def _replay_corpus() -> list[SmcInput]:
+    """Знімки так, як їх бачить smc_producer: ріст історії, ковзне вікно,
+    повтори між закриттями барів, правка останнього бару, розрив ряду."""
+
+    bars = _series(720)
+    corpus: list[SmcInput] = []
+    for end in range(20, 560, 3):
+        window = bars.iloc[max(0, end - 500) : end]
+        corpus.append(_snapshot(window))
+        corpus.append(_snapshot(window))  # цикл без нового бару
+    revised = bars.iloc[60:560].copy()
+    revised.iloc[-1, revised.columns.get_loc("high")] += 5.0
+    corpus.append(_snapshot(revised))
+    corpus.append(_snapshot(bars.iloc[60:560], context={"session_tag": "London"}))
+    # розрив: вікно стрибає вперед без перекриття
+    for end in range(700, 721, 5):
+        corpus.append(_snapshot(bars.iloc[end - 150 : end]))
+    return corpus
+
+
+def _plain(engine: SmcCoreEngine, corpus: list[SmcInput]) -> list[Any]:
+    reset_structure_event_history()
+    return [to_plain_smc_hint(engine.process_snapshot(item)) for item in corpus]
+
+
+def test_incremental_matches_batch_on_replay() -> None:
+    corpus = _replay_corpus()
+    batch = _plain(SmcCoreEngine(), corpus)
+    engine = SmcCoreEngine(incremental=True)
+    incremental = _plain(engine, corpus)
+    reset_structure_event_history()
+
+    assert len(batch) == len(incremental)
+    for idx, (expected, got) in enumerate(zip(batch, incremental, strict=True)):
+        assert got == expected, f"розбіжність на кроці {idx}"
+
+    stats = engine.incremental_stats()
+    assert stats["hints_reused"] >= 170
+    assert stats["swings_reused"] > stats["swings_computed"]
+
+
+def test_incremental_matches_batch_bar_by_bar() -> None:
+    """Потік по одному закритому бару через межу ковзного вікна (300)."""
+
+    bars = _series(360, seed=11)
+    stream = [_snapshot(bars.iloc[:end]) for end in range(250, 361)]
+    batch = _plain(SmcCoreEngine(), stream)
+    engine = SmcCoreEngine(incremental=True)
+    incremental = _plain(engine, stream)
+    reset_structure_event_history()
+
+    for idx, (expected, got) in enumerate(zip(batch, incremental, strict=True)):
+        assert got == expected, f"розбіжність на барі {idx}"
+
+    stats = engine.incremental_stats()
+    assert stats["hints_computed"] == len(stream)
+    assert stats["swings_reused"] > 10 * stats["swings_computed"]
+
+
+def test_reused_hint_survives_history_reset() -> None:
+    engine = SmcCoreEngine(incremental=True)
+    snapshot = _snapshot(_series(300))
+    reset_structure_event_history()
+    first = engine.process_snapshot(snapshot)
+    assert engine.process_snapshot(snapshot) is first
+
+    reset_structure_event_history()
+    expected = to_plain_smc_hint(SmcCoreEngine().process_snapshot(snapshot))
+    reset_structure_event_history()
+    again = engine.process_snapshot(snapshot)
+    assert to_plain_smc_hint(again) == expected
+    reset_structure_event_history()
+
+
+def test_reused_hint_does_not_touch_event_history(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = SmcCoreEngine(incremental=True)
+    snapshot = _snapshot(_series(300))
+    reset_structure_event_history()
+    first = engine.process_snapshot(snapshot)
+
+    calls: list[str] = []
+    original = EVENT_HISTORY.update_history
+
+    def _counting(**kwargs: Any) -> Any:
+        calls.append(kwargs["symbol"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(EVENT_HISTORY, "update_history", _counting)
+    for _ in range(5):
+        assert engine.process_snapshot(snapshot) is first
+    assert calls == []
+
+    # інший запис у ту саму історію → hint перебудовується
+    EVENT_HISTORY.update_history(
+        symbol="XAUUSD",
+        timeframe="1m",
+        events=[],
+        snapshot_end_ts=None,
+        retention_minutes=0,
+        max_entries=0,
+    )
+    assert engine.process_snapshot(snapshot) is not first
+    reset_structure_event_history()
+
+
+@pytest.mark.parametrize("nan_at", [10, 299])
+def test_nan_bars_match_batch(nan_at: int) -> None:
+    frame = _series(300)
+    frame.loc[nan_at, "high"] = np.nan
+    snapshot = _snapshot(frame)
+    reset_structure_event_history()
+    expected = to_plain_smc_hint(SmcCoreEngine().process_snapshot(snapshot))
+    reset_structure_event_history()
+    engine = SmcCoreEngine(incremental=True)
+    assert to_plain_smc_hint(engine.process_snapshot(snapshot)) == expected
+    reset_structure_event_history()
+    engine.reset(symbol="XAUUSD")
+    assert engine.incremental_stats()["series"] == 0
@@ -0,0 +1,142 @@
+"""Паритет кластеризації EQH/EQL і магнітів з попереднім жадібним first-fit."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smc_core.smc_types import SmcLiquidityPool, SmcLiquidityType, SmcSwing
+from smc_liquidity import magnets, pools
+from smc_liquidity.clustering import cluster_by_price, within_tolerance
+
+
+def _reference(prices: list[float], tolerance_pct: float) -> list[list[int]]:
+    """Попередня реалізація: кожен кандидат проти кожного кластера, sum/len."""
+
+    clusters: list[list[int]] = []
+    for pos, price in enumerate(prices):
+        for cluster in clusters:
+            avg = sum(prices[idx] for idx in cluster) / len(cluster)
+            if within_tolerance(price, avg, tolerance_pct):
+                cluster.append(pos)
+                break
+        else:
+            clusters.append([pos])
+    return clusters
+
+
+def _prices(count: int, seed: int, *, decimals: int = 1) -> list[float]:
+    rng = np.random.default_rng(seed)
+    # випадкове блукання з округленням — багато близьких і рівних рівнів
+    walk = 2000.0 + np.cumsum(rng.normal(0.0, 3.0, count))
+    return [float(value) for value in walk.round(decimals)]
+
+
+def _identity(value: int) -> float:
+    return float(value)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("tolerance", [0.0, 0.001, 0.0012, 0.01])
+def test_greedy_mode_matches_reference(seed: int, tolerance: float) -> None:
+    prices = _prices(400, seed)
+    positions = list(range(len(prices)))
+    got = cluster_by_price(positions, prices.__getitem__, tolerance, mode="greedy")
+    assert got == _reference(prices, tolerance)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("tolerance", [0.0, 0.001, 0.01])
+def test_sweep_matches_greedy_on_sorted_input(seed: int, tolerance: float) -> None:
+    prices = _prices(400, seed)
+    order = sorted(range(len(prices)), key=prices.__getitem__)
+    expected = [
+        [order[pos] for pos in group]
+        for group in _reference([prices[idx] for idx in order], tolerance)
+    ]
+    got = cluster_by_price(
+        list(range(len(prices))), prices.__getitem__, tolerance, mode="sweep"
+    )
+    assert got == expected
+
+
+def test_edge_prices_match_reference() -> None:
+    prices = [0.0, 1e-7, -0.0005, 0.0004, 5.0, -5.0, -5.004, 5.004, 0.0]
+    for tolerance in (0.001, 0.5, 1.0, 3.0):
+        got = cluster_by_price(
+            list(range(len(prices))), prices.__getitem__, tolerance, mode="greedy"
+        )
+        assert got == _reference(prices, tolerance)
+
+
+def test_non_finite_prices_stay_singletons() -> None:
+    prices = [100.0, float("nan"), 100.05, float("inf"), 100.02]
+    positions = list(range(len(prices)))
+    assert cluster_by_price(positions, prices.__getitem__, 0.001, mode="greedy") == [
+        [0, 2, 4],
+        [1],
+        [3],
+    ]
+    assert cluster_by_price(positions, prices.__getitem__, 0.001) == [
+        [0, 4, 2],
+        [1],
+        [3],
+    ]
+    with pytest.raises(ValueError):
+        cluster_by_price(positions, _identity, 0.001, mode="kmeans")  # type: ignore[arg-type]
+
+
+def test_pool_and_magnet_wrappers_match_reference() -> None:
+    prices = _prices(300, 11)
+    ts = pd.Timestamp("2024-01-01", tz="UTC")
+    swings = [
+        SmcSwing(index=idx, time=ts, price=price, kind="HIGH", strength=1)
+        for idx, price in enumerate(prices)
+    ]
+    expected = [
+        [swings[idx] for idx in cluster]
+        for cluster in _reference(prices, 0.001)
+        if len(cluster) >= 2
+    ]
+    assert pools._cluster_swings(swings, 0.001) == expected
+
+    liquidity = [
+        SmcLiquidityPool(
+            level=price,
+            liq_type=SmcLiquidityType.EQH,
+            strength=1.0,
+            n_touches=1,
+            first_time=ts,
+            last_time=ts,
+            role="NEUTRAL",
+        )
+        for price in prices
+    ]
+    ordered = sorted(liquidity, key=lambda pool: pool.level)
+    expected_pools = [
+        [ordered[idx] for idx in cluster]
+        for cluster in _reference([pool.level for pool in ordered], 0.001)
+    ]
+    assert magnets._cluster_pools(liquidity, 0.001) == expected_pools
+
+
+def test_greedy_scales_to_thousands_of_swings() -> None:
+    prices = _prices(20_000, 3, decimals=2)
+    positions = list(range(len(prices)))
+    started = time.perf_counter()
+    greedy = cluster_by_price(positions, prices.__getitem__, 0.0012, mode="greedy")
+    sweep = cluster_by_price(positions, prices.__getitem__, 0.0012)
+    elapsed = time.perf_counter() - started
+    assert sorted(pos for group in greedy for pos in group) == positions
+    assert sorted(pos for group in sweep for pos in group) == positions
+    # старий first-fit на такому вході — секунди (квадратичний по swings × clusters)
+    assert elapsed < 2.0
+    # first-fit онлайн: кластери на префіксі визначаються лише префіксом
+    head = 2000
+    prefix = [
+        kept for group in greedy if (kept := [pos for pos in group if pos < head])
+    ]
+    assert prefix == _reference(prices[:head], 0.0012)
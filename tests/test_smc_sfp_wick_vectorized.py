@@ -0,0 +1,195 @@
+"""Паритет матричного detect_sfp_and_wicks з попереднім циклом bars × levels."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import smc_structure
+from smc_core.config import SMC_CORE_CONFIG
+from smc_core.smc_types import SmcInput, SmcLiquidityPool, SmcStructureState
+from smc_liquidity import sfp_wick
+from smc_liquidity.pools import resolve_role_for_bias
+from smc_structure.event_history import reset_structure_event_history
+
+BASE_MS = 1_700_000_000_000
+
+
+def _reference(
+    snapshot: SmcInput, structure: SmcStructureState
+) -> tuple[list[SmcLiquidityPool], list[dict[str, Any]], list[dict[str, Any]]]:
+    """Попередня реалізація: послідовний прохід бар за баром, рівень за рівнем."""
+
+    df = sfp_wick._prepare_price_frame(snapshot, SMC_CORE_CONFIG.max_lookback_bars)
+    levels = sfp_wick._collect_levels(structure)
+    if df is None or not levels:
+        return [], [], []
+    tolerance_pct = max(SMC_CORE_CONFIG.eq_tolerance_pct, 0.001)
+    break_pct = max(tolerance_pct * sfp_wick.SFP_BREAK_FRACTION, sfp_wick.MIN_BREAK_PCT)
+    events: list[dict[str, Any]] = []
+    pools: list[SmcLiquidityPool] = []
+    recorded: set[str] = set()
+    clusters: dict[str, dict[str, Any]] = {}
+    for idx in range(len(df)):
+        ts = pd.Timestamp(df["timestamp"].iloc[idx])
+        open_price = float(df["open"].iloc[idx])
+        high_price = float(df["high"].iloc[idx])
+        low_price = float(df["low"].iloc[idx])
+        close_price = float(df["close"].iloc[idx])
+        body = max(abs(close_price - open_price), 1e-6)
+        upper_wick = max(high_price - max(open_price, close_price), 0.0)
+        lower_wick = max(min(open_price, close_price) - low_price, 0.0)
+        for level in levels:
+            tol = max(level.level * break_pct, sfp_wick.MIN_BREAK_PCT)
+            swept = (
+                high_price >= level.level + tol and close_price < level.level
+                if level.side == "HIGH"
+                else low_price <= level.level - tol and close_price > level.level
+            )
+            if swept and level.key not in recorded:
+                events.append(
+                    {
+                        "level": level.level,
+                        "side": level.side,
+                        "time": ts.isoformat(),
+                        "close": close_price,
+                        "source": level.source,
+                    }
+                )
+                pools.append(
+                    SmcLiquidityPool(
+                        level=level.level,
+                        liq_type=sfp_wick.SmcLiquidityType.SFP,
+                        strength=1.0,
+                        n_touches=1,
+                        first_time=ts,
+                        last_time=ts,
+                        role=resolve_role_for_bias(
+                            structure.bias,
+                            sfp_wick.SmcLiquidityType.SFP,
+                            side=level.side,
+                        ),
+                        meta={
+                            "source": "sfp",
+                            "side": level.side,
+                            "level_source": level.source,
+                        },
+                    )
+                )
+                recorded.add(level.key)
+                continue
+            wick, price = (
+                (upper_wick, high_price)
+                if level.side == "HIGH"
+                else (lower_wick, low_price)
+            )
+            if wick >= body * sfp_wick.WICK_RATIO and abs(level.level - price) <= tol:
+                cluster = clusters.setdefault(
+                    level.key,
+                    {"level": level, "count": 0, "max_wick": 0.0, "first_ts": ts},
+                )
+                cluster["count"] += 1
+                cluster["max_wick"] = max(cluster["max_wick"], float(wick))
+                cluster["last_ts"] = ts
+    wick_meta: list[dict[str, Any]] = []
+    for cluster in clusters.values():
+        level = cluster["level"]
+        wick_meta.append(
+            {
+                "level": level.level,
+                "side": level.side,
+                "count": cluster["count"],
+                "max_wick": cluster["max_wick"],
+                "source": level.source,
+                "first_ts": cluster["first_ts"].isoformat(),
+                "last_ts": cluster["last_ts"].isoformat(),
+            }
+        )
+        pools.append(
+            SmcLiquidityPool(
+                level=level.level,
+                liq_type=sfp_wick.SmcLiquidityType.WICK_CLUSTER,
+                strength=float(cluster["max_wick"]),
+                n_touches=cluster["count"],
+                first_time=cluster["first_ts"],
+                last_time=cluster["last_ts"],
+                role=resolve_role_for_bias(
+                    structure.bias,
+                    sfp_wick.SmcLiquidityType.WICK_CLUSTER,
+                    side=level.side,
+                ),
+                meta={
+                    "source": "wick_cluster",
+                    "side": level.side,
+                    "level_source": level.source,
+                    "count": cluster["count"],
+                },
+            )
+        )
+    return pools, events, wick_meta
+
+
+def _snapshot(count: int, seed: int, *, nan_share: float = 0.0) -> SmcInput:
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.5, count))
+    opens = np.r_[close[0], close[:-1]] + rng.normal(0.0, 0.02, count)
+    # довгі тіні на частині барів — щоб wick-кластери справді траплялись
+    spikes = rng.random(count) < 0.25
+    highs = np.maximum(opens, close) + rng.random(count) * 0.2 + spikes * 4.0
+    lows = np.minimum(opens, close) - rng.random(count) * 0.2 - spikes * 4.0
+    if nan_share:
+        for values in (opens, highs, lows, close):
+            values[rng.random(count) < nan_share] = np.nan
+    times = BASE_MS + np.arange(count) * 60_000
+    frame = pd.DataFrame(
+        {
+            "open_time": times,
+            "open": opens,
+            "high": highs.round(2),
+            "low": lows.round(2),
+            "close": close,
+            "volume": 1.0,
+        }
+    )
+    return SmcInput(symbol="xauusd", tf_primary="1m", ohlc_by_tf={"1m": frame})
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("nan_share", [0.0, 0.03])
+def test_matrix_scan_matches_reference(seed: int, nan_share: float) -> None:
+    snapshot = _snapshot(400, seed, nan_share=nan_share)
+    reset_structure_event_history()
+    structure = smc_structure.compute_structure_state(snapshot, SMC_CORE_CONFIG)
+    reset_structure_event_history()
+
+    expected = _reference(snapshot, structure)
+    got = sfp_wick.detect_sfp_and_wicks(snapshot, structure, SMC_CORE_CONFIG)
+    assert got == expected
+    if not nan_share:
+        assert expected[1] and expected[2]
+
+
+def test_repeated_sweeps_record_one_sfp_per_level() -> None:
+    snapshot = _snapshot(300, 3)
+    reset_structure_event_history()
+    structure = smc_structure.compute_structure_state(snapshot, SMC_CORE_CONFIG)
+    reset_structure_event_history()
+    level = sfp_wick._collect_levels(structure)[0]
+    sign = 1.0 if level.side == "HIGH" else -1.0
+    frame = snapshot.ohlc_by_tf["1m"].copy()
+    # парні бари — sweep із close-back, непарні — довга тінь біля рівня
+    extreme = np.where(np.arange(len(frame)) % 2 == 0, 1.05, 1.01)
+    frame["open"] = level.level * (1 - sign * 0.03)
+    frame["close"] = level.level * (1 - sign * 0.029)
+    frame["high" if sign > 0 else "low"] = level.level * (1 + sign * (extreme - 1))
+    frame["low" if sign > 0 else "high"] = level.level * (1 - sign * 0.031)
+    swept = SmcInput(symbol="xauusd", tf_primary="1m", ohlc_by_tf={"1m": frame})
+
+    expected = _reference(swept, structure)
+    got = sfp_wick.detect_sfp_and_wicks(swept, structure, SMC_CORE_CONFIG)
+    assert got == expected
+    assert [event["level"] for event in got[1]].count(level.level) == 1
+    assert any(cluster["level"] == level.level for cluster in got[2])
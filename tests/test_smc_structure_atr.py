@@ -0,0 +1,68 @@
+"""ATR: паритет з pandas-еталоном і незалежність від початку кадру."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from smc_structure.metrics import compute_atr
+
+BASE_MS = 1_700_000_000_000
+
+
+def _reference_atr(df: pd.DataFrame, period: int) -> pd.Series:
+    """Попередня реалізація (concat + rolling mean) як еталон семантики."""
+
+    highs = df["high"].astype(float)
+    lows = df["low"].astype(float)
+    closes = df["close"].astype(float)
+    prev_close = closes.shift(1)
+    true_range = pd.concat(
+        [highs - lows, (highs - prev_close).abs(), (lows - prev_close).abs()],
+        axis=1,
+    ).max(axis=1)
+    return true_range.rolling(window=period, min_periods=period).mean()
+
+
+def _frame(count: int, seed: int, *, nan_share: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    closes = 100 + np.cumsum(rng.normal(0, 1, count))
+    highs = closes + rng.random(count)
+    lows = closes - rng.random(count)
+    if nan_share:
+        highs[rng.random(count) < nan_share] = np.nan
+        lows[rng.random(count) < nan_share] = np.nan
+        closes[rng.random(count) < nan_share] = np.nan
+    times = BASE_MS + np.arange(count) * 60_000
+    df = pd.DataFrame({"open_time": times, "high": highs, "low": lows, "close": closes})
+    df["timestamp"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+    return df
+
+
+def test_matches_rolling_reference() -> None:
+    for nan_share in (0.0, 0.05):
+        df = _frame(500, 3, nan_share=nan_share)
+        expected = _reference_atr(df, 14)
+        got = compute_atr(df, 14)
+        assert got is not None
+        assert got.index.equals(df.index)
+        assert np.array_equal(got.isna(), expected.isna())
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+    short = compute_atr(_frame(10, 1), 14)
+    assert short is not None and bool(short.isna().all())
+
+
+def test_bar_value_does_not_depend_on_frame_start() -> None:
+    bars = _frame(600, 5, nan_share=0.02)
+    full = compute_atr(bars, 14)
+    assert full is not None
+    for start in (1, 13, 14, 250):
+        window = compute_atr(bars.iloc[start:], 14)
+        assert window is not None
+        # бари, чиє вікно TR цілком усередині кадру, збігаються побайтово
+        tail = slice(start + 14, None)
+        assert np.array_equal(
+            window.loc[tail.start :].to_numpy(),
+            full.iloc[tail].to_numpy(),
+            equal_nan=True,
+        )
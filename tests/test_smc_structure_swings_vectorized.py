@@ -0,0 +1,79 @@
+"""Паритет векторизованого detect_swings з попереднім циклом по iloc."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smc_core.smc_types import SmcSwing
+from smc_structure.swing_detector import SwingCache, _extract_timestamp, detect_swings
+
+BASE_MS = 1_700_000_000_000
+
+
+def _reference_swings(df: pd.DataFrame, min_separation: int) -> list[SmcSwing]:
+    """Попередня реалізація (цикл по барах) як еталон семантики."""
+
+    window = max(1, min_separation)
+    total = len(df)
+    if total < window * 2 + 1:
+        return []
+    highs = df["high"].astype(float)
+    lows = df["low"].astype(float)
+    times = [_extract_timestamp(df, idx) for idx in range(total)]
+    swings: list[SmcSwing] = []
+    for idx in range(window, total - window):
+        local_high = highs.iloc[idx]
+        left_high = highs.iloc[idx - window : idx].max()
+        right_high = highs.iloc[idx + 1 : idx + 1 + window].max()
+        if local_high >= left_high and local_high >= right_high:
+            swings.append(SmcSwing(idx, times[idx], float(local_high), "HIGH", window))
+        local_low = lows.iloc[idx]
+        left_low = lows.iloc[idx - window : idx].min()
+        right_low = lows.iloc[idx + 1 : idx + 1 + window].min()
+        if local_low <= left_low and local_low <= right_low:
+            swings.append(SmcSwing(idx, times[idx], float(local_low), "LOW", window))
+    swings.sort(key=lambda swing: swing.index)
+    return swings
+
+
+def _frame(count: int, seed: int, *, nan_share: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # округлення до 0.5 дає багато рівних high/low — перевіряємо нічиї
+    mid = (100 + np.cumsum(rng.normal(0, 1, count))).round() / 2
+    highs = mid + rng.integers(0, 3, count) * 0.5
+    lows = mid - rng.integers(0, 3, count) * 0.5
+    if nan_share:
+        highs[rng.random(count) < nan_share] = np.nan
+        lows[rng.random(count) < nan_share] = np.nan
+    times = BASE_MS + np.arange(count) * 60_000
+    df = pd.DataFrame({"open_time": times, "high": highs, "low": lows})
+    df["timestamp"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+    return df
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 5])
+@pytest.mark.parametrize("nan_share", [0.0, 0.1, 0.6])
+def test_vectorized_matches_reference(window: int, nan_share: float) -> None:
+    for seed in range(4):
+        df = _frame(400, seed, nan_share=nan_share)
+        assert detect_swings(df, window) == _reference_swings(df, window)
+
+
+def test_timestamp_fallbacks_match_reference() -> None:
+    df = _frame(60, 11).drop(columns=["timestamp"])
+    assert detect_swings(df, 3) == _reference_swings(df, 3)
+    # без жодної колонки часу — синтетичний timestamp за позицією
+    bare = df.drop(columns=["open_time"])
+    assert detect_swings(bare, 3) == _reference_swings(bare, 3)
+    assert detect_swings(df.head(6), 3) == []
+
+
+def test_cached_scan_matches_reference_on_sliding_window() -> None:
+    bars = _frame(700, 5, nan_share=0.05)
+    cache = SwingCache()
+    for end in range(120, 700, 7):
+        window = bars.iloc[max(0, end - 300) : end].reset_index(drop=True)
+        assert detect_swings(window, 3, cache=cache) == _reference_swings(window, 3)
+    assert cache.reused > cache.computed
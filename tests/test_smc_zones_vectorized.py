@@ -0,0 +1,175 @@
+"""Паритет масивних FVG/OB-детекторів з попереднім рядковим (iloc) проходом."""
+
+from __future__ import annotations
+
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import smc_structure
+from core.serialization import safe_float
+from smc_core.config import SMC_CORE_CONFIG, SmcCoreConfig
+from smc_core.smc_types import SmcInput, SmcStructureState, SmcZone
+from smc_structure.event_history import reset_structure_event_history
+from smc_zones import fvg_detector, orderblock_detector
+
+BASE_MS = 1_700_000_000_000
+
+
+def _reference_fvg(structure: SmcStructureState, cfg: SmcCoreConfig) -> list[SmcZone]:
+    """Попередній прохід: кожна трійка рядків через ``frame.iloc``."""
+
+    frame = fvg_detector._primary_frame(structure)
+    if frame is None or len(frame) < 3:
+        return []
+    meta = structure.meta or {}
+    atr = safe_float(meta.get("atr_last") or meta.get("atr_median"))
+    bias = fvg_detector._resolve_bias(meta.get("bias"), structure.bias)
+    last_timestamp = fvg_detector._row_timestamp(frame.iloc[-1])
+    zones: list[SmcZone] = []
+    for idx in range(len(frame) - 2):
+        first = frame.iloc[idx]
+        third = frame.iloc[idx + 2]
+        values = [
+            safe_float(first.get("high")),
+            safe_float(first.get("low")),
+            safe_float(third.get("high")),
+            safe_float(third.get("low")),
+        ]
+        if any(value is None for value in values):
+            continue
+        high_first, low_first, high_third, low_third = values
+        zone = fvg_detector._build_fvg_zone(
+            high_first=high_first,  # type: ignore[arg-type]
+            low_first=low_first,  # type: ignore[arg-type]
+            high_third=high_third,  # type: ignore[arg-type]
+            low_third=low_third,  # type: ignore[arg-type]
+            third_row=third,
+            idx=idx,
+            structure=structure,
+            atr=atr,
+            bias_context=bias,
+            last_timestamp=last_timestamp,
+            cfg=cfg,
+        )
+        if zone is not None:
+            zones.append(zone)
+    return zones
+
+
+def _reference_ob_candidate(
+    frame: pd.DataFrame,
+    start_pos: int,
+    direction: Literal["LONG", "SHORT"],
+    cfg: SmcCoreConfig,
+) -> int | None:
+    """Попередній пошук OB-свічки: рядки вікна через ``iloc`` з кінця."""
+
+    pre_start = max(0, start_pos - cfg.ob_prelude_max_bars)
+    window = frame.iloc[pre_start : start_pos + 1]
+    if window.empty:
+        return None
+    for rel in range(len(window) - 1, -1, -1):
+        row = window.iloc[rel]
+        open_v = float(row["open"])
+        close_v = float(row["close"])
+        if (close_v < open_v) if direction == "LONG" else (close_v > open_v):
+            return pre_start + rel
+    if direction == "LONG":
+        return pre_start + int(window["low"].astype(float).to_numpy().argmin())
+    return pre_start + int(window["high"].astype(float).to_numpy().argmax())
+
+
+def _frame(count: int, seed: int, *, nan_share: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.8, count))
+    opens = np.r_[close[0], close[:-1]] + rng.normal(0.0, 0.3, count)
+    highs = np.maximum(opens, close) + rng.random(count) * 0.3
+    lows = np.minimum(opens, close) - rng.random(count) * 0.3
+    if nan_share:
+        for values in (opens, highs, lows, close):
+            values[rng.random(count) < nan_share] = np.nan
+    times = BASE_MS + np.arange(count) * 60_000
+    frame = pd.DataFrame(
+        {
+            "open_time": times,
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": close,
+            "volume": 1.0,
+        }
+    )
+    frame["timestamp"] = pd.to_datetime(frame["open_time"], unit="ms", utc=True)
+    return frame
+
+
+def _fvg_structure(frame: Any, atr: float | None) -> SmcStructureState:
+    return SmcStructureState(
+        primary_tf="1m",
+        bias="LONG",  # type: ignore[arg-type]
+        meta={"primary_bars": frame, "atr_last": atr},
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("atr", [None, 0.4, 2.0])
+@pytest.mark.parametrize("nan_share", [0.0, 0.05])
+def test_fvg_matches_reference(seed: int, atr: float | None, nan_share: float) -> None:
+    cfg = SmcCoreConfig(fvg_min_gap_pct=0.001, fvg_max_age_minutes=200)
+    bars = _frame(600, seed, nan_share=nan_share).to_dict("records")
+    structure = _fvg_structure(bars, atr)
+    got = fvg_detector.detect_fvg_zones(structure, cfg)
+    assert got == _reference_fvg(structure, cfg)
+    if not nan_share:
+        assert got
+
+
+def test_fvg_object_columns_match_reference() -> None:
+    frame = _frame(120, 9)
+    bars: list[dict[str, Any]] = frame.to_dict("records")
+    bars[5]["high"] = None
+    bars[17]["low"] = "n/a"
+    bars[30]["high"] = str(bars[30]["high"])
+    cfg = SmcCoreConfig(fvg_min_gap_pct=0.001)
+    structure = _fvg_structure(bars, 0.3)
+    assert fvg_detector.detect_fvg_zones(structure, cfg) == _reference_fvg(
+        structure, cfg
+    )
+
+
+@pytest.mark.parametrize("nan_share", [0.0, 0.1])
+def test_ob_candidate_matches_reference(nan_share: float) -> None:
+    frame = _frame(300, 4, nan_share=nan_share)
+    prices = orderblock_detector._price_arrays(frame)
+    for direction in ("LONG", "SHORT"):
+        for start_pos in range(len(frame)):
+            assert orderblock_detector._find_ob_candidate(
+                prices, start_pos, direction, SMC_CORE_CONFIG
+            ) == _reference_ob_candidate(frame, start_pos, direction, SMC_CORE_CONFIG)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_order_blocks_match_reference_pipeline(
+    seed: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    frame = _frame(300, seed)
+    snapshot = SmcInput(symbol="xauusd", tf_primary="1m", ohlc_by_tf={"1m": frame})
+    reset_structure_event_history()
+    structure = smc_structure.compute_structure_state(snapshot, SMC_CORE_CONFIG)
+    reset_structure_event_history()
+
+    got = orderblock_detector.detect_order_blocks(snapshot, structure, SMC_CORE_CONFIG)
+    monkeypatch.setattr(
+        orderblock_detector,
+        "_find_ob_candidate",
+        lambda _prices, start, direction, cfg: _reference_ob_candidate(
+            frame, start, direction, cfg
+        ),
+    )
+    expected = orderblock_detector.detect_order_blocks(
+        snapshot, structure, SMC_CORE_CONFIG
+    )
+    assert got == expected
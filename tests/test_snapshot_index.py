@@ -0,0 +1,125 @@
+"""Тести sidecar offset-індексу jsonl snapshot-ів і range-читання load_bars."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data.snapshot_index import index_path, load_index
+from data.unified_store import StorageAdapter, StoreConfig
+
+BASE_MS = 1_700_000_000_000
+
+
+def _bars(start: int, count: int) -> pd.DataFrame:
+    times = [BASE_MS + i * 60_000 for i in range(start, start + count)]
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0 + i for i in range(start, start + count)],
+            "high": [1.5 + i for i in range(start, start + count)],
+            "low": [0.5 + i for i in range(start, start + count)],
+            "close": [1.2 + i for i in range(start, start + count)],
+            "volume": [10.0] * count,
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _adapter(tmp_path: Path, **overrides: object) -> StorageAdapter:
+    cfg = StoreConfig(base_dir=str(tmp_path), snapshot_index_step=7, **overrides)  # type: ignore[arg-type]
+    return StorageAdapter(tmp_path, cfg)
+
+
+def _ms(bar: int) -> int:
+    return BASE_MS + bar * 60_000
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "tail"),
+    [
+        (10, 20, None),
+        (0, 1, None),
+        (13, None, None),
+        (None, 57, None),
+        (None, 57, 5),
+        (30, 90, 3),
+        (95, None, 20),
+        (200, 300, None),
+    ],
+)
+async def test_range_read_matches_full_filter(
+    tmp_path: Path, start: int | None, end: int | None, tail: int | None
+) -> None:
+    disk = _adapter(tmp_path)
+    await disk.save_bars("xauusd", "1m", _bars(0, 100))
+    snapshot = disk.snapshot_path("xauusd", "1m")
+    assert index_path(snapshot).exists()
+
+    full = await disk.load_bars("xauusd", "1m")
+    assert full is not None
+    expected = full
+    if start is not None:
+        expected = expected[expected["open_time"] >= _ms(start)]
+    if end is not None:
+        expected = expected[expected["open_time"] < _ms(end)]
+    if tail is not None:
+        expected = expected.tail(tail)
+
+    got = await disk.load_bars(
+        "xauusd",
+        "1m",
+        start_ms=None if start is None else _ms(start),
+        end_ms=None if end is None else _ms(end),
+        tail=tail,
+    )
+    assert got is not None
+    pd.testing.assert_frame_equal(got, expected.reset_index(drop=True))
+
+
+async def test_stale_index_is_rebuilt(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, snapshot_segments=False)
+    await disk.save_bars("xauusd", "1m", _bars(0, 50))
+    snapshot = disk.snapshot_path("xauusd", "1m")
+    sidecar = index_path(snapshot)
+    stale = sidecar.read_bytes()
+
+    # Snapshot переписано в обхід UDS (імпорт/експорт) — sidecar застарів.
+    _bars(100, 50).to_json(snapshot, orient="records", lines=True)
+    sidecar.write_bytes(stale)
+    os.utime(snapshot, ns=(1, 1))
+
+    got = await disk.load_bars("xauusd", "1m", start_ms=_ms(120), end_ms=_ms(125))
+    assert got is not None
+    assert got["open_time"].tolist() == [_ms(i) for i in range(120, 125)]
+    assert load_index(snapshot).rows == 50
+    assert sidecar.read_bytes() != stale
+
+
+async def test_range_inside_segments_skips_base(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    await disk.save_bars("xauusd", "1m", _bars(0, 10))
+    await disk.save_bars("xauusd", "1m", _bars(0, 15))
+    assert disk.segment_paths("xauusd", "1m")
+
+    disk.snapshot_path("xauusd", "1m").write_text("not json\n", encoding="utf-8")
+    got = await disk.load_bars("xauusd", "1m", start_ms=_ms(11))
+    assert got is not None
+    assert got["open_time"].tolist() == [_ms(i) for i in range(11, 15)]
+
+
+async def test_unseekable_snapshot_falls_back_to_full_read(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, snapshot_segments=False)
+    # Старий формат: open_time у секундах — індекс непридатний для seek.
+    legacy = _bars(0, 30)
+    legacy["open_time"] = legacy["open_time"] // 1000
+    snapshot = disk.snapshot_path("xauusd", "1m")
+    legacy.to_json(snapshot, orient="records", lines=True)
+
+    got = await disk.load_bars("xauusd", "1m", start_ms=_ms(5), end_ms=_ms(8))
+    assert got is not None
+    assert got["open_time"].tolist() == [_ms(i) for i in range(5, 8)]
+    assert not load_index(snapshot).seekable
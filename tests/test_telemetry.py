@@ -69,3 +69,23 @@ async def _run_absent_redis_case() -> None:
     store = DummyStore(None)
     # Перевіряємо, що цикл завершується навіть без Redis публішера
     await publish_ui_metrics(store, None, iteration_limit=1, interval=0.0)  # type: ignore
+
+
+def test_publish_ui_metrics_reports_backpressure() -> None:
+    asyncio.run(_run_backpressure_case())
+
+
+async def _run_backpressure_case() -> None:
+    store = DummyStore(None)
+    store.backpressure_snapshot = lambda: {"level": "soft", "backlog": 3}  # type: ignore[attr-defined]
+    redis = DummyRedis()
+
+    await publish_ui_metrics(
+        store,  # type: ignore
+        redis,
+        interval=0.0,
+        iteration_limit=1,
+    )
+
+    data = json.loads(redis.messages[0][1])
+    assert data["backpressure"] == {"level": "soft", "backlog": 3}
@@ -14,9 +14,18 @@ class _FakeStore:
     def __init__(self, df: pd.DataFrame) -> None:
         self._df = df
 
-    async def get_df(
-        self, symbol: str, interval: str, *, limit: int | None = None
+        self.calls: list[tuple[int | None, int | None, int | None]] = []
+
+    async def get_range(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        *,
+        limit: int | None = None,
     ) -> pd.DataFrame:
+        self.calls.append((start_ms, end_ms, limit))
         return self._df
 
 
@@ -60,3 +69,17 @@ async def test_unified_provider_raises_when_empty() -> None:
 
     with pytest.raises(OhlcvNotFoundError):
         await provider.fetch_ohlcv("xauusd", "1m", limit=10)
+
+
+@pytest.mark.asyncio
+async def test_unified_provider_passes_range_to_store() -> None:
+    df = pd.DataFrame(
+        [{"open_time": 1_700_000_000_000, "open": 1, "high": 2, "low": 0.5, "close": 1}]
+    )
+    store = _FakeStore(df)
+    provider = UnifiedStoreOhlcvProvider(store)  # type: ignore
+
+    bars = await provider.fetch_ohlcv("xauusd", "1m", 50, end_ms=1_700_000_060_000)
+
+    assert [bar["time"] for bar in bars] == [1_700_000_000_000]
+    assert store.calls == [(None, 1_700_000_060_000, 50)]
@@ -42,8 +42,9 @@ class _FakeOhlcvProvider:
         self._data = data
 
     async def fetch_ohlcv(
-        self, symbol: str, timeframe: str, limit: int
+        self, symbol: str, timeframe: str, limit: int, **range_kwargs: int
     ) -> list[dict[str, Any]]:
+        self.range_kwargs = range_kwargs
         key = (symbol, timeframe)
         bars = self._data.get(key)
         if not bars:
@@ -203,6 +204,21 @@ async def test_http_server_ohlcv_invalid_limit() -> None:
     assert "HTTP/1.1 400 Bad Request" in text
 
 
+@pytest.mark.asyncio
+async def test_http_server_ohlcv_passes_history_range() -> None:
+    bar = {"time": 1, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 1.0}
+    provider = _FakeOhlcvProvider({("xauusd", "1m"): [bar]})
+    server = ViewerStateHttpServer(store=_DummyStore(), ohlcv_provider=provider)  # type: ignore
+    request = b"GET /smc-viewer/ohlcv?symbol=xauusd&tf=1m&limit=5&to=1700000060000 HTTP/1.1\r\nHost: test\r\n\r\n"
+    _, status, _ = await server._process_http_request(request)
+    assert status == 200
+    assert provider.range_kwargs == {"end_ms": 1_700_000_060_000}
+
+    request = b"GET /smc-viewer/ohlcv?symbol=xauusd&tf=1m&from=abc HTTP/1.1\r\nHost: test\r\n\r\n"
+    _, status, _ = await server._process_http_request(request)
+    assert status == 400
+
+
 @pytest.mark.asyncio
 async def test_http_server_ohlcv_not_found() -> None:
     provider = _FakeOhlcvProvider({})
@@ -0,0 +1,192 @@
+"""Тести сигналу backpressure write-behind (normal/soft/hard) і реакції інжестора."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+import pytest
+from redis.asyncio import Redis
+
+from data import fxcm_ingestor as fxcm
+from data.unified_store import (
+    Backpressure,
+    StoreConfig,
+    StoreProfile,
+    UnifiedDataStore,
+    _snapshot_frame,
+)
+
+
+class _MemRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.store[key] = value
+        return True
+
+
+def _bars(times: list[int]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0] * len(times),
+            "high": [1.5] * len(times),
+            "low": [0.5] * len(times),
+            "close": [1.2] * len(times),
+            "volume": [10.0] * len(times),
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _store(tmp_path: Path, **cfg: Any) -> UnifiedDataStore:
+    profile = StoreProfile(flush_batch_max=2, flush_queue_soft=2, flush_queue_hard=4)
+    config = StoreConfig(
+        base_dir=str(tmp_path),
+        profile=profile,
+        redis_write_behind=False,
+        **cfg,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _MemRedis()), cfg=config)
+
+
+async def _fill(store: UnifiedDataStore, keys: int) -> None:
+    for i in range(keys):
+        await store.put_bars(f"sym{i}", "1m", _bars([60_000, 120_000]))
+
+
+@pytest.mark.asyncio
+async def test_level_follows_backlog_with_hysteresis(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    assert store.backpressure_level() == Backpressure.NORMAL
+
+    await _fill(store, 3)
+    assert store.backpressure_level() == Backpressure.SOFT
+    await _fill(store, 5)
+    assert store.backpressure_level() == Backpressure.HARD
+
+    # 5 → 3 ключі: нижче hard, але вище половини порогу (2) — рівень тримається.
+    await store._drain_flush_queue()
+    assert len(store._flush_q) == 3
+    assert store.backpressure_level() == Backpressure.HARD
+
+    await store._drain_flush_queue(force=True)
+    assert store.backpressure_level() == Backpressure.NORMAL
+
+    snap = store.backpressure_snapshot()
+    assert snap["level"] == Backpressure.NORMAL
+    assert snap["soft_total"] == 1
+    assert snap["hard_total"] == 1
+    assert store.metrics_snapshot()["backpressure"]["backlog"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disk_stall_raises_level_even_with_small_backlog(
+    tmp_path: Path,
+) -> None:
+    store = _store(tmp_path, flush_stall_soft_sec=0.05, flush_stall_hard_sec=10.0)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _stalled_save(symbol: str, interval: str, df: pd.DataFrame) -> str:
+        started.set()
+        await release.wait()
+        return "ok"
+
+    store.disk.save_bars = _stalled_save  # type: ignore[method-assign]
+    await _fill(store, 1)
+    drain = asyncio.create_task(store._drain_flush_queue())
+    await started.wait()
+    await asyncio.sleep(0.1)
+    assert store.backpressure_level() == Backpressure.SOFT
+
+    release.set()
+    await drain
+    assert store.backpressure_level() == Backpressure.NORMAL
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_does_not_overwrite_newer_snapshot(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    await _fill(store, 1)
+
+    async def _failing_save(symbol: str, interval: str, df: pd.DataFrame) -> str:
+        await store.put_bars(symbol, interval, _bars([180_000]))
+        raise OSError("disk full")
+
+    store.disk.save_bars = _failing_save  # type: ignore[method-assign]
+    store.cfg.io_retry_backoff = 0.0
+    await store._drain_flush_queue()
+
+    pending = _snapshot_frame(store._flush_pending[("sym0", "1m")])
+    assert list(pending["open_time"]) == [60_000, 120_000, 180_000]
+    assert list(store._flush_q) == [("sym0", "1m")]
+
+
+class _LevelStore:
+    def __init__(self, level: str) -> None:
+        self.level = level
+
+    def backpressure_level(self) -> str:
+        return self.level
+
+
+class _BrokenLevelStore:
+    def backpressure_level(self) -> str:
+        raise RuntimeError("boom")
+
+
+def test_level_of_falls_back_to_normal() -> None:
+    assert Backpressure.level_of(_LevelStore(Backpressure.HARD)) == Backpressure.HARD
+    assert Backpressure.level_of(_LevelStore("overload")) == Backpressure.NORMAL
+    assert Backpressure.level_of(_BrokenLevelStore()) == Backpressure.NORMAL
+    assert Backpressure.level_of(object()) == Backpressure.NORMAL
+
+
+@pytest.mark.asyncio
+async def test_ingestor_pace_switches_to_coalesced_mode(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(fxcm, "_INGEST_STATS", dict(fxcm._INGEST_STATS))
+    store = _LevelStore(Backpressure.NORMAL)
+    pace = {"linger_sec": 0.2, "pause_sec": 0.02}
+
+    assert await fxcm._backpressure_pace(store, **pace) == 0.0  # type: ignore[arg-type]
+
+    store.level = Backpressure.SOFT
+    assert await fxcm._backpressure_pace(store, **pace) == 0.2  # type: ignore[arg-type]
+    assert fxcm._INGEST_STATS["backpressure_soft_batches"] == 1
+
+    store.level = Backpressure.HARD
+    t0 = time.perf_counter()
+    assert await fxcm._backpressure_pace(store, **pace) == 0.2  # type: ignore[arg-type]
+    assert time.perf_counter() - t0 >= 0.02
+    assert fxcm._INGEST_STATS["backpressure_hard_batches"] == 1
+    assert fxcm._INGEST_STATS["backpressure_level"] == 2
+
+    # Store без сигналу → звичайний режим.
+    assert await fxcm._backpressure_pace(object(), **pace) == 0.0  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_linger_batch_collects_late_messages() -> None:
+    queue: asyncio.Queue[tuple[float, Any]] = asyncio.Queue()
+    batch = [(0.0, b"a")]
+
+    async def _late() -> None:
+        await asyncio.sleep(0.01)
+        await queue.put((0.0, b"b"))
+        await queue.put((0.0, b"c"))
+
+    producer = asyncio.create_task(_late())
+    await fxcm._linger_batch(batch, queue, max_messages=3, linger_sec=1.0)
+    await producer
+    assert [raw for _, raw in batch] == [b"a", b"b", b"c"]
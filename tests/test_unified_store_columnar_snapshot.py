@@ -0,0 +1,178 @@
+"""Тести колонкового memmap-формату snapshot-ів UDS."""
+
+from __future__ import annotations
+
+import asyncio
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.columnar_snapshot import read_columnar, read_header, write_columnar
+from data.unified_store import StorageAdapter, StoreConfig
+from tools import run_smc_5m_qa, smc_latency_smoke
+from tools.convert_snapshots_columnar import convert_all
+
+
+def _bars(count: int) -> pd.DataFrame:
+    base = 1_700_000_000_000
+    idx = np.arange(count, dtype="int64")
+    open_time = base + idx * 60_000
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": 1.0 + idx * 0.25,
+            "high": 1.5 + idx * 0.25,
+            "low": 0.5 + idx * 0.25,
+            "close": 1.2 + idx * 0.25,
+            "volume": np.full(count, 10.0),
+            "close_time": open_time + 59_999,
+            "complete": np.ones(count, dtype=bool),
+        }
+    )
+
+
+def _adapter(tmp_path: Path, **overrides: object) -> StorageAdapter:
+    cfg = StoreConfig(base_dir=str(tmp_path), **overrides)  # type: ignore[arg-type]
+    return StorageAdapter(tmp_path, cfg)
+
+
+def test_roundtrip_preserves_dtypes_and_tail(tmp_path: Path) -> None:
+    df = _bars(50)
+    df["open_time"] = df["open_time"].astype("Int64")  # як віддає ingestor
+    path = tmp_path / "x.bin"
+    write_columnar(path, df)
+
+    header = read_header(path)
+    assert header.rows == 50
+    assert all(spec.offset % 64 == 0 for spec in header.columns)
+
+    loaded = read_columnar(path)
+    assert list(loaded.columns) == list(df.columns)
+    assert loaded["open_time"].dtype == np.dtype("int64")
+    assert loaded["complete"].dtype == np.dtype("bool")
+    pd.testing.assert_frame_equal(loaded, df.astype({"open_time": "int64"}))
+
+    tail = read_columnar(path, tail=5)
+    assert tail["open_time"].tolist() == df["open_time"].tail(5).tolist()
+    assert len(read_columnar(path, tail=500)) == 50
+
+
+def test_loaded_frame_is_copy_on_write(tmp_path: Path) -> None:
+    path = tmp_path / "x.bin"
+    write_columnar(path, _bars(10))
+    before = path.read_bytes()
+
+    loaded = read_columnar(path)
+    loaded.loc[0, "close"] = 999.0
+
+    assert path.read_bytes() == before
+    assert float(read_columnar(path)["close"].iloc[0]) != 999.0
+
+
+async def test_storage_adapter_columnar_roundtrip(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, snapshot_format="columnar")
+    df = _bars(20)
+    await disk.save_bars("xauusd", "1m", df)
+
+    assert disk.base_snapshot("xauusd", "1m") == disk.snapshot_path(
+        "xauusd", "1m", ext="bin"
+    )
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    pd.testing.assert_frame_equal(loaded, df)
+
+    tail = await disk.load_bars("xauusd", "1m", tail=3)
+    assert tail is not None
+    assert tail["open_time"].tolist() == df["open_time"].tail(3).tolist()
+
+    stats = await disk.inspect_snapshot("xauusd", "1m")
+    assert stats is not None
+    assert stats.rows == 20
+    assert stats.last_open_time == df["open_time"].iloc[-1] / 1000.0
+
+
+async def test_segments_on_top_of_columnar_base(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, snapshot_format="columnar")
+    await disk.save_bars("xauusd", "1m", _bars(10))
+    await disk.save_bars("xauusd", "1m", _bars(13))
+    assert len(disk.segment_paths("xauusd", "1m")) == 1
+
+    restarted = _adapter(tmp_path, snapshot_format="columnar")
+    loaded = await restarted.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["open_time"].tolist() == _bars(13)["open_time"].tolist()
+
+    tail = await restarted.load_bars("xauusd", "1m", tail=4)
+    assert tail is not None
+    assert tail["open_time"].tolist() == _bars(13)["open_time"].tail(4).tolist()
+
+
+async def test_non_numeric_frame_falls_back_to_jsonl(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, snapshot_format="columnar", snapshot_segments=False)
+    df = _bars(5)
+    df["source"] = "fxcm"
+    path = await disk.save_bars("xauusd", "1m", df)
+
+    assert path.endswith(".jsonl")
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["source"].tolist() == ["fxcm"] * 5
+
+
+async def test_newest_base_wins_after_format_switch(tmp_path: Path) -> None:
+    columnar = _adapter(tmp_path, snapshot_format="columnar", snapshot_segments=False)
+    await columnar.save_bars("xauusd", "1m", _bars(5))
+    text = _adapter(tmp_path, snapshot_segments=False)
+    await text.save_bars("xauusd", "1m", _bars(8))
+    bin_path = columnar.snapshot_path("xauusd", "1m", ext="bin")
+    os.utime(bin_path, (1, 1))  # гарантуємо, що .bin старіший
+
+    loaded = await columnar.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert len(loaded) == 8
+
+
+async def test_converter_migrates_jsonl_snapshots(tmp_path: Path) -> None:
+    text = _adapter(tmp_path, snapshot_segments=False)
+    await text.save_bars("xauusd", "1m", _bars(12))
+    (tmp_path / "xauusd_bars_1m_last7d_snapshot.jsonl").write_text("", "utf-8")
+
+    written = await convert_all(tmp_path)
+
+    assert written == [str(tmp_path / "xauusd_bars_1m_snapshot.bin")]
+    assert (tmp_path / "xauusd_bars_1m_snapshot.jsonl").exists()
+    assert read_header(Path(written[0])).rows == 12
+    assert await convert_all(tmp_path) == []  # .bin вже свіжіший
+
+
+async def _converted_store_with_segments(tmp_path: Path, interval: str) -> None:
+    """Стан проду після конвертації: старий jsonl, свіжіший .bin, сегмент і trim."""
+    text = _adapter(tmp_path, snapshot_segments=False)
+    await text.save_bars("xauusd", interval, _bars(6))
+    await convert_all(tmp_path)
+    disk = _adapter(tmp_path, snapshot_format="columnar")
+    await disk.save_bars("xauusd", interval, _bars(10))
+    await disk.save_bars("xauusd", interval, _bars(13))
+    await disk.save_bars("xauusd", interval, _bars(13).iloc[3:])
+    assert disk.segment_paths("xauusd", interval)
+
+
+async def test_latency_smoke_reads_segments_and_trim(tmp_path: Path) -> None:
+    await _converted_store_with_segments(tmp_path, "1m")
+
+    disk = StorageAdapter(tmp_path, StoreConfig(base_dir=str(tmp_path)))
+    loaded = await smc_latency_smoke._load_snapshot_df(disk, "XAUUSD", "1m")
+
+    assert loaded["open_time"].tolist() == _bars(13)["open_time"].iloc[3:].tolist()
+
+
+def test_qa_tool_reads_segments_and_trim(tmp_path: Path) -> None:
+    asyncio.run(_converted_store_with_segments(tmp_path, "5m"))
+
+    frame = run_smc_5m_qa._load_frame(tmp_path, "XAUUSD", limit=0)
+
+    assert frame["open_time"].tolist() == _bars(13)["open_time"].iloc[3:].tolist()
+    assert "timestamp" in frame.columns
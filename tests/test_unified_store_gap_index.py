@@ -0,0 +1,193 @@
+"""Тести інкрементального індексу gaps і планувальника range-backfill."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.gap_index import BackfillRange, GapIndex, MarketHours, plan_backfill
+from data.unified_store import StoreConfig, UnifiedDataStore
+
+M1 = 60_000
+# Понеділок, 2024-01-08 00:00 UTC
+MONDAY = int(datetime(2024, 1, 8, tzinfo=UTC).timestamp() * 1000)
+FRIDAY_CLOSE = MONDAY + 4 * 86_400_000 + 21 * 3_600_000
+SUNDAY_OPEN = MONDAY + 6 * 86_400_000 + 22 * 3_600_000
+
+
+class _InMemoryRedis:
+    """Мінімальна in-memory реалізація Redis API для юніт-тестів."""
+
+    def __init__(self) -> None:
+        self._store: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        data = value.encode() if isinstance(value, str) else value
+        self._store[key] = bytes(data)
+        return True
+
+
+def _bars(times: list[int]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": 1.0,
+            "high": 1.5,
+            "low": 0.5,
+            "close": 1.2,
+            "volume": 10.0,
+            "close_time": [t + M1 - 1 for t in times],
+        }
+    )
+
+
+def _make_store(tmp_path: Path, **overrides: Any) -> UnifiedDataStore:
+    cfg = StoreConfig(
+        base_dir=str(tmp_path),
+        validate_on_read=False,
+        validate_on_write=False,
+        **overrides,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _InMemoryRedis()), cfg=cfg)
+
+
+def _minutes(start: int, count: int) -> list[int]:
+    return [start + i * M1 for i in range(count)]
+
+
+def test_fx_calendar_skips_weekend() -> None:
+    hours = MarketHours.fx()
+    assert hours.is_open(FRIDAY_CLOSE - M1)
+    assert not hours.is_open(FRIDAY_CLOSE)
+    assert not hours.is_open(SUNDAY_OPEN - M1)
+    assert hours.is_open(SUNDAY_OPEN)
+    # П'ятниця 20:00 → неділя 23:00: відкриті лише дві години по краях.
+    start, end = FRIDAY_CLOSE - 60 * M1, SUNDAY_OPEN + 60 * M1
+    assert hours.open_slot_ranges(start, end, M1) == [
+        (start, FRIDAY_CLOSE),
+        (SUNDAY_OPEN, end),
+    ]
+    assert hours.count_open_slots(start, end, M1) == 120
+    assert MarketHours.always_open().count_open_slots(start, end, M1) == (
+        (end - start) // M1
+    )
+
+
+def test_daily_break_is_not_a_gap() -> None:
+    hours = MarketHours.fx(daily_breaks=("21:00-22:00",))
+    index = GapIndex(hours)
+    tuesday_21 = MONDAY + 86_400_000 + 21 * 3_600_000
+    times = _minutes(tuesday_21 - 10 * M1, 10) + _minutes(tuesday_21 + 3_600_000, 10)
+    index.observe(("xauusd", "1m"), M1, np.array(times))
+    assert index.gaps(("xauusd", "1m")) == []
+
+
+def test_incremental_observe_matches_full_scan() -> None:
+    rng = np.random.default_rng(3)
+    grid = np.array(_minutes(MONDAY, 3_000))
+    present = np.sort(rng.choice(grid, size=2_400, replace=False))
+    full = GapIndex(MarketHours.fx())
+    full.observe(("x", "1m"), M1, present)
+
+    inc = GapIndex(MarketHours.fx())
+    shuffled = present.copy()
+    rng.shuffle(shuffled)
+    for chunk in np.array_split(shuffled, 40):
+        inc.observe(("x", "1m"), M1, chunk)
+
+    assert inc.gaps(("x", "1m")) == full.gaps(("x", "1m"))
+    assert inc.missing_bars(("x", "1m")) == (
+        (int(present[-1]) - int(present[0])) // M1 + 1 - len(present)
+    )
+
+
+def test_backfill_fills_existing_gap() -> None:
+    index = GapIndex(MarketHours.always_open())
+    index.observe(("x", "1m"), M1, np.array([0, 10 * M1]))
+    assert index.gaps(("x", "1m")) == [(M1, 10 * M1)]
+    index.observe(("x", "1m"), M1, np.array([3 * M1, 4 * M1, 9 * M1]))
+    assert index.gaps(("x", "1m")) == [(M1, 3 * M1), (5 * M1, 9 * M1)]
+
+
+def test_planner_merges_close_ranges_and_splits_large_ones() -> None:
+    hours = MarketHours.always_open()
+    gaps = [(10 * M1, 12 * M1), (15 * M1, 20 * M1), (100 * M1, 130 * M1)]
+    plan = plan_backfill(
+        gaps,
+        interval="5m",
+        tf_ms=M1,
+        market_hours=hours,
+        merge_slack_bars=5,
+        max_bars_per_command=20,
+    )
+    assert plan == [
+        BackfillRange("fxcm_backfill", 10 * M1, 20 * M1, 10, "gap"),
+        BackfillRange("fxcm_backfill", 100 * M1, 120 * M1, 20, "gap"),
+        BackfillRange("fxcm_backfill", 120 * M1, 130 * M1, 10, "gap"),
+    ]
+
+
+def test_planner_merges_across_weekend_and_marks_tail() -> None:
+    hours = MarketHours.fx()
+    gaps = [(FRIDAY_CLOSE - 30 * M1, FRIDAY_CLOSE)]
+    plan = plan_backfill(
+        gaps,
+        interval="1m",
+        tf_ms=M1,
+        market_hours=hours,
+        tail=(SUNDAY_OPEN, SUNDAY_OPEN + 10 * M1),
+    )
+    assert len(plan) == 1
+    (cmd,) = plan
+    assert cmd.cmd_type == "fxcm_warmup"
+    assert cmd.reason == "stale_tail"
+    assert (cmd.start_ms, cmd.end_ms, cmd.bars) == (
+        FRIDAY_CLOSE - 30 * M1,
+        SUNDAY_OPEN + 10 * M1,
+        40,
+    )
+
+
+async def test_store_maintains_gaps_and_plans_tail(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    assert store.plan_backfill("xauusd", "1m") is None
+    await store.put_bars("xauusd", "1m", _bars(_minutes(MONDAY, 10)))
+    await store.put_bars("xauusd", "1m", _bars(_minutes(MONDAY + 20 * M1, 10)))
+    assert store.get_gaps("xauusd", "1m") == [(MONDAY + 10 * M1, MONDAY + 20 * M1)]
+
+    # Бекфіл закриває частину пропуску.
+    await store.put_bars("xauusd", "1m", _bars(_minutes(MONDAY + 10 * M1, 5)))
+    assert store.get_gaps("xauusd", "1m") == [(MONDAY + 15 * M1, MONDAY + 20 * M1)]
+
+    now = MONDAY + 40 * M1 + 30_000
+    plan = store.plan_backfill("xauusd", "1m", now_ms=now)
+    # Між пропуском і хвостом 10 наявних барів (> slack) → дві команди.
+    assert plan == [
+        BackfillRange("fxcm_warmup", MONDAY + 15 * M1, MONDAY + 20 * M1, 5, "gap"),
+        BackfillRange(
+            "fxcm_warmup", MONDAY + 30 * M1, MONDAY + 40 * M1, 10, "stale_tail"
+        ),
+    ]
+    assert store.plan_backfill("xauusd", "1m", now_ms=now, include_tail=False) == [
+        BackfillRange("fxcm_warmup", MONDAY + 15 * M1, MONDAY + 20 * M1, 5, "gap")
+    ]
+    stats = store.debug_stats()
+    assert stats["gap_series"] == 1 and stats["gap_ranges"] == 1
+
+
+async def test_warmup_seeds_gap_index(tmp_path: Path) -> None:
+    writer = _make_store(tmp_path)
+    await writer.disk.save_bars(
+        "xauusd", "1m", _bars(_minutes(MONDAY, 5) + _minutes(MONDAY + 8 * M1, 2))
+    )
+    store = _make_store(tmp_path)
+    await store.warmup(["xauusd"], "1m", bars_needed=100)
+    assert store.get_gaps("xauusd", "1m") == [(MONDAY + 5 * M1, MONDAY + 8 * M1)]
@@ -0,0 +1,146 @@
+"""Тести single-flight і негативного кешу для read-through промахів get_df."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.unified_store import StoreConfig, UnifiedDataStore
+
+
+class _InMemoryRedis:
+    """Мінімальна in-memory реалізація Redis API, що рахує GET."""
+
+    def __init__(self) -> None:
+        self._store: dict[str, bytes] = {}
+        self.gets = 0
+
+    async def get(self, key: str) -> bytes | None:
+        self.gets += 1
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        data = value.encode() if isinstance(value, str) else value
+        self._store[key] = bytes(data)
+        return True
+
+    async def delete(self, key: str) -> int:
+        return 1 if self._store.pop(key, None) is not None else 0
+
+
+def _bars(times: list[int]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0] * len(times),
+            "high": [1.5] * len(times),
+            "low": [0.5] * len(times),
+            "close": [1.2] * len(times),
+            "volume": [10.0] * len(times),
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _make_store(tmp_path: Path, **overrides: Any) -> UnifiedDataStore:
+    cfg = StoreConfig(
+        base_dir=str(tmp_path),
+        validate_on_read=False,
+        validate_on_write=False,
+        **overrides,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _InMemoryRedis()), cfg=cfg)
+
+
+def _count_disk_loads(store: UnifiedDataStore, delay: float = 0.0) -> list[int]:
+    calls: list[int] = []
+    original = store.disk.load_bars
+
+    async def _load(symbol: str, interval: str, **kwargs: Any):
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return await original(symbol, interval, **kwargs)
+
+    store.disk.load_bars = _load  # type: ignore[method-assign]
+    return calls
+
+
+async def test_concurrent_misses_share_one_load(tmp_path: Path) -> None:
+    writer = _make_store(tmp_path)
+    await writer.disk.save_bars("xauusd", "1m", _bars([0, 60_000, 120_000]))
+
+    store = _make_store(tmp_path)
+    calls = _count_disk_loads(store, delay=0.02)
+    results = await asyncio.gather(
+        *(store.get_df("xauusd", "1m", limit=2) for _ in range(10))
+    )
+
+    assert calls == [1]
+    assert all(df["open_time"].tolist() == [60_000, 120_000] for df in results)
+    stats = store.debug_stats()
+    assert stats["miss_loads"] == 1
+    assert stats["miss_coalesced"] == 9
+    assert stats["miss_inflight"] == 0
+
+    # Наступний виклик — вже з RAM.
+    await store.get_df("xauusd", "1m")
+    assert calls == [1]
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_load(tmp_path: Path) -> None:
+    writer = _make_store(tmp_path)
+    await writer.disk.save_bars("xauusd", "1m", _bars([0]))
+
+    store = _make_store(tmp_path)
+    calls = _count_disk_loads(store, delay=0.05)
+    first = asyncio.create_task(store.get_df("xauusd", "1m"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(store.get_df("xauusd", "1m"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    df = await second
+    assert df["open_time"].tolist() == [0]
+    assert calls == [1]
+
+
+async def test_negative_cache_absorbs_repeated_misses(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, negative_cache_ttl_sec=0.05)
+    calls = _count_disk_loads(store)
+    redis = cast(_InMemoryRedis, store.redis.r)
+
+    for _ in range(5):
+        df = await store.get_df("eurusd", "1m")
+        assert df.empty
+    assert calls == [1]
+    assert redis.gets == 1
+    stats = store.debug_stats()
+    assert stats["negative_hits"] == 4
+    assert stats["negative_entries"] == 1
+
+    await asyncio.sleep(0.06)
+    await store.get_df("eurusd", "1m")
+    assert calls == [1, 1]
+
+
+async def test_put_bars_clears_negative_entry(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    assert (await store.get_df("eurusd", "1m")).empty
+    assert store.debug_stats()["negative_entries"] == 1
+
+    await store.put_bars("eurusd", "1m", _bars([0]))
+    assert store.debug_stats()["negative_entries"] == 0
+    assert (await store.get_df("eurusd", "1m"))["open_time"].tolist() == [0]
+
+
+async def test_negative_cache_can_be_disabled(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, negative_cache_ttl_sec=0.0)
+    calls = _count_disk_loads(store)
+    await store.get_df("eurusd", "1m")
+    await store.get_df("eurusd", "1m")
+    assert calls == [1, 1]
+    assert store.debug_stats()["negative_entries"] == 0
@@ -0,0 +1,111 @@
+"""Тести UnifiedDataStore.get_range: RAM бінарним пошуком + старіше з диска."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore
+
+BASE_MS = 1_700_000_000_000
+
+
+class _MemRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.store[key] = value
+        return True
+
+
+def _ms(bar: int) -> int:
+    return BASE_MS + bar * 60_000
+
+
+def _bars(start: int, count: int) -> pd.DataFrame:
+    times = [_ms(i) for i in range(start, start + count)]
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0 + i for i in range(start, start + count)],
+            "high": [1.5 + i for i in range(start, start + count)],
+            "low": [0.5 + i for i in range(start, start + count)],
+            "close": [1.2 + i for i in range(start, start + count)],
+            "volume": [10.0] * count,
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _store(tmp_path: Path, ram_max_bars: int = 30_000) -> UnifiedDataStore:
+    config = StoreConfig(
+        profile=StoreProfile(ram_max_bars=ram_max_bars),
+        base_dir=str(tmp_path),
+        redis_write_behind=False,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _MemRedis()), cfg=config)
+
+
+def _open_bars(df: pd.DataFrame) -> list[int]:
+    return [(int(v) - BASE_MS) // 60_000 for v in df["open_time"]]
+
+
+async def test_ram_range_is_zero_copy_slice(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars(0, 100))
+
+    out = await store.get_range("xauusd", "1m", _ms(10), _ms(20))
+    assert _open_bars(out) == list(range(10, 20))
+    ram = store.ram.get("xauusd", "1m")
+    assert ram is not None
+    assert np.shares_memory(out["close"].to_numpy(), ram["close"].to_numpy())
+
+    tail = await store.get_range("xauusd", "1m", None, _ms(50), limit=5)
+    assert _open_bars(tail) == list(range(45, 50))
+    assert (await store.get_range("xauusd", "1m", _ms(500), None)).empty
+
+
+async def test_older_bars_fall_through_to_disk(tmp_path: Path) -> None:
+    store = _store(tmp_path, ram_max_bars=40)
+    await store.disk.save_bars("xauusd", "1m", _bars(0, 100))
+    store.ram.put("xauusd", "1m", _bars(60, 40))
+
+    out = await store.get_range("xauusd", "1m", _ms(50), _ms(70))
+    assert _open_bars(out) == list(range(50, 70))
+
+    # limit, що вміщається в RAM-частину, не чіпає диск
+    calls: list[Any] = []
+    original = store.disk.load_bars
+
+    async def _spy(*args: Any, **kwargs: Any) -> pd.DataFrame | None:
+        calls.append(kwargs)
+        return await original(*args, **kwargs)
+
+    store.disk.load_bars = _spy  # type: ignore[method-assign]
+    out = await store.get_range("xauusd", "1m", None, None, limit=10)
+    assert _open_bars(out) == list(range(90, 100))
+    assert calls == []
+
+    out = await store.get_range("xauusd", "1m", None, _ms(62), limit=5)
+    assert _open_bars(out) == list(range(57, 62))
+    assert calls[-1]["tail"] == 3 and calls[-1]["end_ms"] == _ms(60)
+
+
+async def test_ram_miss_reads_disk_range_without_populating_ram(
+    tmp_path: Path,
+) -> None:
+    store = _store(tmp_path)
+    await store.disk.save_bars("xauusd", "1m", _bars(0, 100))
+
+    out = await store.get_range("xauusd", "1m", _ms(30), _ms(33))
+    assert _open_bars(out) == [30, 31, 32]
+    assert store.ram.get("xauusd", "1m") is None
+    assert (await store.get_range("eurusd", "1m", _ms(0), _ms(10))).empty
@@ -0,0 +1,91 @@
+"""Тести страйп-локів (symbol, interval) у UnifiedDataStore."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.unified_store import StoreConfig, UnifiedDataStore
+
+
+class _SlowRedis:
+    """In-memory Redis, у якого запис ключів із ``slow_marker`` «висить»."""
+
+    def __init__(self, slow_marker: str) -> None:
+        self._store: dict[str, bytes] = {}
+        self.slow_marker = slow_marker
+        self.release = asyncio.Event()
+
+    async def get(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        if self.slow_marker in key:
+            await self.release.wait()
+        data = value.encode() if isinstance(value, str) else value
+        self._store[key] = bytes(data)
+        return True
+
+
+def _bars(open_time: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": [open_time],
+            "open": [1.0],
+            "high": [1.5],
+            "low": [0.5],
+            "close": [1.2],
+            "volume": [10.0],
+            "close_time": [open_time + 59_999],
+        }
+    )
+
+
+def _make_store(tmp_path: Path, redis: _SlowRedis) -> UnifiedDataStore:
+    cfg = StoreConfig(
+        base_dir=str(tmp_path), validate_on_read=False, validate_on_write=False
+    )
+    return UnifiedDataStore(redis=cast(Redis, redis), cfg=cfg)
+
+
+async def test_slow_redis_key_does_not_block_other_keys(tmp_path: Path) -> None:
+    redis = _SlowRedis(slow_marker="eurusd")
+    store = _make_store(tmp_path, redis)
+    assert store._key_lock("eurusd", "1m") is not store._key_lock("xauusd", "1m")
+
+    slow = asyncio.create_task(store.put_bars("eurusd", "1m", _bars(0)))
+    await asyncio.sleep(0)
+    # Інший ключ проходить, поки eurusd чекає на Redis.
+    await asyncio.wait_for(store.put_bars("xauusd", "1m", _bars(0)), timeout=1.0)
+    assert not slow.done()
+
+    redis.release.set()
+    await slow
+    assert len(await store.get_df("eurusd", "1m")) == 1
+
+
+async def test_same_key_is_serialized_and_wait_is_reported(tmp_path: Path) -> None:
+    redis = _SlowRedis(slow_marker="xauusd")
+    store = _make_store(tmp_path, redis)
+
+    first = asyncio.create_task(store.put_bars("xauusd", "1m", _bars(0)))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(store.put_bars("xauusd", "1m", _bars(60_000)))
+    await asyncio.sleep(0.02)
+    assert not first.done() and not second.done()
+
+    redis.release.set()
+    await asyncio.gather(first, second)
+
+    df = await store.get_df("xauusd", "1m")
+    assert df["open_time"].tolist() == [0, 60_000]
+    lock_wait = store.metrics_snapshot()["lock_wait"]
+    key_stats = lock_wait["keys"]["xauusd:1m"]
+    assert key_stats["acquires"] == 2
+    assert key_stats["contended"] == 1
+    assert key_stats["wait_max_ms"] >= 15.0
+    assert lock_wait["contended"] == 1
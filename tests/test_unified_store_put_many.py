@@ -0,0 +1,191 @@
+"""Тести пакетного put_bars_many: одне злиття/flush на ключ і один pipeline."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+import pytest
+from redis.asyncio import Redis
+
+from data.unified_store import PutBarsManyError, StoreConfig, UnifiedDataStore
+
+
+class _Pipeline:
+    def __init__(self, owner: _PipelineRedis) -> None:
+        self._owner = owner
+        self._ops: list[tuple[str, bytes]] = []
+
+    def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        data = value.encode() if isinstance(value, str) else value
+        self._ops.append((key, bytes(data)))
+
+    async def execute(self) -> list[bool]:
+        self._owner.batches.append(len(self._ops))
+        for key, data in self._ops:
+            self._owner.store[key] = data
+        return [True] * len(self._ops)
+
+
+class _PipelineRedis:
+    """In-memory Redis з pipeline; рахує окремі SET і батчі."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.direct_sets = 0
+        self.batches: list[int] = []
+
+    async def get(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.direct_sets += 1
+        self.store[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+def _bars(times: list[int], *, closed: bool = True, px: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [px] * len(times),
+            "high": [px + 0.5] * len(times),
+            "low": [px - 0.5] * len(times),
+            "close": [px + 0.2] * len(times),
+            "volume": [10.0] * len(times),
+            "close_time": [t + 59_999 for t in times],
+            "is_closed": [closed] * len(times),
+        }
+    )
+
+
+def _make_store(
+    tmp_path: Path, redis: _PipelineRedis, **overrides: Any
+) -> UnifiedDataStore:
+    cfg = StoreConfig(
+        base_dir=str(tmp_path),
+        validate_on_read=False,
+        validate_on_write=False,
+        **overrides,
+    )
+    return UnifiedDataStore(redis=cast(Redis, redis), cfg=cfg)
+
+
+def _stream(seed: int) -> list[tuple[str, str, pd.DataFrame]]:
+    rng = random.Random(seed)
+    heads = {"xauusd": 0, "eurusd": 0}
+    out: list[tuple[str, str, pd.DataFrame]] = []
+    for step in range(60):
+        symbol = rng.choice(list(heads))
+        kind = rng.random()
+        if kind < 0.6:
+            times = [heads[symbol] + 60_000 * i for i in range(1, rng.randint(2, 4))]
+            heads[symbol] = times[-1]
+            closed = True
+        elif kind < 0.85:
+            times = [heads[symbol]]  # live-оновлення поточного бару
+            closed = rng.random() < 0.5
+        else:
+            back = rng.randint(0, max(0, heads[symbol] // 60_000))
+            times = [back * 60_000]
+            closed = True
+        out.append((symbol, "1m", _bars(times, closed=closed, px=float(step))))
+    return out
+
+
+async def test_put_bars_many_matches_sequential_put_bars(tmp_path: Path) -> None:
+    stream = _stream(11)
+    seq = _make_store(tmp_path / "seq", _PipelineRedis())
+    for symbol, interval, bars in stream:
+        await seq.put_bars(symbol, interval, bars)
+
+    bulk = _make_store(tmp_path / "bulk", _PipelineRedis())
+    for start in range(0, len(stream), 7):
+        await bulk.put_bars_many(stream[start : start + 7])
+
+    for symbol in ("xauusd", "eurusd"):
+        expected = await seq.get_df(symbol, "1m")
+        got = await bulk.get_df(symbol, "1m")
+        pd.testing.assert_frame_equal(
+            got.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+        )
+        assert await bulk.get_last(symbol, "1m") == await seq.get_last(symbol, "1m")
+
+
+async def test_one_pipeline_and_one_flush_per_key(tmp_path: Path) -> None:
+    redis = _PipelineRedis()
+    store = _make_store(tmp_path, redis)
+    items = [
+        (symbol, "1m", _bars([i * 60_000]))
+        for i in range(20)
+        for symbol in ("xauusd", "eurusd", "gbpusd")
+    ]
+    await store.put_bars_many(items)
+
+    assert redis.batches == [3]
+    assert redis.direct_sets == 0
+    assert len(store._flush_q) == 3
+    df = await store.get_df("gbpusd", "1m")
+    assert len(df) == 20
+
+    stats = store.metrics_snapshot()["put_bars_many"]
+    assert stats["calls"] == 1
+    assert stats["items"] == 60
+    assert stats["keys"] == 3
+    assert stats["rows"] == 60
+    assert stats["last_rows_per_sec"] > 0
+
+
+async def test_without_write_behind_saves_once_per_key(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, _PipelineRedis(), write_behind=False)
+    saved: list[tuple[str, int]] = []
+    original = store.disk.save_bars
+
+    async def _save(symbol: str, interval: str, df: pd.DataFrame) -> str:
+        saved.append((symbol, len(df)))
+        return await original(symbol, interval, df)
+
+    store.disk.save_bars = _save  # type: ignore[method-assign]
+    await store.put_bars_many(
+        [
+            ("xauusd", "1m", _bars([0])),
+            ("eurusd", "1m", _bars([0])),
+            ("xauusd", "1m", _bars([60_000, 120_000])),
+            ("xauusd", "1m", _bars([], closed=True)),
+        ]
+    )
+    assert sorted(saved) == [("eurusd", 1), ("xauusd", 3)]
+
+
+async def test_failed_key_does_not_stop_rest_of_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = _make_store(tmp_path, _PipelineRedis())
+    original = store._put_locked
+
+    async def _put_locked(symbol: str, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        if symbol == "eurusd":
+            raise OSError("disk full")
+        return await original(symbol, *args, **kwargs)
+
+    monkeypatch.setattr(store, "_put_locked", _put_locked)
+    with pytest.raises(PutBarsManyError) as info:
+        await store.put_bars_many(
+            [
+                ("eurusd", "1m", _bars([0])),
+                ("xauusd", "1m", _bars([0])),
+                ("xauusd", "5m", _bars([0])),
+            ]
+        )
+
+    assert list(info.value.failed) == [("eurusd", "1m")]
+    assert isinstance(info.value.failed[("eurusd", "1m")], OSError)
+    assert len(await store.get_df("xauusd", "1m")) == 1
+    assert len(await store.get_df("xauusd", "5m")) == 1
@@ -0,0 +1,112 @@
+"""Тести індексу евікшену RamLayer: heap пріоритетів, TTL wheel, лічильники."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from data import unified_store
+from data.unified_store import Metrics, Priority, RamLayer, StoreProfile
+
+
+def _bars(count: int = 3) -> pd.DataFrame:
+    times = [1_700_000_000_000 + i * 60_000 for i in range(count)]
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0] * count,
+            "high": [1.5] * count,
+            "low": [0.5] * count,
+            "close": [1.2] * count,
+            "volume": [10.0] * count,
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock(1_000_000.0)
+    monkeypatch.setattr(unified_store.time, "time", fake.time)
+    return fake
+
+
+def test_hot_quota_evicts_lowest_priority_then_oldest(clock: _Clock) -> None:
+    ram = RamLayer(StoreProfile(max_symbols_hot=3))
+    ram.set_priority("alert", Priority.ALERT)
+    ram.set_priority("cold", Priority.COLD)
+    for sym in ("alert", "cold", "a", "b"):
+        ram.put(sym, "1m", _bars())
+    # cold — найнижчий пріоритет
+    assert ram.get("cold", "1m") is None
+
+    ram.get("a", "1m")  # a свіжіший за b
+    ram.put("c", "1m", _bars())
+    assert ram.get("b", "1m") is None
+    assert ram.get("a", "1m") is not None
+    assert ram.get("alert", "1m") is not None
+    assert ram.stats["symbols"] == 3
+    assert ram.stats["evictions"] == {"hot_quota": 2}
+
+
+def test_priority_change_reorders_eviction(clock: _Clock) -> None:
+    ram = RamLayer(StoreProfile(max_symbols_hot=2))
+    ram.put("a", "1m", _bars())
+    ram.put("b", "1m", _bars())
+    ram.set_priority("a", Priority.ALERT)  # a був би першим як найстаріший
+    ram.put("c", "1m", _bars())
+    assert ram.get("a", "1m") is not None
+    assert ram.get("b", "1m") is None
+
+
+def test_alert_symbols_are_never_evicted_by_quota(clock: _Clock) -> None:
+    ram = RamLayer(StoreProfile(max_symbols_hot=1))
+    for sym in ("x", "y"):
+        ram.set_priority(sym, Priority.ALERT)
+        ram.put(sym, "1m", _bars())
+    assert ram.stats["symbols"] == 2
+    assert ram.stats["evictions"] == {}
+
+
+def test_sweep_expires_only_due_keys(clock: _Clock) -> None:
+    metrics = Metrics()
+    ram = RamLayer(StoreProfile(hot_ttl_sec=10, warm_ttl_sec=100))
+    ram.put("xauusd", "1m", _bars())
+    ram.put("xauusd", "1h", _bars())
+
+    clock.now += 5
+    ram.touch("xauusd", "1m")  # TTL 1m переноситься на +10 від зараз
+    clock.now += 8
+    ram.sweep(metrics)
+    assert ram.stats["entries"] == 2
+
+    clock.now += 5
+    ram.sweep(metrics)
+    assert ram.stats["entries"] == 1
+    assert ram.get("xauusd", "1h") is not None
+    assert ram.stats["evictions"] == {"ttl_expired": 1}
+    assert ram.stats["bytes_in_ram"] > 0
+
+    clock.now += 200
+    ram.sweep(metrics)
+    assert ram.stats["entries"] == 0
+    assert ram.stats["bytes_in_ram"] == 0
+
+
+def test_eviction_heap_stays_bounded(clock: _Clock) -> None:
+    ram = RamLayer(StoreProfile(max_symbols_hot=500))
+    for i in range(400):
+        ram.put(f"s{i}", "1m", _bars())
+    for _ in range(20):
+        for i in range(400):
+            ram.get(f"s{i}", "1m")
+    assert len(ram._evict_heap) <= 2 * 400 + 64
+    assert ram.stats["symbols"] == 400
@@ -0,0 +1,196 @@
+"""Тести write-behind останніх барів у Redis (коалесинг + pipeline)."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+from redis.asyncio import Redis
+
+from core.serialization import json_loads
+from data.unified_store import StoreConfig, UnifiedDataStore
+
+
+class _Pipeline:
+    def __init__(self, owner: _PipelineRedis) -> None:
+        self._owner = owner
+        self._ops: list[tuple[str, bytes, int | None]] = []
+
+    def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        data = value.encode() if isinstance(value, str) else value
+        self._ops.append((key, bytes(data), ex))
+
+    async def execute(self) -> list[bool]:
+        if self._owner.fail_next:
+            self._owner.fail_next -= 1
+            raise ConnectionError("redis down")
+        self._owner.batches.append(len(self._ops))
+        for key, data, _ex in self._ops:
+            self._owner.store[key] = data
+        return [True] * len(self._ops)
+
+
+class _PipelineRedis:
+    """In-memory Redis з pipeline; рахує окремі SET і батчі."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.direct_sets = 0
+        self.batches: list[int] = []
+        self.transactions: list[bool] = []
+        self.fail_next = 0
+
+    async def get(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.direct_sets += 1
+        self.store[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        self.transactions.append(transaction)
+        return _Pipeline(self)
+
+
+def _bars(open_time: int, close: float = 1.2) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": [open_time],
+            "open": [1.0],
+            "high": [1.5],
+            "low": [0.5],
+            "close": [close],
+            "volume": [10.0],
+            "close_time": [open_time + 59_999],
+        }
+    )
+
+
+def _make_store(tmp_path: Path, redis: _PipelineRedis, **overrides: Any):
+    cfg = StoreConfig(
+        base_dir=str(tmp_path),
+        validate_on_read=False,
+        validate_on_write=False,
+        io_retry_backoff=0.001,
+        **overrides,
+    )
+    return UnifiedDataStore(redis=cast(Redis, redis), cfg=cfg)
+
+
+def _stored_close(redis: _PipelineRedis, symbol: str) -> float:
+    raw = redis.store[f"ai_one:candles:{symbol}:1m"]
+    return float(json_loads(raw.decode())["close"])
+
+
+async def test_put_bars_coalesces_and_flushes_via_pipeline(tmp_path: Path) -> None:
+    redis = _PipelineRedis()
+    store = _make_store(tmp_path, redis, redis_flush_interval_ms=20.0)
+    await store.start_maintenance()
+    try:
+        for i in range(5):
+            await store.put_bars("xauusd", "1m", _bars(i * 60_000, close=float(i)))
+            await store.put_bars("eurusd", "1m", _bars(i * 60_000, close=float(i)))
+        # put_bars повернувся до будь-якого round-trip у Redis
+        assert redis.batches == [] and redis.direct_sets == 0
+        last = await store.get_last("xauusd", "1m")
+        assert last is not None and last["close"] == 4.0
+
+        await asyncio.sleep(0.08)
+        assert redis.batches == [2]
+        assert redis.transactions == [False]
+        assert redis.direct_sets == 0
+        assert _stored_close(redis, "xauusd") == 4.0
+        assert _stored_close(redis, "eurusd") == 4.0
+
+        stats = store.metrics_snapshot()["redis_write_behind"]
+        assert stats["keys_written"] == 2
+        assert stats["coalesced"] == 8
+        assert stats["max_batch"] == 2
+        assert stats["pending"] == 0
+    finally:
+        await store.stop_maintenance()
+
+
+async def test_max_keys_triggers_early_flush(tmp_path: Path) -> None:
+    redis = _PipelineRedis()
+    store = _make_store(
+        tmp_path, redis, redis_flush_interval_ms=10_000.0, redis_flush_max_keys=3
+    )
+    await store.start_maintenance()
+    try:
+        for symbol in ("a", "b", "c"):
+            await store.put_bars(symbol, "1m", _bars(0))
+        await asyncio.sleep(0.02)
+        assert redis.batches == [3]
+    finally:
+        await store.stop_maintenance()
+
+
+async def test_stop_flushes_pending_and_failed_batch_is_retried(
+    tmp_path: Path,
+) -> None:
+    redis = _PipelineRedis()
+    redis.fail_next = 1
+    store = _make_store(tmp_path, redis, redis_flush_interval_ms=10_000.0)
+    await store.start_maintenance()
+    await store.put_bars("xauusd", "1m", _bars(0, close=7.0))
+    await store.stop_maintenance()
+
+    assert redis.batches == [1]
+    assert _stored_close(redis, "xauusd") == 7.0
+
+
+async def test_without_maintenance_writes_inline(tmp_path: Path) -> None:
+    redis = _PipelineRedis()
+    store = _make_store(tmp_path, redis)
+    await store.put_bars("xauusd", "1m", _bars(0, close=3.0))
+    assert redis.direct_sets == 1
+    assert _stored_close(redis, "xauusd") == 3.0
+
+
+async def test_failed_batch_is_retried_without_new_enqueue(tmp_path: Path) -> None:
+    redis = _PipelineRedis()
+    redis.fail_next = 2
+    store = _make_store(
+        tmp_path, redis, redis_flush_interval_ms=10.0, io_retry_attempts=2
+    )
+    await store.start_maintenance()
+    try:
+        await store.put_bars("xauusd", "1m", _bars(0, close=5.0))
+        # перший flush вичерпує всі спроби; повтор — без нового put_bars
+        await asyncio.sleep(0.15)
+        assert redis.batches == [1]
+        assert _stored_close(redis, "xauusd") == 5.0
+        assert store.metrics_snapshot()["redis_write_behind"]["errors"] == 1
+    finally:
+        await store.stop_maintenance()
+
+
+async def test_inflight_batch_stays_visible_until_execute(tmp_path: Path) -> None:
+    redis = _PipelineRedis()
+    release = asyncio.Event()
+    original = _Pipeline.execute
+
+    async def slow_execute(pipe: _Pipeline) -> list[bool]:
+        await release.wait()
+        return await original(pipe)
+
+    store = _make_store(tmp_path, redis, redis_flush_interval_ms=10_000.0)
+    writer = store._redis_wb
+    writer.enqueue("xauusd", "1m", {"open_time": 0, "close": 9.0}, None)
+    _Pipeline.execute = slow_execute  # type: ignore[method-assign]
+    try:
+        flushing = asyncio.ensure_future(writer.flush())
+        await asyncio.sleep(0.01)
+        assert redis.store == {}
+        pending = writer.pending_value("xauusd", "1m")
+        assert pending is not None and pending["close"] == 9.0
+        release.set()
+        assert await flushing == 1
+    finally:
+        _Pipeline.execute = original  # type: ignore[method-assign]
+    assert writer.pending_value("xauusd", "1m") is None
+    assert _stored_close(redis, "xauusd") == 9.0
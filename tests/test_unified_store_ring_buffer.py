@@ -0,0 +1,240 @@
+"""Тести колонкового RAM-буфера барів (BarRingBuffer) у UnifiedDataStore."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.bar_ring_buffer import BarRingBuffer
+from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore
+
+
+class _InMemoryRedis:
+    """Мінімальна in-memory реалізація Redis API для юніт-тестів."""
+
+    def __init__(self) -> None:
+        self._store: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        data = value.encode() if isinstance(value, str) else value
+        self._store[key] = bytes(data)
+        return True
+
+    async def delete(self, key: str) -> int:
+        return 1 if self._store.pop(key, None) is not None else 0
+
+
+def _make_store(tmp_path: Path, **overrides: Any) -> UnifiedDataStore:
+    cfg = StoreConfig(
+        base_dir=str(tmp_path),
+        validate_on_read=False,
+        validate_on_write=False,
+        **overrides,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _InMemoryRedis()), cfg=cfg)
+
+
+def _bars(times: list[int], *, closed: bool | None = None, px: float = 1.0):
+    frame = pd.DataFrame(
+        {
+            "open_time": pd.array(times, dtype="Int64"),
+            "open": [px + t for t in times],
+            "high": [px + t + 0.5 for t in times],
+            "low": [px + t - 0.5 for t in times],
+            "close": [px + t + 0.2 for t in times],
+            "volume": [10.0] * len(times),
+            "close_time": pd.array([t + 59 for t in times], dtype="Int64"),
+        }
+    )
+    if closed is not None:
+        frame["is_closed"] = closed
+    return frame
+
+
+async def test_in_order_appends_stay_in_buffer(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars([0, 60]))
+    buf = store.ram.get_buffer("xauusd", "1m")
+    assert isinstance(buf, BarRingBuffer)
+
+    await store.put_bars("xauusd", "1m", _bars([120]))
+    assert store.ram.get_buffer("xauusd", "1m") is buf
+    df = await store.get_df("xauusd", "1m")
+    assert df["open_time"].tolist() == [0, 60, 120]
+    assert store.ram.stats["bytes_in_ram"] == buf.nbytes
+
+    last = await store.get_last("xauusd", "1m")
+    assert last is not None and last["open_time"] == 120
+
+
+async def test_parity_with_dataframe_merge(tmp_path: Path) -> None:
+    """Буфер дає той самий результат, що й DataFrame-злиття, на змішаному потоці."""
+    fast = _make_store(tmp_path / "fast")
+    slow = _make_store(tmp_path / "slow", ram_ring_buffer=False)
+    rng = random.Random(7)
+    head = 0
+    for step in range(300):
+        kind = rng.random()
+        if kind < 0.6:
+            times = [head + 60 * i for i in range(1, rng.randint(1, 3) + 1)]
+            head = times[-1]
+        elif kind < 0.8:
+            times = [head]  # повтор останнього бару
+        else:
+            back = rng.randint(0, max(0, head // 60))
+            times = sorted({back * 60, max(0, back - 1) * 60})  # бекфіл
+        batch = _bars(times, closed=rng.random() < 0.7, px=float(step))
+        await fast.put_bars("xauusd", "1m", batch)
+        await slow.put_bars("xauusd", "1m", batch)
+
+    got = await fast.get_df("xauusd", "1m")
+    expected = await slow.get_df("xauusd", "1m")
+    pd.testing.assert_frame_equal(
+        got.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+async def test_is_closed_priority_on_upsert(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars([0, 60], closed=False, px=1.0))
+    await store.put_bars("xauusd", "1m", _bars([60], closed=True, px=2.0))
+    await store.put_bars("xauusd", "1m", _bars([60], closed=False, px=3.0))
+
+    df = await store.get_df("xauusd", "1m")
+    assert bool(df["is_closed"].iloc[-1]) is True
+    assert float(df["open"].iloc[-1]) == 62.0
+
+
+async def test_views_are_not_mutated_by_later_writes(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars([0, 60], closed=False))
+    before = await store.get_df("xauusd", "1m")
+    snapshot = before.copy()
+
+    await store.put_bars("xauusd", "1m", _bars([60], closed=True, px=5.0))
+    await store.put_bars("xauusd", "1m", _bars([120, 180]))
+
+    pd.testing.assert_frame_equal(before, snapshot)
+    after = await store.get_df("xauusd", "1m")
+    assert float(after["open"].iloc[1]) == 65.0
+
+
+async def test_live_upserts_update_buffer_in_place(tmp_path: Path) -> None:
+    """put_bars не видає view, тож upsert останнього бару не копіює масиви."""
+    store = _make_store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars([0, 60], closed=False))
+    buf = store.ram.get_buffer("xauusd", "1m")
+    assert buf is not None
+    close_arr = buf._arrays["close"]
+
+    for px in (2.0, 3.0, 4.0):
+        await store.put_bars("xauusd", "1m", _bars([60], closed=False, px=px))
+    assert buf._arrays["close"] is close_arr
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None and meta.rows == 2 and meta.last_close == 64.2
+
+    await store._drain_flush_queue(force=True)
+    saved = await store.disk.load_bars("xauusd", "1m")
+    assert saved is not None
+    assert float(saved["open"].iloc[-1]) == 64.0
+
+
+async def test_capacity_overflow_keeps_full_history(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, profile=StoreProfile(ram_max_bars=5))
+    for t in range(0, 300, 60):
+        await store.put_bars("xauusd", "1m", _bars([t]))
+    assert store.ram.get_buffer("xauusd", "1m") is not None
+
+    # Понад ємність ключ переходить на DataFrame — бари не відкидаються.
+    for t in range(300, 600, 60):
+        await store.put_bars("xauusd", "1m", _bars([t]))
+    assert store.ram.get_buffer("xauusd", "1m") is None
+    df = await store.get_df("xauusd", "1m")
+    assert df["open_time"].tolist() == list(range(0, 600, 60))
+
+    await store.put_bars("xauusd", "1m", _bars(list(range(600, 1200, 60))))
+    df = await store.get_df("xauusd", "1m")
+    assert df["open_time"].tolist() == list(range(0, 1200, 60))
+
+
+def test_buffer_refuses_growth_beyond_capacity() -> None:
+    buf = BarRingBuffer.from_frame(_bars([0, 60, 120]), capacity=4)
+    assert buf is not None
+    view = buf.view()
+    assert not buf.try_merge(_bars([180, 240]))
+    assert buf.try_merge(_bars([120, 180], closed=None))
+    assert not buf.try_merge(_bars([240]))
+    assert buf.view()["open_time"].tolist() == [0, 60, 120, 180]
+    assert view["open_time"].tolist() == [0, 60, 120]
+    assert BarRingBuffer.from_frame(_bars([0, 60, 120, 180, 240]), capacity=4) is None
+
+
+async def test_long_snapshot_survives_put_and_flush(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    times = [1_700_000_000_000 + i * 60_000 for i in range(40_001)]
+    await store.put_bars("xauusd", "1m", _bars(times[:40_000]))
+    await store.put_bars("xauusd", "1m", _bars(times[40_000:]))
+    await store._drain_flush_queue(force=True)
+
+    disk = await store.disk.load_bars("xauusd", "1m")
+    assert disk is not None and len(disk) == 40_001
+    assert disk["open_time"].iloc[0] == times[0]
+    assert disk["open_time"].iloc[-1] == times[-1]
+
+
+async def test_full_buffer_flushes_append_without_compaction(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, profile=StoreProfile(ram_max_bars=5))
+    times = [1_700_000_000_000 + i * 60_000 for i in range(12)]
+    await store.put_bars("xauusd", "1m", _bars(times[:3]))
+    await store._drain_flush_queue(force=True)
+    base = store.disk.base_snapshot("xauusd", "1m")
+    assert base is not None
+    base_bytes = base.read_bytes()
+
+    for t in times[3:]:
+        await store.put_bars("xauusd", "1m", _bars([t]))
+        await store._drain_flush_queue(force=True)
+    assert store.ram.get_buffer("xauusd", "1m") is None
+    assert base.read_bytes() == base_bytes, "флуш повного буфера не має компактувати"
+    segments = store.disk.segment_paths("xauusd", "1m")
+    assert sum(len(p.read_text().splitlines()) for p in segments) == 9
+
+    # обрізка голови теж лише дописує (межа — у trim-маніфесті)
+    await store.enforce_tail_limit("xauusd", "1m", 4)
+    await store._drain_flush_queue(force=True)
+    assert base.read_bytes() == base_bytes
+    disk = await store.disk.load_bars("xauusd", "1m")
+    assert disk is not None and disk["open_time"].tolist() == times[-4:]
+
+
+async def test_non_numeric_frame_falls_back_to_dataframe(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    frame = _bars([0, 60])
+    frame["source"] = "fxcm"
+    await store.put_bars("xauusd", "1m", frame)
+    assert store.ram.get_buffer("xauusd", "1m") is None
+
+    await store.put_bars("xauusd", "1m", _bars([120]).assign(source="fxcm"))
+    df = await store.get_df("xauusd", "1m")
+    assert df["open_time"].astype(int).tolist() == [0, 60, 120]
+
+    store.ram.delete(("xauusd", "1m"))
+    assert store.ram.stats["bytes_in_ram"] == 0
+
+
+def test_buffer_view_is_zero_copy() -> None:
+    buf = BarRingBuffer.from_frame(_bars(list(range(0, 6000, 60))), capacity=1000)
+    assert buf is not None
+    view = buf.view()
+    assert buf.view() is view
+    # view поверх буфера, а не власна копія даних
+    assert not view["close"].to_numpy().flags.owndata
+    assert view["open_time"].dtype == np.dtype("int64")
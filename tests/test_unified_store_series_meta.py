@@ -0,0 +1,104 @@
+"""Тести O(1) метаданих серій барів (get_series_meta) у UnifiedDataStore."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.unified_store import StoreConfig, UnifiedDataStore
+
+
+class _InMemoryRedis:
+    """Мінімальна in-memory реалізація Redis API для юніт-тестів."""
+
+    def __init__(self) -> None:
+        self._store: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        data = value.encode() if isinstance(value, str) else value
+        self._store[key] = bytes(data)
+        return True
+
+
+def _bars(times: list[int], close: float = 1.2) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0] * len(times),
+            "high": [1.5] * len(times),
+            "low": [0.5] * len(times),
+            "close": [close] * len(times),
+            "volume": [10.0] * len(times),
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _make_store(tmp_path: Path, **overrides: Any) -> UnifiedDataStore:
+    cfg = StoreConfig(
+        base_dir=str(tmp_path),
+        validate_on_read=False,
+        validate_on_write=False,
+        **overrides,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _InMemoryRedis()), cfg=cfg)
+
+
+async def test_meta_tracks_puts_and_trim(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    assert store.get_series_meta("xauusd", "1m") is None
+
+    await store.put_bars("xauusd", "1m", _bars([0, 60_000]))
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None
+    assert (meta.rows, meta.first_open_time, meta.last_open_time) == (2, 0, 60_000)
+    assert meta.last_close == 1.2
+    assert meta.last_put_ts is not None
+    assert meta.version == 1
+
+    await store.put_bars("xauusd", "1m", _bars([120_000], close=2.5))
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None
+    assert (meta.rows, meta.last_open_time, meta.last_close) == (3, 120_000, 2.5)
+    assert meta.version == 2
+
+    # Бекфіл у середину (повне злиття) теж оновлює метадані.
+    await store.put_bars("xauusd", "1m", _bars([-60_000]))
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None
+    assert (meta.rows, meta.first_open_time) == (4, -60_000)
+
+    put_ts = meta.last_put_ts
+    await store.enforce_tail_limit("xauusd", "1m", 2)
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None
+    assert (meta.rows, meta.first_open_time, meta.last_open_time) == (
+        2,
+        60_000,
+        120_000,
+    )
+    assert meta.last_put_ts == put_ts
+    assert meta.version == 4
+
+
+async def test_meta_after_warmup_and_read_through(tmp_path: Path) -> None:
+    writer = _make_store(tmp_path)
+    await writer.disk.save_bars("xauusd", "1m", _bars([0, 60_000, 120_000]))
+    await writer.disk.save_bars("eurusd", "1m", _bars([0, 60_000]))
+
+    store = _make_store(tmp_path)
+    await store.warmup(["xauusd"], "1m", bars_needed=2)
+    meta = store.get_series_meta("xauusd", "1m")
+    assert meta is not None
+    assert (meta.rows, meta.last_open_time, meta.last_put_ts) == (2, 120_000, None)
+
+    assert store.get_series_meta("eurusd", "1m") is None
+    await store.get_df("eurusd", "1m")
+    meta = store.get_series_meta("eurusd", "1m")
+    assert meta is not None and meta.rows == 2
@@ -0,0 +1,187 @@
+"""Тести append-only сегментів snapshot-ів у StorageAdapter."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from data.unified_store import StorageAdapter, StoreConfig
+
+
+def _bars(start: int, count: int) -> pd.DataFrame:
+    rows = []
+    for i in range(start, start + count):
+        open_time = 1_700_000_000_000 + i * 60_000
+        rows.append(
+            {
+                "open_time": open_time,
+                "open": 1.0 + i,
+                "high": 1.5 + i,
+                "low": 0.5 + i,
+                "close": 1.2 + i,
+                "volume": 10.0,
+                "close_time": open_time + 59_999,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _adapter(tmp_path: Path, **overrides: object) -> StorageAdapter:
+    cfg = StoreConfig(base_dir=str(tmp_path), **overrides)  # type: ignore[arg-type]
+    return StorageAdapter(tmp_path, cfg)
+
+
+async def test_save_appends_only_new_rows_to_segment(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    first = _bars(0, 5)
+    await disk.save_bars("xauusd", "1m", first)
+    base = disk.snapshot_path("xauusd", "1m")
+    base_bytes = base.read_bytes()
+
+    extended = _bars(0, 7)
+    await disk.save_bars("xauusd", "1m", extended)
+
+    segments = disk.segment_paths("xauusd", "1m")
+    assert len(segments) == 1
+    assert base.read_bytes() == base_bytes, "base snapshot не має перезаписуватись"
+    assert len(segments[0].read_text(encoding="utf-8").splitlines()) == 2
+
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["open_time"].tolist() == extended["open_time"].tolist()
+
+    stats = await disk.inspect_snapshot("xauusd", "1m")
+    assert stats is not None
+    assert stats.rows == 7
+    assert stats.last_open_time == extended["open_time"].iloc[-1] / 1000.0
+
+
+async def test_updated_last_bar_forces_compaction(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    await disk.save_bars("xauusd", "1m", _bars(0, 5))
+    await disk.save_bars("xauusd", "1m", _bars(0, 6))
+    assert disk.segment_paths("xauusd", "1m")
+
+    changed = _bars(0, 7)
+    changed.loc[5, "close"] = 999.0  # вже персистований бар змінився
+    await disk.save_bars("xauusd", "1m", changed)
+
+    assert disk.segment_paths("xauusd", "1m") == []
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert len(loaded) == 7
+    assert float(loaded["close"].iloc[5]) == 999.0
+
+
+async def test_segments_compact_when_threshold_exceeded(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, segment_max_rows=2, segment_compact_rows=4)
+    await disk.save_bars("xauusd", "1m", _bars(0, 3))
+    await disk.save_bars("xauusd", "1m", _bars(0, 5))
+    await disk.save_bars("xauusd", "1m", _bars(0, 7))
+    assert len(disk.segment_paths("xauusd", "1m")) == 2  # ротація по 2 рядки
+
+    await disk.save_bars("xauusd", "1m", _bars(0, 9))
+    assert disk.segment_paths("xauusd", "1m") == []
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert len(loaded) == 9
+
+
+async def test_restart_continues_appending_after_load(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    await disk.save_bars("xauusd", "1m", _bars(0, 4))
+    await disk.save_bars("xauusd", "1m", _bars(0, 6))
+
+    restarted = _adapter(tmp_path)
+    loaded = await restarted.load_bars("xauusd", "1m")
+    assert loaded is not None and len(loaded) == 6
+
+    await restarted.save_bars("xauusd", "1m", _bars(0, 8))
+    segments = restarted.segment_paths("xauusd", "1m")
+    assert len(segments) == 1
+    assert len(segments[0].read_text(encoding="utf-8").splitlines()) == 4
+
+    reloaded = await _adapter(tmp_path).load_bars("xauusd", "1m")
+    assert reloaded is not None
+    assert reloaded["open_time"].tolist() == _bars(0, 8)["open_time"].tolist()
+
+
+async def test_torn_segment_line_is_ignored(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    await disk.save_bars("xauusd", "1m", _bars(0, 3))
+    await disk.save_bars("xauusd", "1m", _bars(0, 4))
+    segment = disk.segment_paths("xauusd", "1m")[0]
+    with segment.open("a", encoding="utf-8") as handle:
+        handle.write('{"open_time": 17000')  # краш посеред append
+
+    loaded = await _adapter(tmp_path).load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert len(loaded) == 4
+
+
+async def test_segments_disabled_keeps_full_rewrite(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path, snapshot_segments=False)
+    await disk.save_bars("xauusd", "1m", _bars(0, 3))
+    await disk.save_bars("xauusd", "1m", _bars(0, 5))
+    assert disk.segment_paths("xauusd", "1m") == []
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None and len(loaded) == 5
+
+
+async def test_head_trim_appends_and_records_manifest(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    await disk.save_bars("xauusd", "1m", _bars(0, 5))
+    base = disk.snapshot_path("xauusd", "1m")
+    base_bytes = base.read_bytes()
+
+    # enforce_tail_limit відрізав голову і прийшли нові бари — без компакції
+    await disk.save_bars("xauusd", "1m", _bars(3, 4))
+    assert base.read_bytes() == base_bytes
+    assert disk.manifest_path("xauusd", "1m").exists()
+    loaded = await disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["open_time"].tolist() == _bars(3, 4)["open_time"].tolist()
+
+    restarted = _adapter(tmp_path)
+    loaded = await restarted.load_bars("xauusd", "1m")
+    assert loaded is not None and len(loaded) == 4
+    await restarted.save_bars("xauusd", "1m", _bars(4, 5))
+    assert base.read_bytes() == base_bytes
+    reloaded = await _adapter(tmp_path).load_bars("xauusd", "1m")
+    assert reloaded is not None
+    assert reloaded["open_time"].tolist() == _bars(4, 5)["open_time"].tolist()
+
+    # бекфіл перед межею обрізки — компакція прибирає і маніфест
+    await restarted.save_bars("xauusd", "1m", _bars(0, 9))
+    assert restarted.segment_paths("xauusd", "1m") == []
+    assert not restarted.manifest_path("xauusd", "1m").exists()
+    reloaded = await _adapter(tmp_path).load_bars("xauusd", "1m")
+    assert reloaded is not None and len(reloaded) == 9
+
+
+async def test_inserted_bar_inside_history_forces_compaction(tmp_path: Path) -> None:
+    disk = _adapter(tmp_path)
+    gapped = pd.concat([_bars(0, 3), _bars(4, 3)], ignore_index=True)
+    await disk.save_bars("xauusd", "1m", gapped)
+    await disk.save_bars("xauusd", "1m", _bars(1, 7))
+
+    assert disk.segment_paths("xauusd", "1m") == []
+    loaded = await _adapter(tmp_path).load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["open_time"].tolist() == _bars(1, 7)["open_time"].tolist()
+
+
+async def test_inspect_skips_trimmed_head(tmp_path: Path) -> None:
+    for fmt in ("jsonl", "columnar"):
+        root = tmp_path / fmt
+        disk = _adapter(root, snapshot_format=fmt)
+        await disk.save_bars("xauusd", "1m", _bars(0, 5))
+        await disk.save_bars("xauusd", "1m", _bars(3, 4))
+        assert disk.manifest_path("xauusd", "1m").exists()
+
+        loaded = await disk.load_bars("xauusd", "1m")
+        stats = await disk.inspect_snapshot("xauusd", "1m")
+        assert loaded is not None and stats is not None
+        assert stats.rows == len(loaded) == 4
+        assert stats.last_open_time == _bars(3, 4)["open_time"].iloc[-1] / 1000.0
@@ -0,0 +1,197 @@
+"""Тести WAL дельт барів: відновлення після крашу та чекпоінт за флушами."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+import pytest
+from redis.asyncio import Redis
+
+from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore
+
+
+class _MemRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.store[key] = value
+        return True
+
+
+def _bars(start: int, end: int) -> pd.DataFrame:
+    times = [i * 60_000 for i in range(start, end)]
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0 + i for i in range(start, end)],
+            "high": [1.5 + i for i in range(start, end)],
+            "low": [0.5 + i for i in range(start, end)],
+            "close": [1.2 + i for i in range(start, end)],
+            "volume": [10.0] * len(times),
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _store(tmp_path: Path, **cfg: Any) -> UnifiedDataStore:
+    config = StoreConfig(
+        profile=StoreProfile(flush_batch_max=1),
+        base_dir=str(tmp_path),
+        wal=True,
+        redis_write_behind=False,
+        **cfg,
+    )
+    return UnifiedDataStore(redis=cast(Redis, _MemRedis()), cfg=config)
+
+
+def _wal_files(tmp_path: Path) -> list[Path]:
+    return sorted((tmp_path / "wal").glob("wal_*.jsonl"))
+
+
+async def test_unflushed_bars_survive_crash(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars(0, 5))
+    await store._drain_flush_queue(force=True)
+    assert _wal_files(tmp_path) == []  # усе на диску → WAL порожній
+
+    await store.put_bars("xauusd", "1m", _bars(5, 8))
+    columns = {
+        name: np.asarray(values)
+        for name, values in _bars(8, 10).to_dict(orient="list").items()
+    }
+    await store.put_bars("xauusd", "1m", columns)
+    assert _wal_files(tmp_path)
+    # краш: флуш snapshot-а так і не відбувся
+
+    restarted = _store(tmp_path)
+    stats = await restarted.replay_wal()
+    assert stats["records"] == 2
+    assert stats["rows"] == 5
+    assert _wal_files(tmp_path) == []
+
+    loaded = await restarted.disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["open_time"].tolist() == _bars(0, 10)["open_time"].tolist()
+    df = await restarted.get_df("xauusd", "1m")
+    assert len(df) == 10
+
+
+async def test_replay_restores_nullable_columns_as_numbers(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars(0, 3))
+    await store._drain_flush_queue(force=True)
+
+    # час інжестора — nullable Int64; NA не має стати рядком "<NA>"
+    delta = _bars(3, 5)
+    delta["close_time"] = pd.array([239_999, None], dtype="Int64")
+    await store.put_bars("xauusd", "1m", delta)
+    last = _bars(5, 6)
+    last["close_time"] = pd.array([None], dtype="Int64")
+    await store.put_bars("xauusd", "1m", last)
+
+    restarted = _store(tmp_path)
+    stats = await restarted.replay_wal()
+    assert stats["rows"] == 3
+    loaded = await restarted.disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    close_time = loaded["close_time"]
+    assert pd.api.types.is_numeric_dtype(close_time)
+    assert close_time.iloc[:4].tolist() == [59_999, 119_999, 179_999, 239_999]
+    assert close_time.iloc[4:].isna().all()
+
+
+async def test_checkpoint_keeps_files_for_dirty_keys(tmp_path: Path) -> None:
+    store = _store(tmp_path, wal_file_max_bytes=1)  # новий файл на кожен запис
+    await store.put_bars("xauusd", "1m", _bars(0, 3))
+    await store.put_bars("eurusd", "1m", _bars(0, 3))
+    assert len(_wal_files(tmp_path)) == 2
+
+    # скидаємо лише перший ключ → його файл більше не потрібен
+    await store._drain_flush_queue()
+    assert len(_wal_files(tmp_path)) == 1
+
+    await store._drain_flush_queue(force=True)
+    assert _wal_files(tmp_path) == []
+    snap = store.wal_snapshot()
+    assert snap["enabled"] is True
+    assert snap["appended_records"] == 2
+    assert snap["removed_files"] == 2
+    assert store.metrics_snapshot()["wal"]["dirty_keys"] == 0
+
+
+async def test_replay_applies_trim_and_skips_torn_line(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    await store.put_bars("xauusd", "1m", _bars(0, 6))
+    await store.enforce_tail_limit("xauusd", "1m", 3)
+    with _wal_files(tmp_path)[-1].open("ab") as handle:
+        handle.write(b'{"s": "xauusd", "i": "1m", "c": ["open_t')  # краш посеред append
+
+    restarted = _store(tmp_path)
+    stats = await restarted.replay_wal()
+    assert stats["records"] == 2
+    loaded = await restarted.disk.load_bars("xauusd", "1m")
+    assert loaded is not None
+    assert loaded["open_time"].tolist() == _bars(3, 6)["open_time"].tolist()
+
+
+async def test_fsync_runs_off_loop_as_group_commit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = _store(tmp_path, wal_fsync=True)
+    loop_thread = threading.get_ident()
+    synced_from: list[int] = []
+    real_fsync = os.fsync
+
+    def _slow_fsync(fd: int) -> None:
+        synced_from.append(threading.get_ident())
+        time.sleep(0.05)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", _slow_fsync)
+    ticks = 0
+
+    async def _ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.create_task(_ticker())
+    symbols = [f"sym{i}" for i in range(8)]
+    await asyncio.gather(*(store.put_bars(s, "1m", _bars(0, 3)) for s in symbols))
+    ticker.cancel()
+
+    assert synced_from and loop_thread not in synced_from
+    # синк стартує вже після того, як дописали всі 8 — лише один-два fsync
+    batch_syncs = len(synced_from)
+    assert batch_syncs <= 2
+    assert ticks > 1  # loop крутився, поки fsync ішов у потоці
+    snap = store.wal_snapshot()
+    assert snap["appended_records"] == 8
+    assert snap["syncs"] == len(synced_from)
+
+    await store.enforce_tail_limit("sym0", "1m", 1)
+    assert len(synced_from) == batch_syncs + 1
+    assert store.wal_snapshot()["syncs"] == batch_syncs + 1
+
+
+async def test_flush_interval_defers_snapshot_writes(tmp_path: Path) -> None:
+    store = _store(tmp_path, flush_interval_sec=60.0)
+    await store.put_bars("xauusd", "1m", _bars(0, 3))
+    assert store._flush_due() is False
+    # Запланована затримка флушу не вважається дисковим сталом.
+    assert store.backpressure_level() == "normal"
+
+    store._flush_enqueued_at[("xauusd", "1m")] = time.monotonic() - 61.0
+    assert store._flush_due() is True
@@ -0,0 +1,176 @@
+"""Тести boot warmup UDS: хвостове читання snapshot-ів і паралельний прогрів."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, cast
+
+import pandas as pd
+from redis.asyncio import Redis
+
+from data.unified_store import StorageAdapter, StoreConfig, UnifiedDataStore
+
+
+class _MemRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.store[key] = value
+        return True
+
+
+def _bars(start: int, count: int) -> pd.DataFrame:
+    times = [1_700_000_000_000 + i * 60_000 for i in range(start, start + count)]
+    return pd.DataFrame(
+        {
+            "open_time": times,
+            "open": [1.0 + i for i in range(start, start + count)],
+            "high": [1.5 + i for i in range(start, start + count)],
+            "low": [0.5 + i for i in range(start, start + count)],
+            "close": [1.2 + i for i in range(start, start + count)],
+            "volume": [10.0] * count,
+            "close_time": [t + 59_999 for t in times],
+        }
+    )
+
+
+def _store(tmp_path: Path, **cfg: Any) -> UnifiedDataStore:
+    config = StoreConfig(base_dir=str(tmp_path), redis_write_behind=False, **cfg)
+    return UnifiedDataStore(redis=cast(Redis, _MemRedis()), cfg=config)
+
+
+async def test_jsonl_tail_matches_full_read(tmp_path: Path) -> None:
+    disk = StorageAdapter(tmp_path, StoreConfig(base_dir=str(tmp_path)))
+    await disk.save_bars("xauusd", "1m", _bars(0, 3000))
+
+    full = await disk.load_bars("xauusd", "1m")
+    assert full is not None
+    for rows in (1, 7, 2999, 3000, 5000):
+        tail = await disk.load_bars("xauusd", "1m", tail=rows)
+        assert tail is not None
+        pd.testing.assert_frame_equal(tail, full.tail(rows).reset_index(drop=True))
+
+
+async def test_tail_inside_segments_skips_base(tmp_path: Path) -> None:
+    disk = StorageAdapter(tmp_path, StoreConfig(base_dir=str(tmp_path)))
+    await disk.save_bars("xauusd", "1m", _bars(0, 10))
+    await disk.save_bars("xauusd", "1m", _bars(0, 15))
+    assert disk.segment_paths("xauusd", "1m")
+
+    # Зіпсований base не читається, якщо хвіст цілком у сегментах.
+    disk.snapshot_path("xauusd", "1m").write_text("not json\n", encoding="utf-8")
+    tail = await disk.load_bars("xauusd", "1m", tail=3)
+    assert tail is not None
+    assert tail["open_time"].tolist() == _bars(12, 3)["open_time"].tolist()
+
+
+async def test_warmup_many_bounds_concurrency_and_reports(tmp_path: Path) -> None:
+    store = _store(tmp_path, warmup_concurrency=2)
+    pairs = [(f"s{i}", "1m") for i in range(6)]
+    for sym, tf in pairs:
+        await store.disk.save_bars(sym, tf, _bars(0, 50))
+
+    active = 0
+    peak = 0
+    original = store.disk.load_bars
+
+    async def _slow_load(*args: Any, **kwargs: Any) -> pd.DataFrame | None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            active -= 1
+
+    store.disk.load_bars = _slow_load  # type: ignore[method-assign]
+    stats = await store.warmup_many([*pairs, ("missing", "1m")], bars_needed=20)
+
+    assert peak == 2
+    assert stats["keys"] == 7
+    assert stats["loaded"] == 6
+    assert stats["rows"] == 6 * 20
+    assert set(stats["per_key_ms"]) == {f"{s}:{tf}" for s, tf in pairs} | {"missing:1m"}
+    df = await store.get_df("s0", "1m")
+    assert len(df) == 20
+    assert store.metrics_snapshot()["warmup"]["runs"] == 1
+
+
+async def test_warmup_keeps_live_bars_and_survives_failures(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    await store.disk.save_bars("xauusd", "1m", _bars(0, 10))
+    await store.put_bars("xauusd", "1m", _bars(10, 2))
+
+    original = store.disk.load_bars
+
+    async def _load(symbol: str, *args: Any, **kwargs: Any) -> pd.DataFrame | None:
+        if symbol == "eurusd":
+            raise OSError("disk error")
+        return await original(symbol, *args, **kwargs)
+
+    store.disk.load_bars = _load  # type: ignore[method-assign]
+    stats = await store.warmup_many([("eurusd", "1m"), ("xauusd", "1m")], 100)
+
+    assert stats["failed"] == 1
+    df = await store.get_df("xauusd", "1m")
+    assert df["open_time"].tolist() == _bars(0, 12)["open_time"].tolist()
+
+
+async def test_tail_warmup_does_not_truncate_disk_history(tmp_path: Path) -> None:
+    await _store(tmp_path).disk.save_bars("xauusd", "1m", _bars(0, 400))
+
+    store = _store(tmp_path)
+    await store.warmup_many([("xauusd", "1m")], bars_needed=100)
+    df = await store.get_df("xauusd", "1m")
+    assert len(df) == 100
+
+    # RAM лишається хвостом, флуш дописує в сегмент лише новіші за диск бари.
+    base = store.disk.snapshot_path("xauusd", "1m")
+    base_bytes = base.read_bytes()
+    await store.put_bars("xauusd", "1m", _bars(400, 1))
+    assert len(await store.get_df("xauusd", "1m")) == 101
+    await store._drain_flush_queue(force=True)
+    assert base.read_bytes() == base_bytes
+    segments = store.disk.segment_paths("xauusd", "1m")
+    assert len(segments) == 1
+    assert len(segments[0].read_text(encoding="utf-8").splitlines()) == 1
+    disk = await store.disk.load_bars("xauusd", "1m")
+    assert disk is not None
+    assert disk["open_time"].tolist() == _bars(0, 401)["open_time"].tolist()
+
+    # Навмисна обрізка не повертає старі бари з диска.
+    await store.enforce_tail_limit("xauusd", "1m", 50)
+    await store.put_bars("xauusd", "1m", _bars(401, 1))
+    await store._drain_flush_queue(force=True)
+    disk = await store.disk.load_bars("xauusd", "1m")
+    assert disk is not None
+    assert disk["open_time"].tolist() == _bars(351, 51)["open_time"].tolist()
+
+
+async def test_tail_flush_rewrites_changed_disk_bar_with_prefix(tmp_path: Path) -> None:
+    history = _bars(0, 300)
+    history["is_closed"] = True
+    history.loc[299, "is_closed"] = False
+    await _store(tmp_path).disk.save_bars("xauusd", "1m", history)
+
+    store = _store(tmp_path)
+    await store.warmup_many([("xauusd", "1m")], bars_needed=50)
+    # Живий бар на диску закрився: дописати не можна — флуш компактує
+    # з дисковим префіксом, RAM при цьому не росте.
+    changed = _bars(299, 1)
+    changed["is_closed"] = True
+    changed.loc[0, "close"] = 999.0
+    await store.put_bars("xauusd", "1m", changed)
+    await store._drain_flush_queue(force=True)
+    assert len(await store.get_df("xauusd", "1m")) == 50
+
+    disk = await store.disk.load_bars("xauusd", "1m")
+    assert disk is not None
+    assert disk["open_time"].tolist() == _bars(0, 300)["open_time"].tolist()
+    assert float(disk["close"].iloc[-1]) == 999.0
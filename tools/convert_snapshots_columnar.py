@@ -0,0 +1,112 @@
+"""Одноразова конвертація JSONL snapshot-ів datastore у колонковий memmap-формат."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import re
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.settings import load_datastore_cfg  # noqa: E402
+from data.unified_store import COLUMNAR_EXT, StorageAdapter, StoreConfig  # noqa: E402
+
+logger = logging.getLogger("tools.convert_snapshots_columnar")
+logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+_SNAPSHOT_RE = re.compile(r"^(?P<symbol>.+?)_bars_(?P<interval>[^_]+)_snapshot\.jsonl$")
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Конвертує datastore/*_bars_<tf>_snapshot.jsonl у columnar .bin",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--base-dir",
+        default=None,
+        help="Каталог snapshot-ів. За замовчуванням — datastore.base_dir",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Конвертувати, навіть якщо .bin вже свіжіший за JSONL",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Лише показати, що буде сконвертовано",
+    )
+    return parser.parse_args(argv)
+
+
+def find_jsonl_snapshots(base_dir: Path) -> list[tuple[str, str, Path]]:
+    """Повертає (symbol, interval, path) для канонічних JSONL snapshot-ів.
+
+    Віртуальні таймфрейми експорту (``1m_last7d``) не чіпаємо — це файли
+    для обміну, а не дисковий шар UDS.
+    """
+    found: list[tuple[str, str, Path]] = []
+    for path in sorted(base_dir.glob("*_bars_*_snapshot.jsonl")):
+        match = _SNAPSHOT_RE.match(path.name)
+        if match is None:
+            continue
+        found.append((match.group("symbol"), match.group("interval"), path))
+    return found
+
+
+async def convert_all(
+    base_dir: Path, *, force: bool = False, dry_run: bool = False
+) -> list[str]:
+    """Конвертує всі JSONL snapshot-и у ``base_dir``; повертає шляхи .bin."""
+    disk = StorageAdapter(base_dir, StoreConfig(base_dir=str(base_dir)))
+    written: list[str] = []
+    for symbol, interval, path in find_jsonl_snapshots(base_dir):
+        target = disk.snapshot_path(symbol, interval, ext=COLUMNAR_EXT)
+        if (
+            not force
+            and target.exists()
+            and target.stat().st_mtime >= path.stat().st_mtime
+        ):
+            logger.info("Пропускаю %s %s — %s вже свіжіший", symbol, interval, target)
+            continue
+        if dry_run:
+            logger.info("Буде сконвертовано %s → %s", path, target)
+            continue
+        result = await disk.convert_snapshot(symbol, interval, fmt="columnar")
+        if result is None:
+            logger.warning("Порожній snapshot %s — пропущено", path)
+            continue
+        logger.info("Сконвертовано %s → %s", path, result)
+        written.append(result)
+    return written
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    base_dir = Path(args.base_dir or load_datastore_cfg().base_dir)
+    if not base_dir.exists():
+        logger.error("Каталог %s не існує", base_dir)
+        return 1
+    try:
+        written = asyncio.run(
+            convert_all(base_dir, force=args.force, dry_run=args.dry_run)
+        )
+    except KeyboardInterrupt:
+        logger.warning("Перервано користувачем")
+        return 130
+    except Exception as exc:
+        logger.error("Помилка конвертації snapshot-ів: %s", exc, exc_info=True)
+        return 1
+    logger.info("Готово: %d файлів", len(written))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,11 +16,11 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-import pandas as pd
-from redis.asyncio import Redis
+import pandas as pd  # noqa: E402
+from redis.asyncio import Redis  # noqa: E402
 
-from app.settings import load_datastore_cfg, settings
-from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore
+from app.settings import load_datastore_cfg, settings  # noqa: E402
+from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore  # noqa: E402
 
 logger = logging.getLogger("tools.export_store_snapshots")
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
@@ -132,7 +132,8 @@ async def _export_interval(
     minutes = _parse_interval_minutes(interval)
     max_minutes = max(w.minutes for w in windows)
     max_bars = int(math.ceil(max_minutes / minutes))
-    df = await store.get_df(symbol, interval, limit=max_bars + 100)
+    # Останні бари: RAM + хвіст snapshot-а без повного парсингу файла.
+    df = await store.get_range(symbol, interval, limit=max_bars + 100)
     if df is None or df.empty:
         logger.warning("Дані для %s %s відсутні", symbol, interval)
         return
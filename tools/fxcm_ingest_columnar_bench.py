@@ -0,0 +1,92 @@
+"""Мікробенчмарк FXCM інжесту: DataFrame-шлях vs колонковий numpy-шлях.
+
+Ціль: поміряти вартість перетворення санітизованих барів одного повідомлення
+в формат для UDS при 1/10/1000 барах на пакет.
+
+Вивід (на кожен розмір пакету):
+- µs/пакет для `_bars_payload_to_df` і `_bars_payload_to_columns`;
+- прискорення колонкового шляху.
+
+Інструмент не змінює runtime-поведінку: це окремий tools/* скрипт.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+# Важливо: при запуску як `python tools/fxcm_ingest_columnar_bench.py`
+# sys.path[0] = tools/, тому корінь репо не видно. Додаємо repo-root явно.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from data.fxcm_ingestor import (  # noqa: E402
+    _bars_payload_to_columns,
+    _bars_payload_to_df,
+    _sanitize_bar,
+)
+
+
+def _make_bars(count: int) -> list[dict[str, Any]]:
+    start = 1_764_002_100_000
+    bars: list[dict[str, Any]] = []
+    for i in range(count):
+        open_time = start + i * 60_000
+        raw = {
+            "open_time": open_time,
+            "close_time": open_time + 59_999,
+            "open": 1.1525 + i * 1e-5,
+            "high": 1.1527 + i * 1e-5,
+            "low": 1.1524 + i * 1e-5,
+            "close": 1.1526 + i * 1e-5,
+            "volume": 149.0,
+            "complete": True,
+        }
+        sanitized = _sanitize_bar(raw)
+        if sanitized is not None:
+            bars.append(sanitized)
+    return bars
+
+
+def _best_us(fn: Any, number: int, repeat: int) -> float:
+    runs = timeit.repeat(fn, number=number, repeat=repeat)
+    return min(runs) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="FXCM ingest: DataFrame vs numpy-колонки (µs/пакет)"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1,10,1000",
+        help="Розміри пакетів через кому (барів на повідомлення)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=2_000,
+        help="Приблизна кількість барів на один замір (для кількості ітерацій)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Кількість замірів")
+    args = parser.parse_args()
+
+    sizes = [int(p) for p in str(args.sizes).split(",") if p.strip()]
+    print(f"{'bars':>6} {'dataframe_us':>14} {'columnar_us':>13} {'speedup':>8}")
+    for size in sizes:
+        bars = _make_bars(max(1, size))
+        number = max(1, int(args.budget) // max(1, size))
+        repeat = max(1, int(args.repeat))
+        df_us = _best_us(lambda b=bars: _bars_payload_to_df(b), number, repeat)
+        col_us = _best_us(lambda b=bars: _bars_payload_to_columns(b), number, repeat)
+        speedup = df_us / col_us if col_us > 0 else float("inf")
+        print(f"{size:>6} {df_us:>14.1f} {col_us:>13.1f} {speedup:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+"""Бенчмарк JSON-кодеків core.serialization по гарячих call-site.
+
+Ціль: показати виграш швидкого кодека (orjson) проти stdlib на типових
+payload кожного call-site: FXCM ohlcv/price-tick (loads з bytes Redis),
+Redis last-bar UDS (dumps/loads), publish_smc_state і viewer broadcaster
+(dumps), WS-сервери (dumps у str).
+
+Вивід: µs/виклик для кожного кодека і прискорення. Інструмент не змінює
+runtime-поведінку: це окремий tools/* скрипт.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Важливо: при запуску як `python tools/json_codec_bench.py` sys.path[0] = tools/,
+# тому корінь репо не видно. Додаємо repo-root явно (інструмент, не runtime).
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.serialization import available_json_codecs, get_json_codec  # noqa: E402
+
+
+def _bar(i: int) -> dict[str, Any]:
+    open_time = 1_764_002_100_000 + i * 60_000
+    return {
+        "open_time": open_time,
+        "close_time": open_time + 59_999,
+        "open": 1.152495 + i * 1e-5,
+        "high": 1.15264 + i * 1e-5,
+        "low": 1.15245 + i * 1e-5,
+        "close": 1.15253 + i * 1e-5,
+        "volume": 149.0,
+        "complete": True,
+    }
+
+
+def _zone(rng: random.Random, i: int) -> dict[str, Any]:
+    return {
+        "id": f"fvg_{i}",
+        "kind": "fvg",
+        "direction": "bull" if i % 2 else "bear",
+        "top": round(2034.5 + rng.random(), 3),
+        "bottom": round(2033.1 + rng.random(), 3),
+        "created_ms": 1_764_002_100_000 + i * 300_000,
+        "filled_pct": None if i % 3 else round(rng.random(), 2),
+        "strength": rng.random(),
+        "meta": {"tf": "5m", "touches": i % 4, "label": "Зона"},
+    }
+
+
+def _smc_state(rng: random.Random) -> dict[str, Any]:
+    assets = []
+    for symbol in ("xauusd", "eurusd", "gbpusd", "usdjpy", "btcusd"):
+        assets.append(
+            {
+                "symbol": symbol,
+                "price": 2034.55,
+                "smc_hint": {
+                    "zones": [_zone(rng, i) for i in range(40)],
+                    "liquidity": [_zone(rng, i) for i in range(20)],
+                    "trend": "up",
+                    "last_signal": None,
+                },
+            }
+        )
+    return {"type": "smc_state", "seq": 1, "assets": assets, "meta": {"v": "smc_v1"}}
+
+
+def _call_sites() -> list[tuple[str, str, Any]]:
+    rng = random.Random(42)
+    return [
+        (
+            "fxcm:ohlcv 1 bar",
+            "loads",
+            {"symbol": "EURUSD", "tf": "1m", "bars": [_bar(0)]},
+        ),
+        (
+            "fxcm:ohlcv warmup 500",
+            "loads",
+            {"symbol": "EURUSD", "tf": "1m", "bars": [_bar(i) for i in range(500)]},
+        ),
+        (
+            "fxcm:price_tik",
+            "loads",
+            {"symbol": "XAUUSD", "bid": 2034.51, "ask": 2034.79, "ts": 1764002159.25},
+        ),
+        ("uds last-bar jset", "dumps_bytes", _bar(0)),
+        ("uds last-bar jget", "loads", _bar(0)),
+        ("publish_smc_state", "dumps_bytes", _smc_state(rng)),
+        ("viewer broadcaster", "dumps_bytes", _smc_state(rng)["assets"][0]),
+        ("ws ohlcv send (str)", "dumps_str", {"bars": [_bar(i) for i in range(50)]}),
+    ]
+
+
+def _runner(codec_name: str, op: str, payload: Any) -> Callable[[], Any]:
+    codec = get_json_codec(codec_name)
+    if op == "loads":
+        raw = get_json_codec("stdlib").dumps_bytes(payload)
+        return lambda: codec.loads_bytes(raw, "replace")
+    if op == "dumps_str":
+        return lambda: codec.dumps_bytes(payload).decode("utf-8")
+    return lambda: codec.dumps_bytes(payload)
+
+
+def _best_us(fn: Callable[[], Any], repeat: int, min_time: float) -> float:
+    number = 1
+    while timeit.timeit(fn, number=number) < min_time:
+        number *= 2
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="JSON-кодеки: stdlib vs швидкий бекенд по call-site (µs/виклик)"
+    )
+    parser.add_argument(
+        "--codec",
+        default="orjson",
+        help="Кодек для порівняння зі stdlib (за замовчуванням orjson)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Кількість замірів")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Мінімальний час одного заміру, с"
+    )
+    args = parser.parse_args()
+
+    if args.codec not in available_json_codecs():
+        print(f"Кодек {args.codec!r} недоступний: {available_json_codecs()}")
+        return 1
+
+    print(f"{'call-site':<24} {'op':<12} {'stdlib_us':>10} {'fast_us':>10} {'x':>6}")
+    for name, op, payload in _call_sites():
+        base = _best_us(_runner("stdlib", op, payload), args.repeat, args.min_time)
+        fast = _best_us(_runner(args.codec, op, payload), args.repeat, args.min_time)
+        speedup = base / fast if fast > 0 else float("inf")
+        print(f"{name:<24} {op:<12} {base:>10.1f} {fast:>10.1f} {speedup:>5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import sys
 from collections import Counter
@@ -22,20 +23,32 @@ def _ensure_root_on_path() -> None:
         sys.path.insert(0, str(ROOT))
 
 
+# (символ, каталог datastore) — snapshot-и 5m читаються через StorageAdapter.
 DATASETS = [
-    ("XAUUSD", ROOT / "datastore" / "xauusd_bars_5m_snapshot.jsonl"),
-    ("XAGUSD", ROOT / "datastore" / "xagusd_bars_5m_snapshot.jsonl"),
-    ("EURUSD", ROOT / "datastore" / "EURUSD" / "eurusd_bars_5m_snapshot.jsonl"),
+    ("XAUUSD", ROOT / "datastore"),
+    ("XAGUSD", ROOT / "datastore"),
+    ("EURUSD", ROOT / "datastore" / "EURUSD"),
 ]
+INTERVAL = "5m"
 OUTPUT_PATH = ROOT / "reports" / "smc_qa_5m_summary.json"
 BARS_LIMIT = 500
 
 
-def _load_frame(path: Path, limit: int) -> pd.DataFrame:
-    if path.suffix.lower() == ".csv":
-        df = pd.read_csv(path)
-    else:
-        df = pd.read_json(path, lines=True)
+def _load_frame(base_dir: Path, symbol: str, limit: int) -> pd.DataFrame:
+    """Бари так, як їх бачить UDS: ``StorageAdapter.load_bars``.
+
+    Base snapshot будь-якого формату (columnar/jsonl), append-сегменти і
+    trim-маніфест — читання лише base-файла дало б застарілу історію.
+    """
+    from data.unified_store import StorageAdapter, StoreConfig
+
+    disk = StorageAdapter(base_dir, StoreConfig(base_dir=str(base_dir)))
+    path = disk.base_snapshot(symbol.lower(), INTERVAL) or disk.snapshot_path(
+        symbol.lower(), INTERVAL
+    )
+    df = asyncio.run(disk.load_bars(symbol.lower(), INTERVAL))
+    if df is None or df.empty:
+        raise ValueError(f"{path}: немає snapshot-а")
     if "is_closed" in df.columns:
         df = df[df["is_closed"].astype(bool)]
     if "open_time" in df.columns:
@@ -60,7 +73,7 @@ def _load_frame(path: Path, limit: int) -> pd.DataFrame:
 def _build_snapshot(symbol: str, frame: pd.DataFrame) -> SmcInput:
     from smc_core.smc_types import SmcInput
 
-    return SmcInput(symbol=symbol, tf_primary="5m", ohlc_by_tf={"5m": frame})
+    return SmcInput(symbol=symbol, tf_primary=INTERVAL, ohlc_by_tf={INTERVAL: frame})
 
 
 def _event_timestamp(zone: SmcZone) -> pd.Timestamp | None:
@@ -83,8 +96,8 @@ def main() -> None:
 
     engine = SmcCoreEngine()
     summaries: list[dict[str, Any]] = []
-    for symbol, path in DATASETS:
-        frame = _load_frame(path, BARS_LIMIT)
+    for symbol, base_dir in DATASETS:
+        frame = _load_frame(base_dir, symbol, BARS_LIMIT)
         snapshot = _build_snapshot(symbol, frame)
         hint = engine.process_snapshot(snapshot)
         zones_state = hint.zones
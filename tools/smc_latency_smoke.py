@@ -31,6 +31,7 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from data.unified_store import StorageAdapter, StoreConfig
 from smc_core.engine import SmcCoreEngine
 from smc_core.input_adapter import build_smc_input_from_store
 
@@ -94,37 +95,26 @@ def _parse_tfs(raw: str) -> list[str]:
     return [p for p in parts if p]
 
 
-def _candidate_snapshot_paths(base_dir: str, symbol: str, tf: str) -> list[str]:
-    sym = str(symbol).lower()
-    # У repo є кілька варіантів, наприклад xauusd_bars_1h_snapshot.jsonl,
-    # xauusd_bars_1h_last7d_snapshot.jsonl — пробуємо найбільш канонічний.
-    return [
-        os.path.join(base_dir, f"{sym}_bars_{tf}_snapshot.jsonl"),
-        os.path.join(base_dir, f"{sym}_bars_{tf}_snapshot.json"),
-    ]
-
-
-def _load_snapshot_df(base_dir: str, symbol: str, tf: str) -> pd.DataFrame:
-    for path in _candidate_snapshot_paths(base_dir, symbol, tf):
-        if not os.path.exists(path):
-            continue
-        try:
-            if path.endswith(".jsonl"):
-                df = pd.read_json(path, orient="records", lines=True)
-            else:
-                df = pd.read_json(path)
-        except Exception:
-            return pd.DataFrame()
+async def _load_snapshot_df(
+    disk: StorageAdapter, symbol: str, tf: str
+) -> pd.DataFrame:
+    """Бари ключа через ``StorageAdapter.load_bars``.
 
-        if df is None or df.empty:
-            return pd.DataFrame()
+    Так інструмент бачить те саме, що UDS: base snapshot будь-якого формату
+    (columnar/jsonl/legacy json), append-сегменти і trim-маніфест.
+    """
+    try:
+        df = await disk.load_bars(str(symbol).lower(), tf)
+    except Exception:
+        return pd.DataFrame()
 
-        # Мінімальний guard: інструмент не виправляє дані, лише читає.
-        if "open_time" in df.columns:
-            df = df.sort_values("open_time", kind="stable")
-        return df.reset_index(drop=True)
+    if df is None or df.empty:
+        return pd.DataFrame()
 
-    return pd.DataFrame()
+    # Мінімальний guard: інструмент не виправляє дані, лише читає.
+    if "open_time" in df.columns:
+        df = df.sort_values("open_time", kind="stable")
+    return df.reset_index(drop=True)
 
 
 async def _run_smoke(
@@ -137,10 +127,11 @@ async def _run_smoke(
     base_dir: str,
 ) -> SmokeResult:
     # preload
+    disk = StorageAdapter(base_dir, StoreConfig(base_dir=base_dir))
     frames: dict[tuple[str, str], pd.DataFrame] = {}
     for sym in symbols:
         for tf in [tf_primary, *tfs_extra]:
-            frames[(sym, tf)] = _load_snapshot_df(base_dir, sym, tf)
+            frames[(sym, tf)] = await _load_snapshot_df(disk, sym, tf)
 
     store = _SnapshotStore(frames)
     engine = SmcCoreEngine()
@@ -219,7 +210,7 @@ def main() -> int:
     parser.add_argument(
         "--datastore-dir",
         default=os.path.join(os.path.dirname(__file__), "..", "datastore"),
-        help="Каталог зі snapshot JSONL (за замовчуванням ./datastore)",
+        help="Каталог datastore зі snapshot-ами (за замовчуванням ./datastore)",
     )
 
     args = parser.parse_args()
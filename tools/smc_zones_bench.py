@@ -0,0 +1,106 @@
+"""Бенчмарк детекторів зон SMC (FVG і Order Block) на синтетичних барах.
+
+Ціль: показати вартість `detect_fvg_zones` та `detect_order_blocks` на
+300/2000/10000 барах (розмір вікна `max_lookback_bars` та довша історія).
+Структура (свінги/ноги/події) будується один раз і в замір не входить.
+
+Вивід: мс/виклик і кількість знайдених зон. Інструмент не змінює
+runtime-поведінку: це окремий tools/* скрипт.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import timeit
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Важливо: при запуску як `python tools/smc_zones_bench.py` sys.path[0] = tools/,
+# тому корінь репо не видно. Додаємо repo-root явно (інструмент, не runtime).
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+import smc_structure  # noqa: E402
+from smc_core.config import SMC_CORE_CONFIG  # noqa: E402
+from smc_core.smc_types import SmcInput  # noqa: E402
+from smc_structure.event_history import reset_structure_event_history  # noqa: E402
+from smc_zones.fvg_detector import detect_fvg_zones  # noqa: E402
+from smc_zones.orderblock_detector import detect_order_blocks  # noqa: E402
+
+BASE_MS = 1_764_002_100_000
+
+
+def _frame(count: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 2000.0 + np.cumsum(rng.normal(0.0, 1.5, count))
+    opens = np.r_[close[0], close[:-1]] + rng.normal(0.0, 0.5, count)
+    times = BASE_MS + np.arange(count) * 60_000
+    frame = pd.DataFrame(
+        {
+            "open_time": times,
+            "open": opens,
+            "high": np.maximum(opens, close) + rng.random(count),
+            "low": np.minimum(opens, close) - rng.random(count),
+            "close": close,
+            "volume": rng.random(count) * 100,
+            "close_time": times + 59_999,
+        }
+    )
+    frame["timestamp"] = pd.to_datetime(frame["open_time"], unit="ms", utc=True)
+    return frame
+
+
+def _best_ms(fn, repeat: int, min_time: float) -> float:  # noqa: ANN001
+    number = 1
+    while timeit.timeit(fn, number=number) < min_time:
+        number *= 2
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="300,2000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # OB_v1 логує кожну зону на INFO — у бенчі це шум.
+    logging.disable(logging.INFO)
+    print(f"{'bars':>7} {'fvg ms':>9} {'fvg zones':>10} {'ob ms':>9} {'ob zones':>9}")
+    for size in (int(item) for item in args.sizes.split(",") if item.strip()):
+        cfg = replace(
+            SMC_CORE_CONFIG,
+            max_lookback_bars=size,
+            fvg_max_age_minutes=size,
+        )
+        frame = _frame(size)
+        snapshot = SmcInput(symbol="xauusd", tf_primary="1m", ohlc_by_tf={"1m": frame})
+        reset_structure_event_history()
+        structure = smc_structure.compute_structure_state(snapshot, cfg)
+        structure.meta["primary_bars"] = frame.to_dict("records")
+
+        fvg_ms = _best_ms(
+            lambda st=structure, c=cfg: detect_fvg_zones(st, c),
+            args.repeat,
+            args.min_time,
+        )
+        ob_ms = _best_ms(
+            lambda sn=snapshot, st=structure, c=cfg: detect_order_blocks(sn, st, c),
+            args.repeat,
+            args.min_time,
+        )
+        fvg_total = len(detect_fvg_zones(structure, cfg))
+        ob_total = len(detect_order_blocks(snapshot, structure, cfg))
+        print(f"{size:>7} {fvg_ms:>9.2f} {fvg_total:>10} {ob_ms:>9.2f} {ob_total:>9}")
+    reset_structure_event_history()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
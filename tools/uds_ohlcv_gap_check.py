@@ -27,8 +27,10 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from app.settings import load_datastore_cfg, settings
-from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore
+from app.settings import load_datastore_cfg, settings  # noqa: E402
+from data.gap_index import MarketHours  # noqa: E402
+from data.snapshot_index import load_index, read_range_bytes  # noqa: E402
+from data.unified_store import StoreConfig, StoreProfile, UnifiedDataStore  # noqa: E402
 
 
 @dataclass(frozen=True)
@@ -78,6 +80,12 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=None,
         help="Опціональний ліміт барів при читанні з UDS (за замовчуванням — розраховується з діапазону)",
     )
+    parser.add_argument(
+        "--market-hours",
+        choices=("24x7", "fx"),
+        default="24x7",
+        help="Календар ринку: fx — слоти у вихідні FX не рахуються як пропуски",
+    )
     parser.add_argument(
         "--snapshot-file",
         default=None,
@@ -129,26 +137,43 @@ def _coerce_int_ms(value: Any) -> int | None:
         return None
 
 
-def _read_open_times_from_jsonl_snapshot(path: Path) -> list[int]:
+def _snapshot_last_open_time(path: Path) -> int | None:
+    """max(open_time) snapshot-а з sidecar-індексу (без парсингу файла)."""
+    try:
+        index = load_index(path)
+    except OSError:
+        return None
+    return index.last_open_time if index.seekable else None
+
+
+def _read_open_times_from_jsonl_snapshot(
+    path: Path, *, start_ms: int | None = None, end_ms: int | None = None
+) -> list[int]:
     if not path.exists() or not path.is_file():
         raise FileNotFoundError(f"snapshot-file не знайдено: {path}")
 
+    # За sidecar-індексом читаємо лише зріз діапазону; інакше — весь файл.
+    payload = None
+    if start_ms is not None or end_ms is not None:
+        payload = read_range_bytes(path, None, start_ms=start_ms, end_ms=end_ms)
+    if payload is None:
+        payload = path.read_bytes()
+
     out: list[int] = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            raw = line.strip()
-            if not raw:
-                continue
-            try:
-                obj = json.loads(raw)
-            except Exception:
-                continue
-            if not isinstance(obj, dict):
-                continue
-            ms = _coerce_int_ms(obj.get("open_time"))
-            if ms is None:
-                continue
-            out.append(ms)
+    for line in payload.splitlines():
+        raw = line.strip()
+        if not raw:
+            continue
+        try:
+            obj = json.loads(raw)
+        except Exception:
+            continue
+        if not isinstance(obj, dict):
+            continue
+        ms = _coerce_int_ms(obj.get("open_time"))
+        if ms is None:
+            continue
+        out.append(ms)
     out = sorted(set(out))
     return out
 
@@ -182,6 +207,7 @@ async def main(argv: list[str] | None = None) -> None:
     symbol = str(args.symbol).strip().lower()
     tf = str(args.tf).strip().lower()
     tf_ms = _parse_tf_ms(tf)
+    market_hours = MarketHours.from_name(args.market_hours)
 
     hours = int(args.hours) if args.hours is not None else None
     if hours is not None and hours <= 0:
@@ -230,10 +256,23 @@ async def main(argv: list[str] | None = None) -> None:
     try:
         if args.snapshot_file:
             snapshot_path = Path(args.snapshot_file).expanduser().resolve()
-            open_times = _read_open_times_from_jsonl_snapshot(snapshot_path)
+            if hours is not None and snapshot_path.is_file():
+                last_ms = _snapshot_last_open_time(snapshot_path)
+                if last_ms is not None:
+                    start_ms = last_ms + tf_ms - hours * 3600_000
+                    end_ms = last_ms + tf_ms
+            open_times = _read_open_times_from_jsonl_snapshot(
+                snapshot_path, start_ms=start_ms, end_ms=end_ms
+            )
         else:
             store, redis = await _init_store()
-            df = await store.get_df(symbol, tf, limit=limit)
+            if hours is None:
+                # Точний діапазон: RAM бінарним пошуком + старіше з диска.
+                df = await store.get_range(
+                    symbol, tf, start_ms, end_ms, limit=args.limit
+                )
+            else:
+                df = await store.get_range(symbol, tf, limit=limit)
             if df is None or df.empty:
                 print(f"UDS повернув порожній DF для {symbol.upper()} {tf}")
                 return
@@ -285,8 +324,10 @@ async def main(argv: list[str] | None = None) -> None:
             if delta_ms > max_delta_ms:
                 max_delta_ms = delta_ms
 
-            # missing bars: якщо між open_time більше ніж 1 TF
-            missing_bars = max(0, (delta_ms // tf_ms) - 1)
+            # missing bars: слоти сітки TF між open_time з відкритим ринком
+            missing_bars = market_hours.count_open_slots(
+                prev_ms + tf_ms, curr_ms, tf_ms
+            )
             if missing_bars > 0:
                 gap_gt_1 += 1
                 gaps.append(
@@ -311,7 +352,9 @@ async def main(argv: list[str] | None = None) -> None:
         if top_n and gaps:
             print(f"\nTop {min(top_n, len(gaps))} gaps:")
             for item in sorted(gaps, key=lambda x: x.delta_ms, reverse=True)[:top_n]:
-                missing_bars = max(0, (item.delta_ms // tf_ms) - 1)
+                missing_bars = market_hours.count_open_slots(
+                    item.prev_open_time_ms + tf_ms, item.curr_open_time_ms, tf_ms
+                )
                 prev_dt = datetime.fromtimestamp(item.prev_open_time_ms / 1000, tz=UTC)
                 curr_dt = datetime.fromtimestamp(item.curr_open_time_ms / 1000, tz=UTC)
                 print(